@@ -1,5 +1,7 @@
+using System.Diagnostics;
 using Godot;
 using Game.Core.Ports;
+using Game.Godot.Scripts.Perf;
 
 namespace Game.Godot.Adapters;
 
@@ -10,9 +12,12 @@ public partial class ResourceLoaderAdapter : Node, IResourceLoader
         try
         {
             if (!IsPathSafe(path)) return null;
+            var sw = Stopwatch.StartNew();
             using var f = FileAccess.Open(path, FileAccess.ModeFlags.Read);
             if (f == null) return null;
-            return f.GetAsText();
+            var text = f.GetAsText();
+            PerformanceTracker.RecordResourceLoad(path, sw.Elapsed.TotalMilliseconds);
+            return text;
         }
         catch
         {
@@ -25,9 +30,12 @@ public partial class ResourceLoaderAdapter : Node, IResourceLoader
         try
         {
             if (!IsPathSafe(path)) return null;
+            var sw = Stopwatch.StartNew();
             using var f = FileAccess.Open(path, FileAccess.ModeFlags.Read);
             if (f == null) return null;
-            return f.GetBuffer((long)f.GetLength());
+            var bytes = f.GetBuffer((long)f.GetLength());
+            PerformanceTracker.RecordResourceLoad(path, sw.Elapsed.TotalMilliseconds);
+            return bytes;
         }
         catch
         {
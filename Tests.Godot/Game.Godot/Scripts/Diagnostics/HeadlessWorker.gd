@@ -0,0 +1,138 @@
+extends SceneTree
+
+# Warm headless worker: keeps the engine, C# assemblies and imported resources
+# loaded and serves newline-delimited JSON requests on 127.0.0.1, one at a time.
+# Started and spoken to by scripts/python/godot_worker_lib.py.
+#
+# Env:
+#   GODOT_WORKER_TOKEN     shared secret every request must carry
+#   GODOT_WORKER_PORT      listen port (0 / unset = any free port)
+#   GODOT_WORKER_IDLE_SEC  quit after this long without requests (default 1800)
+#
+# Ops: ping | selfcheck | smoke {scene, seconds} | gdunit {args} | shutdown.
+# Console output of a request is framed by [WORKER_BEGIN id=..] / [WORKER_END id=..]
+# so the client can cut its slice out of the shared worker log.
+
+const Probe = preload("res://Game.Godot/Scripts/Diagnostics/CompositionRootProbe.gd")
+const GDUNIT_RUNNER := "res://Game.Godot/Scripts/Diagnostics/WorkerGdUnitRunner.gd"
+const GDUNIT_BASE := "res://addons/gdUnit4/src/core/runners/GdUnitTestCIRunner.gd"
+const IDLE_MAX_FPS := 30
+
+var _server := TCPServer.new()
+var _token := ""
+var _idle_sec := 1800.0
+var _last_activity_ms := 0
+var _busy := false
+
+func _initialize() -> void:
+    _token = OS.get_environment("GODOT_WORKER_TOKEN")
+    var idle := OS.get_environment("GODOT_WORKER_IDLE_SEC")
+    if idle != "":
+        _idle_sec = float(idle)
+    var err := _server.listen(int(OS.get_environment("GODOT_WORKER_PORT")), "127.0.0.1")
+    if err != OK or _token == "":
+        printerr("[WORKER_ERROR] cannot start: listen=", error_string(err), " token_set=", _token != "")
+        quit(1)
+        return
+    Engine.max_fps = IDLE_MAX_FPS
+    _last_activity_ms = Time.get_ticks_msec()
+    print("[WORKER_READY] port=%d pid=%d" % [_server.get_local_port(), OS.get_process_id()])
+
+func _process(_delta: float) -> bool:
+    if _busy:
+        return false
+    if _server.is_connection_available():
+        _serve(_server.take_connection())
+    elif Time.get_ticks_msec() - _last_activity_ms > int(_idle_sec * 1000.0):
+        print("[WORKER_IDLE_EXIT]")
+        return true
+    return false
+
+func _serve(peer: StreamPeerTCP) -> void:
+    _busy = true
+    var response := {}
+    var req = JSON.parse_string(await _read_line(peer, 10.0))
+    if typeof(req) != TYPE_DICTIONARY:
+        response = {"ok": false, "error": "bad request"}
+    elif str(req.get("token", "")) != _token:
+        response = {"ok": false, "error": "bad token"}
+    else:
+        var id := str(req.get("id", ""))
+        print("[WORKER_BEGIN id=%s op=%s]" % [id, str(req.get("op", ""))])
+        Engine.max_fps = 0
+        response = await _dispatch(req)
+        Engine.max_fps = IDLE_MAX_FPS
+        print("[WORKER_END id=%s]" % id)
+        response["id"] = id
+    peer.put_data((JSON.stringify(response) + "\n").to_utf8_buffer())
+    peer.disconnect_from_host()
+    _last_activity_ms = Time.get_ticks_msec()
+    _busy = false
+    if bool(response.get("shutdown", false)):
+        quit(0)
+
+func _read_line(peer: StreamPeerTCP, timeout_sec: float) -> String:
+    var buf := PackedByteArray()
+    var deadline := Time.get_ticks_msec() + int(timeout_sec * 1000.0)
+    while Time.get_ticks_msec() < deadline:
+        peer.poll()
+        if peer.get_status() != StreamPeerTCP.STATUS_CONNECTED:
+            break
+        var n := peer.get_available_bytes()
+        if n > 0:
+            var chunk: Array = peer.get_partial_data(n)
+            if chunk[0] == OK:
+                buf.append_array(chunk[1])
+                var nl := buf.find(10)
+                if nl >= 0:
+                    return buf.slice(0, nl).get_string_from_utf8()
+        await process_frame
+    return ""
+
+func _dispatch(req: Dictionary) -> Dictionary:
+    match str(req.get("op", "")):
+        "ping":
+            return {"ok": true, "pid": OS.get_process_id(), "uptime_sec": Time.get_ticks_msec() / 1000.0}
+        "selfcheck":
+            var result: Dictionary = await Probe.new().run(self)
+            var path := Probe.write_result(result)
+            print("SELF_CHECK_OUT:", path)
+            return {"ok": true, "json": path}
+        "smoke":
+            return await _smoke(str(req.get("scene", "")), float(req.get("seconds", 5.0)))
+        "gdunit":
+            return await _gdunit(req.get("args", []))
+        "shutdown":
+            return {"ok": true, "shutdown": true}
+    return {"ok": false, "error": "unknown op: %s" % str(req.get("op", ""))}
+
+# Same window a cold `godot --scene` smoke gets before it is killed, then the scene is freed.
+func _smoke(scene: String, seconds: float) -> Dictionary:
+    var packed = ResourceLoader.load(scene, "", ResourceLoader.CACHE_MODE_REPLACE_DEEP)
+    if not (packed is PackedScene):
+        printerr("[WORKER_ERROR] scene not found: ", scene)
+        return {"ok": false, "error": "scene not found: %s" % scene}
+    var node: Node = packed.instantiate()
+    root.add_child(node)
+    current_scene = node
+    await create_timer(seconds).timeout
+    if is_instance_valid(node):
+        current_scene = null
+        node.queue_free()
+    await process_frame
+    return {"ok": true, "scene": scene, "seconds": seconds}
+
+# `args` are the GdUnitCmdTool.gd options (-a, -rd, --ignoreHeadlessMode, ...).
+func _gdunit(args: Array) -> Dictionary:
+    if not ResourceLoader.exists(GDUNIT_BASE):
+        return {"ok": false, "error": "GdUnit4 is not installed in this project"}
+    var runner: Node = load(GDUNIT_RUNNER).new()
+    var cmd := PackedStringArray(["GdUnitCmdTool.gd"])
+    for a in args:
+        cmd.append(str(a))
+    runner._debug_cmd_args = cmd
+    root.add_child(runner)
+    var code: int = await runner.finished
+    runner.queue_free()
+    await process_frame
+    return {"ok": true, "rc": code}
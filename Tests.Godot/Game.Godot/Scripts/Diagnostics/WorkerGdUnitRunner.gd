@@ -0,0 +1,14 @@
+extends "res://addons/gdUnit4/src/core/runners/GdUnitTestCIRunner.gd"
+
+# GdUnit CI runner used by HeadlessWorker.gd: same options and reports as
+# GdUnitCmdTool.gd, but a finished run emits `finished(code)` instead of
+# quitting the worker's SceneTree. Only loadable in projects with GdUnit4.
+
+signal finished(code: int)
+
+func quit(code: int) -> void:
+    _state = EXIT
+    GdUnitTools.dispose_all()
+    await GdUnitMemoryObserver.gc_on_guarded_instances()
+    await get_tree().process_frame
+    finished.emit(code)
@@ -1,4 +1,6 @@
+using System.Diagnostics;
 using Godot;
+using Game.Godot.Scripts.Perf;
 
 namespace Game.Godot.Scripts.Navigation;
 
@@ -28,23 +30,28 @@ public bool SwitchTo(string scenePath)
     {
         if (_busy) return false;
         if (_root == null) return false;
+        var sw = Stopwatch.StartNew();
         var packed = ResourceLoader.Load<PackedScene>(scenePath);
+        var loadMs = sw.Elapsed.TotalMilliseconds;
         if (packed == null)
         {
             GD.PushWarning($"[Navigator] Scene not found: {scenePath}");
             return false;
         }
+        PerformanceTracker.RecordResourceLoad(scenePath, loadMs);
         if (UseFadeTransition && _overlays != null)
         {
-            _ = FadeAndSwitch(packed);
+            _ = FadeAndSwitch(packed, scenePath, loadMs);
             return true;
         }
-        DoSwitch(packed);
+        DoSwitch(packed, scenePath, loadMs);
         return true;
     }
 
-    private void DoSwitch(PackedScene packed)
+    // Scene switch time = load + swap; the fade tween is intentional latency and is excluded.
+    private void DoSwitch(PackedScene packed, string scenePath, double loadMs)
     {
+        var sw = Stopwatch.StartNew();
         // Call Exit on current if present, then remove
         if (_current != null)
         {
@@ -56,13 +63,14 @@ private void DoSwitch(PackedScene packed)
         _root!.AddChild(inst);
         _current = inst;
         if (_current.HasMethod("Enter")) _current.CallDeferred("Enter");
+        PerformanceTracker.RecordSceneSwitch(scenePath, loadMs + sw.Elapsed.TotalMilliseconds);
     }
 
-    private async System.Threading.Tasks.Task FadeAndSwitch(PackedScene packed)
+    private async System.Threading.Tasks.Task FadeAndSwitch(PackedScene packed, string scenePath, double loadMs)
     {
         if (_overlays == null)
         {
-            DoSwitch(packed);
+            DoSwitch(packed, scenePath, loadMs);
             return;
         }
         _busy = true;
@@ -79,7 +87,7 @@ private async System.Threading.Tasks.Task FadeAndSwitch(PackedScene packed)
         await ToSignal(tween, Tween.SignalName.Finished);
 
         // Switch content while fully faded
-        DoSwitch(packed);
+        DoSwitch(packed, scenePath, loadMs);
 
         var tween2 = _overlays.CreateTween();
         tween2.TweenProperty(fade, "color:a", 0.0, FadeDurationSec).SetTrans(Tween.TransitionType.Cubic).SetEase(Tween.EaseType.Out);
@@ -12,17 +12,44 @@ public partial class PerformanceTracker : Node
     [Export] public bool Enabled { get; set; } = true;
     [Export] public int WindowFrames { get; set; } = 300;
     [Export] public float FlushIntervalSec { get; set; } = 1.0f;
+    // Opt-in raw frame stream for offline histograms (scripts/python/perf_frame_hist.py).
+    // Also enabled by env PERF_FRAME_STREAM=1; env PERF_FRAME_STREAM_DIR overrides user://logs/perf.
+    [Export] public bool StreamFrameSamples { get; set; } = false;
+
+    // Stream format: "PFS1" magic, then one little-endian uint32 frame time in microseconds per frame.
+    private static readonly byte[] FrameStreamMagic = { (byte)'P', (byte)'F', (byte)'S', (byte)'1' };
 
     private readonly List<double> _frameMs = new();
+    private readonly List<uint> _pendingFrameUs = new();
+    private BinaryWriter? _frameStream;
     private Timer _timer = default!;
 
+    // First load of a path in this process counts as cold; later loads are hot (ADR-0015 budgets).
+    private static readonly HashSet<string> SeenScenes = new();
+    private static readonly HashSet<string> SeenResources = new();
+    private static readonly object SeenLock = new();
+
+    // Live tracker (autoload); the static scene/load markers follow its Enabled switch.
+    private static PerformanceTracker? _instance;
+
     public override void _Ready()
     {
+        _instance = this;
         if (!Enabled) return;
         SetProcess(true);
         _timer = new Timer { WaitTime = FlushIntervalSec, OneShot = false, Autostart = true };
         AddChild(_timer);
         _timer.Timeout += OnFlush;
+        if (StreamFrameSamples || (System.Environment.GetEnvironmentVariable("PERF_FRAME_STREAM") ?? "0") == "1")
+            OpenFrameStream();
+    }
+
+    public override void _ExitTree()
+    {
+        if (_instance == this) _instance = null;
+        FlushFrameStream();
+        _frameStream?.Dispose();
+        _frameStream = null;
     }
 
     public override void _Process(double delta)
@@ -30,16 +57,20 @@ public override void _Process(double delta)
         if (!Enabled) return;
         var ms = Math.Max(0, delta * 1000.0);
         _frameMs.Add(ms);
+        if (_frameStream != null)
+            _pendingFrameUs.Add((uint)Math.Min(uint.MaxValue, ms * 1000.0));
         if (_frameMs.Count > WindowFrames)
             _frameMs.RemoveRange(0, _frameMs.Count - WindowFrames);
     }
 
     private void OnFlush()
     {
+        FlushFrameStream();
         if (!Enabled || _frameMs.Count < 5) return;
         var metrics = Compute();
-        // Console marker for smoke parser
-        GD.Print($"[PERF] frames={metrics.frames} avg_ms={metrics.avg_ms:F2} p50_ms={metrics.p50_ms:F2} p95_ms={metrics.p95_ms:F2} p99_ms={metrics.p99_ms:F2}");
+        // Console marker for smoke parser (uptime_s lets perf runs discard warm-up windows)
+        var uptimeSec = Time.GetTicksMsec() / 1000.0;
+        GD.Print($"[PERF] frames={metrics.frames} avg_ms={metrics.avg_ms:F2} p50_ms={metrics.p50_ms:F2} p95_ms={metrics.p95_ms:F2} p99_ms={metrics.p99_ms:F2} uptime_s={uptimeSec:F1}");
         // Write JSON file
         try
         {
@@ -51,6 +82,61 @@ private void OnFlush()
         catch { }
     }
 
+    private void OpenFrameStream()
+    {
+        try
+        {
+            var dir = System.Environment.GetEnvironmentVariable("PERF_FRAME_STREAM_DIR");
+            if (string.IsNullOrWhiteSpace(dir))
+                dir = ProjectSettings.GlobalizePath("user://logs/perf");
+            Directory.CreateDirectory(dir);
+            var path = Path.Combine(dir, $"frames-{DateTime.Now:yyyyMMdd-HHmmss}-{System.Environment.ProcessId}.pfs");
+            _frameStream = new BinaryWriter(File.Open(path, FileMode.Create, System.IO.FileAccess.Write, FileShare.Read));
+            _frameStream.Write(FrameStreamMagic);
+            GD.Print($"[PERF_STREAM] path={path}");
+        }
+        catch (Exception ex)
+        {
+            GD.PushWarning($"[Perf] frame stream disabled: {ex.Message}");
+            _frameStream = null;
+        }
+    }
+
+    private void FlushFrameStream()
+    {
+        if (_frameStream == null || _pendingFrameUs.Count == 0) return;
+        try
+        {
+            foreach (var us in _pendingFrameUs)
+                _frameStream.Write(us);
+            _frameStream.Flush();
+        }
+        catch { }
+        _pendingFrameUs.Clear();
+    }
+
+    // Console marker for smoke parser: [PERF_SCENE] kind=cold|hot ms=... scene=...
+    public static void RecordSceneSwitch(string scenePath, double ms)
+    {
+        if (_instance is { Enabled: false }) return;
+        GD.Print($"[PERF_SCENE] kind={Kind(SeenScenes, scenePath)} ms={ms:F2} scene={scenePath}");
+    }
+
+    // Console marker for smoke parser: [PERF_LOAD] kind=cold|hot ms=... path=...
+    public static void RecordResourceLoad(string path, double ms)
+    {
+        if (_instance is { Enabled: false }) return;
+        GD.Print($"[PERF_LOAD] kind={Kind(SeenResources, path)} ms={ms:F2} path={path}");
+    }
+
+    private static string Kind(HashSet<string> seen, string key)
+    {
+        lock (SeenLock)
+        {
+            return seen.Add(key) ? "cold" : "hot";
+        }
+    }
+
     private (int frames, double avg_ms, double p50_ms, double p95_ms, double p99_ms) Compute()
     {
         var frames = _frameMs.Count;
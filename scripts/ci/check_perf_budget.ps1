@@ -1,14 +1,28 @@
 param(
   [int]$MaxP95Ms = 20,
-  [string]$LogPath
+  [string]$LogPath,
+  [string]$BudgetsPath = "$PSScriptRoot/perf-budgets.json"
 )
 
+# ADR-0015 multi-metric budgets. Frame p95 uses -MaxP95Ms; the other metrics come from
+# perf-budgets.json (same file as scripts/python/perf_budget_lib.py). Metrics without
+# markers in the log are reported as NO-DATA and never fail the gate.
+
 $ErrorActionPreference = 'Stop'
 function Find-LatestHeadlessLog {
   $logs = Get-ChildItem -Recurse -Filter headless.log -Path "$PSScriptRoot/../../logs/ci" -ErrorAction SilentlyContinue | Sort-Object LastWriteTime -Descending
   return $logs | Select-Object -First 1
 }
 
+function Get-P95([double[]]$values) {
+  $sorted = $values | Sort-Object
+  $pos = 0.95 * ($sorted.Count - 1)
+  $lo = [math]::Floor($pos); $hi = [math]::Ceiling($pos)
+  if ($lo -eq $hi) { return [double]$sorted[$lo] }
+  $w = $pos - $lo
+  return [double]$sorted[$lo] * (1 - $w) + [double]$sorted[$hi] * $w
+}
+
 if (-not $LogPath) {
   $l = Find-LatestHeadlessLog
   if (-not $l) { Write-Error 'No headless.log found under logs/ci'; exit 1 }
@@ -18,9 +32,50 @@ if (-not $LogPath) {
 if (-not (Test-Path $LogPath)) { Write-Error "Log not found: $LogPath"; exit 1 }
 
 $content = Get-Content $LogPath -Raw
-$m = [regex]::Matches($content, '\[PERF\][^\n]*p95_ms=([0-9]+(?:\.[0-9]+)?)')
+$m = [regex]::Matches($content, '\[PERF\][^\n]*p95_ms=([0-9]+(?:\.[0-9]+)?)\s+p99_ms=([0-9]+(?:\.[0-9]+)?)')
 if ($m.Count -eq 0) { Write-Error 'No PERF markers found'; exit 1 }
-$last = $m[$m.Count-1].Groups[1].Value
-$p95 = [double]$last
+$last = $m[$m.Count-1]
+$p95 = [double]$last.Groups[1].Value
+$values = @{
+  'frame_p95_ms' = $p95
+  'frame_p99_ms' = [double]$last.Groups[2].Value
+}
+$events = [regex]::Matches($content, '\[PERF_(SCENE|LOAD)\]\s*kind=(cold|hot)\s+ms=([0-9]+(?:\.[0-9]+)?)')
+$eventMetrics = @{
+  'SCENE:cold' = 'scene_switch_cold_p95_ms'; 'SCENE:hot' = 'scene_switch_hot_p95_ms'
+  'LOAD:cold' = 'resource_load_cold_p95_ms'; 'LOAD:hot' = 'resource_load_hot_p95_ms'
+}
+foreach ($key in $eventMetrics.Keys) {
+  $parts = $key.Split(':')
+  $samples = @($events | Where-Object { $_.Groups[1].Value -eq $parts[0] -and $_.Groups[2].Value -eq $parts[1] } | ForEach-Object { [double]$_.Groups[3].Value })
+  if ($samples.Count -gt 0) { $values[$eventMetrics[$key]] = Get-P95 $samples }
+}
+
+$budgets = @{}
+if (Test-Path $BudgetsPath) {
+  $cfg = Get-Content $BudgetsPath -Raw | ConvertFrom-Json
+  foreach ($p in $cfg.metrics.PSObject.Properties) { $budgets[$p.Name] = $p.Value }
+} else {
+  Write-Host "Budgets file not found: $BudgetsPath (frame p95 only)"
+}
+$budgets['frame_p95_ms'] = [pscustomobject]@{ max_ms = $MaxP95Ms; gate = 'hard' }
+
+$hardFail = 0
+foreach ($metric in ($budgets.Keys | Sort-Object)) {
+  $b = $budgets[$metric]
+  $gate = if ($b.gate) { $b.gate } else { 'hard' }
+  if (-not $values.ContainsKey($metric)) {
+    Write-Host ("{0}: NO-DATA (budget {1} ms, {2})" -f $metric, $b.max_ms, $gate)
+    continue
+  }
+  $v = [math]::Round($values[$metric], 2)
+  if ($v -le [double]$b.max_ms) {
+    Write-Host ("{0}: PASS {1} ms (budget {2} ms, {3})" -f $metric, $v, $b.max_ms, $gate)
+  } else {
+    Write-Host ("{0}: FAIL {1} ms (budget {2} ms, {3})" -f $metric, $v, $b.max_ms, $gate)
+    if ($gate -eq 'hard') { $hardFail++ }
+  }
+}
+
 Write-Host "Found p95_ms=$p95 ms (budget $MaxP95Ms ms)"
-if ($p95 -le $MaxP95Ms) { Write-Host 'PERF BUDGET PASS'; exit 0 } else { Write-Error 'PERF BUDGET FAIL'; exit 1 }
+if ($hardFail -eq 0) { Write-Host 'PERF BUDGET PASS'; exit 0 } else { Write-Error "PERF BUDGET FAIL ($hardFail hard budget(s) exceeded)"; exit 1 }
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Artifact catalog for logs/ci, logs/unit and logs/e2e.
+
+Why:
+  Evidence consumers (sc-llm-review, acceptance evidence checks, unit metrics)
+  located "the latest" acceptance summary / TRX / GdUnit results.xml by walking
+  dated log directories and sorting by mtime. That is slow on long-lived agents
+  and picks the wrong artifact when two runs (or two tasks) overlap.
+
+Design:
+  - SQLite file logs/ci/.artifact-catalog.sqlite3 (override: env SC_ARTIFACT_CATALOG).
+    One table:
+      artifacts(run_id, task_id, step, kind, path, created_at)
+    with (run_id, step, kind, path) unique; re-registering refreshes created_at.
+  - Producers register what they wrote: sc-test (summary, unit dir, gdunit report
+    dir), run_dotnet.py (TRX, cobertura, summary), run_gdunit.py
+    (results.xml, report dir) and sc-acceptance-check (summary).
+  - run_id / task_id default to env SC_RUN_ID / SC_TASK_ID, which sc-test and
+    sc-acceptance-check export so child processes tag their outputs.
+  - Lookups return the newest registered path that still exists on disk; callers
+    keep their directory scan as a fallback for logs written before the catalog.
+
+Registration and lookup are best-effort: a locked or unreadable catalog never
+fails a gate (register_artifact() returns False, find_artifact() returns None).
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+
+# Artifact kinds (keep in sync with producers).
+KIND_ACCEPTANCE_SUMMARY = "acceptance-summary"
+KIND_SC_TEST_SUMMARY = "sc-test-summary"
+KIND_UNIT_DIR = "unit-dir"
+KIND_UNIT_SUMMARY = "unit-summary"
+KIND_TRX = "trx"
+KIND_COBERTURA = "cobertura"
+KIND_GDUNIT_REPORT_DIR = "gdunit-report-dir"
+KIND_GDUNIT_RESULTS_XML = "gdunit-results-xml"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id     TEXT NOT NULL,
+    task_id    TEXT NOT NULL,
+    step       TEXT NOT NULL,
+    kind       TEXT NOT NULL,
+    path       TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (run_id, step, kind, path)
+);
+CREATE INDEX IF NOT EXISTS artifacts_kind_task ON artifacts (kind, task_id, created_at);
+CREATE INDEX IF NOT EXISTS artifacts_kind_run ON artifacts (kind, run_id, created_at);
+"""
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def default_db_path() -> Path:
+    override = os.environ.get("SC_ARTIFACT_CATALOG", "").strip()
+    if override:
+        return Path(override)
+    return repo_root() / "logs" / "ci" / ".artifact-catalog.sqlite3"
+
+
+def current_run_id() -> str:
+    return os.environ.get("SC_RUN_ID", "").strip()
+
+
+def current_task_id() -> str:
+    return os.environ.get("SC_TASK_ID", "").strip()
+
+
+def _store_path(path: Path, root: Path) -> str:
+    """Repo-relative posix path when under the repo, absolute otherwise."""
+    p = path.resolve()
+    try:
+        return p.relative_to(root).as_posix()
+    except ValueError:
+        return p.as_posix()
+
+
+class ArtifactCatalog:
+    def __init__(self, db_path: Path | None = None, *, root: Path | None = None) -> None:
+        self.root = (root or repo_root()).resolve()
+        self.db_path = db_path or default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ArtifactCatalog":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def register(
+        self,
+        kind: str,
+        path: Path,
+        *,
+        run_id: str | None = None,
+        task_id: str | None = None,
+        step: str = "",
+    ) -> None:
+        row = (
+            current_run_id() if run_id is None else str(run_id),
+            current_task_id() if task_id is None else str(task_id),
+            step,
+            kind,
+            _store_path(Path(path), self.root),
+            time.time(),
+        )
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?)", row)
+
+    def query(
+        self,
+        kind: str,
+        *,
+        run_id: str | None = None,
+        task_id: str | None = None,
+        step: str | None = None,
+        limit: int = 20,
+    ) -> list[dict[str, Any]]:
+        """Newest first. None filters are ignored."""
+        sql = "SELECT run_id, task_id, step, kind, path, created_at FROM artifacts WHERE kind = ?"
+        params: list[Any] = [kind]
+        for column, value in (("run_id", run_id), ("task_id", task_id), ("step", step)):
+            if value is not None:
+                sql += f" AND {column} = ?"
+                params.append(str(value))
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(max(1, int(limit)))
+        cols = ("run_id", "task_id", "step", "kind", "path", "created_at")
+        return [dict(zip(cols, r)) for r in self._conn.execute(sql, params).fetchall()]
+
+    def resolve(self, stored: str) -> Path:
+        p = Path(stored)
+        return p if p.is_absolute() else self.root / p
+
+    def latest(
+        self,
+        kind: str,
+        *,
+        run_id: str | None = None,
+        task_id: str | None = None,
+        step: str | None = None,
+        under: Path | None = None,
+    ) -> Path | None:
+        """Newest registered artifact that still exists (optionally below `under`)."""
+        base = under.resolve() if under is not None else None
+        for row in self.query(kind, run_id=run_id, task_id=task_id, step=step):
+            p = self.resolve(str(row["path"]))
+            if base is not None and base != p.resolve() and base not in p.resolve().parents:
+                continue
+            if p.exists():
+                return p
+        return None
+
+    def paths_for_run(self, run_id: str) -> list[Path]:
+        rows = self._conn.execute("SELECT path FROM artifacts WHERE run_id = ?", (str(run_id),)).fetchall()
+        return [self.resolve(str(r[0])) for r in rows]
+
+    def prune_missing(self) -> int:
+        """Drops entries whose path no longer exists (e.g. after logs_gc.py); returns the count."""
+        stale = [(r[0],) for r in self._conn.execute("SELECT rowid, path FROM artifacts").fetchall() if not self.resolve(str(r[1])).exists()]
+        with self._conn:
+            self._conn.executemany("DELETE FROM artifacts WHERE rowid = ?", stale)
+        return len(stale)
+
+
+def register_artifact(
+    kind: str,
+    path: Path,
+    *,
+    run_id: str | None = None,
+    task_id: str | None = None,
+    step: str = "",
+) -> bool:
+    """Best-effort registration; returns False when the catalog is unavailable."""
+    try:
+        with ArtifactCatalog() as catalog:
+            catalog.register(kind, path, run_id=run_id, task_id=task_id, step=step)
+    except (OSError, sqlite3.Error):
+        return False
+    return True
+
+
+def find_artifact(
+    kind: str,
+    *,
+    run_id: str | None = None,
+    task_id: str | None = None,
+    step: str | None = None,
+    under: Path | None = None,
+) -> Path | None:
+    """Best-effort lookup; None when nothing matches or the catalog is unavailable."""
+    if not default_db_path().is_file():
+        return None
+    try:
+        with ArtifactCatalog() as catalog:
+            return catalog.latest(kind, run_id=run_id, task_id=task_id, step=step, under=under)
+    except (OSError, sqlite3.Error):
+        return None
@@ -3,41 +3,31 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
 import json
-import subprocess
 from pathlib import Path
 from typing import Any
 
+import validate_acceptance_anchors
+import validate_acceptance_refs
+from task_batch_lib import TaskGateResult, run_chunked
+from taskmaster_store_lib import get_store
+
 
 def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def load_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def write_json(path: Path, payload: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8", newline="\n")
 
 
-def run(cmd: list[str], cwd: Path) -> tuple[int, str]:
-    p = subprocess.Popen(cmd, cwd=str(cwd), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="ignore")
-    out, _ = p.communicate()
-    return p.returncode or 0, out
-
-
-def collect_task_ids(back: list[dict[str, Any]], gameplay: list[dict[str, Any]]) -> list[int]:
-    ids: set[int] = set()
-    for view in (back, gameplay):
-        for t in view:
-            if not isinstance(t, dict):
-                continue
-            tid = t.get("taskmaster_id")
-            if isinstance(tid, int):
-                ids.add(tid)
-    return sorted(ids)
+def _audit_chunk(task_ids: list[str], *, stage: str, out_dir: str) -> list[tuple[TaskGateResult, TaskGateResult]]:
+    # Both validators share this process's TaskmasterStore; one chunk per pool worker.
+    refs = validate_acceptance_refs.validate_tasks(task_ids, stage=stage, out_dir=out_dir)
+    anchors = validate_acceptance_anchors.validate_tasks(task_ids, stage=stage, out_dir=out_dir)
+    return list(zip(refs, anchors))
 
 
 def main() -> int:
@@ -45,6 +35,7 @@ def main() -> int:
     ap.add_argument("--out-dir", default="", help="Output directory (default logs/ci/<date>/audit-acceptance-gates).")
     ap.add_argument("--stage", default="refactor", choices=["red", "green", "refactor"])
     ap.add_argument("--limit", type=int, default=0, help="Limit to first N tasks (0 = all).")
+    ap.add_argument("--workers", type=int, default=1, help="Process pool size for validation (default 1 = in-process).")
     args = ap.parse_args()
 
     root = repo_root()
@@ -57,12 +48,11 @@ def main() -> int:
         out_dir = root / "logs" / "ci" / today / "audit-acceptance-gates"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    back = load_json(root / ".taskmaster/tasks/tasks_back.json")
-    gameplay = load_json(root / ".taskmaster/tasks/tasks_gameplay.json")
-    if not isinstance(back, list) or not isinstance(gameplay, list):
+    store = get_store(root)
+    if not isinstance(store.back_view(), list) or not isinstance(store.gameplay_view(), list):
         raise SystemExit("Expected tasks_back.json/tasks_gameplay.json to be JSON arrays.")
 
-    task_ids = collect_task_ids(back, gameplay)
+    task_ids = store.taskmaster_ids()
     if args.limit and args.limit > 0:
         task_ids = task_ids[: args.limit]
 
@@ -75,51 +65,25 @@ def main() -> int:
         "anchors_fail": 0,
     }
 
-    for tid in task_ids:
+    fn = functools.partial(_audit_chunk, stage=args.stage, out_dir=str(out_dir))
+    results = run_chunked(fn, [str(tid) for tid in task_ids], workers=int(args.workers))
+
+    for tid, (refs, anchors) in zip(task_ids, results):
         tdir = out_dir / f"task-{tid}"
         tdir.mkdir(parents=True, exist_ok=True)
+        (tdir / "acceptance-refs.log").write_text(refs.out, encoding="utf-8", newline="\n")
+        (tdir / "acceptance-anchors.log").write_text(anchors.out, encoding="utf-8", newline="\n")
 
-        refs_out = tdir / "acceptance-refs.json"
-        anchors_out = tdir / "acceptance-anchors.json"
-
-        refs_cmd = [
-            "py",
-            "-3",
-            "scripts/python/validate_acceptance_refs.py",
-            "--task-id",
-            str(tid),
-            "--stage",
-            args.stage,
-            "--out",
-            str(refs_out),
-        ]
-        anchors_cmd = [
-            "py",
-            "-3",
-            "scripts/python/validate_acceptance_anchors.py",
-            "--task-id",
-            str(tid),
-            "--stage",
-            args.stage,
-            "--out",
-            str(anchors_out),
-        ]
-
-        rc_refs, out_refs = run(refs_cmd, cwd=root)
-        (tdir / "acceptance-refs.log").write_text(out_refs, encoding="utf-8", newline="\n")
-        rc_anchors, out_anchors = run(anchors_cmd, cwd=root)
-        (tdir / "acceptance-anchors.log").write_text(out_anchors, encoding="utf-8", newline="\n")
-
-        refs_ok = rc_refs == 0
-        anchors_ok = rc_anchors == 0
+        refs_ok = refs.rc == 0
+        anchors_ok = anchors.rc == 0
         counts["refs_ok" if refs_ok else "refs_fail"] += 1
         counts["anchors_ok" if anchors_ok else "anchors_fail"] += 1
 
         per_task.append(
             {
                 "task_id": tid,
-                "refs": {"rc": rc_refs, "out": str(refs_out.relative_to(root)).replace("\\", "/")},
-                "anchors": {"rc": rc_anchors, "out": str(anchors_out.relative_to(root)).replace("\\", "/")},
+                "refs": {"rc": refs.rc, "out": str(Path(refs.report_path).relative_to(root)).replace("\\", "/")},
+                "anchors": {"rc": anchors.rc, "out": str(Path(anchors.report_path).relative_to(root)).replace("\\", "/")},
             }
         )
 
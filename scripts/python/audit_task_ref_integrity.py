@@ -36,6 +36,8 @@ from datetime import date
 from pathlib import Path
 from typing import Any, Iterable
 
+from taskmaster_store_lib import get_store
+
 
 ADR_STATUS_RE = re.compile(r"^\s*-?\s*Status\s*:\s*(.+?)\s*$", flags=re.IGNORECASE | re.MULTILINE)
 EVENTTYPE_RE = re.compile(r'public\s+const\s+string\s+EventType\s*=\s*"([^"]+)"\s*;', flags=re.MULTILINE)
@@ -46,10 +48,6 @@ def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def load_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def write_json(path: Path, payload: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8", newline="\n")
@@ -117,15 +115,6 @@ class Finding:
     message: str
 
 
-def find_task_by_taskmaster_id(view: list[dict[str, Any]], taskmaster_id: int) -> dict[str, Any] | None:
-    for t in view:
-        if not isinstance(t, dict):
-            continue
-        if t.get("taskmaster_id") == taskmaster_id:
-            return t
-    return None
-
-
 def audit_view_task(
     *,
     root: Path,
@@ -309,13 +298,14 @@ def main() -> int:
     d = date.today().strftime("%Y-%m-%d")
     out_path = Path(args.out) if args.out else (root / "logs" / "ci" / d / "task-refs-audit" / "task_ref_integrity.json")
 
-    tasks_json = load_json(root / ".taskmaster" / "tasks" / "tasks.json")
+    store = get_store(root)
+    tasks_json = store.tasks_json()
     master_tasks = (tasks_json.get("master") or {}).get("tasks") or []
     if not isinstance(master_tasks, list):
         raise SystemExit("tasks.json: master.tasks is not a list")
 
-    tasks_back = load_json(root / ".taskmaster" / "tasks" / "tasks_back.json")
-    tasks_gameplay = load_json(root / ".taskmaster" / "tasks" / "tasks_gameplay.json")
+    tasks_back = store.back_view()
+    tasks_gameplay = store.gameplay_view()
     if not isinstance(tasks_back, list) or not isinstance(tasks_gameplay, list):
         raise SystemExit("tasks_back.json/tasks_gameplay.json must be JSON arrays")
 
@@ -342,8 +332,8 @@ def main() -> int:
             tm_id = int(str(tid))
         except ValueError:
             continue
-        back_entry = find_task_by_taskmaster_id(tasks_back, tm_id)
-        gameplay_entry = find_task_by_taskmaster_id(tasks_gameplay, tm_id)
+        back_entry = store.back_task(tm_id)
+        gameplay_entry = store.gameplay_task(tm_id)
         findings.extend(audit_master_task(root=root, master_task=m, back_task=back_entry, gameplay_task=gameplay_entry))
 
     # Summarize
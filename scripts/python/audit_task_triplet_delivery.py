@@ -29,6 +29,8 @@ import os
 from pathlib import Path
 from typing import Any
 
+from taskmaster_store_lib import get_store
+
 
 def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
@@ -44,38 +46,6 @@ def ci_dir(name: str) -> Path:
     return out
 
 
-def load_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def iter_master_tasks(tasks_json: dict[str, Any]) -> list[dict[str, Any]]:
-    master = tasks_json.get("master") or {}
-    tasks = master.get("tasks") or []
-    if not isinstance(tasks, list):
-        return []
-    return [t for t in tasks if isinstance(t, dict)]
-
-
-def find_master_task(tasks_json: dict[str, Any], task_id: str) -> dict[str, Any] | None:
-    for t in iter_master_tasks(tasks_json):
-        if str(t.get("id")) == str(task_id):
-            return t
-    return None
-
-
-def find_view_task(view: list[dict[str, Any]], task_id: str) -> dict[str, Any] | None:
-    try:
-        tid_int = int(str(task_id))
-    except ValueError:
-        return None
-    for t in view:
-        if not isinstance(t, dict):
-            continue
-        if t.get("taskmaster_id") == tid_int:
-            return t
-    return None
-
-
 def is_abs_path(p: str) -> bool:
     if not p:
         return False
@@ -166,23 +136,17 @@ def main() -> int:
     root = repo_root()
     out_dir = ci_dir("task-triplet-audit")
 
-    tasks_json_path = root / ".taskmaster" / "tasks" / "tasks.json"
-    back_path = root / ".taskmaster" / "tasks" / "tasks_back.json"
-    gameplay_path = root / ".taskmaster" / "tasks" / "tasks_gameplay.json"
-
-    tasks_json = load_json(tasks_json_path)
-    back = load_json(back_path)
-    gameplay = load_json(gameplay_path)
-    if not isinstance(back, list) or not isinstance(gameplay, list):
+    store = get_store(root)
+    store.tasks_json()  # fail early when tasks.json is missing
+    if not isinstance(store.back_view(), list) or not isinstance(store.gameplay_view(), list):
         raise ValueError("tasks_back.json and tasks_gameplay.json must be JSON arrays")
 
     per_task: list[dict[str, Any]] = []
     any_errors = False
 
     for tid in task_ids:
-        master = find_master_task(tasks_json, tid)
-        back_task = find_view_task(back, tid)
-        gameplay_task = find_view_task(gameplay, tid)
+        triplet = store.triplet(tid)
+        master, back_task, gameplay_task = triplet.master, triplet.back, triplet.gameplay
 
         errors: list[str] = []
         warnings: list[str] = []
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Input-hash build stamps: skip restore/build steps whose inputs did not change.
+
+Why:
+  run_dotnet.py (restore + test), sc/build.py (-warnaserror, run by the acceptance gate),
+  the run_gdunit.py prewarm and godot_selfcheck.py --build-solutions each rebuilt on every
+  gate run, even when no .cs/.csproj/.sln changed since the last successful build.
+
+Design:
+  - Inputs of a target (.sln, .csproj, or a Godot project directory = its *.sln/*.csproj)
+    are the projects reachable through the solution and ProjectReference, their C# sources
+    (the project directory, or only the Compile Include roots when default compile items
+    are disabled) and the ambient MSBuild/NuGet files from the project directory up to the
+    repo root (Directory.Build.*, Directory.Packages.props, global.json, nuget.config,
+    .editorconfig). Restore stamps only hash project and package/config files.
+  - The digest is sha256 over (path, content sha256) of every input plus the step
+    parameters (configuration, flags, Godot binary). Per-file digests are reused from the
+    previous stamp while size and mtime_ns are unchanged, so a hit costs one stat per input.
+  - Stamps are written next to the outputs, only after the step succeeded:
+      dotnet: <project intermediate dir>/sc-build-stamps/<target>.<step>[.<configuration>].json
+              (obj/, or .godot/mono/temp/obj for Godot.NET.Sdk; <sln dir>/obj for a solution)
+      Godot:  <project>/.godot/mono/sc-build-stamps/<step>.json
+    A stamp lists the outputs it vouches for (bin/<config>, obj/project.assets.json,
+    .godot/mono/temp/bin); a missing output (clean, deleted bin/) is a miss.
+  - The stamp is invalidated before the step runs, so a failed or interrupted build never
+    leaves a matching stamp behind.
+  - Env SC_BUILD_CACHE=0 disables hits (stamps are still refreshed).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Iterable
+
+
+STAMP_DIR = "sc-build-stamps"
+SOURCE_SUFFIXES = {".cs", ".resx"}
+PROJECT_SUFFIXES = {".csproj", ".props", ".targets"}
+RESTORE_FILES = ("Directory.Build.props", "Directory.Build.targets", "Directory.Packages.props", "global.json", "nuget.config", "NuGet.Config", "packages.lock.json")
+BUILD_FILES = RESTORE_FILES + (".editorconfig",)
+SKIP_DIRS = {".git", ".godot", ".vs", "bin", "obj", "logs", "reports", "TestResults", "node_modules"}
+SLN_PROJECT_RE = re.compile(r'^Project\("[^"]*"\)\s*=\s*"[^"]*",\s*"([^"]+\.csproj)"', re.MULTILINE)
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("SC_BUILD_CACHE", "").strip() != "0"
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _msbuild_path(base: Path, value: str) -> Path:
+    return (base / value.replace("\\", "/").replace("//", "/")).resolve()
+
+
+def _parse_project(csproj: Path) -> ET.Element | None:
+    try:
+        return ET.parse(csproj).getroot()
+    except (OSError, ET.ParseError):
+        return None
+
+
+# --- projects / inputs
+
+
+def solution_projects(sln: Path) -> list[Path]:
+    try:
+        text = sln.read_text(encoding="utf-8-sig", errors="ignore")
+    except OSError:
+        return []
+    return [_msbuild_path(sln.parent, m) for m in SLN_PROJECT_RE.findall(text)]
+
+
+def project_references(csproj: Path) -> list[Path]:
+    root = _parse_project(csproj)
+    if root is None:
+        return []
+    return [_msbuild_path(csproj.parent, str(el.get("Include"))) for el in root.iter() if _local(el.tag) == "ProjectReference" and el.get("Include")]
+
+
+def is_godot_project(csproj: Path) -> bool:
+    root = _parse_project(csproj)
+    return root is not None and str(root.get("Sdk") or "").startswith("Godot.NET.Sdk")
+
+
+def target_projects(target: Path) -> list[Path]:
+    """Projects built for target (.sln, .csproj or Godot project dir), references included."""
+    if target.is_dir():
+        seeds = sorted(target.glob("*.csproj"))
+        for sln in sorted(target.glob("*.sln")):
+            seeds += solution_projects(sln)
+    elif target.suffix == ".sln":
+        seeds = solution_projects(target)
+    else:
+        seeds = [target]
+    seen: dict[Path, None] = {}
+    stack = [p.resolve() for p in seeds]
+    while stack:
+        proj = stack.pop()
+        if proj in seen or not proj.is_file():
+            continue
+        seen[proj] = None
+        stack.extend(project_references(proj))
+    return sorted(seen)
+
+
+def compile_roots(csproj: Path) -> list[Path]:
+    """Directories holding the project's C# sources (Compile Include bases when default items are off)."""
+    root = _parse_project(csproj)
+    if root is None:
+        return [csproj.parent]
+    defaults = all(str(el.text or "").strip().lower() != "false" for el in root.iter() if _local(el.tag) == "EnableDefaultCompileItems")
+    roots = [csproj.parent] if defaults else []
+    for el in root.iter():
+        include = el.get("Include") if _local(el.tag) == "Compile" else None
+        if not include:
+            continue
+        for pattern in include.split(";"):
+            parts = pattern.replace("\\", "/").split("/")
+            fixed = parts[: next((i for i, p in enumerate(parts) if "*" in p), len(parts) - 1)]
+            roots.append(_msbuild_path(csproj.parent, "/".join(fixed) or "."))
+    return roots
+
+
+def _ancestor_files(start: Path, names: Iterable[str]) -> list[Path]:
+    top = repo_root()
+    out: list[Path] = []
+    cur = start
+    while True:
+        out.extend(cur / n for n in names if (cur / n).is_file())
+        if cur == top or cur.parent == cur or top not in cur.parents:
+            return out
+        cur = cur.parent
+
+
+def _walk(base: Path, suffixes: set[str]) -> list[Path]:
+    out: list[Path] = []
+    for cur, dirs, files in os.walk(base):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        out.extend(Path(cur) / n for n in files if os.path.splitext(n)[1] in suffixes)
+    return out
+
+
+def collect_inputs(target: Path, *, restore_only: bool = False) -> list[Path]:
+    target = target.resolve()
+    files: set[Path] = set()
+    if target.is_dir():
+        files.update(target.glob("*.sln"))
+    elif target.suffix == ".sln":
+        files.add(target)
+    for proj in target_projects(target):
+        files.add(proj)
+        files.update(_ancestor_files(proj.parent, RESTORE_FILES if restore_only else BUILD_FILES))
+        if restore_only:
+            continue
+        for base in compile_roots(proj):
+            files.update(_walk(base, SOURCE_SUFFIXES | PROJECT_SUFFIXES))
+    return sorted(files)
+
+
+# --- outputs
+
+
+def intermediate_dir(csproj: Path) -> Path:
+    return csproj.parent / ".godot" / "mono" / "temp" / "obj" if is_godot_project(csproj) else csproj.parent / "obj"
+
+
+def build_outputs(target: Path, configuration: str) -> list[Path]:
+    out = []
+    for proj in target_projects(target.resolve()):
+        if is_godot_project(proj):
+            out.append(proj.parent / ".godot" / "mono" / "temp" / "bin" / configuration)
+        else:
+            out.append(proj.parent / "bin" / configuration)
+    return out
+
+
+def restore_outputs(target: Path) -> list[Path]:
+    return [intermediate_dir(p) / "project.assets.json" for p in target_projects(target.resolve())]
+
+
+def godot_outputs(project_dir: Path) -> list[Path]:
+    return [project_dir / ".godot" / "mono" / "temp" / "bin"]
+
+
+# --- stamps
+
+
+def _rel(path: Path) -> str:
+    try:
+        return path.relative_to(repo_root()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+class BuildStamp:
+    """One (target, step, params) stamp: hit() before the step, invalidate() / record() around it."""
+
+    def __init__(
+        self,
+        target: str | Path,
+        step: str,
+        *,
+        path: Path,
+        outputs: Iterable[Path] = (),
+        params: dict[str, Any] | None = None,
+        restore_only: bool = False,
+    ) -> None:
+        self.target = Path(target).resolve()
+        self.step = step
+        self.path = path
+        self.outputs = [Path(p) for p in outputs]
+        self.params = {k: str(v) for k, v in sorted((params or {}).items())}
+        self.restore_only = restore_only
+        self._digest: str | None = None
+        self._files: dict[str, list[Any]] = {}
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            obj = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return obj if isinstance(obj, dict) else {}
+
+    def digest(self) -> str:
+        if self._digest is not None:
+            return self._digest
+        previous = self._load().get("files") or {}
+        h = hashlib.sha256(json.dumps({"step": self.step, "params": self.params}, sort_keys=True).encode("utf-8"))
+        for path in collect_inputs(self.target, restore_only=self.restore_only):
+            rel = _rel(path)
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entry = previous.get(rel)
+            if not (isinstance(entry, list) and len(entry) == 3 and entry[0] == st.st_size and entry[1] == st.st_mtime_ns):
+                entry = [st.st_size, st.st_mtime_ns, hashlib.sha256(path.read_bytes()).hexdigest()]
+            self._files[rel] = entry
+            h.update(f"{rel}\0{entry[2]}\n".encode("utf-8"))
+        self._digest = h.hexdigest()
+        return self._digest
+
+    def hit(self) -> bool:
+        if not cache_enabled():
+            return False
+        stamp = self._load()
+        if not stamp.get("digest") or stamp.get("digest") != self.digest():
+            return False
+        return all(Path(p).exists() for p in stamp.get("outputs") or [])
+
+    def _write(self, digest: str | None) -> None:
+        obj = {
+            "step": self.step,
+            "target": _rel(self.target),
+            "params": self.params,
+            "digest": digest,
+            "outputs": [str(p) for p in self.outputs],
+            "files": self._files,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(obj, indent=2) + "\n", encoding="utf-8")
+        except OSError:
+            pass
+
+    def invalidate(self) -> None:
+        """Before the step runs; per-file digests are kept for the next check."""
+        if self.path.is_file():
+            self.digest()
+            self._write(None)
+
+    def record(self) -> None:
+        """After the step succeeded. Inputs are re-read: edits made during the build must not be stamped."""
+        self._digest = None
+        self._write(self.digest())
+
+
+def dotnet_stamp(target: str | Path, step: str, *, configuration: str = "Debug", params: dict[str, Any] | None = None) -> BuildStamp:
+    """step 'restore' hashes restore inputs and checks project.assets.json; anything else is a build."""
+    target = Path(target).resolve()
+    restore = step == "restore"
+    if target.suffix == ".csproj":
+        stamp_dir = intermediate_dir(target) / STAMP_DIR
+    else:
+        stamp_dir = (target if target.is_dir() else target.parent) / "obj" / STAMP_DIR
+    return BuildStamp(
+        target,
+        step,
+        path=stamp_dir / (f"{target.name}.{step}.json" if restore else f"{target.name}.{step}.{configuration}.json"),
+        outputs=restore_outputs(target) if restore else build_outputs(target, configuration),
+        params={**({} if restore else {"configuration": configuration}), **(params or {})},
+        restore_only=restore,
+    )
+
+
+def godot_stamp(godot_bin: str, project: str | Path) -> BuildStamp:
+    """`godot --build-solutions` of a project directory (or its project.godot)."""
+    proj = Path(project).resolve()
+    proj = proj.parent if proj.is_file() else proj
+    return BuildStamp(
+        proj,
+        "build-solutions",
+        path=proj / ".godot" / "mono" / STAMP_DIR / "build-solutions.json",
+        outputs=godot_outputs(proj),
+        params={"godot": Path(godot_bin).resolve()},
+    )
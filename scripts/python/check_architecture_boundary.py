@@ -19,6 +19,8 @@ import sys
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
+from source_index_lib import get_source_index
+
 
 def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
@@ -29,17 +31,11 @@ def _to_posix(path: Path) -> str:
 
 
 def scan_core_sources(root: Path) -> list[str]:
-    core_dir = root / "Game.Core"
-    if not core_dir.exists():
-        return []
-
     violations: list[str] = []
-    for p in core_dir.rglob("*.cs"):
-        if any(seg in {"bin", "obj"} for seg in p.parts):
-            continue
-        text = p.read_text(encoding="utf-8", errors="ignore")
+    for sf in get_source_index(root).iter_files(under="Game.Core", exts=[".cs"]):
+        text = sf.text
         if "using Godot" in text or "Godot." in text:
-            violations.append(_to_posix(p.relative_to(root)))
+            violations.append(sf.rel)
     return violations
 
 
@@ -102,10 +98,10 @@ def scan_core_csproj(root: Path) -> dict:
     }
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Check Game.Core architecture boundary constraints.")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     root = repo_root()
     out_path = Path(args.out)
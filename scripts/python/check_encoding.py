@@ -23,8 +23,11 @@ import os
 import re
 import subprocess
 import sys
+from pathlib import Path
 from typing import Iterable, List
 
+from gate_cache_lib import GateCache, rules_version_of
+
 
 TEXT_EXT = {
     ".md",
@@ -203,13 +206,21 @@ def _filter_existing_files(paths: Iterable[str]) -> List[str]:
     return out
 
 
-def main() -> int:
+def _cache_key(path: str) -> str:
+    try:
+        return os.path.relpath(os.path.abspath(path)).replace("\\", "/")
+    except ValueError:
+        return os.path.abspath(path).replace("\\", "/")
+
+
+def main(argv: List[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--since-today", action="store_true")
     ap.add_argument("--since", default=None)
     ap.add_argument("--files", nargs="*")
     ap.add_argument("--root", default=None, help="Scan all text files under a directory (overrides --since/--files)")
-    args = ap.parse_args()
+    ap.add_argument("--no-cache", action="store_true", help="Re-check every file (ignore logs/ci/.cache/check-encoding.json)")
+    args = ap.parse_args(argv)
 
     if args.root:
         files = iter_files_under(args.root)
@@ -226,18 +237,31 @@ def main() -> int:
 
     results = []
     bad = []
+    cache = GateCache("check-encoding", rules_version=rules_version_of(Path(__file__)), enabled=not args.no_cache)
     for fpath in files:
-        r = check_utf8(fpath)
+        key = _cache_key(fpath)
+        hit, cached = cache.get(key, Path(fpath))
+        if hit:
+            r = {"path": fpath, **cached}
+        else:
+            r = check_utf8(fpath)
+            # Only cache content-derived verdicts (not transient I/O errors).
+            if r["utf8_ok"] or str(r.get("error") or "").startswith("UnicodeDecodeError"):
+                cache.put(key, Path(fpath), {k: v for k, v in r.items() if k != "path"})
         results.append(r)
         if not r["utf8_ok"]:
             bad.append(r)
 
+    # --since/--files only visit a subset of files: keep entries for the rest.
+    cache.save(prune_unseen=False)
+
     summary = {
         "scanned": len(results),
         "bad": len(bad),
         "bad_paths": [b["path"] for b in bad],
         "mojibake_paths": [r["path"] for r in results if r.get("mojibake_hits")],
         "generated": dt.datetime.now().isoformat(),
+        "cache": cache.stats(),
     }
 
     with io.open(os.path.join(out_dir, "session-details.json"), "w", encoding="utf-8") as f:
@@ -28,7 +28,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 CONTRACT_PATH = PROJECT_ROOT / "Game.Core" / "Contracts" / "Sanguo" / "GameEvents.cs"
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     result: Dict[str, Any] = {
         "ok": False,
         "file": str(CONTRACT_PATH),
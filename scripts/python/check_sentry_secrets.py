@@ -29,7 +29,7 @@ import os
 from pathlib import Path
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
     has_token = bool(os.environ.get("SENTRY_AUTH_TOKEN"))
     has_org = bool(os.environ.get("SENTRY_ORG"))
     has_project = bool(os.environ.get("SENTRY_PROJECT"))
@@ -51,7 +51,8 @@ def main() -> None:
         except OSError:
             # Best-effort: do not fail the job
             pass
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
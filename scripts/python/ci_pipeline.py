@@ -6,7 +6,13 @@ Usage (Windows):
   py -3 scripts/python/ci_pipeline.py all \
     --solution Game.sln --configuration Debug \
     --godot-bin "C:\\Godot\\Godot_v4.5.1-stable_mono_win64_console.exe" \
-    --build-solutions
+    --build-solutions [--warm-worker]
+
+--warm-worker starts (or reuses) a warm headless Godot worker for the project before the
+self-check (scripts/python/godot_worker.py); it stays up for later sc-test / smoke runs until idle.
+
+Each stage in ci-pipeline-summary.json carries `metrics` (wall, CPU user/sys, peak RSS and I/O of
+its child processes; scripts/python/proc_metrics_lib.py).
 
 Exit codes:
   0  success (or only soft gates failed)
@@ -17,20 +23,18 @@ import datetime as dt
 import io
 import json
 import os
-import subprocess
+import shutil
 import sys
 
+from proc_metrics_lib import ResourceMeter
+from stream_run_lib import DEFAULT_TAIL_LINES, LineMatcher, run_streaming
 
-def run_cmd(args, cwd=None, timeout=900_000):
-    p = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                         text=True, encoding='utf-8', errors='ignore')
-    try:
-        out, _ = p.communicate(timeout=timeout/1000.0)
-    except subprocess.TimeoutExpired:
-        p.kill()
-        out, _ = p.communicate()
-        return 124, out
-    return p.returncode, out
+
+def run_cmd(args, cwd=None, timeout=900_000, log_path=None, matchers=()):
+    """With log_path the output streams into that file and only its tail is returned."""
+    res = run_streaming(args, cwd=cwd, timeout_sec=timeout/1000.0, log_path=log_path, matchers=matchers,
+                        tail_lines=DEFAULT_TAIL_LINES if log_path else None)
+    return res.rc, res.tail
 
 
 def read_json(path):
@@ -50,6 +54,7 @@ def main():
     ap_all.add_argument('--godot-bin', required=True)
     ap_all.add_argument('--project', default='project.godot')
     ap_all.add_argument('--build-solutions', action='store_true')
+    ap_all.add_argument('--warm-worker', action='store_true', help='Dispatch Godot runs to a warm headless worker')
 
     args = ap.parse_args()
     if args.cmd != 'all':
@@ -70,35 +75,48 @@ def main():
     hard_fail = False
 
     # 1) Dotnet tests + coverage (soft gate on coverage)
-    rc, out = run_cmd(['py', '-3', 'scripts/python/run_dotnet.py',
-                       '--solution', args.solution,
-                       '--configuration', args.configuration], cwd=root)
+    with ResourceMeter() as dotnet_meter:
+        rc, _ = run_cmd(['py', '-3', 'scripts/python/run_dotnet.py',
+                         '--solution', args.solution,
+                         '--configuration', args.configuration], cwd=root,
+                        log_path=os.path.join(ci_dir, 'run-dotnet-stdout.txt'))
     dotnet_sum = read_json(os.path.join('logs', 'unit', date, 'summary.json')) or {}
     summary['dotnet'] = {
         'rc': rc,
         'line_pct': (dotnet_sum.get('coverage') or {}).get('line_pct'),
         'branch_pct': (dotnet_sum.get('coverage') or {}).get('branch_pct'),
-        'status': dotnet_sum.get('status')
+        'status': dotnet_sum.get('status'),
+        'metrics': dotnet_meter.metrics,
     }
     if rc not in (0, 2) or summary['dotnet']['status'] == 'tests_failed':
         hard_fail = True
 
     # 2) Godot self-check (hard gate)
-    # ensure autoload fixed (explicit project path)
-    _ = run_cmd(['py', '-3', 'scripts/python/godot_selfcheck.py', 'fix-autoload', '--project', args.project], cwd=root)
-    sc_args = ['py', '-3', 'scripts/python/godot_selfcheck.py', 'run', '--godot-bin', args.godot_bin, '--project', args.project]
-    if args.build_solutions:
-        sc_args.append('--build-solutions')
-    rc2, out2 = run_cmd(sc_args, cwd=root, timeout=600_000)
-    # persist raw stdout for diagnosis
-    os.makedirs(os.path.join('logs', 'ci', date), exist_ok=True)
-    with io.open(os.path.join('logs', 'ci', date, 'selfcheck-stdout.txt'), 'w', encoding='utf-8') as f:
-        f.write(out2)
+    with ResourceMeter() as selfcheck_meter:
+        # ensure autoload fixed (explicit project path)
+        _ = run_cmd(['py', '-3', 'scripts/python/godot_selfcheck.py', 'fix-autoload', '--project', args.project], cwd=root)
+        sc_args = ['py', '-3', 'scripts/python/godot_selfcheck.py', 'run', '--godot-bin', args.godot_bin, '--project', args.project]
+        build_solutions = args.build_solutions
+        if args.warm_worker:
+            wk_args = ['py', '-3', 'scripts/python/godot_worker.py', 'start', '--godot-bin', args.godot_bin,
+                       '--project', os.path.dirname(os.path.abspath(args.project))]
+            if args.build_solutions:
+                wk_args.append('--build-solutions')
+            rcw, outw = run_cmd(wk_args, cwd=root, timeout=900_000)
+            summary['worker'] = {'rc': rcw, 'status': (outw.strip().splitlines() or [''])[-1]}
+            # The worker start already built the solutions; building again would mark it stale.
+            build_solutions = build_solutions and rcw != 0
+        if build_solutions:
+            sc_args.append('--build-solutions')
+        # raw stdout streams to logs/ci/<date>/selfcheck-stdout.txt for diagnosis
+        sc_line = LineMatcher(r"SELF_CHECK status=([a-z]+).*? out=([^\r\n]+)", name='selfcheck', regex=True)
+        rc2, _ = run_cmd(sc_args, cwd=root, timeout=600_000, log_path=os.path.join(ci_dir, 'selfcheck-stdout.txt'),
+                         matchers=[sc_line])
     sc_sum = read_json(os.path.join('logs', 'e2e', date, 'selfcheck-summary.json')) or {}
     # fallback: parse status from stdout if summary missing
-    if not sc_sum:
+    if not sc_sum and sc_line.hits:
         import re
-        m = re.search(r"SELF_CHECK status=([a-z]+).*? out=([^\r\n]+)", out2)
+        m = re.search(sc_line.pattern, sc_line.hits[-1])
         if m:
             sc_status = m.group(1)
             sc_out = m.group(2)
@@ -113,25 +131,26 @@ def main():
             cons.sort()
             src = os.path.join(e2e_dir, cons[-1])
             with io.open(src, 'r', encoding='utf-8', errors='ignore') as rf, io.open(os.path.join(ci_dir, 'selfcheck-console.txt'), 'w', encoding='utf-8') as wf:
-                wf.write(rf.read())
+                shutil.copyfileobj(rf, wf)
         errs = [p for p in os.listdir(e2e_dir) if p.startswith('godot-selfcheck-stderr-')]
         if errs:
             errs.sort()
             src = os.path.join(e2e_dir, errs[-1])
             with io.open(src, 'r', encoding='utf-8', errors='ignore') as rf, io.open(os.path.join(ci_dir, 'selfcheck-stderr.txt'), 'w', encoding='utf-8') as wf:
-                wf.write(rf.read())
+                shutil.copyfileobj(rf, wf)
     except Exception:
         pass
 
     sc_ok = (sc_sum.get('status') == 'ok') or (rc2 == 0)
-    summary['selfcheck'] = sc_sum or {'status': 'fail', 'note': 'no-summary'}
+    summary['selfcheck'] = dict(sc_sum or {'status': 'fail', 'note': 'no-summary'}, metrics=selfcheck_meter.metrics)
     if not sc_ok:
         hard_fail = True
 
     # 3) Encoding scan (soft gate)
-    rc3, out3 = run_cmd(['py', '-3', 'scripts/python/check_encoding.py', '--since-today'], cwd=root)
+    with ResourceMeter() as encoding_meter:
+        rc3, out3 = run_cmd(['py', '-3', 'scripts/python/check_encoding.py', '--since-today'], cwd=root)
     enc_sum = read_json(os.path.join('logs', 'ci', date, 'encoding', 'session-summary.json')) or {}
-    summary['encoding'] = enc_sum
+    summary['encoding'] = dict(enc_sum, metrics=encoding_meter.metrics)
 
     summary['status'] = 'ok' if not hard_fail else 'fail'
     with io.open(os.path.join(ci_dir, 'ci-pipeline-summary.json'), 'w', encoding='utf-8') as f:
@@ -6,6 +6,8 @@ import re
 from pathlib import Path
 from typing import Any, Iterable
 
+from source_index_lib import SourceFile, get_source_index
+
 EVENT_TYPE_RE = re.compile(r'public\s+const\s+string\s+EventType\s*=\s*"([^"]+)"\s*;')
 SEALED_RECORD_RE = re.compile(r"public\s+sealed\s+record\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(")
 PUBLIC_RECORD_RE = re.compile(r"public\s+record\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(")
@@ -20,15 +22,16 @@ def posix(path: Path) -> str:
 def load_json(path: Path) -> Any:
     return json.loads(read_text_utf8(path))
 
-def iter_cs_files(root: Path) -> Iterable[Path]:
-    for p in root.rglob("*.cs"):
-        if p.name.endswith(".g.cs"):
+def iter_cs_files(root: Path, *, repo_root: Path | None = None) -> Iterable[SourceFile]:
+    # `root` is a directory inside `repo_root`; the walk itself is shared via the source index.
+    for sf in get_source_index(repo_root).iter_files(under=root.resolve(), exts=[".cs"]):
+        if sf.rel.endswith(".g.cs"):
             continue
-        yield p
+        yield sf
 
 
-def extract_domain_events_from_file(path: Path) -> list[dict[str, str]]:
-    text = read_text_utf8(path)
+def extract_domain_events_from_file(path: Path, text: str | None = None) -> list[dict[str, str]]:
+    text = read_text_utf8(path) if text is None else text
     matches = list(EVENT_TYPE_RE.finditer(text))
     if not matches:
         return []
@@ -56,8 +59,8 @@ def extract_domain_events_from_file(path: Path) -> list[dict[str, str]]:
         )
     return out
 
-def extract_public_interfaces_from_file(path: Path) -> list[dict[str, str]]:
-    text = read_text_utf8(path)
+def extract_public_interfaces_from_file(path: Path, text: str | None = None) -> list[dict[str, str]]:
+    text = read_text_utf8(path) if text is None else text
     rel = posix(path)
     return [{"name": m.group(1), "file": rel} for m in PUBLIC_INTERFACE_RE.finditer(text)]
 
@@ -131,8 +134,8 @@ def generate_contract_catalog(
     # Domain events (SSoT)
     contracts_root = repo_root / "Game.Core" / "Contracts"
     domain_events: list[dict[str, str]] = []
-    for cs in iter_cs_files(contracts_root):
-        domain_events.extend(extract_domain_events_from_file(cs))
+    for cs in iter_cs_files(contracts_root, repo_root=repo_root):
+        domain_events.extend(extract_domain_events_from_file(cs.path, cs.strict_text))
     domain_events = sorted(domain_events, key=lambda e: (e["file"], e["event_type"]))
     event_record_names = sorted_unique_str(e["csharp_type"] for e in domain_events)
 
@@ -146,8 +149,8 @@ def generate_contract_catalog(
         for r in roots:
             if not r.exists():
                 continue
-            for cs in iter_cs_files(r):
-                out.extend(extract_public_interfaces_from_file(cs))
+            for cs in iter_cs_files(r, repo_root=repo_root):
+                out.extend(extract_public_interfaces_from_file(cs.path, cs.strict_text))
         uniq: dict[tuple[str, str], dict[str, str]] = {}
         for i in out:
             uniq[(i["name"], i["file"])] = i
@@ -134,6 +134,17 @@ def cmd_run_smoke_strict(args: argparse.Namespace) -> int:
     ])
 
 
+def cmd_logs_gc(args: argparse.Namespace) -> int:
+    """Prune/compact logs/ per scripts/ci/logs-retention.json."""
+
+    cmd = ["py", "-3", "scripts/python/logs_gc.py"]
+    for kind in args.kind:
+        cmd += ["--kind", kind]
+    if args.dry_run:
+        cmd.append("--dry-run")
+    return run(cmd)
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Dev CLI for Godot+C# template (AI-friendly entrypoint)",
@@ -172,6 +183,12 @@ def build_parser() -> argparse.ArgumentParser:
     p_sm.add_argument("--timeout-sec", type=int, default=5)
     p_sm.set_defaults(func=cmd_run_smoke_strict)
 
+    # logs-gc
+    p_gc = sub.add_parser("logs-gc", help="prune/compact logs/ (age/size/count per kind; acceptance-pinned runs kept)")
+    p_gc.add_argument("--kind", action="append", default=[])
+    p_gc.add_argument("--dry-run", action="store_true")
+    p_gc.set_defaults(func=cmd_logs_gc)
+
     return parser
 
 
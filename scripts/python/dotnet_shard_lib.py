@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sharded `dotnet test`: duration-balanced class shards and TRX / cobertura merging.
+
+Why:
+  run_dotnet.py ran one `dotnet test Game.sln --collect:"XPlat Code Coverage"` process,
+  so unit-test wall time did not scale with the agent's cores.
+
+Flow (run_dotnet.py --shards N):
+  1. `dotnet build` once (skipped on a build-stamp hit, see build_cache_lib.py), then
+     `dotnet test --no-build --list-tests` to enumerate test classes (falls back to the
+     static scan in test_impact_lib.py).
+  2. Classes are split into N shards by longest-processing-time-first over historical
+     class durations (logs/unit/.test-durations.json, refreshed from every TRX; classes
+     without history get the median).
+  3. Each shard runs `dotnet test --no-build --filter "FullyQualifiedName~Cls.|..."` in
+     its own results directory, in parallel.
+  4. Shard TRX files are merged into one tests.trx (results/definitions/entries appended,
+     counters summed) and shard cobertura reports into one coverage.cobertura.xml (line
+     hits summed, rates recomputed), so _unit_metrics, the coverage thresholds and
+     build/tdd.py hotspots read the same artifacts as before.
+
+Branch merge note: cobertura only records covered/total per line, not which conditions
+were taken. Shards therefore also write coverlet's JSON report (Format=json,cobertura),
+whose per-branch hits are summed across shards (merge_coverlet_branches) to get exact
+per-line branch counts. Without JSON for every shard the merge falls back to the best
+shard per line, which is a lower bound; run_dotnet.py then re-runs unsharded when
+COVERAGE_BRANCHES_MIN is set.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import statistics
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Iterable
+
+
+TRX_NS = "http://microsoft.com/schemas/VisualStudio/TeamTest/2010"
+DURATIONS_FILE = ".test-durations.json"
+DEFAULT_CLASS_SEC = 1.0
+CONDITION_RE = re.compile(r"\((\d+)/(\d+)\)")
+LIST_TESTS_HEADER = "The following Tests are available:"
+
+
+def _q(tag: str) -> str:
+    return f"{{{TRX_NS}}}{tag}"
+
+
+def _parse_timespan(value: str) -> float:
+    """TRX duration "hh:mm:ss.fffffff" -> seconds."""
+    try:
+        h, m, s = value.split(":")
+        return int(h) * 3600 + int(m) * 60 + float(s)
+    except ValueError:
+        return 0.0
+
+
+def class_of_test(name: str) -> str:
+    """Namespace.Class.Method(args) -> Namespace.Class."""
+    base = name.split("(", 1)[0].strip()
+    return base.rsplit(".", 1)[0] if "." in base else base
+
+
+# --- enumeration / durations
+
+
+def parse_list_tests(output: str) -> list[str]:
+    """Test classes from `dotnet test --list-tests` output (indented FQNs after the header)."""
+    classes: set[str] = set()
+    listing = False
+    for line in output.splitlines():
+        if LIST_TESTS_HEADER in line:
+            listing = True
+            continue
+        if listing and line.startswith((" ", "\t")) and line.strip():
+            classes.add(class_of_test(line.strip()))
+    return sorted(classes)
+
+
+def trx_class_durations(trx: Path) -> dict[str, float]:
+    """Sum of test durations per class in one TRX."""
+    root = ET.parse(trx).getroot()
+    class_by_test: dict[str, str] = {}
+    for ut in root.iter(_q("UnitTest")):
+        tm = ut.find(_q("TestMethod"))
+        if tm is not None and tm.get("className"):
+            class_by_test[str(ut.get("id"))] = str(tm.get("className")).split(",", 1)[0].strip()
+    out: dict[str, float] = {}
+    for res in root.iter(_q("UnitTestResult")):
+        cls = class_by_test.get(str(res.get("testId"))) or class_of_test(str(res.get("testName") or ""))
+        if cls:
+            out[cls] = out.get(cls, 0.0) + _parse_timespan(str(res.get("duration") or "0:0:0"))
+    return out
+
+
+def load_durations(path: Path) -> dict[str, float]:
+    try:
+        obj = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {str(k): float(v) for k, v in obj.items()} if isinstance(obj, dict) else {}
+
+
+def update_durations(path: Path, trx: Path) -> None:
+    """Latest observed duration per class wins; classes absent from this TRX keep their history."""
+    try:
+        fresh = trx_class_durations(trx)
+    except (OSError, ET.ParseError):
+        return
+    merged = {**load_durations(path), **{k: round(v, 3) for k, v in fresh.items()}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(sorted(merged.items())), indent=2) + "\n", encoding="utf-8")
+
+
+# --- planning
+
+
+def plan_shards(classes: Iterable[str], durations: dict[str, float], shards: int) -> list[list[str]]:
+    """LPT: heaviest class first onto the currently lightest shard. Empty shards are dropped."""
+    classes = sorted(set(classes))
+    known = [durations[c] for c in classes if c in durations]
+    default = statistics.median(known) if known else DEFAULT_CLASS_SEC
+    weighted = sorted(((durations.get(c, default), c) for c in classes), key=lambda t: (-t[0], t[1]))
+    bins: list[tuple[float, list[str]]] = [(0.0, []) for _ in range(max(1, shards))]
+    for w, c in weighted:
+        i = min(range(len(bins)), key=lambda k: bins[k][0])
+        bins[i] = (bins[i][0] + w, bins[i][1] + [c])
+    return [sorted(members) for _, members in bins if members]
+
+
+def shard_filter(classes: Iterable[str]) -> str:
+    return "|".join(f"FullyQualifiedName~{c}." for c in classes)
+
+
+def estimate_seconds(classes: Iterable[str], durations: dict[str, float]) -> float:
+    known = list(durations.values())
+    default = statistics.median(known) if known else DEFAULT_CLASS_SEC
+    return round(sum(durations.get(c, default) for c in classes), 2)
+
+
+# --- TRX merge
+
+
+def merge_trx(paths: list[Path], dest: Path) -> None:
+    ET.register_namespace("", TRX_NS)
+    trees = [ET.parse(p) for p in paths]
+    base = trees[0].getroot()
+
+    def child(root: ET.Element, tag: str) -> ET.Element:
+        node = root.find(_q(tag))
+        if node is None:
+            node = ET.SubElement(root, _q(tag))
+        return node
+
+    for tree in trees[1:]:
+        other = tree.getroot()
+        for tag in ("Results", "TestDefinitions", "TestEntries"):
+            src = other.find(_q(tag))
+            if src is not None:
+                child(base, tag).extend(list(src))
+
+    # Times: earliest start, latest finish.
+    times = [t.getroot().find(_q("Times")) for t in trees]
+    times = [t for t in times if t is not None]
+    if times:
+        for attr, pick in (("creation", min), ("queuing", min), ("start", min), ("finish", max)):
+            values = [str(t.get(attr)) for t in times if t.get(attr)]
+            if values:
+                times[0].set(attr, pick(values))
+
+    summaries = [t.getroot().find(_q("ResultSummary")) for t in trees]
+    summaries = [s for s in summaries if s is not None]
+    if summaries:
+        target = summaries[0]
+        if any(str(s.get("outcome") or "") == "Failed" for s in summaries):
+            target.set("outcome", "Failed")
+        counters = target.find(_q("Counters"))
+        if counters is not None:
+            for s in summaries[1:]:
+                c = s.find(_q("Counters"))
+                if c is None:
+                    continue
+                for k, v in c.attrib.items():
+                    try:
+                        counters.set(k, str(int(counters.get(k) or 0) + int(v)))
+                    except ValueError:
+                        continue
+        run_infos = child(target, "RunInfos")
+        for s in summaries[1:]:
+            ri = s.find(_q("RunInfos"))
+            if ri is not None:
+                run_infos.extend(list(ri))
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    trees[0].write(dest, encoding="utf-8", xml_declaration=True)
+
+
+# --- cobertura merge
+
+
+def _line_key(cls: ET.Element, line: ET.Element) -> tuple[str, str, str]:
+    return (str(cls.get("filename") or ""), str(cls.get("name") or ""), str(line.get("number") or ""))
+
+
+def _rate(covered: int, valid: int) -> str:
+    return f"{(covered / valid) if valid else 1.0:.4g}"
+
+
+def _line_counts(lines: Iterable[ET.Element]) -> tuple[int, int, int, int]:
+    lc = lv = bc = bv = 0
+    for line in lines:
+        lv += 1
+        if int(line.get("hits") or 0) > 0:
+            lc += 1
+        m = CONDITION_RE.search(str(line.get("condition-coverage") or ""))
+        if m:
+            bc += int(m.group(1))
+            bv += int(m.group(2))
+    return lc, lv, bc, bv
+
+
+def merge_coverlet_branches(paths: list[Path]) -> dict[tuple[str, str], tuple[int, int]]:
+    """
+    Exact (covered, total) branches per (class name, line number) from coverlet JSON reports.
+    Branch hits are summed per (module, file, class, method, line, offset, path, ordinal).
+    """
+    hits: dict[tuple[Any, ...], int] = {}
+    for path in paths:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for module, files in data.items():
+            for file, classes in files.items():
+                for cls, methods in classes.items():
+                    for method, body in methods.items():
+                        for b in body.get("Branches") or []:
+                            key = (module, file, cls, method, b.get("Line"), b.get("Offset"),
+                                   b.get("EndOffset"), b.get("Path"), b.get("Ordinal"))
+                            hits[key] = hits.get(key, 0) + int(b.get("Hits") or 0)
+    counts: dict[tuple[str, str], tuple[int, int]] = {}
+    for (_, _, cls, _, line, *_), n in hits.items():
+        c, t = counts.get((cls, str(line)), (0, 0))
+        counts[(cls, str(line))] = (c + (1 if n > 0 else 0), t + 1)
+    return counts
+
+
+def merge_cobertura(
+    paths: list[Path],
+    dest: Path,
+    *,
+    branches: dict[tuple[str, str], tuple[int, int]] | None = None,
+) -> bool:
+    """
+    Merges shard cobertura reports into `dest`. `branches` (merge_coverlet_branches) supplies
+    exact per-line branch counts; returns False when any line fell back to the best shard.
+    """
+    trees = [ET.parse(p) for p in paths]
+    hits: dict[tuple[str, str, str], int] = {}
+    conds: dict[tuple[str, str, str], tuple[int, int]] = {}
+    for tree in trees:
+        for cls in tree.getroot().iter("class"):
+            for line in cls.find("lines") if cls.find("lines") is not None else []:
+                key = _line_key(cls, line)
+                hits[key] = hits.get(key, 0) + int(line.get("hits") or 0)
+                m = CONDITION_RE.search(str(line.get("condition-coverage") or ""))
+                if m:
+                    cur = (int(m.group(1)), int(m.group(2)))
+                    if key not in conds or cur[0] > conds[key][0]:
+                        conds[key] = cur
+
+    base = trees[0].getroot()
+    packages = base.find("packages")
+    known = {(str(c.get("filename")), str(c.get("name"))) for c in base.iter("class")}
+    # Classes only instrumented in other shards (normally coverlet lists all of them everywhere).
+    for tree in trees[1:]:
+        for pkg in tree.getroot().iter("package"):
+            target = next((p for p in base.iter("package") if p.get("name") == pkg.get("name")), None)
+            for cls in pkg.iter("class"):
+                if (str(cls.get("filename")), str(cls.get("name"))) in known:
+                    continue
+                if target is None and packages is not None:
+                    target = ET.SubElement(packages, "package", dict(pkg.attrib))
+                    ET.SubElement(target, "classes")
+                if target is not None:
+                    target.find("classes").append(cls)  # type: ignore[union-attr]
+                    known.add((str(cls.get("filename")), str(cls.get("name"))))
+
+    lower_bound = [False]
+
+    def apply(cls: ET.Element, line: ET.Element) -> None:
+        key = _line_key(cls, line)
+        line.set("hits", str(hits.get(key, int(line.get("hits") or 0))))
+        exact = (branches or {}).get((str(cls.get("name") or ""), str(line.get("number") or "")))
+        if key in conds or exact:
+            if exact is None:
+                lower_bound[0] = True
+            c, t = exact or conds[key]
+            pct = int(round(100 * c / t)) if t else 0
+            line.set("condition-coverage", f"{pct}% ({c}/{t})")
+            for cond in line.iter("condition"):
+                cond.set("coverage", f"{pct}%")
+
+    tot = [0, 0, 0, 0]
+    for pkg in base.iter("package"):
+        ptot = [0, 0, 0, 0]
+        for cls in pkg.iter("class"):
+            for line in cls.iter("line"):
+                apply(cls, line)
+            for method in cls.iter("method"):
+                lc, lv, bc, bv = _line_counts(method.iter("line"))
+                method.set("line-rate", _rate(lc, lv))
+                method.set("branch-rate", _rate(bc, bv))
+            class_lines = cls.find("lines")
+            lc, lv, bc, bv = _line_counts(class_lines if class_lines is not None else [])
+            cls.set("line-rate", _rate(lc, lv))
+            cls.set("branch-rate", _rate(bc, bv))
+            ptot = [a + b for a, b in zip(ptot, (lc, lv, bc, bv))]
+        pkg.set("line-rate", _rate(ptot[0], ptot[1]))
+        pkg.set("branch-rate", _rate(ptot[2], ptot[3]))
+        tot = [a + b for a, b in zip(tot, ptot)]
+
+    base.set("lines-covered", str(tot[0]))
+    base.set("lines-valid", str(tot[1]))
+    base.set("branches-covered", str(tot[2]))
+    base.set("branches-valid", str(tot[3]))
+    base.set("line-rate", _rate(tot[0], tot[1]))
+    base.set("branch-rate", _rate(tot[2], tot[3]))
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    trees[0].write(dest, encoding="utf-8", xml_declaration=True)
+    return not lower_bound[0]
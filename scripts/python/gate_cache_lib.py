@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent per-file findings cache for deterministic gates.
+
+Why:
+  Static gates (quality rules, security hard/soft scans, encoding check) are
+  pure functions of (file content, rule set). Re-running sc-acceptance-check
+  (especially in --out-per-task loops) used to rescan the whole unchanged tree.
+
+Design:
+  - One JSON file per gate under logs/ci/.cache/<gate>.json.
+  - Entries are keyed by repo-relative path and validated by content sha256.
+    A (size, mtime_ns) match short-circuits hashing for untouched files.
+    Gates that read through the source index pass `sha256=lambda: sf.sha256`
+    (evaluated only when the shortcut misses), so content is hashed once.
+  - The whole cache is dropped when `rules_version` changes; use
+    rules_version_of(<gate source files>) so editing a gate invalidates it.
+  - Disable with --no-cache on the gate CLI or env SC_GATE_CACHE=0.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Union
+
+
+CACHE_SCHEMA = 1
+
+# A precomputed content hash, or a callable producing it on demand.
+Sha256 = Union[str, Callable[[], str], None]
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def cache_dir(root: Path | None = None) -> Path:
+    return (root or repo_root()) / "logs" / "ci" / ".cache"
+
+
+def cache_enabled_by_env() -> bool:
+    return str(os.environ.get("SC_GATE_CACHE", "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def rules_version_of(*paths: Path, extra: str = "") -> str:
+    h = hashlib.sha256()
+    h.update(f"schema={CACHE_SCHEMA};{extra}".encode("utf-8"))
+    for p in paths:
+        try:
+            h.update(Path(p).read_bytes())
+        except OSError:
+            h.update(str(p).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def _sha256_file(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class GateCache:
+    def __init__(self, gate: str, *, rules_version: str, root: Path | None = None, enabled: bool = True) -> None:
+        self.gate = gate
+        self.rules_version = rules_version
+        self.enabled = bool(enabled) and cache_enabled_by_env()
+        self.path = cache_dir(root) / f"{gate}.json"
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._seen: set[str] = set()
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        if self.enabled:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            obj = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if not isinstance(obj, dict) or obj.get("rules_version") != self.rules_version:
+            self._dirty = True
+            return
+        entries = obj.get("entries")
+        if isinstance(entries, dict):
+            self._entries = {str(k): v for k, v in entries.items() if isinstance(v, dict)}
+
+    def _fingerprint(self, rel: str, path: Path, sha256: Sha256) -> dict[str, Any] | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        fp: dict[str, Any] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": sha256}
+        entry = self._entries.get(rel)
+        if not isinstance(sha256, str):
+            if entry and entry.get("size") == fp["size"] and entry.get("mtime_ns") == fp["mtime_ns"]:
+                fp["sha256"] = entry.get("sha256")
+            else:
+                fp["sha256"] = sha256() if callable(sha256) else _sha256_file(path)
+        return fp
+
+    def get(self, rel: str, path: Path, *, sha256: Sha256 = None) -> tuple[bool, Any]:
+        """
+        Returns (True, value) on a hit. On a miss returns (False, None); call put() with
+        the freshly computed value afterwards.
+        """
+        self._seen.add(rel)
+        if not self.enabled:
+            self.misses += 1
+            return False, None
+        fp = self._fingerprint(rel, path, sha256)
+        entry = self._entries.get(rel)
+        if fp and fp["sha256"] and entry and entry.get("sha256") == fp["sha256"] and "value" in entry:
+            if entry.get("mtime_ns") != fp["mtime_ns"] or entry.get("size") != fp["size"]:
+                entry.update({"size": fp["size"], "mtime_ns": fp["mtime_ns"]})
+                self._dirty = True
+            self.hits += 1
+            return True, entry["value"]
+        if fp:
+            self._pending[rel] = fp
+        self.misses += 1
+        return False, None
+
+    def put(self, rel: str, path: Path, value: Any, *, sha256: Sha256 = None) -> None:
+        self._seen.add(rel)
+        if not self.enabled:
+            return
+        fp = self._pending.pop(rel, None) or self._fingerprint(rel, path, sha256)
+        if not fp or not fp.get("sha256"):
+            return
+        self._entries[rel] = {**fp, "value": value}
+        self._dirty = True
+
+    def stats(self) -> dict[str, Any]:
+        return {"enabled": self.enabled, "hits": self.hits, "misses": self.misses, "rules_version": self.rules_version}
+
+    def save(self, *, prune_unseen: bool = True) -> None:
+        """
+        prune_unseen=True drops entries not visited in this run (use for full-scope scans).
+        """
+        if not self.enabled:
+            return
+        if prune_unseen:
+            dropped = [k for k in self._entries if k not in self._seen]
+            for k in dropped:
+                del self._entries[k]
+            self._dirty = self._dirty or bool(dropped)
+        if not self._dirty:
+            return
+        payload = {"gate": self.gate, "schema": CACHE_SCHEMA, "rules_version": self.rules_version, "entries": self._entries}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            # Cache is best-effort (e.g. concurrent writers on Windows); never fail the gate.
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+        self._dirty = False
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sharded GdUnit4 runs: suite planning, per-shard isolation and JUnit report merging.
+
+Why:
+  run_gdunit.py started one headless Godot with every `-a` directory, so the e2e stage
+  ran on a single core and one Debugger Break killed all remaining suites.
+
+Flow (run_gdunit.py --shards N):
+  1. `--add` directories are expanded to their `test_*.gd` suites (a directory without
+     suites stays one unit) and split into N shards by longest-processing-time-first over
+     historical suite durations (logs/e2e/.gdunit-durations.json, refreshed from every
+     merged results.xml; reuses dotnet_shard_lib.plan_shards).
+  2. Each shard is its own headless Godot with:
+       - `-rd res://reports/shards/shard-<k>` (GdUnit qualifies report paths against res://),
+       - an isolated user:// (APPDATA / XDG_DATA_HOME pointed at the shard work dir),
+       - its own AUDIT_LOG_ROOT; audit files are appended back into the caller's root
+         once all shards finish.
+  3. A shard that died before producing results.xml, without a break marker and without
+     timing out, is treated as a startup crash (C# assembly load, GPU/driver init) and
+     retried.
+  4. Shard results.xml files are merged into `<rd>/report_1/results.xml` (testsuites
+     concatenated, counters summed) next to an index.html linking the shard HTML
+     reports, which is what validate_acceptance_execution_evidence.py reads.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Iterable
+
+from dotnet_shard_lib import plan_shards  # noqa: F401  (re-exported for run_gdunit.py)
+
+
+DURATIONS_FILE = ".gdunit-durations.json"
+SUITE_GLOB = "test_*.gd"
+SHARD_REPORTS_RES = "res://reports/shards"
+COUNTER_ATTRS = ("tests", "failures", "errors", "skipped", "flaky")
+
+
+def to_res(path: str) -> str:
+    if path.startswith("res://"):
+        return path
+    return "res://" + path.replace("\\", "/").lstrip("/")
+
+
+def expand_suites(project: Path, adds: Iterable[str]) -> list[str]:
+    """`--add` entries -> res:// suite paths (directories expanded to their test_*.gd files)."""
+    out: list[str] = []
+    for add in adds:
+        res = to_res(add)
+        local = project / res[len("res://"):]
+        if local.is_dir():
+            suites = sorted(p.relative_to(project).as_posix() for p in local.rglob(SUITE_GLOB))
+            if suites:
+                out.extend(to_res(s) for s in suites)
+            else:
+                out.append(res)
+        else:
+            out.append(res)
+    return list(dict.fromkeys(out))
+
+
+# --- durations
+
+
+def junit_suite_durations(results_xml: Path) -> dict[str, float]:
+    """testsuite package/name/time -> {res://<package>/<name>.gd: seconds}."""
+    out: dict[str, float] = {}
+    for suite in ET.parse(results_xml).getroot().iter("testsuite"):
+        name = str(suite.get("name") or "")
+        if not name:
+            continue
+        key = to_res(f"{suite.get('package') or ''}/{name}.gd")
+        try:
+            out[key] = out.get(key, 0.0) + float(suite.get("time") or 0)
+        except ValueError:
+            continue
+    return out
+
+
+def load_durations(path: Path) -> dict[str, float]:
+    try:
+        obj = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {str(k): float(v) for k, v in obj.items()} if isinstance(obj, dict) else {}
+
+
+def update_durations(path: Path, results_xml: Path) -> None:
+    try:
+        fresh = junit_suite_durations(results_xml)
+    except (OSError, ET.ParseError):
+        return
+    merged = {**load_durations(path), **{k: round(v, 3) for k, v in fresh.items()}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(sorted(merged.items())), indent=2) + "\n", encoding="utf-8")
+
+
+# --- isolation
+
+
+def shard_env(base_env: dict[str, str], work_dir: Path) -> dict[str, str]:
+    """Per-shard user:// (Windows APPDATA, Linux XDG_DATA_HOME) and AUDIT_LOG_ROOT."""
+    env = dict(base_env)
+    user_dir = work_dir / "userdata"
+    audit_dir = work_dir / "audit"
+    user_dir.mkdir(parents=True, exist_ok=True)
+    audit_dir.mkdir(parents=True, exist_ok=True)
+    env["APPDATA"] = str(user_dir)
+    env["XDG_DATA_HOME"] = str(user_dir)
+    env["AUDIT_LOG_ROOT"] = str(audit_dir)
+    return env
+
+
+def merge_audit_logs(shard_dirs: Iterable[Path], audit_root: Path) -> int:
+    """Append every shard's audit files into audit_root (same relative path); returns files merged."""
+    merged = 0
+    for work_dir in shard_dirs:
+        src_root = work_dir / "audit"
+        if not src_root.is_dir():
+            continue
+        for src in sorted(p for p in src_root.rglob("*") if p.is_file()):
+            dst = audit_root / src.relative_to(src_root)
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            with src.open("rb") as fin, dst.open("ab") as fout:
+                shutil.copyfileobj(fin, fout)
+            merged += 1
+    return merged
+
+
+def is_startup_crash(rc: int, results_xml: Path | None, hit_break: bool) -> bool:
+    return rc not in (0, 124) and results_xml is None and not hit_break
+
+
+def find_results_xml(report_dir: Path) -> Path | None:
+    xmls = list(report_dir.rglob("results.xml")) if report_dir.is_dir() else []
+    return max(xmls, key=lambda p: p.stat().st_mtime) if xmls else None
+
+
+# --- merge
+
+
+def merge_junit(paths: list[Path], dest: Path) -> dict[str, int]:
+    """Concatenate GdUnit testsuites; testsuites counters and time are summed. Returns the totals."""
+    merged = ET.Element("testsuites", {"id": "", "name": dest.parent.name})
+    totals = {k: 0 for k in COUNTER_ATTRS}
+    seconds = 0.0
+    index = 0
+    for path in paths:
+        root = ET.parse(path).getroot()
+        merged.set("id", merged.get("id") or str(root.get("id") or ""))
+        try:
+            seconds += float(root.get("time") or 0)
+        except ValueError:
+            pass
+        for suite in root.iter("testsuite"):
+            suite.set("id", str(index))
+            index += 1
+            for k in COUNTER_ATTRS:
+                try:
+                    totals[k] += int(suite.get(k) or 0)
+                except ValueError:
+                    continue
+            merged.append(suite)
+    for k in COUNTER_ATTRS:
+        merged.set(k, str(totals[k]))
+    merged.set("time", f"{seconds:.3f}")
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(merged).write(dest, encoding="utf-8", xml_declaration=True)
+    return totals
+
+
+def write_index_html(dest: Path, shards: list[dict[str, Any]]) -> None:
+    rows = []
+    for s in shards:
+        link = s.get("report_html") or ""
+        cell = f'<a href="{link}">report</a>' if link else "-"
+        rows.append(
+            f"<tr><td>{s['index']}</td><td>{s['suites']}</td><td>{s['rc']}</td>"
+            f"<td>{s['attempts']}</td><td>{s['seconds']}</td><td>{cell}</td></tr>"
+        )
+    html = (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>GdUnit sharded run</title></head><body>"
+        "<h1>GdUnit sharded run</h1><p>Merged JUnit: <a href=\"results.xml\">results.xml</a></p>"
+        "<table border=\"1\"><tr><th>shard</th><th>suites</th><th>rc</th><th>attempts</th><th>seconds</th><th>html</th></tr>"
+        + "".join(rows)
+        + "</table></body></html>\n"
+    )
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_text(html, encoding="utf-8")
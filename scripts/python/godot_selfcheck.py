@@ -9,6 +9,11 @@ Subcommands:
 Usage examples (Windows / py launcher):
   py -3 scripts/python/godot_selfcheck.py fix-autoload --project project.godot
   py -3 scripts/python/godot_selfcheck.py run --godot-bin "C:\\Godot\\Godot_v4.5.1-stable_mono_win64_console.exe" --build-solutions
+
+`run` dispatches to a warm headless worker when one is registered for the project
+(scripts/python/godot_worker.py); the cold launch remains the fallback and the retry path.
+--build-solutions is skipped (summary build_cache_hit) while the project's input-hash build
+stamp matches (scripts/python/build_cache_lib.py).
 """
 
 import argparse
@@ -19,10 +24,14 @@ import os
 import re
 import shutil
 import sys
-import subprocess
+
+from build_cache_lib import godot_stamp
+from godot_worker_lib import WorkerError, connect
+from stream_run_lib import DEFAULT_TAIL_LINES, LineMatcher, run_streaming
 
 AUT_LOAD_NAME = 'CompositionRoot'
 AUT_LOAD_VALUE = '"*res://Game.Godot/Autoloads/CompositionRoot.cs"'
+SELF_CHECK_OUT_RE = re.compile(r'SELF_CHECK_OUT:(.*)$')
 
 
 def read_text(path: str) -> str:
@@ -66,24 +75,28 @@ def ensure_autoload(project_path: str) -> bool:
     return changed
 
 
-def run_cmd(args: list[str], cwd: str | None = None, timeout: int = 120000) -> tuple[int, str, str]:
-    """Run a command and capture stdout/stderr separately (UTF-8 text)."""
-    p = subprocess.Popen(
+def run_cmd(
+    args: list[str],
+    cwd: str | None = None,
+    timeout: int = 120000,
+    log_path: str | None = None,
+    stderr_log_path: str | None = None,
+    append: bool = False,
+    matchers: tuple = (),
+) -> tuple[int, str, str]:
+    """Run a command, streaming stdout to log_path and stderr to stderr_log_path (merged into
+    stdout without one). Returns (rc, stdout tail, stderr tail); without log_path nothing is cut."""
+    res = run_streaming(
         args,
         cwd=cwd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        encoding='utf-8',
-        errors='ignore',
+        timeout_sec=timeout / 1000.0,
+        log_path=log_path,
+        append=append,
+        stderr_log_path=stderr_log_path,
+        matchers=matchers,
+        tail_lines=DEFAULT_TAIL_LINES if log_path else None,
     )
-    try:
-        out, err = p.communicate(timeout=timeout / 1000.0)
-    except subprocess.TimeoutExpired:
-        p.kill()
-        out, err = p.communicate()
-        return 124, out, err
-    return p.returncode, out, err
+    return res.rc, res.tail, res.stderr_tail
 
 
 def run_selfcheck(godot_bin: str, project_godot: str, build_solutions: bool) -> dict:
@@ -101,46 +114,64 @@ def run_selfcheck(godot_bin: str, project_godot: str, build_solutions: bool) ->
 
     ts = dt.datetime.now().strftime('%H%M%S%f')
     if build_solutions:
-        # Be explicit with --path to avoid project resolution flakiness on CI
-        rc, out, err = run_cmd([godot_bin, '--headless', '--no-window', '--path', root, '--build-solutions', '--quit'], cwd=root, timeout=600000)
-        with open(os.path.join(out_dir, f'godot-buildsolutions-{ts}.txt'), 'w', encoding='utf-8') as f:
-            f.write(out or '')
-            if err:
-                f.write("\n--- STDERR ---\n")
-                f.write(err)
-        summary['build_rc'] = rc
+        # Skipped while no C# input changed since the last successful build (input-hash stamp)
+        stamp = godot_stamp(godot_bin, root)
+        summary['build_cache_hit'] = stamp.hit()
+        if summary['build_cache_hit']:
+            summary['build_rc'] = 0
+        else:
+            stamp.invalidate()
+            # Be explicit with --path to avoid project resolution flakiness on CI
+            rc, _, _ = run_cmd([godot_bin, '--headless', '--no-window', '--path', root, '--build-solutions', '--quit'], cwd=root,
+                               timeout=600000, log_path=os.path.join(out_dir, f'godot-buildsolutions-{ts}.txt'))
+            summary['build_rc'] = rc
+            if rc == 0:
+                stamp.record()
 
     # Run the selfcheck script with explicit --path and verbose output
     args = [godot_bin, '--headless', '--no-window', '--path', root, '-s', 'res://Game.Godot/Scripts/Diagnostics/CompositionRootSelfCheck.gd', '--verbose']
     console_path = os.path.join(out_dir, f'godot-selfcheck-console-{ts}.txt')
     stderr_path = os.path.join(out_dir, f'godot-selfcheck-stderr-{ts}.txt')
-    # Write call header for traceability
-    with open(console_path, 'w', encoding='utf-8') as f:
-        f.write('SELF_CHECK_CALL: ' + ' '.join(args) + '\n')
-    rc, out, err = run_cmd(args, cwd=root, timeout=300000)
-    with open(console_path, 'a', encoding='utf-8') as f:
-        f.write(out or '')
-    with open(stderr_path, 'w', encoding='utf-8') as f:
-        f.write(err or '')
+    # The SELF_CHECK_OUT line is picked up as the console streams; the logs are never read back.
+    sc_out = LineMatcher(SELF_CHECK_OUT_RE.pattern, name='selfcheck-out', regex=True)
+    worker = connect(godot_bin, root)
+    rc = None
+    if worker is not None:
+        # Warm worker: same probe, no engine boot
+        with open(console_path, 'w', encoding='utf-8') as f:
+            f.write(f'SELF_CHECK_CALL: worker pid={worker.state.pid} port={worker.state.port} op=selfcheck\n')
+        try:
+            resp, out = worker.request('selfcheck', timeout_sec=300)
+            rc = 0 if resp.get('ok') else 1
+            summary['worker'] = {'pid': worker.state.pid, 'port': worker.state.port}
+            with open(console_path, 'a', encoding='utf-8') as f:
+                f.write(out or '')
+            write_text(stderr_path, '')
+            for line in (out or '').splitlines():
+                sc_out.feed(line)
+        except WorkerError as e:
+            summary['worker_error'] = str(e)
+    if rc is None:
+        # Write call header for traceability
+        with open(console_path, 'w', encoding='utf-8') as f:
+            f.write('SELF_CHECK_CALL: ' + ' '.join(args) + '\n')
+        write_text(stderr_path, '')
+        rc, _, _ = run_cmd(args, cwd=root, timeout=300000, log_path=console_path, stderr_log_path=stderr_path,
+                           append=True, matchers=(sc_out,))
     summary['selfcheck_rc'] = rc
-    m = re.search(r'SELF_CHECK_OUT:(.*)$', out or '', flags=re.M)
-    if not m:
+    if not sc_out.hits:
         # Retry once after a lightweight prewarm
         _rcpw, _outpw, _errpw = run_cmd([godot_bin, '--headless', '--no-window', '--path', root, '--quit'], cwd=root, timeout=120000)
-        rc2, out2, err2 = run_cmd(args, cwd=root, timeout=300000)
-        with open(console_path, 'a', encoding='utf-8') as f:
-            f.write('\n--- RETRY ---\n')
-            f.write(out2 or '')
-        with open(stderr_path, 'a', encoding='utf-8') as f:
-            f.write('\n--- RETRY ---\n')
-            f.write(err2 or '')
+        for path in (console_path, stderr_path):
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write('\n--- RETRY ---\n')
+        rc2, _, _ = run_cmd(args, cwd=root, timeout=300000, log_path=console_path, stderr_log_path=stderr_path,
+                            append=True, matchers=(sc_out,))
         summary['selfcheck_rc'] = rc2
-        out = out2
-        m = re.search(r'SELF_CHECK_OUT:(.*)$', out or '', flags=re.M)
-        if not m:
+        if not sc_out.hits:
             summary['reason'] = 'SELF_CHECK_OUT not found in console output'
             return summary
-    user_json = m.group(1).strip()
+    user_json = SELF_CHECK_OUT_RE.search(sc_out.hits[0]).group(1).strip()
     if not os.path.exists(user_json):
         summary['reason'] = f'output not found at {user_json}'
         return summary
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Warm headless Godot worker CLI (see godot_worker_lib.py).
+
+Usage (Windows):
+  # Root project (self-check, smoke) and the GdUnit project; both stay up until idle
+  py -3 scripts/python/godot_worker.py start --godot-bin "%GODOT_BIN%" --project . --build-solutions
+  py -3 scripts/python/godot_worker.py start --godot-bin "%GODOT_BIN%" --project Tests.Godot --build-solutions
+
+  py -3 scripts/python/godot_worker.py status --godot-bin "%GODOT_BIN%" --project Tests.Godot
+  py -3 scripts/python/godot_worker.py stop --godot-bin "%GODOT_BIN%" --project Tests.Godot
+
+While a worker is registered and its sources are unchanged, godot_selfcheck.py,
+smoke_headless.py (single run) and run_gdunit.py (unsharded) dispatch to it instead of
+launching Godot; set GODOT_WORKER=0 to force cold launches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from godot_worker_lib import DEFAULT_IDLE_SEC, WorkerError, connect, load_state, start_worker, stop_worker
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Start, stop or inspect a warm headless Godot worker.")
+    ap.add_argument("cmd", choices=["start", "stop", "status"])
+    ap.add_argument("--godot-bin", required=True)
+    ap.add_argument("--project", default=".", help="Godot project directory or project.godot (default '.')")
+    ap.add_argument("--idle-sec", type=int, default=DEFAULT_IDLE_SEC, help="Worker exits after this long without requests")
+    ap.add_argument(
+        "--build-solutions",
+        action="store_true",
+        help="start: build C# solutions first (replaces the cold prewarm); always restarts a running worker",
+    )
+    args = ap.parse_args(argv)
+
+    if args.cmd == "start":
+        live = connect(args.godot_bin, args.project)
+        if live is not None and not args.build_solutions:
+            print(f"GODOT_WORKER status=reused key={live.state.key} pid={live.state.pid} port={live.state.port} log={live.state.log}")
+            return 0
+        try:
+            state = start_worker(args.godot_bin, args.project, idle_sec=args.idle_sec, build_solutions=args.build_solutions)
+        except (WorkerError, OSError) as exc:
+            print(f"GODOT_WORKER status=fail reason={exc}")
+            return 1
+        print(f"GODOT_WORKER status=started key={state.key} pid={state.pid} port={state.port} log={state.log}")
+        return 0
+
+    if args.cmd == "stop":
+        stopped = stop_worker(args.godot_bin, args.project)
+        print(f"GODOT_WORKER status={'stopped' if stopped else 'none'}")
+        return 0
+
+    client = connect(args.godot_bin, args.project)
+    if client is None:
+        state = load_state(args.godot_bin, args.project)
+        print(f"GODOT_WORKER status=down registered={state is not None}")
+        return 1
+    response, _ = client.request("ping", timeout_sec=10)
+    print(f"GODOT_WORKER status=up key={client.state.key} pid={client.state.pid} port={client.state.port} uptime_sec={response.get('uptime_sec')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
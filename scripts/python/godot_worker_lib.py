@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Warm headless Godot worker: start/stop/connect plus a small request client.
+
+Why:
+  One `ci_pipeline.py all` plus `sc-test --type all` booted Godot cold for the self-check
+  (and its retry), the GdUnit prewarm/retry/run and the smoke scene; every launch paid for
+  engine boot, C# assembly load and the import scan.
+
+Design:
+  - The worker is `godot --headless --path <project> -s res://Game.Godot/Scripts/Diagnostics/HeadlessWorker.gd`
+    (mirrored into Tests.Godot). It listens on 127.0.0.1 and serves one newline-delimited
+    JSON request at a time: ping | selfcheck | smoke {scene, seconds} | gdunit {args} | shutdown.
+    Every request carries a random token handed over via env GODOT_WORKER_TOKEN.
+  - State per (godot binary, project dir) lives in logs/ci/.godot-workers/<key>.json; the
+    worker's console goes to <key>.log and each request's output is cut from it between
+    [WORKER_BEGIN id=..] and [WORKER_END id=..].
+  - The state records a fingerprint of the project's scripts/scenes/C# sources and built
+    assemblies at start. connect() refuses (and stops) a worker whose fingerprint no longer
+    matches, so runners never test stale code.
+  - Runners (godot_selfcheck.py, smoke_headless.py, run_gdunit.py) call connect() and fall
+    back to their cold launch when it returns None or a request raises WorkerError.
+    Env GODOT_WORKER=0 disables dispatch.
+  - start --build-solutions skips the build while the project's input-hash stamp matches
+    (build_cache_lib.py).
+  - Workers exit on their own after GODOT_WORKER_IDLE_SEC (default 1800) without requests.
+
+CLI: scripts/python/godot_worker.py start|stop|status.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import secrets
+import signal
+import socket
+import subprocess
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from build_cache_lib import godot_stamp
+
+
+WORKER_SCRIPT = "res://Game.Godot/Scripts/Diagnostics/HeadlessWorker.gd"
+READY_MARKER = "[WORKER_READY]"
+DEFAULT_IDLE_SEC = 1800
+SOURCE_SUFFIXES = {".gd", ".cs", ".tscn", ".tres", ".csproj", ".godot"}
+SKIP_DIRS = {".git", ".godot", "logs", "reports", "TestResults", "node_modules", "bin", "obj"}
+
+
+class WorkerError(RuntimeError):
+    pass
+
+
+class WorkerUnreachable(WorkerError):
+    """Nothing listens on the recorded port: the worker exited (idle timeout, crash, reboot)."""
+
+
+class WorkerTimeout(WorkerError):
+    """The request outlived its timeout; the worker was killed."""
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def state_dir() -> Path:
+    return repo_root() / "logs" / "ci" / ".godot-workers"
+
+
+def dispatch_enabled() -> bool:
+    return os.environ.get("GODOT_WORKER", "").strip() != "0"
+
+
+def project_dir(project: str | Path) -> Path:
+    """Accepts a project directory or its project.godot."""
+    p = Path(project).resolve()
+    return p.parent if p.is_file() else p
+
+
+def worker_key(godot_bin: str, project: str | Path) -> str:
+    ident = f"{Path(godot_bin).resolve()}|{project_dir(project)}".lower()
+    return hashlib.sha1(ident.encode("utf-8")).hexdigest()[:12]
+
+
+def source_fingerprint(project: str | Path) -> str:
+    """count:max-mtime of sources plus the C# assemblies Godot loads (.godot/mono/temp/bin)."""
+    base = project_dir(project)
+    count = 0
+    newest = 0
+    for cur, dirs, files in os.walk(base):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if os.path.splitext(name)[1] in SOURCE_SUFFIXES:
+                count += 1
+                newest = max(newest, os.stat(os.path.join(cur, name)).st_mtime_ns)
+    for dll in (base / ".godot" / "mono" / "temp" / "bin").rglob("*.dll"):
+        count += 1
+        newest = max(newest, dll.stat().st_mtime_ns)
+    return f"{count}:{newest}"
+
+
+@dataclass
+class WorkerState:
+    key: str
+    pid: int
+    port: int
+    token: str
+    godot_bin: str
+    project: str
+    log: str
+    fingerprint: str
+    started_at: float
+
+
+def _state_path(key: str) -> Path:
+    return state_dir() / f"{key}.json"
+
+
+def load_state(godot_bin: str, project: str | Path) -> WorkerState | None:
+    try:
+        obj = json.loads(_state_path(worker_key(godot_bin, project)).read_text(encoding="utf-8"))
+        return WorkerState(**obj)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _drop_state(key: str) -> None:
+    try:
+        _state_path(key).unlink()
+    except OSError:
+        pass
+
+
+def kill_worker(state: WorkerState) -> None:
+    """Hard stop for a worker that accepts connections but no longer answers (stuck in a request)."""
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(state.pid)], capture_output=True, check=False)
+        else:
+            os.kill(state.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    _drop_state(state.key)
+
+
+class WorkerClient:
+    def __init__(self, state: WorkerState) -> None:
+        self.state = state
+
+    def request(self, op: str, *, timeout_sec: float = 600, **params: Any) -> tuple[dict[str, Any], str]:
+        """Sends one request; returns (response, console output of this request)."""
+        req_id = uuid.uuid4().hex[:12]
+        log_path = Path(self.state.log)
+        offset = log_path.stat().st_size if log_path.is_file() else 0
+        payload = json.dumps({"id": req_id, "op": op, "token": self.state.token, **params}) + "\n"
+        try:
+            sock = socket.create_connection(("127.0.0.1", self.state.port), timeout=5)
+        except OSError as exc:
+            raise WorkerUnreachable(f"worker {self.state.key} not reachable: {exc}") from exc
+        try:
+            with sock:
+                sock.settimeout(timeout_sec)
+                sock.sendall(payload.encode("utf-8"))
+                buf = b""
+                while not buf.endswith(b"\n"):
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    buf += chunk
+        except socket.timeout as exc:
+            # Alive but stuck in this request (hung suite, modal break): nothing else can use it.
+            kill_worker(self.state)
+            raise WorkerTimeout(f"worker {self.state.key} {op} timed out after {timeout_sec}s; worker killed") from exc
+        except OSError as exc:
+            raise WorkerError(f"worker {self.state.key} {op} failed: {exc}") from exc
+        try:
+            response = json.loads(buf.decode("utf-8"))
+        except ValueError as exc:
+            raise WorkerError(f"worker {self.state.key} {op}: malformed response") from exc
+        if response.get("error") in ("bad token", "bad request"):
+            raise WorkerError(f"worker {self.state.key} rejected {op}: {response['error']}")
+        return response, self._console_slice(log_path, offset, req_id)
+
+    @staticmethod
+    def _console_slice(log_path: Path, offset: int, req_id: str, wait_sec: float = 5.0) -> str:
+        begin, end = f"[WORKER_BEGIN id={req_id} ", f"[WORKER_END id={req_id}]"
+        deadline = time.monotonic() + wait_sec
+        while True:
+            try:
+                with log_path.open("r", encoding="utf-8", errors="ignore") as f:
+                    f.seek(offset)
+                    text = f.read()
+            except OSError:
+                return ""
+            if end in text or time.monotonic() > deadline:
+                break
+            time.sleep(0.05)
+        start = text.find(begin)
+        if start < 0:
+            return text
+        start = text.find("\n", start) + 1
+        stop = text.find(end, start)
+        return text[start:stop] if stop >= 0 else text[start:]
+
+    def ping(self) -> bool:
+        try:
+            response, _ = self.request("ping", timeout_sec=10)
+        except WorkerError:
+            return False
+        return bool(response.get("ok"))
+
+
+def connect(godot_bin: str, project: str | Path) -> WorkerClient | None:
+    """A live, up-to-date worker for this binary/project, or None (caller launches cold)."""
+    if not dispatch_enabled():
+        return None
+    state = load_state(godot_bin, project)
+    if state is None:
+        return None
+    if state.fingerprint != source_fingerprint(project):
+        print(f"[godot_worker] worker {state.key} is stale (sources changed); stopping it")
+        stop_worker(godot_bin, project)
+        return None
+    client = WorkerClient(state)
+    if not client.ping():
+        _drop_state(state.key)
+        return None
+    return client
+
+
+def start_worker(
+    godot_bin: str,
+    project: str | Path,
+    *,
+    idle_sec: int = DEFAULT_IDLE_SEC,
+    build_solutions: bool = False,
+    timeout_sec: float = 300,
+) -> WorkerState:
+    proj = project_dir(project)
+    key = worker_key(godot_bin, proj)
+    stop_worker(godot_bin, proj)
+    stamp = godot_stamp(godot_bin, proj) if build_solutions else None
+    if stamp is not None and not stamp.hit():
+        # Same step as the cold prewarm; done before fingerprinting so the worker loads fresh assemblies.
+        stamp.invalidate()
+        built = subprocess.run(
+            [godot_bin, "--headless", "--path", str(proj), "--build-solutions", "--quit"],
+            cwd=str(proj),
+            capture_output=True,
+            timeout=600,
+            check=False,
+        )
+        if built.returncode == 0:
+            stamp.record()
+    fingerprint = source_fingerprint(proj)
+    token = secrets.token_hex(16)
+    log_path = state_dir() / f"{key}.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ, GODOT_WORKER_TOKEN=token, GODOT_WORKER_PORT="0", GODOT_WORKER_IDLE_SEC=str(idle_sec))
+    detach: dict[str, Any] = {"start_new_session": True}
+    if os.name == "nt":
+        detach = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS}
+    with log_path.open("wb") as log:
+        proc = subprocess.Popen(
+            [godot_bin, "--headless", "--path", str(proj), "-s", WORKER_SCRIPT],
+            cwd=str(proj),
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            env=env,
+            **detach,
+        )
+
+    deadline = time.monotonic() + timeout_sec
+    port = 0
+    while time.monotonic() < deadline:
+        for line in log_path.read_text(encoding="utf-8", errors="ignore").splitlines():
+            if line.startswith(READY_MARKER):
+                fields = dict(kv.split("=", 1) for kv in line[len(READY_MARKER):].split() if "=" in kv)
+                port = int(fields.get("port", 0))
+        if port or proc.poll() is not None:
+            break
+        time.sleep(0.2)
+    if not port:
+        if proc.poll() is None:
+            proc.kill()
+        raise WorkerError(f"worker did not become ready (rc={proc.poll()}); see {log_path}")
+
+    state = WorkerState(
+        key=key,
+        pid=proc.pid,
+        port=port,
+        token=token,
+        godot_bin=str(godot_bin),
+        project=str(proj),
+        log=str(log_path),
+        fingerprint=fingerprint,
+        started_at=time.time(),
+    )
+    _state_path(key).write_text(json.dumps(asdict(state), indent=2) + "\n", encoding="utf-8")
+    return state
+
+
+def stop_worker(godot_bin: str, project: str | Path) -> bool:
+    """Graceful shutdown request (a stuck worker is killed). True if one was registered."""
+    state = load_state(godot_bin, project)
+    if state is None:
+        return False
+    try:
+        WorkerClient(state).request("shutdown", timeout_sec=10)
+    except WorkerError:
+        pass  # unreachable: already gone; timed out: request() killed it
+    _drop_state(state.key)
+    return True
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental log reading and a latest-log index for logs/ci.
+
+Why:
+  Gates read whole headless/test logs into memory to run one regex, and
+  find_latest_headless_log() walked all of logs/ci with rglob() on every call.
+  On long-lived agents logs/ci holds thousands of dated directories.
+
+What:
+  - iter_lines / grep_lines / contains_any: stream a file line by line
+    (only matching lines are kept).
+  - find_last: scan backwards from EOF in blocks; for "last marker wins" lookups.
+  - LogCursor: resume scanning a growing log from a saved byte offset (state is a
+    small JSON file; truncation/rotation restarts from 0).
+  - record_latest / latest_log: logs/ci/.latest-logs.json maps a log file name
+    (e.g. "headless.log") to the newest known path. Writers record their output;
+    readers only walk top-level directories modified after the recorded entry, so
+    logs written by tools that do not update the index are still found.
+  - WORKER_LOG_MARKER: first line of a warm headless worker's console slice
+    (headless-worker.log; its idle-throttled [PERF] windows are never budgeted).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+BLOCK_SIZE = 64 * 1024
+INDEX_FILE = ".latest-logs.json"
+MTIME_SLACK_SEC = 2.0
+WORKER_LOG_MARKER = "[HEADLESS_WORKER]"
+
+_index_lock = threading.Lock()
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+# --- streaming reads
+
+
+def iter_lines(path: Path, *, start: int = 0) -> Iterator[tuple[int, str]]:
+    """Yields (offset after the line, decoded line) from byte offset `start`."""
+    with path.open("rb") as f:
+        f.seek(start)
+        pos = start
+        for raw in f:
+            pos += len(raw)
+            yield pos, raw.decode("utf-8", errors="ignore")
+
+
+def grep_lines(path: Path, needles: Iterable[str], *, start: int = 0) -> list[str]:
+    """Lines containing any of `needles` (substring match), in file order."""
+    keys = tuple(needles)
+    return [line for _, line in iter_lines(path, start=start) if any(k in line for k in keys)]
+
+
+def contains_any(path: Path, needles: Iterable[str]) -> set[str]:
+    """Which of `needles` occur in the file; stops reading once all were seen."""
+    pending = set(needles)
+    found: set[str] = set()
+    for _, line in iter_lines(path):
+        hits = {k for k in pending if k in line}
+        if hits:
+            found |= hits
+            pending -= hits
+            if not pending:
+                break
+    return found
+
+
+def iter_lines_reverse(path: Path, *, block_size: int = BLOCK_SIZE) -> Iterator[str]:
+    """Yields lines from the end of the file backwards, reading `block_size` chunks."""
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + tail
+            lines = chunk.split(b"\n")
+            tail = lines[0]  # may be partial; completed by the next (earlier) block
+            for raw in reversed(lines[1:]):
+                if raw.strip():
+                    yield raw.decode("utf-8", errors="ignore").rstrip("\r")
+        if tail.strip():
+            yield tail.decode("utf-8", errors="ignore").rstrip("\r")
+
+
+def find_last(path: Path, pattern: re.Pattern[str]) -> re.Match[str] | None:
+    """Last line-local match of `pattern` (searched from EOF backwards)."""
+    for line in iter_lines_reverse(path):
+        m = pattern.search(line)
+        if m:
+            return m
+    return None
+
+
+class LogCursor:
+    """
+    Remembers how far each log has been read. `read_new(path)` returns only lines
+    appended since the previous call (persisted to `state_path` by save()).
+    """
+
+    def __init__(self, state_path: Path) -> None:
+        self.state_path = state_path
+        try:
+            self._state: dict[str, dict[str, int]] = json.loads(state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._state = {}
+
+    def read_new(self, path: Path) -> list[str]:
+        key = str(path.resolve())
+        try:
+            st = path.stat()
+        except OSError:
+            return []
+        entry = self._state.get(key) or {}
+        offset = int(entry.get("offset") or 0)
+        if st.st_size < offset or int(entry.get("ino") or st.st_ino) != st.st_ino:
+            offset = 0  # truncated or replaced
+        lines: list[str] = []
+        end = offset
+        for pos, line in iter_lines(path, start=offset):
+            if not line.endswith("\n"):
+                break  # incomplete last line; pick it up next time
+            lines.append(line)
+            end = pos
+        self._state[key] = {"offset": end, "ino": st.st_ino}
+        return lines
+
+    def save(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._state), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+
+# --- latest-log index
+
+
+def _index_path(base: Path) -> Path:
+    return base / INDEX_FILE
+
+
+def _load_index(base: Path) -> dict[str, dict[str, object]]:
+    try:
+        obj = json.loads(_index_path(base).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return obj if isinstance(obj, dict) else {}
+
+
+def record_latest(name: str, path: Path, *, base: Path | None = None) -> None:
+    """Records `path` as the newest `name` log under `base` (default logs/ci). Best-effort."""
+    base = base or repo_root() / "logs" / "ci"
+    try:
+        mtime = path.stat().st_mtime
+        with _index_lock:
+            index = _load_index(base)
+            current = index.get(name) or {}
+            if float(current.get("mtime") or 0) > mtime and Path(str(current.get("path"))).is_file():
+                return
+            index[name] = {"path": str(path.resolve()), "mtime": mtime}
+            base.mkdir(parents=True, exist_ok=True)
+            tmp = _index_path(base).with_name(f"{INDEX_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp, _index_path(base))
+    except OSError:
+        pass
+
+
+def latest_log(name: str, *, base: Path | None = None) -> Path | None:
+    """
+    Newest file called `name` under `base` (default logs/ci). Uses the index entry as a
+    lower bound and only descends into top-level directories modified since then.
+    """
+    base = base or repo_root() / "logs" / "ci"
+    if not base.is_dir():
+        return None
+
+    best: Path | None = None
+    best_mtime = -1.0
+    entry = _load_index(base).get(name) or {}
+    known = Path(str(entry.get("path") or ""))
+    if entry and known.is_file():
+        best, best_mtime = known, known.stat().st_mtime
+
+    cutoff = best_mtime - MTIME_SLACK_SEC if best is not None else None
+    with os.scandir(base) as it:
+        for d in it:
+            if not d.is_dir(follow_symlinks=False) or d.name.startswith("."):
+                continue
+            if cutoff is not None and d.stat().st_mtime < cutoff:
+                continue
+            for p in Path(d.path).rglob(name):
+                try:
+                    m = p.stat().st_mtime
+                except OSError:
+                    continue
+                if m > best_mtime:
+                    best, best_mtime = p, m
+
+    if best is not None and (best != known):
+        record_latest(name, best, base=base)
+    return best
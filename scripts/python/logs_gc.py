@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+logs gc: retention and compaction for logs/ci, logs/unit, logs/e2e and logs/perf/frames.
+
+Why:
+  Every sc-* command writes under logs/ci/<date>/, run_gdunit.py copies whole GdUnit
+  report trees into logs/e2e/<date>/ and run_dotnet.py copies TRX/cobertura files into
+  logs/unit/<date>/. Nothing was ever pruned: agents ran out of disk and every
+  mtime-sorted log search got slower as the tree grew.
+
+Policy (scripts/ci/logs-retention.json):
+  - Per kind, the top-level entries of its root (dated/timestamped directories, or files)
+    are ranked newest first. An entry is deleted when it is older than max_age_days,
+    outside the newest max_count days, or would push the kept total over max_total_mb.
+    max_count counts calendar days, not entries: logs/ci mixes YYYY-MM-DD day directories
+    with YYYYMMDD-HHMMSS run directories (smoke / perf runs), and a busy day of runs
+    must not push out weeks of dated evidence.
+  - Kept entries older than compress_after_days have their text logs (compress_suffixes,
+    >= compress_min_kb) gzip-compressed in place (<name>.gz, original mtime kept).
+  - Pinned entries are never deleted or compressed: the newest pin_acceptance_per_task
+    sc-acceptance-check summaries of each task pin their own directory, every logs/ path
+    they reference and every artifact registered under their run_id in the artifact
+    catalog (artifact_catalog_lib.py).
+  - Entries younger than min_age_hours are never touched (runs still writing).
+  - Dot entries (logs/ci/.cache, .llm-cache, catalog/index files) manage themselves.
+
+Usage (Windows):
+  py -3 scripts/python/logs_gc.py --dry-run
+  py -3 scripts/python/logs_gc.py --kind e2e --kind unit
+  py -3 scripts/python/dev_cli.py logs-gc --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import gzip
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from artifact_catalog_lib import KIND_ACCEPTANCE_SUMMARY, ArtifactCatalog, default_db_path
+
+
+ENTRY_DATE_RE = re.compile(r"^(\d{4})-?(\d{2})-?(\d{2})(?:-(\d{2})(\d{2})(\d{2}))?$")
+DAY_SEC = 86_400.0
+MB = 1024 * 1024
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def default_config_path(root: Path | None = None) -> Path:
+    return (root or repo_root()) / "scripts" / "ci" / "logs-retention.json"
+
+
+@dataclass(frozen=True)
+class KindPolicy:
+    kind: str
+    root: str
+    max_age_days: float
+    max_count: int
+    max_total_mb: float
+    compress_after_days: float
+
+
+@dataclass(frozen=True)
+class GcConfig:
+    kinds: dict[str, KindPolicy]
+    min_age_hours: float = 24.0
+    pin_acceptance_per_task: int = 1
+    compress_suffixes: tuple[str, ...] = (".log", ".txt")
+    compress_min_kb: float = 4.0
+
+
+def load_config(path: Path) -> GcConfig:
+    obj = json.loads(path.read_text(encoding="utf-8"))
+    kinds: dict[str, KindPolicy] = {}
+    for kind, raw in (obj.get("kinds") or {}).items():
+        if not isinstance(raw, dict) or not raw.get("root"):
+            raise ValueError(f"invalid retention kind '{kind}' in {path}")
+        kinds[kind] = KindPolicy(
+            kind=kind,
+            root=str(raw["root"]),
+            max_age_days=float(raw.get("max_age_days") or 0),
+            max_count=int(raw.get("max_count") or 0),
+            max_total_mb=float(raw.get("max_total_mb") or 0),
+            compress_after_days=float(raw.get("compress_after_days") or 0),
+        )
+    return GcConfig(
+        kinds=kinds,
+        min_age_hours=float(obj.get("min_age_hours", 24)),
+        pin_acceptance_per_task=int(obj.get("pin_acceptance_per_task", 1)),
+        compress_suffixes=tuple(str(s).lower() for s in (obj.get("compress_suffixes") or [".log", ".txt"])),
+        compress_min_kb=float(obj.get("compress_min_kb", 4)),
+    )
+
+
+@dataclass
+class Entry:
+    path: Path
+    timestamp: float
+    size: int
+    pinned: bool = False
+    action: str = "keep"  # keep | delete
+    reason: str = ""
+
+
+@dataclass
+class KindReport:
+    kind: str
+    root: str
+    entries: int = 0
+    pinned: int = 0
+    deleted: list[dict[str, Any]] = field(default_factory=list)
+    freed_bytes: int = 0
+    compressed: int = 0
+    saved_bytes: int = 0
+    kept_bytes: int = 0
+
+
+# --- pins
+
+
+def _iter_strings(obj: Any) -> Iterator[str]:
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from _iter_strings(v)
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from _iter_strings(v)
+
+
+def _logs_path(value: str, root: Path) -> Path | None:
+    """A string from a summary that names something under logs/ (absolute or repo-relative)."""
+    s = value.strip().replace("\\", "/")
+    if "logs/" not in s or len(s) > 512 or "\n" in s:
+        return None
+    p = Path(s)
+    p = p if p.is_absolute() else root / p
+    try:
+        p.resolve().relative_to(root / "logs")
+    except (ValueError, OSError):
+        return None
+    return p.resolve()
+
+
+def _acceptance_summaries(root: Path) -> list[Path]:
+    found: set[Path] = set()
+    if default_db_path().is_file():
+        with ArtifactCatalog() as catalog:
+            for row in catalog.query(KIND_ACCEPTANCE_SUMMARY, limit=100_000):
+                p = catalog.resolve(str(row["path"]))
+                if p.is_file():
+                    found.add(p.resolve())
+    # Summaries written before the catalog existed.
+    ci_root = root / "logs" / "ci"
+    if ci_root.is_dir():
+        found.update(p.resolve() for p in ci_root.glob("*/sc-acceptance-check*/summary.json"))
+    return sorted(found)
+
+
+def collect_pins(root: Path, per_task: int) -> tuple[set[Path], list[str]]:
+    """(pinned paths, pinning summaries). Newest `per_task` acceptance summaries of each task pin."""
+    if per_task <= 0:
+        return set(), []
+    by_task: dict[str, list[tuple[float, Path, dict[str, Any]]]] = {}
+    for summary in _acceptance_summaries(root):
+        try:
+            data = json.loads(summary.read_text(encoding="utf-8"))
+            mtime = summary.stat().st_mtime
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict):
+            by_task.setdefault(str(data.get("task_id") or ""), []).append((mtime, summary, data))
+
+    pins: set[Path] = set()
+    pinning: list[str] = []
+    run_ids: set[str] = set()
+    for items in by_task.values():
+        for _, summary, data in sorted(items, key=lambda t: t[0], reverse=True)[:per_task]:
+            pinning.append(summary.relative_to(root).as_posix() if summary.is_relative_to(root) else str(summary))
+            pins.add(summary.parent)
+            pins.update(p for p in (_logs_path(s, root) for s in _iter_strings(data)) if p is not None)
+            if data.get("run_id"):
+                run_ids.add(str(data["run_id"]))
+
+    if run_ids and default_db_path().is_file():
+        with ArtifactCatalog() as catalog:
+            for rid in run_ids:
+                pins.update(p.resolve() for p in catalog.paths_for_run(rid))
+    return pins, sorted(pinning)
+
+
+def _is_pinned(entry: Path, pins: set[Path]) -> bool:
+    e = entry.resolve()
+    # Only pins at or below the entry count; a pin naming a whole root (e.g. "logs/ci") is ignored.
+    return any(p == e or e in p.parents for p in pins)
+
+
+# --- entries
+
+
+def _entry_timestamp(path: Path, mtime: float) -> float:
+    """Date encoded in the entry name (end of that day / exact timestamp), else mtime."""
+    m = ENTRY_DATE_RE.match(path.name)
+    if m:
+        try:
+            if m.group(4):
+                return dt.datetime(*(int(g) for g in m.groups())).timestamp()
+            day = dt.datetime(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            return (day + dt.timedelta(days=1)).timestamp() - 1
+        except ValueError:
+            pass
+    return mtime
+
+
+def _tree_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    total = 0
+    for cur, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(cur, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def scan_entries(base: Path) -> list[Entry]:
+    out: list[Entry] = []
+    if not base.is_dir():
+        return out
+    with os.scandir(base) as it:
+        for d in it:
+            if d.name.startswith("."):
+                continue
+            p = Path(d.path)
+            try:
+                mtime = d.stat(follow_symlinks=False).st_mtime
+            except OSError:
+                continue
+            out.append(Entry(path=p, timestamp=_entry_timestamp(p, mtime), size=_tree_size(p)))
+    out.sort(key=lambda e: e.timestamp, reverse=True)
+    return out
+
+
+def plan_kind(entries: list[Entry], policy: KindPolicy, *, now: float, min_age_hours: float) -> None:
+    """Marks entries for deletion (newest first; pinned and young entries always kept)."""
+    kept_days: set[dt.date] = set()
+    kept_bytes = 0
+    budget = policy.max_total_mb * MB
+    for e in entries:
+        age_days = (now - e.timestamp) / DAY_SEC
+        day = dt.date.fromtimestamp(e.timestamp)
+        if not e.pinned and age_days * 24 >= min_age_hours:
+            if policy.max_age_days > 0 and age_days > policy.max_age_days:
+                e.action, e.reason = "delete", f"age>{policy.max_age_days:g}d"
+            elif policy.max_count > 0 and day not in kept_days and len(kept_days) >= policy.max_count:
+                e.action, e.reason = "delete", f"days>{policy.max_count}"
+            elif policy.max_total_mb > 0 and kept_bytes + e.size > budget:
+                e.action, e.reason = "delete", f"size>{policy.max_total_mb:g}MB"
+        if e.action == "keep":
+            kept_days.add(day)
+            kept_bytes += e.size
+
+
+def _compress_file(path: Path) -> int:
+    """gzip `path` to `path.gz` (keeps mtime); returns bytes saved."""
+    st = path.stat()
+    gz = path.with_name(path.name + ".gz")
+    with path.open("rb") as src, gzip.open(gz, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst)
+    os.utime(gz, (st.st_atime, st.st_mtime))
+    path.unlink()
+    return st.st_size - gz.stat().st_size
+
+
+def compress_entry(entry: Path, cfg: GcConfig, *, dry_run: bool) -> tuple[int, int]:
+    """(files compressed, bytes saved); dry runs report candidates with saved=0."""
+    files = [entry] if entry.is_file() else [Path(cur) / n for cur, _, names in os.walk(entry) for n in names]
+    count = 0
+    saved = 0
+    min_bytes = cfg.compress_min_kb * 1024
+    for f in files:
+        if f.suffix.lower() not in cfg.compress_suffixes:
+            continue
+        try:
+            if f.stat().st_size < min_bytes:
+                continue
+            count += 1
+            if not dry_run:
+                saved += _compress_file(f)
+        except OSError:
+            continue
+    return count, saved
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def run_gc(cfg: GcConfig, *, root: Path, kinds: list[str] | None = None, dry_run: bool = False, now: float | None = None) -> dict[str, Any]:
+    now = time.time() if now is None else now
+    pins, pinning = collect_pins(root, cfg.pin_acceptance_per_task)
+    reports: list[KindReport] = []
+    for kind, policy in cfg.kinds.items():
+        if kinds and kind not in kinds:
+            continue
+        rep = KindReport(kind=kind, root=policy.root)
+        entries = scan_entries(root / policy.root)
+        for e in entries:
+            e.pinned = _is_pinned(e.path, pins)
+        plan_kind(entries, policy, now=now, min_age_hours=cfg.min_age_hours)
+        rep.entries = len(entries)
+        rep.pinned = sum(1 for e in entries if e.pinned)
+        for e in entries:
+            rel = e.path.relative_to(root).as_posix()
+            if e.action == "delete":
+                rep.deleted.append({"path": rel, "reason": e.reason, "mb": round(e.size / MB, 2)})
+                rep.freed_bytes += e.size
+                if not dry_run:
+                    _remove(e.path)
+                continue
+            rep.kept_bytes += e.size
+            age_days = (now - e.timestamp) / DAY_SEC
+            if e.pinned or policy.compress_after_days <= 0 or age_days <= policy.compress_after_days:
+                continue
+            n, saved = compress_entry(e.path, cfg, dry_run=dry_run)
+            rep.compressed += n
+            rep.saved_bytes += saved
+        reports.append(rep)
+
+    pruned = 0
+    if not dry_run and default_db_path().is_file():
+        with ArtifactCatalog() as catalog:
+            pruned = catalog.prune_missing()
+
+    return {
+        "dry_run": dry_run,
+        "pinning_summaries": pinning,
+        "pinned_paths": len(pins),
+        "catalog_pruned": pruned,
+        "kinds": [rep.__dict__ for rep in reports],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Prune and compact logs/ per scripts/ci/logs-retention.json.")
+    ap.add_argument("--config", default=None, help="Retention config (default scripts/ci/logs-retention.json)")
+    ap.add_argument("--kind", action="append", default=[], help="Only these kinds (repeatable; default all)")
+    ap.add_argument("--dry-run", action="store_true", help="Report what would be deleted/compressed without touching files")
+    ap.add_argument("--out", default=None, help="Write the JSON report here")
+    args = ap.parse_args(argv)
+
+    root = repo_root()
+    cfg_path = Path(args.config) if args.config else default_config_path(root)
+    try:
+        cfg = load_config(cfg_path)
+    except (OSError, ValueError) as exc:
+        print(f"LOGS_GC status=fail error=bad_config config={cfg_path} detail={exc}")
+        return 1
+    unknown = [k for k in args.kind if k not in cfg.kinds]
+    if unknown:
+        print(f"LOGS_GC status=fail error=unknown_kind kinds={','.join(unknown)}")
+        return 1
+
+    report = run_gc(cfg, root=root, kinds=args.kind or None, dry_run=bool(args.dry_run))
+    for rep in report["kinds"]:
+        for d in rep["deleted"]:
+            print(f"  - {d['path']} ({d['mb']} MB, {d['reason']})")
+        print(
+            f"[logs_gc] {rep['kind']}: entries={rep['entries']} pinned={rep['pinned']} deleted={len(rep['deleted'])} "
+            f"freed_mb={rep['freed_bytes'] / MB:.1f} compressed={rep['compressed']} kept_mb={rep['kept_bytes'] / MB:.1f}"
+        )
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    kinds = report["kinds"]
+    print(
+        f"LOGS_GC status=ok dry_run={str(report['dry_run']).lower()} deleted={sum(len(k['deleted']) for k in kinds)} "
+        f"freed_mb={sum(k['freed_bytes'] for k in kinds) / MB:.1f} compressed={sum(k['compressed'] for k in kinds)} "
+        f"saved_mb={sum(k['saved_bytes'] for k in kinds) / MB:.1f} pinned={report['pinned_paths']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
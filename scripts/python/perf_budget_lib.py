@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ADR-0015 multi-metric perf budgets evaluated from a headless log.
+
+Why:
+  The perf gate only checked frame p95 from the last `[PERF]` marker. ADR-0015 also
+  budgets frame p99 spikes, cold/hot scene switches and cold/hot resource loads,
+  which nothing measured, so scene-load regressions shipped unnoticed.
+
+Markers (printed by Game.Godot/Scripts/Perf/PerformanceTracker.cs):
+  [PERF] frames=... avg_ms=... p50_ms=... p95_ms=... p99_ms=...   (rolling frame window)
+  [PERF_SCENE] kind=cold|hot ms=... scene=res://...               (one per scene switch)
+  [PERF_LOAD] kind=cold|hot ms=... path=res://...                 (one per resource load)
+
+Budgets:
+  scripts/ci/perf-budgets.json maps metric id -> {"max_ms": float, "gate": "hard"|"soft"}.
+  Frame metrics use the last [PERF] window (same as before); scene/load metrics use the
+  p95 over every marker of that kind in the log.
+
+Per-metric status:
+  pass | fail | no-data (no markers of that kind in the log; never fails the gate).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+from perf_history_lib import parse_perf_samples
+
+
+EVENT_RE = re.compile(r"\[PERF_(SCENE|LOAD)\]\s*kind=(cold|hot)\s+ms=([0-9]+(?:\.[0-9]+)?)")
+
+# metric id -> (source, selector): frame metrics pick a [PERF] field, events pick (marker, kind).
+METRIC_SOURCES: dict[str, tuple[str, str]] = {
+    "frame_p95_ms": ("frame", "p95_ms"),
+    "frame_p99_ms": ("frame", "p99_ms"),
+    "scene_switch_cold_p95_ms": ("SCENE", "cold"),
+    "scene_switch_hot_p95_ms": ("SCENE", "hot"),
+    "resource_load_cold_p95_ms": ("LOAD", "cold"),
+    "resource_load_hot_p95_ms": ("LOAD", "hot"),
+}
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def default_budgets_path(root: Path | None = None) -> Path:
+    return (root or repo_root()) / "scripts" / "ci" / "perf-budgets.json"
+
+
+@dataclass(frozen=True)
+class Budget:
+    metric: str
+    max_ms: float
+    gate: str  # hard | soft
+
+
+def load_budgets(path: Path | None = None) -> list[Budget]:
+    p = path or default_budgets_path()
+    obj = json.loads(p.read_text(encoding="utf-8"))
+    metrics = obj.get("metrics") if isinstance(obj, dict) else None
+    if not isinstance(metrics, dict):
+        raise ValueError(f"perf budgets file has no 'metrics' object: {p}")
+    out: list[Budget] = []
+    for metric, spec in metrics.items():
+        if metric not in METRIC_SOURCES:
+            raise ValueError(f"unknown perf metric in {p}: {metric}")
+        if not isinstance(spec, dict):
+            raise ValueError(f"perf budget for {metric} must be an object: {p}")
+        gate = str(spec.get("gate") or "hard").strip().lower()
+        if gate not in ("hard", "soft"):
+            raise ValueError(f"perf budget gate must be hard|soft: {metric}={gate}")
+        out.append(Budget(metric=metric, max_ms=float(spec["max_ms"]), gate=gate))
+    return out
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Linear interpolation between closest ranks (same as PerformanceTracker.Compute)."""
+    s = sorted(values)
+    if not s:
+        return float("nan")
+    pos = q * (len(s) - 1)
+    lo, hi = math.floor(pos), math.ceil(pos)
+    if lo == hi:
+        return s[lo]
+    w = pos - lo
+    return s[lo] * (1 - w) + s[hi] * w
+
+
+def extract_metrics(text: str) -> dict[str, dict[str, Any]]:
+    """metric id -> {"value": float | None, "samples": int}."""
+    frames = parse_perf_samples(text)
+    events: dict[tuple[str, str], list[float]] = {}
+    for m in EVENT_RE.finditer(text or ""):
+        events.setdefault((m.group(1), m.group(2)), []).append(float(m.group(3)))
+
+    out: dict[str, dict[str, Any]] = {}
+    for metric, (source, selector) in METRIC_SOURCES.items():
+        if source == "frame":
+            last = frames[-1] if frames else None
+            out[metric] = {"value": getattr(last, selector) if last else None, "samples": len(frames)}
+        else:
+            values = events.get((source, selector), [])
+            out[metric] = {"value": round(percentile(values, 0.95), 3) if values else None, "samples": len(values)}
+    return out
+
+
+def evaluate_budgets(text: str, budgets: Sequence[Budget]) -> dict[str, dict[str, Any]]:
+    """metric id -> {value, samples, max_ms, gate, status}; only metrics with a budget are returned."""
+    extracted = extract_metrics(text)
+    result: dict[str, dict[str, Any]] = {}
+    for b in budgets:
+        value = extracted[b.metric]["value"]
+        if value is None:
+            status = "no-data"
+        else:
+            status = "pass" if float(value) <= b.max_ms else "fail"
+        result[b.metric] = {
+            "value": value,
+            "samples": extracted[b.metric]["samples"],
+            "max_ms": b.max_ms,
+            "gate": b.gate,
+            "status": status,
+        }
+    return result
+
+
+def hard_failures(results: dict[str, dict[str, Any]]) -> list[str]:
+    return [m for m, r in results.items() if r.get("gate") == "hard" and r.get("status") == "fail"]
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Frame-time histograms from PerformanceTracker raw frame streams (*.pfs).
+
+Why:
+  The [PERF] marker only carries avg/p50/p95/p99 of a sliding window. A bimodal
+  distribution (steady 8 ms frames plus periodic 40 ms GC/streaming hitches) can
+  have a harmless-looking p95 while players see stutter.
+
+Input:
+  - Frame streams written when PerformanceTracker.StreamFrameSamples is on (or env
+    PERF_FRAME_STREAM=1; env PERF_FRAME_STREAM_DIR picks the directory):
+    "PFS1" + little-endian uint32 frame time in microseconds per frame.
+  - Histogram JSON previously written with --out (so per-run histograms can be
+    merged later without the raw streams).
+
+Histogram:
+  Log-linear buckets in microseconds (HDR-style, 64 sub-buckets per power of two,
+  i.e. <= ~1.6% relative error). Histograms merge by adding bucket counts.
+
+Usage (Windows):
+  $env:PERF_FRAME_STREAM="1"; $env:PERF_FRAME_STREAM_DIR="$PWD/logs/perf/frames"
+  py -3 scripts/python/smoke_headless.py --godot-bin "$env:GODOT_BIN" --perf-runs 3
+  py -3 scripts/python/perf_frame_hist.py logs/perf/frames --warmup-frames 120 --out logs/perf/frames/merged.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+
+STREAM_MAGIC = b"PFS1"
+HIST_SCHEMA = "perf-frame-hist/1"
+SUB_BUCKETS = 64  # per power of two above 2*SUB_BUCKETS us
+PERCENTILES = (50.0, 90.0, 95.0, 99.0, 99.9, 100.0)
+STUTTER_THRESHOLDS_MS = (16.7, 33.3, 50.0, 100.0)
+
+
+def bucket_index(us: int) -> int:
+    """Exact below 2*SUB_BUCKETS us; above, SUB_BUCKETS linear sub-buckets per power of two."""
+    if us < 2 * SUB_BUCKETS:
+        return max(0, us)
+    shift = us.bit_length() - SUB_BUCKETS.bit_length()  # us >> shift in [SUB_BUCKETS, 2*SUB_BUCKETS)
+    return 2 * SUB_BUCKETS + (shift - 1) * SUB_BUCKETS + ((us >> shift) - SUB_BUCKETS)
+
+
+def bucket_bounds(idx: int) -> tuple[int, int]:
+    """[low, high) in microseconds."""
+    if idx < 2 * SUB_BUCKETS:
+        return idx, idx + 1
+    rel = idx - 2 * SUB_BUCKETS
+    shift = rel // SUB_BUCKETS + 1
+    low = (SUB_BUCKETS + rel % SUB_BUCKETS) << shift
+    return low, low + (1 << shift)
+
+
+@dataclass
+class FrameHistogram:
+    counts: dict[int, int] = field(default_factory=dict)
+    total: int = 0
+    max_us: int = 0
+    sources: list[str] = field(default_factory=list)
+
+    def record(self, us: int) -> None:
+        idx = bucket_index(us)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.total += 1
+        self.max_us = max(self.max_us, us)
+
+    def merge(self, other: "FrameHistogram") -> None:
+        for idx, n in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + n
+        self.total += other.total
+        self.max_us = max(self.max_us, other.max_us)
+        self.sources.extend(other.sources)
+
+    def percentile_ms(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th frame (max for 100)."""
+        if self.total == 0:
+            return float("nan")
+        if pct >= 100.0:
+            return self.max_us / 1000.0
+        rank = max(1, math.ceil(pct / 100.0 * self.total))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(bucket_bounds(idx)[1] - 1, self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def count_above_ms(self, threshold_ms: float) -> int:
+        limit = int(threshold_ms * 1000)
+        return sum(n for idx, n in self.counts.items() if bucket_bounds(idx)[0] >= limit)
+
+    def to_json(self) -> dict:
+        return {
+            "schema": HIST_SCHEMA,
+            "sub_buckets": SUB_BUCKETS,
+            "total": self.total,
+            "max_us": self.max_us,
+            "sources": self.sources,
+            "counts": {str(k): v for k, v in sorted(self.counts.items())},
+        }
+
+    @classmethod
+    def from_json(cls, obj: dict, *, source: str = "") -> "FrameHistogram":
+        if obj.get("schema") != HIST_SCHEMA or int(obj.get("sub_buckets") or 0) != SUB_BUCKETS:
+            raise ValueError(f"unsupported histogram file: {source or obj.get('schema')}")
+        return cls(
+            counts={int(k): int(v) for k, v in (obj.get("counts") or {}).items()},
+            total=int(obj.get("total") or 0),
+            max_us=int(obj.get("max_us") or 0),
+            sources=list(obj.get("sources") or [source]),
+        )
+
+
+def read_frame_stream(path: Path) -> list[int]:
+    """Frame times in microseconds; a truncated trailing record (killed process) is ignored."""
+    data = path.read_bytes()
+    if data[:4] != STREAM_MAGIC:
+        raise ValueError(f"not a PerformanceTracker frame stream: {path}")
+    body = data[4:]
+    n = len(body) // 4
+    return list(struct.unpack(f"<{n}I", body[: n * 4]))
+
+
+def load_histogram(path: Path, *, warmup_frames: int = 0) -> FrameHistogram:
+    if path.suffix.lower() == ".json":
+        return FrameHistogram.from_json(json.loads(path.read_text(encoding="utf-8")), source=str(path))
+    hist = FrameHistogram(sources=[str(path)])
+    for us in read_frame_stream(path)[max(0, warmup_frames) :]:
+        hist.record(us)
+    return hist
+
+
+def expand_inputs(inputs: Iterable[str]) -> list[Path]:
+    out: list[Path] = []
+    for raw in inputs:
+        p = Path(raw)
+        if p.is_dir():
+            out.extend(sorted(p.rglob("*.pfs")))
+        elif p.is_file():
+            out.append(p)
+    return out
+
+
+def render_table(hist: FrameHistogram) -> str:
+    lines = [f"frames={hist.total} sources={len(hist.sources)}", "", "| percentile | frame_ms |", "|---:|---:|"]
+    for pct in PERCENTILES:
+        lines.append(f"| p{pct:g} | {hist.percentile_ms(pct):.2f} |")
+    lines.extend(["", "| frames over | count | share |", "|---:|---:|---:|"])
+    for t in STUTTER_THRESHOLDS_MS:
+        n = hist.count_above_ms(t)
+        share = (100.0 * n / hist.total) if hist.total else 0.0
+        lines.append(f"| {t:g} ms | {n} | {share:.2f}% |")
+    return "\n".join(lines)
+
+
+def render_bars(hist: FrameHistogram, *, width: int = 50, bin_ms: float = 2.0) -> str:
+    """Coarse fixed-width view so separate modes (e.g. 8 ms and 40 ms) are visible."""
+    if hist.total == 0:
+        return ""
+    bins: dict[int, int] = {}
+    for idx, n in hist.counts.items():
+        low_ms = bucket_bounds(idx)[0] / 1000.0
+        b = int(low_ms // bin_ms)
+        bins[b] = bins.get(b, 0) + n
+    peak = max(bins.values())
+    lines = []
+    for b in range(min(bins), max(bins) + 1):
+        n = bins.get(b, 0)
+        if n == 0:
+            continue
+        bar = "#" * max(1, int(round(width * n / peak)))
+        lines.append(f"{b * bin_ms:7.1f}-{(b + 1) * bin_ms:<7.1f} ms {n:8d} {bar}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Merge PerformanceTracker frame streams/histograms and print percentile tables.")
+    ap.add_argument("inputs", nargs="+", help="*.pfs streams, histogram *.json files, or directories (scanned for *.pfs)")
+    ap.add_argument("--warmup-frames", type=int, default=0, help="Drop the first N frames of each raw stream")
+    ap.add_argument("--per-source", action="store_true", help="Also print one table per input")
+    ap.add_argument("--bars", action="store_true", help="Print a coarse distribution chart (spots bimodal stutter)")
+    ap.add_argument("--bin-ms", type=float, default=2.0, help="Bin width for --bars")
+    ap.add_argument("--out", default=None, help="Write the merged histogram JSON here (mergeable later)")
+    args = ap.parse_args(argv)
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("PERF_FRAME_HIST status=fail error=no_inputs")
+        return 1
+
+    merged = FrameHistogram()
+    for p in paths:
+        try:
+            hist = load_histogram(p, warmup_frames=args.warmup_frames)
+        except (OSError, ValueError) as exc:
+            print(f"PERF_FRAME_HIST status=fail error={exc}")
+            return 1
+        if args.per_source:
+            print(f"## {p}")
+            print(render_table(hist))
+            print("")
+        merged.merge(hist)
+
+    print("## merged")
+    print(render_table(merged))
+    if args.bars:
+        print("")
+        print(render_bars(merged, bin_ms=args.bin_ms))
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(merged.to_json(), ensure_ascii=False) + "\n", encoding="utf-8")
+    print("")
+    print(f"PERF_FRAME_HIST status=ok sources={len(paths)} frames={merged.total} p99_ms={merged.percentile_ms(99.0):.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
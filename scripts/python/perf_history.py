@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Perf history CLI: ingest [PERF] samples into logs/perf/ and check for regressions.
+
+Usage (Windows):
+  # Record every headless.log under logs/ci that is not in the history yet
+  py -3 scripts/python/perf_history.py ingest
+
+  # Record one run with explicit tags
+  py -3 scripts/python/perf_history.py ingest --log logs/ci/<ts>/smoke/headless.log --scene res://Game.Godot/Scenes/Main.tscn
+
+  # Compare the newest run's p95 with the previous 10 runs (exit 1 on regression with --strict)
+  py -3 scripts/python/perf_history.py check --metric p95_ms --baseline-runs 10 --strict
+
+See perf_history_lib.py for the storage layout and the statistics used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from perf_history_lib import (
+    DEFAULT_ALPHA,
+    DEFAULT_BASELINE_RUNS,
+    DEFAULT_MIN_DELTA_MS,
+    METRICS,
+    PerfHistory,
+    default_db_path,
+    median,
+    repo_root,
+)
+
+
+def _cmd_ingest(args: argparse.Namespace, db: PerfHistory) -> int:
+    root = repo_root()
+    if args.log:
+        log = Path(args.log)
+        if not log.is_absolute():
+            log = root / log
+        if not log.is_file():
+            print(f"PERF_HISTORY ingest status=fail error=log_not_found log={args.log}")
+            return 1
+        run_id, added = db.ingest_log(
+            log,
+            run_id=args.run_id or None,
+            commit_sha=args.commit if args.commit is not None else None,
+            scene=args.scene,
+            source=args.source,
+        )
+        print(f"PERF_HISTORY ingest status=ok run_id={run_id} samples={added}")
+        return 0
+
+    scan = Path(args.scan)
+    results = db.ingest_tree(scan if scan.is_absolute() else root / scan)
+    new_runs = [(rid, n) for rid, n in results if n]
+    for rid, n in new_runs:
+        print(f"  + {rid} samples={n}")
+    print(f"PERF_HISTORY ingest status=ok scanned={len(results)} new_runs={len(new_runs)}")
+    return 0
+
+
+def _cmd_check(args: argparse.Namespace, db: PerfHistory) -> int:
+    result = db.check_regression(
+        run_id=args.run_id or None,
+        metric=args.metric,
+        baseline_runs=args.baseline_runs,
+        alpha=args.alpha,
+        min_delta_ms=args.min_delta_ms,
+    )
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(
+        f"PERF_HISTORY check status={result.get('status')} metric={result.get('metric')} run_id={result.get('run_id')} "
+        f"baseline_median_ms={result.get('baseline_median_ms')} candidate_median_ms={result.get('candidate_median_ms')} "
+        f"delta_ms={result.get('delta_ms')} p={result.get('p_value')}"
+    )
+    return 1 if (args.strict and result.get("status") == "regression") else 0
+
+
+def _cmd_list(args: argparse.Namespace, db: PerfHistory) -> int:
+    for r in db.runs(scene=args.scene or None, limit=args.limit):
+        values = db.metric_values([r["run_id"]], "p95_ms")
+        med = round(median(values), 3) if values else None
+        print(f"{r['ingested_at']} {r['run_id']} commit={str(r['commit_sha'])[:10]} scene={r['scene']} samples={len(values)} p95_med={med}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="Perf history store for [PERF] markers (logs/perf/).")
+    ap.add_argument("--db", default=None, help="SQLite path (default: logs/perf/perf-history.sqlite3)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    ing = sub.add_parser("ingest", help="Append [PERF] samples from headless logs")
+    ing.add_argument("--log", default=None, help="Single log file to ingest (default: scan --scan dir)")
+    ing.add_argument("--scan", default="logs/ci", help="Directory scanned for headless.log when --log is not given")
+    ing.add_argument("--run-id", default="", help="Run id (default: the log's directory relative to the repo)")
+    ing.add_argument("--commit", default=None, help="Commit sha tag (default: git HEAD for --log, empty for scans)")
+    ing.add_argument("--scene", default="", help="Scene tag, e.g. res://Game.Godot/Scenes/Main.tscn")
+    ing.add_argument("--source", default="headless.log", help="Source tag (smoke, e2e, ...)")
+
+    chk = sub.add_parser("check", help="Mann-Whitney regression check against a rolling baseline")
+    chk.add_argument("--run-id", default="", help="Run to check (default: newest)")
+    chk.add_argument("--metric", choices=list(METRICS), default="p95_ms")
+    chk.add_argument("--baseline-runs", type=int, default=DEFAULT_BASELINE_RUNS)
+    chk.add_argument("--alpha", type=float, default=DEFAULT_ALPHA)
+    chk.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    chk.add_argument("--out", default=None, help="Write the result JSON here")
+    chk.add_argument("--strict", action="store_true", help="Exit 1 when a regression is detected")
+
+    lst = sub.add_parser("list", help="List recorded runs (newest first)")
+    lst.add_argument("--scene", default="")
+    lst.add_argument("--limit", type=int, default=20)
+    return ap
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    db_path = Path(args.db) if args.db else default_db_path()
+    with PerfHistory(db_path) as db:
+        if args.cmd == "ingest":
+            return _cmd_ingest(args, db)
+        if args.cmd == "check":
+            return _cmd_check(args, db)
+        return _cmd_list(args, db)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
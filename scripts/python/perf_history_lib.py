@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Append-only history of `[PERF]` frame-time samples and a regression check.
+
+Why:
+  The acceptance perf-budget step only compares the last `[PERF] ... p95_ms=...`
+  line of the newest headless.log with the ADR-0015 threshold (20 ms). A slow
+  creep (e.g. 12 ms -> 14 ms p95) passes every single run and is only noticed
+  once it crosses the gate.
+
+Design:
+  - SQLite file under logs/perf/perf-history.sqlite3 (stdlib only, safe for
+    concurrent appends). Two tables:
+      runs(run_id, commit_sha, scene, source, log_path, ingested_at)
+      samples(run_id, seq, frames, avg_ms, p50_ms, p95_ms, p99_ms)
+    Rows are only ever inserted; re-ingesting the same log is a no-op
+    (run_id defaults to the log's directory, seq is the marker index).
+  - Regression check: one-sided Mann-Whitney U test (normal approximation with
+    tie correction) of the newest run's samples against the pooled samples of
+    the previous N runs for the same scene. A regression needs both p < alpha
+    and a median shift >= min_delta_ms, so noise on an unchanged build does not
+    flag and a real 2 ms creep does.
+
+Notes:
+  PerformanceTracker prints one marker per second over a sliding frame window,
+  so samples within a run overlap. The test is used as a ranking heuristic for
+  "is this run slower than recent runs", not as an exact p-value.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+import sqlite3
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from log_tail_lib import grep_lines
+
+
+# The only [PERF] window pattern (also used by perf_runs_lib and the sc perf-budget step):
+# groups frames, avg_ms, p50_ms, p95_ms, p99_ms and the optional uptime_s.
+PERF_METRICS_RE = re.compile(
+    r"\[PERF\]\s*frames=(\d+)\s+avg_ms=([0-9]+(?:\.[0-9]+)?)\s+p50_ms=([0-9]+(?:\.[0-9]+)?)\s+p95_ms=([0-9]+(?:\.[0-9]+)?)\s+p99_ms=([0-9]+(?:\.[0-9]+)?)"
+    r"(?:\s+uptime_s=([0-9]+(?:\.[0-9]+)?))?"
+)
+
+METRICS = ("avg_ms", "p50_ms", "p95_ms", "p99_ms")
+
+DEFAULT_BASELINE_RUNS = 10
+DEFAULT_ALPHA = 0.01
+DEFAULT_MIN_DELTA_MS = 1.0
+MIN_SAMPLES = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL UNIQUE,
+    commit_sha TEXT NOT NULL DEFAULT '',
+    scene TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    log_path TEXT NOT NULL DEFAULT '',
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    frames INTEGER NOT NULL,
+    avg_ms REAL NOT NULL,
+    p50_ms REAL NOT NULL,
+    p95_ms REAL NOT NULL,
+    p99_ms REAL NOT NULL,
+    PRIMARY KEY (run_id, seq)
+);
+"""
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def default_db_path(root: Path | None = None) -> Path:
+    return (root or repo_root()) / "logs" / "perf" / "perf-history.sqlite3"
+
+
+@dataclass(frozen=True)
+class PerfSample:
+    frames: int
+    avg_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def parse_perf_samples(text: str) -> list[PerfSample]:
+    return [
+        PerfSample(
+            frames=int(m.group(1)),
+            avg_ms=float(m.group(2)),
+            p50_ms=float(m.group(3)),
+            p95_ms=float(m.group(4)),
+            p99_ms=float(m.group(5)),
+        )
+        for m in PERF_METRICS_RE.finditer(text or "")
+    ]
+
+
+def current_commit(root: Path | None = None) -> str:
+    env = str(os.environ.get("PERF_COMMIT_SHA") or os.environ.get("GITHUB_SHA") or "").strip()
+    if env:
+        return env
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=str(root or repo_root()),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=10,
+        )
+    except Exception:  # noqa: BLE001
+        return ""
+    return (proc.stdout or "").strip() if proc.returncode == 0 else ""
+
+
+def default_run_id(log_path: Path, root: Path | None = None) -> str:
+    """The log's directory relative to the repo, e.g. logs/ci/20250101-120000/smoke."""
+    parent = log_path.resolve().parent
+    try:
+        return str(parent.relative_to((root or repo_root()).resolve())).replace("\\", "/")
+    except ValueError:
+        return str(parent).replace("\\", "/")
+
+
+def median(values: Sequence[float]) -> float:
+    s = sorted(values)
+    n = len(s)
+    if n == 0:
+        return float("nan")
+    mid = n // 2
+    return s[mid] if n % 2 else (s[mid - 1] + s[mid]) / 2.0
+
+
+def mann_whitney_greater(baseline: Sequence[float], candidate: Sequence[float]) -> tuple[float, float, float]:
+    """
+    One-sided Mann-Whitney U test, H1: candidate tends to be larger than baseline.
+    Returns (U_candidate, z, p). Normal approximation with tie and continuity correction.
+    """
+    n1, n2 = len(baseline), len(candidate)
+    if n1 == 0 or n2 == 0:
+        return 0.0, 0.0, 1.0
+
+    pooled = sorted([(v, 0) for v in baseline] + [(v, 1) for v in candidate])
+    ranks = [0.0] * len(pooled)
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        avg_rank = (i + j) / 2.0 + 1.0
+        for k in range(i, j + 1):
+            ranks[k] = avg_rank
+        t = j - i + 1
+        tie_term += t**3 - t
+        i = j + 1
+
+    r2 = sum(r for r, (_, grp) in zip(ranks, pooled) if grp == 1)
+    u2 = r2 - n2 * (n2 + 1) / 2.0
+    n = n1 + n2
+    mean_u = n1 * n2 / 2.0
+    var_u = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if var_u <= 0:
+        return u2, 0.0, 1.0
+    z = (u2 - mean_u - 0.5) / math.sqrt(var_u)
+    p = 0.5 * math.erfc(z / math.sqrt(2.0))
+    return u2, z, p
+
+
+def detect_regression(
+    baseline: Sequence[float],
+    candidate: Sequence[float],
+    *,
+    alpha: float = DEFAULT_ALPHA,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> dict[str, Any]:
+    """
+    status: "regression" | "ok" | "insufficient-data".
+    A regression requires both statistical significance and a practical median shift.
+    """
+    result: dict[str, Any] = {
+        "baseline_samples": len(baseline),
+        "candidate_samples": len(candidate),
+        "alpha": alpha,
+        "min_delta_ms": min_delta_ms,
+    }
+    if len(baseline) < MIN_SAMPLES or len(candidate) < MIN_SAMPLES:
+        result["status"] = "insufficient-data"
+        return result
+
+    base_med = median(baseline)
+    cand_med = median(candidate)
+    u, z, p = mann_whitney_greater(baseline, candidate)
+    delta = cand_med - base_med
+    result.update(
+        {
+            "baseline_median_ms": round(base_med, 3),
+            "candidate_median_ms": round(cand_med, 3),
+            "delta_ms": round(delta, 3),
+            "u": round(u, 1),
+            "z": round(z, 3),
+            "p_value": round(p, 6),
+            "status": "regression" if (p < alpha and delta >= min_delta_ms) else "ok",
+        }
+    )
+    return result
+
+
+class PerfHistory:
+    def __init__(self, db_path: Path | None = None) -> None:
+        self.db_path = db_path or default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "PerfHistory":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    # --- ingest
+
+    def has_run(self, run_id: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone() is not None
+
+    def add_run(
+        self,
+        run_id: str,
+        samples: Iterable[PerfSample],
+        *,
+        commit_sha: str = "",
+        scene: str = "",
+        source: str = "",
+        log_path: str = "",
+    ) -> int:
+        """Appends a run; returns the number of new samples (0 when already recorded)."""
+        rows = [(run_id, seq, s.frames, s.avg_ms, s.p50_ms, s.p95_ms, s.p99_ms) for seq, s in enumerate(samples)]
+        if not rows:
+            return 0
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, commit_sha, scene, source, log_path, ingested_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, commit_sha, scene, source, log_path, time.strftime("%Y-%m-%dT%H:%M:%S")),
+            )
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            return self._conn.total_changes - before
+
+    def ingest_log(
+        self,
+        log_path: Path,
+        *,
+        run_id: str | None = None,
+        commit_sha: str | None = None,
+        scene: str = "",
+        source: str = "headless.log",
+        root: Path | None = None,
+    ) -> tuple[str, int]:
+        """Parses every [PERF] marker in `log_path`. Returns (run_id, new samples)."""
+        rid = run_id or default_run_id(log_path, root)
+        if self.has_run(rid):
+            return rid, 0
+        samples = parse_perf_samples("".join(grep_lines(log_path, ["[PERF]"])))
+        if not samples:
+            return rid, 0
+        added = self.add_run(
+            rid,
+            samples,
+            commit_sha=current_commit(root) if commit_sha is None else commit_sha,
+            scene=scene,
+            source=source,
+            log_path=default_run_id(log_path, root) + "/" + log_path.name,
+        )
+        return rid, added
+
+    def ingest_tree(self, base: Path, *, pattern: str = "headless.log", root: Path | None = None) -> list[tuple[str, int]]:
+        """Ingests every `pattern` file under `base` that is not recorded yet (oldest first)."""
+        if not base.is_dir():
+            return []
+        logs = sorted(base.rglob(pattern), key=lambda p: p.stat().st_mtime)
+        return [self.ingest_log(p, root=root, commit_sha="") for p in logs]
+
+    # --- queries
+
+    def runs(self, *, scene: str | None = None, limit: int | None = None) -> list[dict[str, Any]]:
+        """Runs newest first, optionally for one scene."""
+        sql = "SELECT run_id, commit_sha, scene, source, log_path, ingested_at FROM runs"
+        params: list[Any] = []
+        if scene is not None:
+            sql += " WHERE scene = ?"
+            params.append(scene)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        cols = ("run_id", "commit_sha", "scene", "source", "log_path", "ingested_at")
+        return [dict(zip(cols, row)) for row in self._conn.execute(sql, params)]
+
+    def metric_values(self, run_ids: Sequence[str], metric: str = "p95_ms") -> list[float]:
+        if metric not in METRICS:
+            raise ValueError(f"unknown metric: {metric}")
+        if not run_ids:
+            return []
+        marks = ",".join("?" for _ in run_ids)
+        sql = f"SELECT {metric} FROM samples WHERE run_id IN ({marks})"
+        return [float(r[0]) for r in self._conn.execute(sql, list(run_ids))]
+
+    def check_regression(
+        self,
+        *,
+        run_id: str | None = None,
+        metric: str = "p95_ms",
+        baseline_runs: int = DEFAULT_BASELINE_RUNS,
+        alpha: float = DEFAULT_ALPHA,
+        min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+    ) -> dict[str, Any]:
+        """
+        Compares `run_id` (default: newest run) with up to `baseline_runs` earlier runs of
+        the same scene (rolling baseline).
+        """
+        all_runs = self.runs()
+        if run_id is None:
+            if not all_runs:
+                return {"status": "insufficient-data", "error": "perf history is empty", "metric": metric}
+            run_id = str(all_runs[0]["run_id"])
+        target = next((r for r in all_runs if r["run_id"] == run_id), None)
+        if target is None:
+            return {"status": "insufficient-data", "error": f"run not found: {run_id}", "metric": metric}
+
+        older = [r for r in all_runs[all_runs.index(target) + 1 :] if r["scene"] == target["scene"]]
+        baseline_ids = [str(r["run_id"]) for r in older[: max(1, int(baseline_runs))]]
+        result = detect_regression(
+            self.metric_values(baseline_ids, metric),
+            self.metric_values([run_id], metric),
+            alpha=alpha,
+            min_delta_ms=min_delta_ms,
+        )
+        result.update(
+            {
+                "metric": metric,
+                "run_id": run_id,
+                "commit_sha": target["commit_sha"],
+                "scene": target["scene"],
+                "baseline_runs": baseline_ids,
+            }
+        )
+        return result
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Multi-run perf sampling: warm-up filtering, pooling and bootstrap confidence intervals.
+
+Why:
+  One 5 s smoke launch gives a handful of overlapping [PERF] windows, several of which
+  still contain JIT/shader warm-up frames. Gating on the last window made the perf gate
+  flaky on busy CI agents.
+
+Design:
+  - smoke_headless.py --perf-runs N launches the scene N times; each run's [PERF] windows
+    with uptime_s < warm-up are dropped (markers without uptime_s fall back to the flush
+    index, ~1 marker per second).
+  - Runs are the independent unit: the CI is a cluster bootstrap that resamples whole runs
+    with replacement and takes the median of the pooled windows (default 2000 resamples,
+    fixed seed so reruns on the same logs give the same interval).
+  - Gate: "fail" only when the whole interval is above the budget, "pass" when it is at or
+    below, otherwise "inconclusive" (does not fail; more runs narrow the interval).
+
+Output (perf-runs.json next to the run-XX/ directories):
+  {"runs": N, "warmup_sec": W, "confidence": 0.95,
+   "metrics": {"p95_ms": {"point": .., "ci_low": .., "ci_high": .., "windows": .., "runs": ..}, ...}}
+"""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from perf_history_lib import PERF_METRICS_RE, median
+
+
+WINDOW_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+PERF_RUNS_FILE = "perf-runs.json"
+DEFAULT_WARMUP_SEC = 5.0
+DEFAULT_BOOTSTRAP_ITERS = 2000
+DEFAULT_CONFIDENCE = 0.95
+
+
+def parse_windows(text: str, *, warmup_sec: float = 0.0) -> list[dict[str, float]]:
+    """[PERF] windows emitted after the warm-up period, in log order."""
+    out: list[dict[str, float]] = []
+    for idx, m in enumerate(PERF_METRICS_RE.finditer(text or "")):
+        uptime = float(m.group(6)) if m.group(6) else float(idx + 1)
+        if uptime < warmup_sec:
+            continue
+        out.append({"p50_ms": float(m.group(3)), "p95_ms": float(m.group(4)), "p99_ms": float(m.group(5)), "uptime_s": uptime})
+    return out
+
+
+def cluster_bootstrap_ci(
+    runs: Sequence[Sequence[float]],
+    *,
+    stat: Callable[[Sequence[float]], float] = median,
+    iters: int = DEFAULT_BOOTSTRAP_ITERS,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int = 0,
+) -> tuple[float, float, float]:
+    """(point, low, high): percentile interval of `stat` over runs resampled with replacement."""
+    clusters = [list(r) for r in runs if r]
+    if not clusters:
+        return float("nan"), float("nan"), float("nan")
+    point = stat([v for r in clusters for v in r])
+    if len(clusters) == 1:
+        # One run: resample windows instead (wider in practice because windows overlap).
+        clusters = [[v] for v in clusters[0]]
+    rng = random.Random(seed)
+    n = len(clusters)
+    estimates = sorted(stat([v for _ in range(n) for v in rng.choice(clusters)]) for _ in range(max(1, iters)))
+    tail = (1.0 - confidence) / 2.0
+    lo = estimates[int(tail * (len(estimates) - 1))]
+    hi = estimates[int(round((1.0 - tail) * (len(estimates) - 1)))]
+    return point, lo, hi
+
+
+def summarize_runs(
+    run_texts: Sequence[str],
+    *,
+    warmup_sec: float = DEFAULT_WARMUP_SEC,
+    iters: int = DEFAULT_BOOTSTRAP_ITERS,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> dict[str, Any]:
+    per_run = [parse_windows(t, warmup_sec=warmup_sec) for t in run_texts]
+    metrics: dict[str, Any] = {}
+    for metric in WINDOW_METRICS:
+        runs = [[w[metric] for w in r] for r in per_run]
+        used = [r for r in runs if r]
+        if not used:
+            metrics[metric] = {"point": None, "ci_low": None, "ci_high": None, "windows": 0, "runs": 0}
+            continue
+        point, lo, hi = cluster_bootstrap_ci(used, iters=iters, confidence=confidence)
+        metrics[metric] = {
+            "point": round(point, 3),
+            "ci_low": round(lo, 3),
+            "ci_high": round(hi, 3),
+            "windows": sum(len(r) for r in used),
+            "runs": len(used),
+        }
+    return {
+        "runs": len(run_texts),
+        "runs_with_samples": sum(1 for r in per_run if r),
+        "warmup_sec": warmup_sec,
+        "confidence": confidence,
+        "bootstrap_iters": iters,
+        "metrics": metrics,
+    }
+
+
+def ci_verdict(metric: dict[str, Any], max_ms: float) -> str:
+    """pass | fail | inconclusive | no-data."""
+    lo, hi = metric.get("ci_low"), metric.get("ci_high")
+    if lo is None or hi is None:
+        return "no-data"
+    if float(lo) > max_ms:
+        return "fail"
+    if float(hi) <= max_ms:
+        return "pass"
+    return "inconclusive"
+
+
+def find_perf_runs(headless_log: Path) -> Path | None:
+    """perf-runs.json for a log written by a multi-run (…/perf-runs/run-XX/headless.log)."""
+    candidate = headless_log.parent.parent / PERF_RUNS_FILE
+    return candidate if candidate.is_file() else None
+
+
+def apply_ci_verdicts(budgets: dict[str, dict[str, Any]], summary: dict[str, Any]) -> None:
+    """
+    Replaces single-window frame budget results (frame_p95_ms / frame_p99_ms) with the
+    pooled multi-run estimate; the budget fails only when the CI clears it.
+    """
+    metrics = summary.get("metrics") if isinstance(summary.get("metrics"), dict) else {}
+    for budget_metric, run_metric in (("frame_p95_ms", "p95_ms"), ("frame_p99_ms", "p99_ms")):
+        res = budgets.get(budget_metric)
+        m = metrics.get(run_metric)
+        if not isinstance(res, dict) or not isinstance(m, dict):
+            continue
+        verdict = ci_verdict(m, float(res["max_ms"]))
+        res.update(
+            {
+                "value": m.get("point"),
+                "ci": [m.get("ci_low"), m.get("ci_high")],
+                "samples": m.get("windows"),
+                "runs": m.get("runs"),
+                "ci_verdict": verdict,
+                "status": "fail" if verdict == "fail" else ("no-data" if verdict == "no-data" else "pass"),
+            }
+        )
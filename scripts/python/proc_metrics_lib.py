@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resource telemetry for gate steps: wall time, CPU user/sys, peak RSS and I/O bytes.
+
+Why:
+  summary.json of sc-acceptance-check, sc-test and ci_pipeline recorded status/rc/log per
+  step but not what a step cost, so there was no data for deciding which gates to speed up
+  or move to nightly.
+
+Design:
+  - ProcessMeter measures one child process and everything it starts. stream_run_lib uses it
+    for every run_streaming call.
+      POSIX:   the child is reaped with os.wait4; its rusage covers the child and every
+               descendant it waited for (ru_utime/ru_stime; ru_maxrss is the largest single
+               process; ru_inblock/ru_oublock are 512-byte blocks that reached the block device,
+               page-cache hits are not counted).
+      Windows: the child is put into a Job Object right after CreateProcess; job accounting
+               covers the whole tree (TotalUserTime/TotalKernelTime, Read/WriteTransferCount;
+               PeakJobMemoryUsed = peak committed memory of the job, the closest tree-wide
+               peak the API offers). Grandchildren started before the assignment escape it.
+    Detached helpers (dotnet build servers, a warm Godot worker) are not part of the tree.
+  - ResourceMeter is a context manager for one step. It samples the calling thread's CPU
+    (RUSAGE_THREAD on Linux, GetThreadTimes on Windows, time.thread_time elsewhere) and, on
+    Linux, its block I/O, so in-process gates are covered and concurrently scheduled steps do
+    not see each other's work. Every ProcessMeter finished on the same thread while a meter is
+    active adds to it (CPU and I/O summed, peak RSS = max). A step without child processes
+    reports the runner's own peak RSS (a process-wide high-water mark).
+  - processes counts the child processes a step ran (on Windows every process of the job tree).
+  - A value is None when the platform cannot provide it; nothing here raises.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Iterable
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+METRIC_KEYS = ("wall_sec", "cpu_user_sec", "cpu_sys_sec", "peak_rss_bytes", "read_bytes", "write_bytes", "processes")
+BLOCK_BYTES = 512
+
+_local = threading.local()
+_win_api: SimpleNamespace | None = None
+
+
+def _active() -> list[ResourceMeter]:
+    meters = getattr(_local, "meters", None)
+    if meters is None:
+        meters = _local.meters = []
+    return meters
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 3)
+
+
+def _sum(values: Iterable[float | int | None]) -> float | int | None:
+    present = [v for v in values if v is not None]
+    return sum(present) if present else None
+
+
+# --- Windows (ctypes, loaded on first use)
+
+
+def _win() -> SimpleNamespace:
+    global _win_api
+    if _win_api is not None:
+        return _win_api
+    import ctypes
+    from ctypes import wintypes
+
+    class IO_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            (n, ctypes.c_ulonglong)
+            for n in ("ReadOperationCount", "WriteOperationCount", "OtherOperationCount", "ReadTransferCount", "WriteTransferCount", "OtherTransferCount")
+        ]
+
+    class BASIC_ACCOUNTING(ctypes.Structure):
+        _fields_ = [
+            ("TotalUserTime", ctypes.c_longlong),
+            ("TotalKernelTime", ctypes.c_longlong),
+            ("ThisPeriodTotalUserTime", ctypes.c_longlong),
+            ("ThisPeriodTotalKernelTime", ctypes.c_longlong),
+            ("TotalPageFaultCount", wintypes.DWORD),
+            ("TotalProcesses", wintypes.DWORD),
+            ("ActiveProcesses", wintypes.DWORD),
+            ("TotalTerminatedProcesses", wintypes.DWORD),
+        ]
+
+    class BASIC_AND_IO_ACCOUNTING(ctypes.Structure):
+        _fields_ = [("BasicInfo", BASIC_ACCOUNTING), ("IoInfo", IO_COUNTERS)]
+
+    class BASIC_LIMIT(ctypes.Structure):
+        _fields_ = [
+            ("PerProcessUserTimeLimit", ctypes.c_longlong),
+            ("PerJobUserTimeLimit", ctypes.c_longlong),
+            ("LimitFlags", wintypes.DWORD),
+            ("MinimumWorkingSetSize", ctypes.c_size_t),
+            ("MaximumWorkingSetSize", ctypes.c_size_t),
+            ("ActiveProcessLimit", wintypes.DWORD),
+            ("Affinity", ctypes.c_size_t),
+            ("PriorityClass", wintypes.DWORD),
+            ("SchedulingClass", wintypes.DWORD),
+        ]
+
+    class EXTENDED_LIMIT(ctypes.Structure):
+        _fields_ = [
+            ("BasicLimitInformation", BASIC_LIMIT),
+            ("IoInfo", IO_COUNTERS),
+            ("ProcessMemoryLimit", ctypes.c_size_t),
+            ("JobMemoryLimit", ctypes.c_size_t),
+            ("PeakProcessMemoryUsed", ctypes.c_size_t),
+            ("PeakJobMemoryUsed", ctypes.c_size_t),
+        ]
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+            (n, ctypes.c_size_t)
+            for n in (
+                "PeakWorkingSetSize",
+                "WorkingSetSize",
+                "QuotaPeakPagedPoolUsage",
+                "QuotaPagedPoolUsage",
+                "QuotaPeakNonPagedPoolUsage",
+                "QuotaNonPagedPoolUsage",
+                "PagefileUsage",
+                "PeakPagefileUsage",
+            )
+        ]
+
+    k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    k32.CreateJobObjectW.argtypes = [ctypes.c_void_p, wintypes.LPCWSTR]
+    k32.CreateJobObjectW.restype = wintypes.HANDLE
+    k32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    k32.OpenProcess.restype = wintypes.HANDLE
+    k32.AssignProcessToJobObject.argtypes = [wintypes.HANDLE, wintypes.HANDLE]
+    k32.AssignProcessToJobObject.restype = wintypes.BOOL
+    k32.QueryInformationJobObject.argtypes = [wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, wintypes.DWORD, ctypes.c_void_p]
+    k32.QueryInformationJobObject.restype = wintypes.BOOL
+    k32.CloseHandle.argtypes = [wintypes.HANDLE]
+    k32.CloseHandle.restype = wintypes.BOOL
+    k32.GetCurrentThread.restype = wintypes.HANDLE
+    k32.GetCurrentProcess.restype = wintypes.HANDLE
+    filetime_p = ctypes.POINTER(wintypes.FILETIME)
+    k32.GetThreadTimes.argtypes = [wintypes.HANDLE, filetime_p, filetime_p, filetime_p, filetime_p]
+    k32.GetThreadTimes.restype = wintypes.BOOL
+    k32.K32GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD]
+    k32.K32GetProcessMemoryInfo.restype = wintypes.BOOL
+
+    _win_api = SimpleNamespace(
+        ctypes=ctypes,
+        wintypes=wintypes,
+        k32=k32,
+        BASIC_AND_IO_ACCOUNTING=BASIC_AND_IO_ACCOUNTING,
+        EXTENDED_LIMIT=EXTENDED_LIMIT,
+        PROCESS_MEMORY_COUNTERS=PROCESS_MEMORY_COUNTERS,
+    )
+    return _win_api
+
+
+_JOB_BASIC_AND_IO_ACCOUNTING = 8
+_JOB_EXTENDED_LIMIT = 9
+_PROCESS_SET_QUOTA_AND_TERMINATE = 0x0100 | 0x0001
+
+
+def _win_job_for(pid: int) -> int | None:
+    try:
+        api = _win()
+        job = api.k32.CreateJobObjectW(None, None)
+        if not job:
+            return None
+        proc = api.k32.OpenProcess(_PROCESS_SET_QUOTA_AND_TERMINATE, False, pid)
+        ok = bool(proc) and bool(api.k32.AssignProcessToJobObject(job, proc))
+        if proc:
+            api.k32.CloseHandle(proc)
+        if not ok:
+            api.k32.CloseHandle(job)
+            return None
+        return job
+    except (OSError, AttributeError):
+        return None
+
+
+def _win_job_usage(job: int) -> dict[str, Any]:
+    api = _win()
+    ctypes = api.ctypes
+    acct = api.BASIC_AND_IO_ACCOUNTING()
+    ext = api.EXTENDED_LIMIT()
+    out: dict[str, Any] = {}
+    if api.k32.QueryInformationJobObject(job, _JOB_BASIC_AND_IO_ACCOUNTING, ctypes.byref(acct), ctypes.sizeof(acct), None):
+        out["cpu_user_sec"] = _round(acct.BasicInfo.TotalUserTime / 1e7)
+        out["cpu_sys_sec"] = _round(acct.BasicInfo.TotalKernelTime / 1e7)
+        out["read_bytes"] = int(acct.IoInfo.ReadTransferCount)
+        out["write_bytes"] = int(acct.IoInfo.WriteTransferCount)
+        out["processes"] = int(acct.BasicInfo.TotalProcesses)
+    if api.k32.QueryInformationJobObject(job, _JOB_EXTENDED_LIMIT, ctypes.byref(ext), ctypes.sizeof(ext), None):
+        out["peak_rss_bytes"] = int(ext.PeakJobMemoryUsed)
+    api.k32.CloseHandle(job)
+    return out
+
+
+def _filetime_sec(ft: Any) -> float:
+    return ((ft.dwHighDateTime << 32) | ft.dwLowDateTime) / 1e7
+
+
+# --- current thread / process
+
+
+def _thread_usage() -> dict[str, float | int | None]:
+    if resource is not None and hasattr(resource, "RUSAGE_THREAD"):
+        ru = resource.getrusage(resource.RUSAGE_THREAD)
+        return {
+            "cpu_user_sec": ru.ru_utime,
+            "cpu_sys_sec": ru.ru_stime,
+            "read_bytes": ru.ru_inblock * BLOCK_BYTES,
+            "write_bytes": ru.ru_oublock * BLOCK_BYTES,
+        }
+    if os.name == "nt":
+        try:
+            api = _win()
+            ft = [api.wintypes.FILETIME() for _ in range(4)]
+            if api.k32.GetThreadTimes(api.k32.GetCurrentThread(), *(api.ctypes.byref(f) for f in ft)):
+                return {"cpu_user_sec": _filetime_sec(ft[3]), "cpu_sys_sec": _filetime_sec(ft[2]), "read_bytes": None, "write_bytes": None}
+        except (OSError, AttributeError):
+            pass
+    return {"cpu_user_sec": time.thread_time(), "cpu_sys_sec": None, "read_bytes": None, "write_bytes": None}
+
+
+def _self_peak_rss() -> int | None:
+    if resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(maxrss if sys.platform == "darwin" else maxrss * 1024)
+    if os.name == "nt":
+        try:
+            api = _win()
+            pmc = api.PROCESS_MEMORY_COUNTERS()
+            pmc.cb = api.ctypes.sizeof(pmc)
+            if api.k32.K32GetProcessMemoryInfo(api.k32.GetCurrentProcess(), api.ctypes.byref(pmc), pmc.cb):
+                return int(pmc.PeakWorkingSetSize)
+        except (OSError, AttributeError):
+            pass
+    return None
+
+
+# --- meters
+
+
+class ProcessMeter:
+    """Wraps a freshly started Popen: wait() reaps it (keeping its rusage), finish() returns its metrics."""
+
+    def __init__(self, proc: subprocess.Popen[Any]) -> None:
+        self.proc = proc
+        self.t0 = time.monotonic()
+        self.usage: dict[str, Any] = {}
+        self._job = _win_job_for(proc.pid) if os.name == "nt" else None
+
+    def wait(self, timeout: float | None = None) -> int:
+        """Same contract as Popen.wait (raises subprocess.TimeoutExpired)."""
+        if not hasattr(os, "wait4"):
+            return self.proc.wait(timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = 0.0005
+        while self.proc.returncode is None:
+            try:
+                pid, status, ru = os.wait4(self.proc.pid, 0 if deadline is None else os.WNOHANG)
+            except ChildProcessError:
+                return self.proc.wait()  # already reaped elsewhere; no usage for this one
+            if pid:
+                self.proc.returncode = os.waitstatus_to_exitcode(status)
+                self.usage = {
+                    "cpu_user_sec": _round(ru.ru_utime),
+                    "cpu_sys_sec": _round(ru.ru_stime),
+                    "peak_rss_bytes": int(ru.ru_maxrss if sys.platform == "darwin" else ru.ru_maxrss * 1024),
+                    "read_bytes": ru.ru_inblock * BLOCK_BYTES,
+                    "write_bytes": ru.ru_oublock * BLOCK_BYTES,
+                }
+                break
+            assert deadline is not None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self.proc.args, timeout)  # type: ignore[arg-type]
+            delay = min(delay * 2, remaining, 0.05)
+            time.sleep(delay)
+        return self.proc.returncode
+
+    def finish(self) -> dict[str, Any]:
+        """Call once after the process was reaped; also feeds every ResourceMeter active on this thread."""
+        metrics: dict[str, Any] = {k: None for k in METRIC_KEYS}
+        metrics.update(wall_sec=_round(time.monotonic() - self.t0), processes=1, **self.usage)
+        if self._job is not None:
+            try:
+                metrics.update(_win_job_usage(self._job))
+            except (OSError, AttributeError):
+                pass
+            self._job = None
+        for meter in _active():
+            meter.add_child(metrics)
+        return metrics
+
+
+class ResourceMeter:
+    """
+    with ResourceMeter() as meter: ...   ->   meter.metrics (dict with METRIC_KEYS)
+
+    Covers in-process work of the current thread plus every child process it ran.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, Any] | None = None
+        self._children: list[dict[str, Any]] = []
+
+    def __enter__(self) -> ResourceMeter:
+        self._t0 = time.monotonic()
+        self._own0 = _thread_usage()
+        _active().append(self)
+        return self
+
+    def add_child(self, metrics: dict[str, Any]) -> None:
+        self._children.append(metrics)
+
+    def __exit__(self, *exc: Any) -> bool:
+        meters = _active()
+        if self in meters:
+            meters.remove(self)
+        own1 = _thread_usage()
+        own = {k: (None if own1[k] is None or self._own0[k] is None else own1[k] - self._own0[k]) for k in own1}  # type: ignore[operator]
+        kids = self._children
+        self.metrics = {
+            "wall_sec": _round(time.monotonic() - self._t0),
+            "cpu_user_sec": _round(_sum([own["cpu_user_sec"]] + [c.get("cpu_user_sec") for c in kids])),
+            "cpu_sys_sec": _round(_sum([own["cpu_sys_sec"]] + [c.get("cpu_sys_sec") for c in kids])),
+            "peak_rss_bytes": max((c["peak_rss_bytes"] for c in kids if c.get("peak_rss_bytes") is not None), default=None)
+            if kids
+            else _self_peak_rss(),
+            "read_bytes": _sum([own["read_bytes"]] + [c.get("read_bytes") for c in kids]),
+            "write_bytes": _sum([own["write_bytes"]] + [c.get("write_bytes") for c in kids]),
+            "processes": sum(int(c.get("processes") or 0) for c in kids),
+        }
+        return False
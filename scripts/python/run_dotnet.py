@@ -9,6 +9,23 @@ Env thresholds (optional):
 
 Usage (Windows):
   py -3 scripts/python/run_dotnet.py --solution Game.sln --configuration Debug
+  py -3 scripts/python/run_dotnet.py --filter "FullyQualifiedName~Game.Core.Tests.State.GameStateManagerTests."
+
+With --filter (test impact selection) coverage thresholds are not enforced: coverage of a
+partial run says nothing about the suite.
+
+With --shards N (0 = one per core, max 8) test classes of the built solution run in
+N parallel `dotnet test --no-build` processes, balanced by historical class durations
+(logs/unit/.test-durations.json). Shard TRX/cobertura files under <out>/shards/ are merged into
+tests.trx / coverage.cobertura.xml, so thresholds and downstream readers are unchanged.
+Branch counts are merged exactly from the shards' coverlet JSON reports; when a shard wrote
+none, the merged branch rate is only a lower bound (summary coverage.branch_pct_lower_bound)
+and, with COVERAGE_BRANCHES_MIN set, the tests are re-run unsharded (summary
+shard_fallback=branch_threshold). See scripts/python/dotnet_shard_lib.py.
+
+Restore and build are explicit steps (tests always run with --no-build) and are skipped while
+their input-hash stamps match (summary restore_cache_hit / build_cache_hit; see
+scripts/python/build_cache_lib.py, SC_BUILD_CACHE=0 forces both).
 """
 import argparse
 import datetime as dt
@@ -17,21 +34,26 @@ import json
 import os
 import re
 import shutil
-import subprocess
 import sys
+import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+from artifact_catalog_lib import KIND_COBERTURA, KIND_TRX, KIND_UNIT_SUMMARY, register_artifact
+from build_cache_lib import dotnet_stamp
+from dotnet_shard_lib import (DURATIONS_FILE, estimate_seconds, load_durations, merge_cobertura,
+                              merge_coverlet_branches, merge_trx, parse_list_tests, plan_shards, shard_filter,
+                              update_durations)
+from stream_run_lib import DEFAULT_TAIL_LINES, LineMatcher, run_streaming
+from test_impact_lib import build_graph
 
-def run_cmd(args, cwd=None, timeout=900_000):
-    p = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                         text=True, encoding='utf-8', errors='ignore')
-    try:
-        out, _ = p.communicate(timeout=timeout/1000.0)
-    except subprocess.TimeoutExpired:
-        p.kill()
-        out, _ = p.communicate()
-        return 124, out
-    return p.returncode, out
+
+def run_cmd(args, cwd=None, timeout=900_000, log_path=None, matchers=()):
+    """With log_path the output streams into that file and only its tail is returned."""
+    res = run_streaming(args, cwd=cwd, timeout_sec=timeout/1000.0, log_path=log_path, matchers=matchers,
+                        tail_lines=DEFAULT_TAIL_LINES if log_path else None)
+    return res.rc, res.tail
 
 
 def ensure_dir(path):
@@ -83,46 +105,8 @@ def pick_latest_existing(paths):
     return max(existing, key=lambda p: os.path.getmtime(p))
 
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument('--solution', default='Game.sln')
-    ap.add_argument('--configuration', default='Debug')
-    ap.add_argument('--out-dir', default=None)
-    args = ap.parse_args()
-
-    root = os.getcwd()
-    date = dt.date.today().strftime('%Y-%m-%d')
-    out_dir = args.out_dir or os.path.join(root, 'logs', 'unit', date)
-    ensure_dir(out_dir)
-
-    summary = {
-        'solution': args.solution,
-        'configuration': args.configuration,
-        'out_dir': out_dir,
-        'status': 'fail',
-    }
-
-    # Restore
-    rc, out = run_cmd(['dotnet', 'restore', args.solution], cwd=root)
-    with io.open(os.path.join(out_dir, 'dotnet-restore.log'), 'w', encoding='utf-8') as f:
-        f.write(out)
-    summary['restore_rc'] = rc
-    if rc != 0:
-        with io.open(os.path.join(out_dir, 'summary.json'), 'w', encoding='utf-8') as f:
-            json.dump(summary, f, ensure_ascii=False, indent=2)
-        print(f'RUN_DOTNET status=fail stage=restore out={out_dir}')
-        return 1
-
-    # Test with coverage
-    rc, out = run_cmd(['dotnet', 'test', args.solution,
-                       f'-c', args.configuration,
-                       '--collect:XPlat Code Coverage',
-                       '--logger', 'trx;LogFileName=tests.trx'], cwd=root)
-    with io.open(os.path.join(out_dir, 'dotnet-test-output.txt'), 'w', encoding='utf-8') as f:
-        f.write(out)
-    summary['test_rc'] = rc
-
-    # Copy artifacts using paths emitted by dotnet test output (preferred).
+def copy_single_run_artifacts(root, out_dir, out, summary):
+    """Copy TRX/cobertura of a single `dotnet test` run into out_dir, preferring paths it printed."""
     artifacts = parse_paths_from_test_output(out)
     summary['artifacts_detected'] = artifacts
 
@@ -164,17 +148,209 @@ def main():
         except Exception:
             pass
 
+
+def run_stamped(stamp, cmd, cwd, log_path):
+    """Run cmd unless its build stamp matches. Returns (rc, cache_hit); the stamp is refreshed on success."""
+    if stamp.hit():
+        with io.open(log_path, 'w', encoding='utf-8') as f:
+            f.write(f'SC_BUILD_CACHE hit: inputs unchanged since {stamp.path}; skipped: {" ".join(cmd)}\n')
+        return 0, True
+    stamp.invalidate()
+    rc, _ = run_cmd(cmd, cwd=cwd, log_path=log_path)
+    if rc == 0:
+        stamp.record()
+    return rc, False
+
+
+def find_files(root_dir, predicate):
+    found = []
+    for cur_root, _, files in os.walk(root_dir):
+        for name in files:
+            if predicate(name):
+                found.append(os.path.join(cur_root, name))
+    return sorted(found)
+
+
+def run_sharded(args, root, out_dir, summary, test_log):
+    """
+    Run test-class shards of the already built solution in parallel and merge their artifacts into out_dir.
+
+    Returns the worst shard rc, or None when no test classes could be enumerated (caller falls
+    back to the single-process run). Shard consoles stream to shards/shard-<i>/dotnet-test-output.txt
+    and are concatenated into test_log.
+    """
+    _, listing = run_cmd(['dotnet', 'test', args.solution, '-c', args.configuration, '--no-build', '--list-tests'], cwd=root)
+    classes = parse_list_tests(listing)
+    if not classes:
+        classes = build_graph(Path(root)).dotnet_test_classes()
+    if not classes:
+        return None
+
+    durations = load_durations(Path(root) / 'logs' / 'unit' / DURATIONS_FILE)
+    plan = plan_shards(classes, durations, args.shards)
+    shards_dir = os.path.join(out_dir, 'shards')
+    # Shard results are collected by walking shards_dir: drop leftovers of earlier runs into this out_dir
+    # (coverlet <guid>/ folders, shard-N.trx of runs with more shards).
+    shutil.rmtree(shards_dir, ignore_errors=True)
+
+    def run_shard(index, members):
+        shard_dir = os.path.join(shards_dir, f'shard-{index}')
+        ensure_dir(shard_dir)
+        cmd = ['dotnet', 'test', args.solution, '-c', args.configuration, '--no-build',
+               '--collect:XPlat Code Coverage',
+               '--results-directory', shard_dir,
+               '--logger', f'trx;LogFileName=shard-{index}.trx',
+               '--filter', shard_filter(members),
+               # coverlet JSON keeps per-branch hits, so branch coverage can be merged exactly.
+               '--', 'DataCollectionRunSettings.DataCollectors.DataCollector.Configuration.Format=json,cobertura']
+        t0 = time.monotonic()
+        log_path = os.path.join(shard_dir, 'dotnet-test-output.txt')
+        shard_rc, _ = run_cmd(cmd, cwd=root, log_path=log_path)
+        return {
+            'index': index,
+            'classes': len(members),
+            'rc': shard_rc,
+            'seconds': round(time.monotonic() - t0, 2),
+            'estimate_seconds': estimate_seconds(members, durations),
+            'log': log_path,
+        }
+
+    with ThreadPoolExecutor(max_workers=len(plan)) as pool:
+        results = list(pool.map(lambda item: run_shard(*item), enumerate(plan)))
+
+    summary['shards'] = results
+    trx_paths = find_files(shards_dir, lambda n: n.lower().endswith('.trx'))
+    cov_paths = find_files(shards_dir, lambda n: n == 'coverage.cobertura.xml')
+    if trx_paths:
+        try:
+            merge_trx([Path(p) for p in trx_paths], Path(out_dir) / 'tests.trx')
+        except (OSError, ET.ParseError) as e:
+            summary.setdefault('merge_errors', []).append(f'tests.trx: {e}')
+    if cov_paths:
+        # Every cobertura needs its coverage.json sibling for an exact branch merge.
+        json_paths = [Path(p).with_name('coverage.json') for p in cov_paths]
+        try:
+            branches = merge_coverlet_branches(json_paths) if all(p.is_file() for p in json_paths) else None
+        except (OSError, ValueError, AttributeError) as e:
+            summary.setdefault('merge_errors', []).append(f'coverage.json: {e}')
+            branches = None
+        try:
+            exact = merge_cobertura([Path(p) for p in cov_paths], Path(out_dir) / 'coverage.cobertura.xml', branches=branches)
+            summary['branch_merge'] = 'exact' if exact else 'lower_bound'
+        except (OSError, ET.ParseError) as e:
+            summary.setdefault('merge_errors', []).append(f'coverage.cobertura.xml: {e}')
+    with io.open(test_log, 'w', encoding='utf-8') as f:
+        for r in results:
+            f.write(f"===== shard {r['index']} =====\n")
+            try:
+                with io.open(r['log'], 'r', encoding='utf-8', errors='ignore') as src:
+                    shutil.copyfileobj(src, f)
+            except OSError:
+                pass
+    return max(r['rc'] for r in results)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--solution', default='Game.sln')
+    ap.add_argument('--configuration', default='Debug')
+    ap.add_argument('--out-dir', default=None)
+    ap.add_argument('--filter', default=None, help='dotnet test --filter expression (e.g. from scripts/python/test_impact.py)')
+    ap.add_argument('--shards', type=int, default=1, help='parallel test-class shards (0 = auto: one per core, max 8; ignored with --filter)')
+    args = ap.parse_args()
+    if args.shards <= 0:
+        args.shards = min(os.cpu_count() or 1, 8)
+
+    root = os.getcwd()
+    date = dt.date.today().strftime('%Y-%m-%d')
+    out_dir = args.out_dir or os.path.join(root, 'logs', 'unit', date)
+    ensure_dir(out_dir)
+
+    summary = {
+        'solution': args.solution,
+        'configuration': args.configuration,
+        'out_dir': out_dir,
+        'status': 'fail',
+    }
+
+    # Restore, then build once; both are skipped while their input-hash stamps match
+    solution = os.path.join(root, args.solution)
+    steps = (
+        ('restore', dotnet_stamp(solution, 'restore'), ['dotnet', 'restore', args.solution]),
+        ('build', dotnet_stamp(solution, 'build', configuration=args.configuration),
+         ['dotnet', 'build', args.solution, '-c', args.configuration, '--no-restore']),
+    )
+    for stage, stamp, cmd in steps:
+        rc, hit = run_stamped(stamp, cmd, root, os.path.join(out_dir, f'dotnet-{stage}.log'))
+        summary[f'{stage}_rc'] = rc
+        summary[f'{stage}_cache_hit'] = hit
+        if rc != 0:
+            with io.open(os.path.join(out_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            print(f'RUN_DOTNET status=fail stage={stage} out={out_dir}')
+            return 1
+
+    # Test with coverage (sharded: artifacts are merged straight into out_dir)
+    test_log = os.path.join(out_dir, 'dotnet-test-output.txt')
+    for name in ('tests.trx', 'coverage.cobertura.xml'):
+        # A run that produces no artifact must not report the previous run's one.
+        if os.path.exists(os.path.join(out_dir, name)):
+            os.remove(os.path.join(out_dir, name))
+    sharded = None
+    if args.shards > 1 and not args.filter:
+        sharded = run_sharded(args, root, out_dir, summary, test_log)
+    if sharded is not None and os.environ.get('COVERAGE_BRANCHES_MIN') and summary.get('branch_merge') != 'exact':
+        # A lower-bound branch rate cannot be held against the branch gate: measure it unsharded.
+        print(f"RUN_DOTNET shards merged branch coverage as {summary.get('branch_merge', 'missing')} "
+              f"(no coverlet JSON); COVERAGE_BRANCHES_MIN is set, re-running tests unsharded")
+        summary['shard_fallback'] = 'branch_threshold'
+        sharded = None
+        for name in ('tests.trx', 'coverage.cobertura.xml'):
+            if os.path.exists(os.path.join(out_dir, name)):
+                os.remove(os.path.join(out_dir, name))
+    if sharded is not None:
+        rc = sharded
+    else:
+        test_cmd = ['dotnet', 'test', args.solution,
+                    f'-c', args.configuration, '--no-build',
+                    '--collect:XPlat Code Coverage',
+                    '--logger', 'trx;LogFileName=tests.trx']
+        if args.filter:
+            test_cmd += ['--filter', args.filter]
+            summary['filter'] = args.filter
+        # The console streams to test_log; only the lines naming TRX/cobertura files are kept.
+        artifact_lines = LineMatcher(r'[A-Za-z]:\\[^\r\n]*?(\.trx|coverage\.cobertura\.xml)', name='artifacts', regex=True)
+        rc, _ = run_cmd(test_cmd, cwd=root, log_path=test_log, matchers=[artifact_lines])
+    summary['test_rc'] = rc
+
+    if sharded is not None:
+        merged = {name: os.path.join(out_dir, name) for name in ('tests.trx', 'coverage.cobertura.xml')}
+        summary['artifacts_selected'] = {
+            'trx': merged['tests.trx'] if os.path.exists(merged['tests.trx']) else None,
+            'coverage': merged['coverage.cobertura.xml'] if os.path.exists(merged['coverage.cobertura.xml']) else None,
+        }
+    else:
+        copy_single_run_artifacts(root, out_dir, '\n'.join(artifact_lines.hits), summary)
+
+    # Class durations feed the next sharded run's balancing.
+    if os.path.exists(os.path.join(out_dir, 'tests.trx')):
+        update_durations(Path(root) / 'logs' / 'unit' / DURATIONS_FILE, Path(out_dir) / 'tests.trx')
+
     coverage = None
     cov_path = os.path.join(out_dir, 'coverage.cobertura.xml')
     if os.path.exists(cov_path):
         coverage = parse_cobertura(cov_path)
+        if coverage and sharded is not None:
+            coverage['branch_pct_lower_bound'] = summary.get('branch_merge') != 'exact'
         summary['coverage'] = coverage
 
     # Thresholds (optional)
     lines_min = os.environ.get('COVERAGE_LINES_MIN')
     branches_min = os.environ.get('COVERAGE_BRANCHES_MIN')
     threshold_ok = True
-    if coverage and (lines_min or branches_min):
+    if args.filter:
+        summary['threshold_skipped'] = 'filtered_run'
+    elif coverage and (lines_min or branches_min):
         try:
             if lines_min:
                 threshold_ok = threshold_ok and (coverage.get('line_pct', 0) >= float(lines_min))
@@ -188,6 +364,12 @@ def main():
     with io.open(os.path.join(out_dir, 'summary.json'), 'w', encoding='utf-8') as f:
         json.dump(summary, f, ensure_ascii=False, indent=2)
 
+    # Catalog entries carry SC_RUN_ID / SC_TASK_ID from the caller (sc-test).
+    register_artifact(KIND_UNIT_SUMMARY, Path(out_dir) / 'summary.json', step='unit')
+    for kind, name in ((KIND_TRX, 'tests.trx'), (KIND_COBERTURA, 'coverage.cobertura.xml')):
+        if os.path.exists(os.path.join(out_dir, name)):
+            register_artifact(kind, Path(out_dir) / name, step='unit')
+
     print(f"RUN_DOTNET status={summary['status']} line={coverage.get('line_pct', 'n/a') if coverage else 'n/a'}% branch={coverage.get('branch_pct','n/a') if coverage else 'n/a'} out={out_dir}")
     if summary['status'] == 'ok':
         return 0
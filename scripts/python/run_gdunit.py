@@ -8,69 +8,62 @@ Usage:
     --project Tests.Godot \
     --add tests/Adapters --add tests/OtherSuite \
     --timeout-sec 300
+
+With --shards N (0 = one per core, max 8) the suites under --add are split across N headless
+Godot instances running in parallel, each with its own user:// and AUDIT_LOG_ROOT; a shard that
+crashes during startup is retried (--shard-retries). Shard results.xml files are merged into
+<rd>/report_1/results.xml and the shard HTML reports are kept under <rd>/shards/.
+See scripts/python/gdunit_shard_lib.py.
+
+Unsharded runs are dispatched to a warm headless worker when one is registered for the project
+(scripts/python/godot_worker.py): no prewarm and no engine boot; break markers in the console
+slice still fail the run. Without a usable worker the cold launch below is used.
+
+--prewarm is skipped (run-summary prewarm_cache_hit) while the project's input-hash build stamp
+matches (scripts/python/build_cache_lib.py); a successful prewarm or dotnet fallback refreshes it.
 """
 import argparse
 import datetime as dt
 import os
 import shutil
-import subprocess
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+from artifact_catalog_lib import KIND_GDUNIT_REPORT_DIR, KIND_GDUNIT_RESULTS_XML, register_artifact
+from build_cache_lib import godot_stamp
+from godot_worker_lib import WorkerError, WorkerTimeout, connect
+from gdunit_shard_lib import (DURATIONS_FILE, SHARD_REPORTS_RES, expand_suites, find_results_xml, is_startup_crash,
+                              load_durations, merge_audit_logs, merge_junit, plan_shards, shard_env, update_durations,
+                              write_index_html)
+from log_tail_lib import contains_any
+from stream_run_lib import DEFAULT_TAIL_LINES, LineMatcher, run_streaming
 
-def run_cmd(args, cwd=None, timeout=600_000):
-    p = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                         text=True, encoding='utf-8', errors='ignore')
-    try:
-        out, _ = p.communicate(timeout=timeout/1000.0)
-    except subprocess.TimeoutExpired:
-        p.kill()
-        out, _ = p.communicate()
-        return 124, out
-    return p.returncode, out
+BREAK_MARKERS = [
+    'Debugger Break',
+    'Parser Error',
+    'SCRIPT ERROR',
+]
+
+
+def run_cmd(args, cwd=None, timeout=600_000, env=None, log_path=None, append=False):
+    """With log_path the output streams into that file and only its tail is returned."""
+    res = run_streaming(args, cwd=cwd, env=env, timeout_sec=timeout/1000.0, log_path=log_path, append=append,
+                        tail_lines=DEFAULT_TAIL_LINES if log_path else None)
+    return res.rc, res.tail
 
 
-def run_cmd_failfast(args, cwd=None, timeout=600_000, break_markers=None):
+def run_cmd_failfast(args, cwd=None, timeout=600_000, break_markers=None, log_path=None, env=None):
     """Run a process and stream stdout; if any line contains a break marker, kill early and return rc=1.
     This avoids long timeouts when Godot enters Debugger Break state.
+    With log_path, lines are written to that file as they arrive (only the tail is returned);
+    otherwise the full output is returned.
     """
-    break_markers = break_markers or [
-        'Debugger Break',
-        'Parser Error',
-        'SCRIPT ERROR',
-    ]
-    p = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                         text=True, encoding='utf-8', errors='ignore')
-    buf_lines = []
-    hit_break = False
-    try:
-        # Poll line-by-line up to timeout
-        end_ts = dt.datetime.now().timestamp() + (timeout/1000.0)
-        while True:
-            line = p.stdout.readline()
-            if line:
-                buf_lines.append(line)
-                low = line.lower()
-                if any(m.lower() in low for m in break_markers):
-                    hit_break = True
-                    p.kill()
-                    break
-            else:
-                if p.poll() is not None:
-                    break
-            if dt.datetime.now().timestamp() > end_ts:
-                p.kill()
-                return 124, ''.join(buf_lines)
-        out = ''.join(buf_lines)
-        if hit_break:
-            return 1, out
-        return (p.returncode or 0), out
-    except Exception:
-        try:
-            p.kill()
-        except Exception:
-            pass
-        return 1, ''.join(buf_lines)
+    stop = [LineMatcher(m, stop=True) for m in (break_markers or BREAK_MARKERS)]
+    res = run_streaming(args, cwd=cwd, env=env, timeout_sec=timeout/1000.0, log_path=log_path, matchers=stop,
+                        tail_lines=DEFAULT_TAIL_LINES if log_path else None)
+    return res.rc, res.tail
 
 
 def write_text(path: str, content: str) -> None:
@@ -79,6 +72,105 @@ def write_text(path: str, content: str) -> None:
         f.write(content)
 
 
+def gdunit_options(add_paths):
+    """GdUnitCmdTool.gd options (also what the warm worker's runner is given)."""
+    opts = ['--ignoreHeadlessMode']
+    for a in add_paths:
+        opts += ['-a', a]
+    return opts
+
+
+def gdunit_cmd(godot_bin, proj, add_paths):
+    return [godot_bin, '--headless', '--path', proj, '-s', '-d', 'res://addons/gdUnit4/bin/GdUnitCmdTool.gd'] + gdunit_options(add_paths)
+
+
+def run_sharded(args, root, proj, out_dir, dest, add_paths):
+    """
+    Run suite shards in parallel headless Godot instances and merge their reports into dest.
+
+    Returns (rc, shard summaries); rc is the first non-zero shard rc (0 when all passed).
+    """
+    durations_path = Path(root) / 'logs' / 'e2e' / DURATIONS_FILE
+    durations = load_durations(durations_path)
+    plan = plan_shards(expand_suites(Path(proj), add_paths), durations, args.shards)
+    work_root = Path(out_dir) / 'gdunit-shards'
+    reports_root = Path(proj) / SHARD_REPORTS_RES[len('res://'):]
+    shutil.rmtree(work_root, ignore_errors=True)
+    shutil.rmtree(reports_root, ignore_errors=True)
+    base_env = dict(os.environ)
+
+    def run_shard(index, suites):
+        work_dir = work_root / f'shard-{index}'
+        report_res = f'{SHARD_REPORTS_RES}/shard-{index}'
+        report_dir = reports_root / f'shard-{index}'
+        console = work_dir / 'gdunit-console.txt'
+        env = shard_env(base_env, work_dir)
+        cmd = gdunit_cmd(args.godot_bin, proj, suites) + ['-rd', report_res]
+        t0 = time.monotonic()
+        attempts = 0
+        while True:
+            attempts += 1
+            shutil.rmtree(report_dir, ignore_errors=True)
+            rc, _ = run_cmd_failfast(cmd, cwd=proj, timeout=args.timeout_sec*1000, log_path=str(console), env=env)
+            results = find_results_xml(report_dir)
+            hit_break = bool(contains_any(console, BREAK_MARKERS))
+            if attempts > args.shard_retries or not is_startup_crash(rc, results, hit_break):
+                break
+            shutil.copyfile(console, work_dir / f'gdunit-console.attempt{attempts}.txt')
+            time.sleep(3)
+        run_cmd([args.godot_bin, '--headless', '--path', proj, '--quiet', '-s', 'res://addons/gdUnit4/bin/GdUnitCopyLog.gd',
+                 '-rd', report_res], cwd=proj, env=env)
+        return {
+            'index': index,
+            'suites': len(suites),
+            'rc': rc,
+            'attempts': attempts,
+            'seconds': round(time.monotonic() - t0, 2),
+            'results_xml': str(results) if results else None,
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, len(plan))) as pool:
+        shards = list(pool.map(lambda item: run_shard(*item), enumerate(plan)))
+
+    if os.path.isdir(dest):
+        shutil.rmtree(dest, ignore_errors=True)
+    os.makedirs(dest, exist_ok=True)
+    consoles = []
+    for s in shards:
+        k = s['index']
+        shard_dest = Path(dest) / 'shards' / f'shard-{k}'
+        if (reports_root / f'shard-{k}').is_dir():
+            shutil.copytree(reports_root / f'shard-{k}', shard_dest, dirs_exist_ok=True)
+        shard_dest.mkdir(parents=True, exist_ok=True)
+        console = work_root / f'shard-{k}' / 'gdunit-console.txt'
+        if console.is_file():
+            shutil.copy2(console, shard_dest / 'gdunit-console.txt')
+            consoles.append(f'===== shard {k} rc={s["rc"]} attempts={s["attempts"]} =====\n' + console.read_text(encoding='utf-8', errors='ignore'))
+        if s['results_xml']:
+            s['results_xml'] = str(shard_dest / Path(s['results_xml']).relative_to(reports_root / f'shard-{k}'))
+        html = sorted(shard_dest.rglob('index.html'))
+        s['report_html'] = os.path.relpath(html[0], Path(dest) / 'report_1').replace(os.sep, '/') if html else None
+    shutil.rmtree(reports_root, ignore_errors=True)
+    write_text(os.path.join(out_dir, 'gdunit-console.txt'), '\n'.join(consoles))
+    shutil.copy2(os.path.join(out_dir, 'gdunit-console.txt'), os.path.join(dest, 'gdunit-console.txt'))
+
+    xmls = [Path(s['results_xml']) for s in shards if s['results_xml']]
+    if xmls:
+        merged = Path(dest) / 'report_1' / 'results.xml'
+        merge_junit(xmls, merged)
+        update_durations(durations_path, merged)
+    write_index_html(Path(dest) / 'report_1' / 'index.html', shards)
+
+    audit_root = base_env.get('AUDIT_LOG_ROOT')
+    if audit_root:
+        merge_audit_logs([work_root / f'shard-{s["index"]}' for s in shards], Path(audit_root))
+
+    rc = next((s['rc'] for s in shards if s['rc'] != 0), 0)
+    if rc == 0 and len(xmls) < len(shards):
+        rc = 1
+    return rc, shards
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--godot-bin', required=True)
@@ -87,7 +179,11 @@ def main():
     ap.add_argument('--timeout-sec', type=int, default=600, help='Timeout seconds for test run (default 600)')
     ap.add_argument('--prewarm', action='store_true', help='Prewarm: build solutions before running tests')
     ap.add_argument('--rd', dest='report_dir', default=None, help='Custom destination to copy reports into (defaults to logs/e2e/<date>/gdunit-reports)')
+    ap.add_argument('--shards', type=int, default=1, help='Parallel headless Godot instances, suites split across them (0 = auto: one per core, max 8)')
+    ap.add_argument('--shard-retries', type=int, default=1, help='Retries for a shard that crashed during startup (default 1)')
     args = ap.parse_args()
+    if args.shards <= 0:
+        args.shards = min(os.cpu_count() or 1, 8)
 
     root = os.getcwd()
     proj = os.path.abspath(args.project)
@@ -95,31 +191,36 @@ def main():
     out_dir = os.path.join(root, 'logs', 'e2e', date)
     os.makedirs(out_dir, exist_ok=True)
 
-    # Optional prewarm with fallback
+    # Warm worker (unsharded only): assemblies are already built and loaded, skip the prewarm
+    worker = connect(args.godot_bin, proj) if args.shards <= 1 and args.add else None
+
+    # Optional prewarm with fallback; skipped while no C# input changed since the last successful one
     prewarm_rc = None
     prewarm_note = None
-    if args.prewarm:
+    prewarm_cache_hit = None
+    if args.prewarm and worker is None:
+        stamp = godot_stamp(args.godot_bin, proj)
+        prewarm_cache_hit = stamp.hit()
+    if prewarm_cache_hit is False:
+        stamp.invalidate()
         pre_cmd = [args.godot_bin, '--headless', '--path', proj, '--build-solutions', '--quit']
-        _rcp, _outp = run_cmd(pre_cmd, cwd=proj, timeout=300_000)
+        prewarm_log = os.path.join(out_dir, 'prewarm-godot.txt')
+        _rcp, _ = run_cmd(pre_cmd, cwd=proj, timeout=300_000, log_path=prewarm_log)
         prewarm_attempts = 1
         prewarm_rc = _rcp
-        # Write first attempt
-        write_text(os.path.join(out_dir, 'prewarm-godot.txt'), _outp)
         if _rcp != 0:
-            # Wait and retry once to mitigate transient C# load issues
+            # Wait and retry once to mitigate transient C# load issues; the retry streams into the same file
             time.sleep(3)
-            _rcp2, _outp2 = run_cmd(pre_cmd, cwd=proj, timeout=360_000)
+            with open(prewarm_log, 'a', encoding='utf-8') as f:
+                f.write("\n=== retry ===\n")
+            _rcp2, _ = run_cmd(pre_cmd, cwd=proj, timeout=360_000, log_path=prewarm_log, append=True)
             prewarm_attempts = 2
             prewarm_rc = _rcp2
-            # Append retry log to same file
-            try:
-                with open(os.path.join(out_dir, 'prewarm-godot.txt'), 'a', encoding='utf-8') as f:
-                    f.write("\n=== retry rc=%d ===\n" % _rcp2)
-                    f.write(_outp2)
-            except Exception:
-                pass
+            with open(prewarm_log, 'a', encoding='utf-8') as f:
+                f.write("=== retry rc=%d ===\n" % _rcp2)
             if _rcp2 == 0:
                 prewarm_note = 'retry-ok'
+                stamp.record()
             else:
                 # Fallback to dotnet build to avoid editor plugin failures
                 dotnet_projects = []
@@ -130,56 +231,86 @@ def main():
                 sln = os.path.join(root, 'GodotGame.sln')
                 # Prefer project build; if solution exists, add as secondary
                 build_logs = []
+                dotnet_log = os.path.join(out_dir, 'prewarm-dotnet.txt')
+                write_text(dotnet_log, '')
                 for item in (dotnet_projects or [sln] if os.path.isfile(sln) else []):
-                    rc_b, out_b = run_cmd(['dotnet', 'build', item, '-c', 'Debug', '-v', 'minimal'], cwd=root, timeout=600_000)
-                    build_logs.append((item, rc_b, out_b))
-                # Persist build logs
-                agg = []
-                for item, rc_b, out_b in build_logs:
-                    agg.append(f'=== {item} rc={rc_b} ===\n{out_b}\n')
-                write_text(os.path.join(out_dir, 'prewarm-dotnet.txt'), '\n'.join(agg) if agg else 'NO_DOTNET_BUILD_TARGETS')
+                    with open(dotnet_log, 'a', encoding='utf-8') as f:
+                        f.write(f'=== {item} ===\n')
+                    rc_b, _ = run_cmd(['dotnet', 'build', item, '-c', 'Debug', '-v', 'minimal'], cwd=root, timeout=600_000,
+                                      log_path=dotnet_log, append=True)
+                    with open(dotnet_log, 'a', encoding='utf-8') as f:
+                        f.write(f'=== {item} rc={rc_b} ===\n\n')
+                    build_logs.append((item, rc_b))
+                if not build_logs:
+                    write_text(dotnet_log, 'NO_DOTNET_BUILD_TARGETS')
                 prewarm_note = 'fallback-dotnet'
+                if build_logs and all(rc_b == 0 for _, rc_b in build_logs):
+                    stamp.record()
+        else:
+            stamp.record()
 
     # Run tests (Debugger break, fail-fast).
-    # Build command with optional -a filters
-    cmd = [args.godot_bin, '--headless', '--path', proj, '-s', '-d', 'res://addons/gdUnit4/bin/GdUnitCmdTool.gd', '--ignoreHeadlessMode']
+    # Build command with optional -a filters (normalized to res://)
+    add_paths = []
     for a in args.add:
         apath = a
         if not apath.startswith('res://'):
             # normalize relative tests path to res://
             apath = 'res://' + apath.replace('\\', '/').lstrip('/')
-        cmd += ['-a', apath]
-    rc, out = run_cmd_failfast(cmd, cwd=proj, timeout=args.timeout_sec*1000)
-    console_path = os.path.join(out_dir, 'gdunit-console.txt')
-    with open(console_path, 'w', encoding='utf-8') as f:
-        f.write(out)
+        add_paths.append(apath)
+    dest = args.report_dir if args.report_dir else os.path.join(out_dir, 'gdunit-reports')
+    shards = None
+    worker_info = None
+    if args.shards > 1 and add_paths:
+        rc, shards = run_sharded(args, root, proj, out_dir, dest, add_paths)
+    else:
+        console_path = os.path.join(out_dir, 'gdunit-console.txt')
+        rc = None
+        if worker is not None:
+            worker_info = {'pid': worker.state.pid, 'port': worker.state.port}
+            try:
+                resp, console = worker.request('gdunit', timeout_sec=args.timeout_sec, args=gdunit_options(add_paths))
+                write_text(console_path, console)
+                rc = int(resp.get('rc', 1)) if resp.get('ok') else 1
+                if rc == 0 and contains_any(Path(console_path), BREAK_MARKERS):
+                    rc = 1
+            except WorkerError as e:
+                worker_info['error'] = str(e)
+                rc = 124 if isinstance(e, WorkerTimeout) else None
+        if rc is None:
+            rc, _out = run_cmd_failfast(gdunit_cmd(args.godot_bin, proj, add_paths), cwd=proj, timeout=args.timeout_sec*1000, log_path=console_path)
 
-    # Generate HTML log frame (optional)
-    _rc2, _out2 = run_cmd([args.godot_bin, '--headless', '--path', proj, '--quiet', '-s', 'res://addons/gdUnit4/bin/GdUnitCopyLog.gd'], cwd=proj)
+            # Generate HTML log frame (optional)
+            _rc2, _out2 = run_cmd([args.godot_bin, '--headless', '--path', proj, '--quiet', '-s', 'res://addons/gdUnit4/bin/GdUnitCopyLog.gd'], cwd=proj)
 
-    # Archive reports
-    reports_dir = os.path.join(proj, 'reports')
-    dest = args.report_dir if args.report_dir else os.path.join(out_dir, 'gdunit-reports')
-    # Always create a destination folder with at least the console log and a summary
-    if os.path.isdir(dest):
-        shutil.rmtree(dest, ignore_errors=True)
-    os.makedirs(dest, exist_ok=True)
-    # Copy console log for diagnosis
-    try:
-        shutil.copy2(console_path, os.path.join(dest, 'gdunit-console.txt'))
-    except Exception:
-        pass
-    # Copy reports if they exist
-    if os.path.isdir(reports_dir):
-        for name in os.listdir(reports_dir):
-            src = os.path.join(reports_dir, name)
-            dst = os.path.join(dest, name)
-            if os.path.isdir(src):
-                shutil.copytree(src, dst, dirs_exist_ok=True)
-            else:
-                shutil.copy2(src, dst)
+        # Archive reports
+        reports_dir = os.path.join(proj, 'reports')
+        # Always create a destination folder with at least the console log and a summary
+        if os.path.isdir(dest):
+            shutil.rmtree(dest, ignore_errors=True)
+        os.makedirs(dest, exist_ok=True)
+        # Copy console log for diagnosis
+        try:
+            shutil.copy2(console_path, os.path.join(dest, 'gdunit-console.txt'))
+        except Exception:
+            pass
+        # Copy reports if they exist
+        if os.path.isdir(reports_dir):
+            for name in os.listdir(reports_dir):
+                src = os.path.join(reports_dir, name)
+                dst = os.path.join(dest, name)
+                if os.path.isdir(src):
+                    shutil.copytree(src, dst, dirs_exist_ok=True)
+                else:
+                    shutil.copy2(src, dst)
     # Write a small summary json for CI
     summary = {'rc': rc, 'project': proj, 'added': args.add, 'timeout_sec': args.timeout_sec}
+    if shards is not None:
+        summary['shards'] = shards
+    if worker_info is not None:
+        summary['worker'] = worker_info
+    if prewarm_cache_hit is not None:
+        summary['prewarm_cache_hit'] = prewarm_cache_hit
     if prewarm_rc is not None:
         summary['prewarm_rc'] = prewarm_rc
         if prewarm_note:
@@ -193,6 +324,14 @@ def main():
             json.dump(summary, f, ensure_ascii=False)
     except Exception:
         pass
+    # Catalog entries carry SC_RUN_ID / SC_TASK_ID from the caller (sc-test).
+    register_artifact(KIND_GDUNIT_REPORT_DIR, Path(dest), step='gdunit')
+    xml_paths = sorted(Path(dest).rglob('results.xml'), key=lambda p: p.stat().st_mtime)
+    if shards is not None:
+        # Only the merged report: shard results.xml files are partial.
+        xml_paths = [p for p in xml_paths if p.parent == Path(dest) / 'report_1']
+    for xml_path in xml_paths:
+        register_artifact(KIND_GDUNIT_RESULTS_XML, xml_path, step='gdunit')
     print(f'GDUNIT_DONE rc={rc} out={out_dir}')
     return 0 if rc == 0 else rc
 
@@ -23,6 +23,9 @@ import json
 import re
 from pathlib import Path
 
+from gate_cache_lib import GateCache, rules_version_of
+from source_index_lib import SourceFile, get_source_index
+
 
 AUDIT_FILE_RE = re.compile(r"security-audit\.jsonl", re.IGNORECASE)
 REQUIRED_KEYS = ("\"ts\"", "\"action\"", "\"reason\"", "\"target\"", "\"caller\"")
@@ -32,47 +35,47 @@ def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def iter_cs_files(root: Path) -> list[Path]:
-    roots = [root / "Game.Godot", root / "Game.Core"]
-    files: list[Path] = []
-    for r in roots:
-        if not r.exists():
-            continue
-        for p in r.rglob("*.cs"):
-            if any(seg in {"bin", "obj", ".godot", "logs"} for seg in p.parts):
-                continue
-            files.append(p)
-    return sorted(files)
+def iter_cs_files(root: Path) -> list[SourceFile]:
+    return get_source_index(root).iter_files(under=["Game.Godot", "Game.Core"], exts=[".cs"])
+
+
+def scan_file(sf: SourceFile) -> dict | None:
+    text = sf.text
+    if not AUDIT_FILE_RE.search(text):
+        return None
+    missing = [k for k in REQUIRED_KEYS if k not in text]
+    return {
+        "file": sf.rel,
+        "mentions_audit_file": True,
+        "has_all_required_keys": len(missing) == 0,
+        "missing_keys": missing,
+    }
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Hard gate: security audit logging presence & schema (static scan).")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
-    args = ap.parse_args()
+    ap.add_argument("--no-cache", action="store_true", help="Rescan every file (ignore logs/ci/.cache/security-audit-gate.json).")
+    args = ap.parse_args(argv)
 
     root = repo_root()
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     candidates: list[dict] = []
+    cache = GateCache("security-audit-gate", rules_version=rules_version_of(Path(__file__)), root=root, enabled=not args.no_cache)
 
-    for p in iter_cs_files(root):
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        if not AUDIT_FILE_RE.search(text):
-            continue
-        rel = p.relative_to(root).as_posix()
-        missing = [k for k in REQUIRED_KEYS if k not in text]
-        candidates.append(
-            {
-                "file": rel,
-                "mentions_audit_file": True,
-                "has_all_required_keys": len(missing) == 0,
-                "missing_keys": missing,
-            }
-        )
+    for sf in iter_cs_files(root):
+        hit, cached = cache.get(sf.rel, sf.path, sha256=lambda: sf.sha256)
+        candidate = cached if hit else scan_file(sf)
+        if not hit:
+            cache.put(sf.rel, sf.path, candidate, sha256=lambda: sf.sha256)
+        if candidate:
+            candidates.append(candidate)
+    cache.save()
 
     ok = any(c.get("has_all_required_keys") for c in candidates)
-    report = {"ok": ok, "candidates": candidates, "required_keys": list(REQUIRED_KEYS)}
+    report = {"ok": ok, "candidates": candidates, "required_keys": list(REQUIRED_KEYS), "cache": cache.stats()}
     out_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
     print(f"SECURITY_AUDIT_GATE status={'ok' if ok else 'fail'} candidates={len(candidates)}")
     return 0 if ok else 1
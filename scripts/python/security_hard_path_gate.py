@@ -27,6 +27,9 @@ import json
 import re
 from pathlib import Path
 
+from gate_cache_lib import GateCache, rules_version_of
+from source_index_lib import SourceFile, get_source_index
+
 
 ABS_WIN_PATH_RE = re.compile(r'"[A-Za-z]:\\\\[^"]+"')
 TRAVERSAL_RE = re.compile(r'"[^"]*(?:\.\./|\.\.\\)[^"]*"')
@@ -37,75 +40,73 @@ def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def iter_runtime_files(root: Path) -> list[Path]:
-    roots = [root / "Game.Godot", root / "Game.Core"]
-    files: list[Path] = []
-    for r in roots:
-        if not r.exists():
-            continue
-        for p in r.rglob("*"):
-            if not p.is_file():
-                continue
-            if p.suffix.lower() not in {".cs", ".gd"}:
-                continue
-            if any(seg in {"bin", "obj", ".godot", "logs"} for seg in p.parts):
-                continue
-            files.append(p)
-    return sorted(files)
-
-
-def main() -> int:
+def iter_runtime_files(root: Path) -> list[SourceFile]:
+    return get_source_index(root).iter_files(under=["Game.Godot", "Game.Core"], exts=[".cs", ".gd"])
+
+
+def scan_file(sf: SourceFile) -> list[dict]:
+    violations: list[dict] = []
+    rel = sf.rel
+    for i, line in enumerate(sf.lines, start=1):
+        if ABS_WIN_PATH_RE.search(line):
+            violations.append({"rule": "no_absolute_windows_path_literal", "file": rel, "line": i, "text": line.strip()})
+        # Only consider traversal tokens when the line appears to deal with filesystem paths.
+        # (Scene tree NodePath like "../Root" is not a filesystem traversal.)
+        if any(
+            t in line
+            for t in (
+                "System.IO.",
+                "File.",
+                "Directory.",
+                "Path.",
+                "FileAccess.",
+                "DirAccess.",
+                "ProjectSettings.GlobalizePath",
+                "GetFolderPath",
+            )
+        ):
+            if TRAVERSAL_RE.search(line):
+                violations.append({"rule": "no_path_traversal_literal", "file": rel, "line": i, "text": line.strip()})
+
+        m = GLOBALIZE_RE.search(line)
+        if m:
+            arg = (m.group(1) or "").strip()
+            if not (arg.startswith("user://") or arg.startswith("res://")):
+                violations.append(
+                    {
+                        "rule": "globalize_path_only_user_or_res",
+                        "file": rel,
+                        "line": i,
+                        "text": line.strip(),
+                        "arg": arg,
+                    }
+                )
+    return violations
+
+
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Hard gate: path safety invariants (static scan).")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
-    args = ap.parse_args()
+    ap.add_argument("--no-cache", action="store_true", help="Rescan every file (ignore logs/ci/.cache/security-path-gate.json).")
+    args = ap.parse_args(argv)
 
     root = repo_root()
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     violations: list[dict] = []
+    cache = GateCache("security-path-gate", rules_version=rules_version_of(Path(__file__)), root=root, enabled=not args.no_cache)
 
-    for p in iter_runtime_files(root):
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        rel = p.relative_to(root).as_posix()
-
-        for i, line in enumerate(text.splitlines(), start=1):
-            if ABS_WIN_PATH_RE.search(line):
-                violations.append({"rule": "no_absolute_windows_path_literal", "file": rel, "line": i, "text": line.strip()})
-            # Only consider traversal tokens when the line appears to deal with filesystem paths.
-            # (Scene tree NodePath like "../Root" is not a filesystem traversal.)
-            if any(
-                t in line
-                for t in (
-                    "System.IO.",
-                    "File.",
-                    "Directory.",
-                    "Path.",
-                    "FileAccess.",
-                    "DirAccess.",
-                    "ProjectSettings.GlobalizePath",
-                    "GetFolderPath",
-                )
-            ):
-                if TRAVERSAL_RE.search(line):
-                    violations.append({"rule": "no_path_traversal_literal", "file": rel, "line": i, "text": line.strip()})
-
-            m = GLOBALIZE_RE.search(line)
-            if m:
-                arg = (m.group(1) or "").strip()
-                if not (arg.startswith("user://") or arg.startswith("res://")):
-                    violations.append(
-                        {
-                            "rule": "globalize_path_only_user_or_res",
-                            "file": rel,
-                            "line": i,
-                            "text": line.strip(),
-                            "arg": arg,
-                        }
-                    )
+    for sf in iter_runtime_files(root):
+        hit, cached = cache.get(sf.rel, sf.path, sha256=lambda: sf.sha256)
+        file_violations = cached if hit else scan_file(sf)
+        if not hit:
+            cache.put(sf.rel, sf.path, file_violations, sha256=lambda: sf.sha256)
+        violations.extend(file_violations)
+    cache.save()
 
     ok = len(violations) == 0
-    report = {"ok": ok, "violations": violations, "counts": {"total": len(violations)}}
+    report = {"ok": ok, "violations": violations, "counts": {"total": len(violations)}, "cache": cache.stats()}
     out_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
     print(f"SECURITY_PATH_GATE status={'ok' if ok else 'fail'} violations={len(violations)}")
     return 0 if ok else 1
@@ -26,6 +26,9 @@ import json
 import re
 from pathlib import Path
 
+from gate_cache_lib import GateCache, rules_version_of
+from source_index_lib import SourceFile, get_source_index
+
 
 INTERP_CALL_RE = re.compile(r"\.\s*(Query|Execute)\s*\(\s*\$\"", re.IGNORECASE)
 FORMAT_CALL_RE = re.compile(r"\.\s*(Query|Execute)\s*\(\s*string\.Format\s*\(", re.IGNORECASE)
@@ -37,46 +40,49 @@ def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def iter_cs_files(root: Path) -> list[Path]:
-    roots = [root / "Game.Godot", root / "Game.Core"]
-    files: list[Path] = []
-    for r in roots:
-        if not r.exists():
-            continue
-        for p in r.rglob("*.cs"):
-            if any(seg in {"bin", "obj", ".godot", "logs"} for seg in p.parts):
+def iter_cs_files(root: Path) -> list[SourceFile]:
+    return get_source_index(root).iter_files(under=["Game.Godot", "Game.Core"], exts=[".cs"])
+
+
+def scan_file(sf: SourceFile) -> list[dict]:
+    violations: list[dict] = []
+    rel = sf.rel
+    for i, line in enumerate(sf.lines, start=1):
+        s = line.strip()
+        if INTERP_CALL_RE.search(s) or INTERP_CMDTEXT_RE.search(s):
+            # Allowlist: PRAGMA statements may require whitelisted dynamic tokens (e.g. journal_mode).
+            if "PRAGMA " in s.upper():
                 continue
-            files.append(p)
-    return sorted(files)
+            violations.append({"rule": "no_interpolated_sql_statement", "file": rel, "line": i, "text": s})
+            continue
+        if FORMAT_CALL_RE.search(s) or FORMAT_CMDTEXT_RE.search(s):
+            violations.append({"rule": "no_string_format_sql_statement", "file": rel, "line": i, "text": s})
+    return violations
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Hard gate: SQL injection anti-pattern scan (static scan).")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
-    args = ap.parse_args()
+    ap.add_argument("--no-cache", action="store_true", help="Rescan every file (ignore logs/ci/.cache/security-sql-gate.json).")
+    args = ap.parse_args(argv)
 
     root = repo_root()
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     violations: list[dict] = []
+    cache = GateCache("security-sql-gate", rules_version=rules_version_of(Path(__file__)), root=root, enabled=not args.no_cache)
 
-    for p in iter_cs_files(root):
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        rel = p.relative_to(root).as_posix()
-        for i, line in enumerate(text.splitlines(), start=1):
-            s = line.strip()
-            if INTERP_CALL_RE.search(s) or INTERP_CMDTEXT_RE.search(s):
-                # Allowlist: PRAGMA statements may require whitelisted dynamic tokens (e.g. journal_mode).
-                if "PRAGMA " in s.upper():
-                    continue
-                violations.append({"rule": "no_interpolated_sql_statement", "file": rel, "line": i, "text": s})
-                continue
-            if FORMAT_CALL_RE.search(s) or FORMAT_CMDTEXT_RE.search(s):
-                violations.append({"rule": "no_string_format_sql_statement", "file": rel, "line": i, "text": s})
+    for sf in iter_cs_files(root):
+        hit, cached = cache.get(sf.rel, sf.path, sha256=lambda: sf.sha256)
+        file_violations = cached if hit else scan_file(sf)
+        if not hit:
+            cache.put(sf.rel, sf.path, file_violations, sha256=lambda: sf.sha256)
+        violations.extend(file_violations)
+    cache.save()
 
     ok = len(violations) == 0
-    report = {"ok": ok, "violations": violations, "counts": {"total": len(violations)}}
+    report = {"ok": ok, "violations": violations, "counts": {"total": len(violations)}, "cache": cache.stats()}
     out_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
     print(f"SECURITY_SQL_GATE status={'ok' if ok else 'fail'} violations={len(violations)}")
     return 0 if ok else 1
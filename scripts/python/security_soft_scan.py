@@ -19,6 +19,9 @@ import sys
 from dataclasses import dataclass
 from pathlib import Path
 
+from gate_cache_lib import GateCache, rules_version_of
+from source_index_lib import SourceFile, get_source_index
+
 
 @dataclass(frozen=True)
 class Rule:
@@ -36,33 +39,32 @@ def _to_posix(path: Path) -> str:
     return str(path).replace("\\", "/")
 
 
-def iter_code_files(root: Path, globs: tuple[str, ...]) -> list[Path]:
-    files: list[Path] = []
+def iter_code_files(root: Path, globs: tuple[str, ...]) -> list[SourceFile]:
+    # Globs are "<dir>/**/*.<ext>" or "**/*.<ext>"; files come from the shared source index.
+    index = get_source_index(root)
+    files: dict[str, SourceFile] = {}
     for g in globs:
-        files.extend(root.rglob(g))
-    filtered: list[Path] = []
-    for p in files:
-        if not p.is_file():
-            continue
-        if any(seg in {".git", ".godot", "bin", "obj", "logs"} for seg in p.parts):
-            continue
-        filtered.append(p)
-    return sorted(set(filtered))
-
-
-def find_matches(path: Path, rule: Rule) -> list[dict]:
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    findings: list[dict] = []
+        under, _, name = g.rpartition("**/")
+        for sf in index.iter_files(under=under or None, exts=[Path(name).suffix]):
+            files[sf.rel] = sf
+    return [files[k] for k in sorted(files)]
+
+
+def match_lines(text: str, rules: list[Rule]) -> dict[str, list[dict]]:
+    # Per-file matches for every rule (cacheable by file content); glob scoping is applied by the caller.
+    out: dict[str, list[dict]] = {}
     for i, line in enumerate(text.splitlines(), start=1):
-        if rule.pattern.search(line):
-            findings.append({"file": _to_posix(path), "line": i, "rule": rule.name, "severity": rule.severity, "text": line.strip()})
-    return findings
+        for rule in rules:
+            if rule.pattern.search(line):
+                out.setdefault(rule.name, []).append({"line": i, "text": line.strip()})
+    return out
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Heuristic security soft scan (deterministic).")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
-    args = ap.parse_args()
+    ap.add_argument("--no-cache", action="store_true", help="Rescan every file (ignore logs/ci/.cache/security-soft-scan.json).")
+    args = ap.parse_args(argv)
 
     root = repo_root()
     out_path = Path(args.out)
@@ -107,10 +109,25 @@ def main() -> int:
         ),
     ]
 
+    cache = GateCache("security-soft-scan", rules_version=rules_version_of(Path(__file__)), root=root, enabled=not args.no_cache)
+    per_file: dict[str, dict[str, list[dict]]] = {}
+
+    def file_matches(sf: SourceFile) -> dict[str, list[dict]]:
+        if sf.rel in per_file:
+            return per_file[sf.rel]
+        hit, cached = cache.get(sf.rel, sf.path, sha256=lambda: sf.sha256)
+        if not hit:
+            cached = match_lines(sf.text, rules)
+            cache.put(sf.rel, sf.path, cached, sha256=lambda: sf.sha256)
+        per_file[sf.rel] = cached
+        return cached
+
     findings: list[dict] = []
     for rule in rules:
-        for p in iter_code_files(root, rule.file_globs):
-            findings.extend(find_matches(p, rule))
+        for sf in iter_code_files(root, rule.file_globs):
+            for m in file_matches(sf).get(rule.name) or []:
+                findings.append({"file": _to_posix(sf.path), "line": m["line"], "rule": rule.name, "severity": rule.severity, "text": m["text"]})
+    cache.save()
 
     report = {
         "status": "ok",
@@ -122,6 +139,7 @@ def main() -> int:
             "warn": sum(1 for f in findings if f.get("severity") == "warn"),
             "info": sum(1 for f in findings if f.get("severity") == "info"),
         },
+        "cache": cache.stats(),
     }
 
     out_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
@@ -11,6 +11,17 @@ Heuristics (kept aligned with the PowerShell version):
 - Fallback to "[DB] opened".
 - In loose mode, any output counts as PASS.
 
+Perf mode (--perf-runs N, N>1): launches the scene N times (logs/ci/<ts>/perf-runs/run-XX/),
+drops warm-up [PERF] windows and writes perf-runs.json with p50/p95/p99 bootstrap CIs.
+With --perf-p95-ms the run fails only when the whole p95 interval is above the budget.
+
+Single runs are dispatched to a warm headless worker when one is registered for the project
+(scripts/python/godot_worker.py): the scene is loaded for --timeout-sec in the running engine and
+its console slice becomes headless-worker.log (first line [HEADLESS_WORKER]). It is never registered
+as headless.log: the warm engine throttles to 30 fps while idle, so its [PERF] windows must not feed
+perf-budget or the perf history. Perf runs always launch cold (they measure fresh processes), and
+--cold (or GODOT_WORKER=0) skips the worker for a single run whose headless.log feeds a perf budget.
+
 Example (PowerShell):
   py -3 scripts/python/smoke_headless.py `
     --godot-bin "C:\\Godot\\Godot_v4.5.1-stable_mono_win64_console.exe" `
@@ -22,21 +33,33 @@ from __future__ import annotations
 
 import argparse
 import datetime as _dt
+import json
+import shutil
 import subprocess
 import sys
 from pathlib import Path
 
+from godot_worker_lib import WorkerError, connect
+from log_tail_lib import WORKER_LOG_MARKER, contains_any, grep_lines, iter_lines, record_latest
 
-def _run_smoke(godot_bin: str, project: str, scene: str, timeout_sec: int, mode: str) -> int:
-    bin_path = Path(godot_bin)
-    if not bin_path.is_file():
-        print(f"[smoke_headless] GODOT_BIN not found: {godot_bin}", file=sys.stderr)
-        return 1
 
-    ts = _dt.datetime.now().strftime("%Y%m%d-%H%M%S")
-    dest = Path("logs") / "ci" / ts / "smoke"
-    dest.mkdir(parents=True, exist_ok=True)
+def _record_perf_history(log_path: Path, scene: str) -> None:
+    """Appends this run's [PERF] samples to logs/perf/ (best-effort; never affects the verdict)."""
+    try:
+        from perf_history_lib import PerfHistory
 
+        with PerfHistory() as db:
+            run_id, added = db.ingest_log(log_path, scene=scene, source="smoke")
+    except Exception as exc:  # noqa: BLE001
+        print(f"[smoke_headless] perf history not updated: {exc}")
+        return
+    if added:
+        print(f"[smoke_headless] perf history: run_id={run_id} samples={added}")
+
+
+def _launch(bin_path: Path, project: str, scene: str, timeout_sec: int, dest: Path) -> Path | None:
+    """Runs Godot once into `dest`; returns the combined log path (None when it failed to start)."""
+    dest.mkdir(parents=True, exist_ok=True)
     out_path = dest / "headless.out.log"
     err_path = dest / "headless.err.log"
     log_path = dest / "headless.log"
@@ -50,7 +73,7 @@ def _run_smoke(godot_bin: str, project: str, scene: str, timeout_sec: int, mode:
             proc = subprocess.Popen(cmd, stdout=f_out, stderr=f_err, text=True)
         except Exception as exc:  # pragma: no cover - environment-specific failure
             print(f"[smoke_headless] failed to start Godot: {exc}", file=sys.stderr)
-            return 1
+            return None
 
         try:
             proc.wait(timeout=timeout_sec)
@@ -61,20 +84,53 @@ def _run_smoke(godot_bin: str, project: str, scene: str, timeout_sec: int, mode:
             except Exception:
                 pass
 
-    content_parts: list[str] = []
-    if out_path.is_file():
-        content_parts.append(out_path.read_text(encoding="utf-8", errors="ignore"))
-    if err_path.is_file():
-        content_parts.append("\n" + err_path.read_text(encoding="utf-8", errors="ignore"))
+    # Concatenate out + err without loading either into memory.
+    with log_path.open("wb") as f_log:
+        if out_path.is_file():
+            with out_path.open("rb") as f:
+                shutil.copyfileobj(f, f_log)
+        if err_path.is_file():
+            f_log.write(b"\n")
+            with err_path.open("rb") as f:
+                shutil.copyfileobj(f, f_log)
 
-    combined = "".join(content_parts)
-    log_path.write_text(combined, encoding="utf-8", errors="ignore")
     print(f"[smoke_headless] log saved at {log_path} (out={out_path}, err={err_path})")
+    record_latest("headless.log", log_path)
+    _record_perf_history(log_path, scene)
+    return log_path
+
+
+def _launch_worker(godot_bin: str, project: str, scene: str, timeout_sec: int, dest: Path) -> Path | None:
+    """Loads the scene in a warm worker for `timeout_sec`; None when no worker is usable."""
+    worker = connect(godot_bin, project)
+    if worker is None:
+        return None
+    print(f"[smoke_headless] dispatching to warm worker pid={worker.state.pid} port={worker.state.port} (window={timeout_sec}s)")
+    try:
+        resp, out = worker.request("smoke", timeout_sec=timeout_sec + 60, scene=scene, seconds=timeout_sec)
+    except WorkerError as exc:
+        print(f"[smoke_headless] worker failed, launching cold: {exc}")
+        return None
+    if not resp.get("ok"):
+        print(f"[smoke_headless] worker rejected smoke ({resp.get('error')}), launching cold")
+        return None
 
-    text = combined or ""
-    has_marker = "[TEMPLATE_SMOKE_READY]" in text
-    has_db_open = "[DB] opened" in text
-    has_any = bool(text.strip())
+    dest.mkdir(parents=True, exist_ok=True)
+    log_path = dest / "headless-worker.log"
+    (dest / "headless-worker.out.log").write_text(out, encoding="utf-8")
+    (dest / "headless-worker.err.log").write_text("", encoding="utf-8")
+    log_path.write_text(f"{WORKER_LOG_MARKER} pid={worker.state.pid} scene={scene}\n{out}", encoding="utf-8")
+    print(f"[smoke_headless] log saved at {log_path} (worker console slice)")
+    # Separate key and no perf history: [PERF] windows of a warm engine are not comparable with cold launches.
+    record_latest("headless-worker.log", log_path)
+    return log_path
+
+
+def _smoke_verdict(log_path: Path, mode: str) -> int:
+    found = contains_any(log_path, ["[TEMPLATE_SMOKE_READY]", "[DB] opened"])
+    has_marker = "[TEMPLATE_SMOKE_READY]" in found
+    has_db_open = "[DB] opened" in found
+    has_any = has_marker or has_db_open or any(line.strip() for _, line in iter_lines(log_path))
 
     if has_marker:
         print("SMOKE PASS (marker)")
@@ -93,16 +149,99 @@ def _run_smoke(godot_bin: str, project: str, scene: str, timeout_sec: int, mode:
     return 0
 
 
+def _run_smoke(godot_bin: str, project: str, scene: str, timeout_sec: int, mode: str, *, cold: bool = False) -> int:
+    bin_path = Path(godot_bin)
+    if not bin_path.is_file():
+        print(f"[smoke_headless] GODOT_BIN not found: {godot_bin}", file=sys.stderr)
+        return 1
+
+    ts = _dt.datetime.now().strftime("%Y%m%d-%H%M%S")
+    dest = Path("logs") / "ci" / ts / "smoke"
+    log_path = None if cold else _launch_worker(godot_bin, project, scene, timeout_sec, dest)
+    log_path = log_path or _launch(bin_path, project, scene, timeout_sec, dest)
+    if log_path is None:
+        return 1
+    return _smoke_verdict(log_path, mode)
+
+
+def _run_perf(
+    godot_bin: str,
+    project: str,
+    scene: str,
+    timeout_sec: int,
+    mode: str,
+    *,
+    runs: int,
+    warmup_sec: float,
+    max_p95_ms: float,
+    bootstrap_iters: int,
+) -> int:
+    """
+    Launches the scene `runs` times and gates on the bootstrap CI of the pooled p95
+    (see perf_runs_lib.py). Each run keeps the usual smoke artifacts under run-XX/.
+    """
+    from perf_runs_lib import PERF_RUNS_FILE, ci_verdict, summarize_runs
+
+    bin_path = Path(godot_bin)
+    if not bin_path.is_file():
+        print(f"[smoke_headless] GODOT_BIN not found: {godot_bin}", file=sys.stderr)
+        return 1
+
+    ts = _dt.datetime.now().strftime("%Y%m%d-%H%M%S")
+    base = Path("logs") / "ci" / ts / "perf-runs"
+    logs: list[Path] = []
+    for i in range(runs):
+        log_path = _launch(bin_path, project, scene, timeout_sec, base / f"run-{i + 1:02d}")
+        if log_path is None:
+            return 1
+        logs.append(log_path)
+
+    # Only the [PERF] lines are kept in memory.
+    texts = ["".join(grep_lines(p, ["[PERF]"])) for p in logs]
+    summary = summarize_runs(texts, warmup_sec=warmup_sec, iters=bootstrap_iters)
+    summary.update({"scene": scene, "timeout_sec": timeout_sec, "max_p95_ms": max_p95_ms})
+    p95 = summary["metrics"]["p95_ms"]
+    verdict = ci_verdict(p95, max_p95_ms) if max_p95_ms > 0 else "disabled"
+    summary["p95_verdict"] = verdict
+    (base / PERF_RUNS_FILE).write_text(json.dumps(summary, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    for metric, m in summary["metrics"].items():
+        print(f"[smoke_headless] {metric}: {m['point']} ms [{m['ci_low']}, {m['ci_high']}] (windows={m['windows']} runs={m['runs']})")
+    print(f"PERF RUNS p95_verdict={verdict} runs={runs} warmup_sec={warmup_sec} summary={base / PERF_RUNS_FILE}")
+
+    rc = max(_smoke_verdict(p, mode) for p in logs)
+    if verdict == "fail":
+        return 1
+    return rc
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Run Godot headless smoke test (Python variant)")
     parser.add_argument("--godot-bin", required=True, help="Path to Godot executable (mono console)")
     parser.add_argument("--project", default=".", help="Godot project path (default '.')")
     parser.add_argument("--scene", default="res://Game.Godot/Scenes/Main.tscn", help="Scene to load")
-    parser.add_argument("--timeout-sec", type=int, default=5, help="Timeout seconds before kill")
+    parser.add_argument("--timeout-sec", type=int, default=None, help="Timeout seconds before kill (default 5; 20 per run in perf mode)")
     parser.add_argument("--mode", choices=["loose", "strict"], default="loose", help="Gate mode")
+    parser.add_argument("--cold", action="store_true", help="Never dispatch to a warm worker (the headless.log feeds perf budgets)")
+    parser.add_argument("--perf-runs", type=int, default=1, help="Perf mode: launch the scene N times and pool [PERF] windows (N>1)")
+    parser.add_argument("--perf-warmup-sec", type=float, default=5.0, help="Perf mode: drop [PERF] windows emitted before this uptime")
+    parser.add_argument("--perf-p95-ms", type=float, default=0.0, help="Perf mode: fail only when the p95 CI lies entirely above this budget (0 = report only)")
+    parser.add_argument("--bootstrap-iters", type=int, default=2000, help="Perf mode: bootstrap resamples for the CI")
 
     args = parser.parse_args()
-    return _run_smoke(args.godot_bin, args.project, args.scene, args.timeout_sec, args.mode)
+    if args.perf_runs > 1:
+        return _run_perf(
+            args.godot_bin,
+            args.project,
+            args.scene,
+            args.timeout_sec or 20,
+            args.mode,
+            runs=args.perf_runs,
+            warmup_sec=args.perf_warmup_sec,
+            max_p95_ms=args.perf_p95_ms,
+            bootstrap_iters=args.bootstrap_iters,
+        )
+    return _run_smoke(args.godot_bin, args.project, args.scene, args.timeout_sec or 5, args.mode, cold=args.cold)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared source index for deterministic static gates.
+
+Why:
+  The security gates, architecture boundary check, quality rules, UI event
+  validators and the contract catalog all used to `rglob("*.cs")` the same
+  trees with slightly different exclusion sets and re-read every file.
+
+  This module walks the repo once (per process) with a single exclusion set
+  and lazily caches each file's decoded text, line offsets and content hash.
+  `text` is lenient (errors="ignore"); `strict_text` keeps strict UTF-8 decoding.
+  Gates ask the index for the files under their scope instead of walking.
+
+Scope:
+  - Extensions: .cs, .gd, .py
+  - Excluded directory names: .git, .godot, bin, obj, logs, TestResults
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Iterable
+
+
+EXCLUDED_DIRS = frozenset({".git", ".godot", "bin", "obj", "logs", "TestResults"})
+INDEXED_EXTS = frozenset({".cs", ".gd", ".py"})
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+@dataclass(frozen=True)
+class SourceFile:
+    path: Path
+    rel: str  # posix path relative to the index root
+
+    @cached_property
+    def data(self) -> bytes:
+        try:
+            return self.path.read_bytes()
+        except OSError:
+            return b""
+
+    @cached_property
+    def text(self) -> str:
+        return self.data.decode("utf-8", errors="ignore")
+
+    @cached_property
+    def strict_text(self) -> str:
+        """`text` for gates that must reject non-UTF-8 files (raises UnicodeDecodeError)."""
+        return self.data.decode("utf-8", errors="strict")
+
+    @cached_property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
+
+    @cached_property
+    def lines(self) -> list[str]:
+        return self.text.splitlines()
+
+    @cached_property
+    def line_offsets(self) -> tuple[int, ...]:
+        # Start offset of each "\n"-separated line in `text`.
+        offsets = [0]
+        text = self.text
+        pos = text.find("\n")
+        while pos >= 0:
+            offsets.append(pos + 1)
+            pos = text.find("\n", pos + 1)
+        return tuple(offsets)
+
+    def line_at(self, pos: int) -> int:
+        """1-based line number for a 0-based offset into `text`."""
+        return bisect.bisect_right(self.line_offsets, pos)
+
+
+@dataclass
+class SourceIndex:
+    root: Path
+    files: dict[str, SourceFile] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, root: Path) -> "SourceIndex":
+        root = root.resolve()
+        files: dict[str, SourceFile] = {}
+        for cur_root, dirs, names in os.walk(root):
+            dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+            for name in names:
+                if os.path.splitext(name)[1].lower() not in INDEXED_EXTS:
+                    continue
+                p = Path(cur_root) / name
+                rel = p.relative_to(root).as_posix()
+                files[rel] = SourceFile(path=p, rel=rel)
+        return cls(root=root, files=dict(sorted(files.items())))
+
+    def _prefix(self, under: str | Path) -> str | None:
+        if isinstance(under, Path) and under.is_absolute():
+            try:
+                rel = under.resolve().relative_to(self.root).as_posix()
+            except ValueError:
+                return None
+        else:
+            rel = str(under).replace("\\", "/")
+        rel = rel.strip("/")
+        if rel in ("", "."):
+            return ""
+        return rel + "/"
+
+    def iter_files(
+        self,
+        *,
+        under: str | Path | Iterable[str | Path] | None = None,
+        exts: Iterable[str] = (".cs",),
+    ) -> list[SourceFile]:
+        """
+        Files (sorted by rel path) whose extension is in `exts` and that live under
+        any of the `under` directories (repo-relative or absolute; default: whole root).
+        """
+        ext_set = {e.lower() for e in exts}
+        if under is None:
+            prefixes: list[str] = [""]
+        elif isinstance(under, (str, Path)):
+            prefixes = [p for p in [self._prefix(under)] if p is not None]
+        else:
+            prefixes = [p for p in (self._prefix(u) for u in under) if p is not None]
+        out: list[SourceFile] = []
+        for rel, sf in self.files.items():
+            if os.path.splitext(rel)[1].lower() not in ext_set:
+                continue
+            if not any(rel.startswith(pre) for pre in prefixes):
+                continue
+            out.append(sf)
+        return out
+
+    def get(self, rel: str) -> SourceFile | None:
+        return self.files.get(str(rel).replace("\\", "/"))
+
+
+_INDEXES: dict[Path, SourceIndex] = {}
+_LOCK = threading.Lock()
+
+
+def get_source_index(root: Path | None = None, *, refresh: bool = False) -> SourceIndex:
+    """
+    Process-wide memoized index for `root` (default: repo root).
+    Use refresh=True after writing files that a later gate must see.
+    """
+    key = (root or repo_root()).resolve()
+    with _LOCK:
+        idx = _INDEXES.get(key)
+        if idx is None or refresh:
+            idx = SourceIndex.build(key)
+            _INDEXES[key] = idx
+        return idx
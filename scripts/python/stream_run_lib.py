@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming subprocess runner: output goes straight to a log file, memory keeps only a tail.
+
+Why:
+  sc/_util.run_cmd and the run_cmd copies in run_dotnet.py, run_gdunit.py, ci_pipeline.py
+  and godot_selfcheck.py called communicate(), holding the whole console in memory until
+  the process exited and only then writing the log. Verbose dotnet/Godot runs produce
+  hundreds of MB, and a 30-minute gate could not be tailed while it ran.
+
+Design:
+  - A reader thread per pipe copies raw chunks (one line, at most MAX_CHUNK bytes, so a
+    newline-free blob cannot grow memory) through an incremental UTF-8 decoder into the log
+    file, flushed at least every FLUSH_SEC so `tail -f` / Get-Content -Wait sees it live.
+  - The last `tail_lines` pieces stay in a ring buffer (collections.deque(maxlen=...));
+    tail_lines=None keeps everything (the old in-memory behaviour, for callers without a log).
+  - LineMatcher: substring (case-insensitive) or regex checked on every line as it arrives;
+    it records its first hits, calls on_match(line) and, with stop=True, kills the process
+    (break markers). A stopped run returns rc=1, a timed-out run rc=124.
+  - The main thread only waits for the process, so the timeout also fires while the child
+    is silent. After exit the readers get DRAIN_SEC to drain: a grandchild that inherited
+    the pipe (e.g. a lingering build server) cannot hang the caller.
+  - CRLF is folded to LF like the text-mode pipes it replaces.
+  - The child is reaped through proc_metrics_lib.ProcessMeter: StreamResult.metrics holds its
+    wall/CPU/peak-RSS/I/O, which also feed any ResourceMeter active on the calling thread.
+"""
+
+from __future__ import annotations
+
+import codecs
+import collections
+import re
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Callable, Sequence
+
+from proc_metrics_lib import ProcessMeter
+
+
+MAX_CHUNK = 64 * 1024
+FLUSH_SEC = 0.5
+DEFAULT_TAIL_LINES = 2000
+MAX_HITS = 100
+DRAIN_SEC = 5.0
+
+
+@dataclass
+class LineMatcher:
+    pattern: str
+    name: str = ""
+    regex: bool = False
+    stop: bool = False
+    on_match: Callable[[str], Any] | None = None
+    hits: list[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._re = re.compile(self.pattern) if self.regex else None
+        self._low = self.pattern.lower()
+        self.name = self.name or self.pattern
+
+    def matches(self, line: str) -> bool:
+        return bool(self._re.search(line)) if self._re is not None else self._low in line.lower()
+
+    def feed(self, line: str) -> bool:
+        """Records a matching line and fires on_match; True when the run should stop."""
+        if not self.matches(line):
+            return False
+        if len(self.hits) < MAX_HITS:
+            self.hits.append(line.rstrip("\r\n"))
+        if self.on_match is not None:
+            try:
+                self.on_match(line)
+            except Exception:  # noqa: BLE001
+                pass  # a failing callback must not stop draining the pipe (the child would block)
+        return self.stop
+
+
+@dataclass
+class StreamResult:
+    rc: int
+    tail: str
+    timed_out: bool = False
+    stopped_by: str | None = None
+    lines: int = 0
+    bytes: int = 0
+    log_path: str | None = None
+    stderr_tail: str = ""
+    metrics: dict[str, Any] | None = None
+
+
+class _Pump(threading.Thread):
+    def __init__(
+        self,
+        stream: IO[bytes],
+        sink: IO[str] | None,
+        tail_lines: int | None,
+        matchers: Sequence[LineMatcher],
+        on_stop: Callable[[LineMatcher], None],
+    ) -> None:
+        super().__init__(daemon=True)
+        self.stream = stream
+        self.sink = sink
+        self.tail: collections.deque[str] = collections.deque(maxlen=tail_lines)
+        self.matchers = matchers
+        self.on_stop = on_stop
+        self.lines = 0
+        self.bytes = 0
+
+    def run(self) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        last_flush = time.monotonic()
+        try:
+            while True:
+                chunk = self.stream.readline(MAX_CHUNK)
+                if not chunk:
+                    break
+                self.bytes += len(chunk)
+                text = decoder.decode(chunk).replace("\r\n", "\n")
+                if not text:
+                    continue
+                if text.endswith("\n"):
+                    self.lines += 1
+                self.tail.append(text)
+                if self.sink is not None:
+                    self.sink.write(text)
+                    if time.monotonic() - last_flush >= FLUSH_SEC:
+                        self.sink.flush()
+                        last_flush = time.monotonic()
+                for m in self.matchers:
+                    if m.feed(text):
+                        self.on_stop(m)
+        except (OSError, ValueError):
+            pass  # pipe closed under us (process killed)
+        finally:
+            if self.sink is not None:
+                try:
+                    self.sink.flush()
+                except (OSError, ValueError):
+                    pass
+
+
+def run_streaming(
+    args: Sequence[str],
+    *,
+    cwd: str | Path | None = None,
+    env: dict[str, str] | None = None,
+    timeout_sec: float | None = None,
+    log_path: str | Path | None = None,
+    append: bool = False,
+    stderr_log_path: str | Path | None = None,
+    matchers: Sequence[LineMatcher] = (),
+    tail_lines: int | None = DEFAULT_TAIL_LINES,
+) -> StreamResult:
+    """stderr is merged into stdout unless stderr_log_path is given (then it gets its own log and tail)."""
+    sinks: list[IO[str]] = []
+
+    def _open(path: str | Path | None) -> IO[str] | None:
+        if path is None:
+            return None
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        sink = open(path, "a" if append else "w", encoding="utf-8")
+        sinks.append(sink)
+        return sink
+
+    stopped: list[LineMatcher] = []
+    proc: subprocess.Popen[bytes] | None = None
+
+    def _stop(m: LineMatcher) -> None:
+        if not stopped:
+            stopped.append(m)
+            if proc is not None:
+                try:
+                    proc.kill()
+                except OSError:
+                    pass
+
+    try:
+        proc = subprocess.Popen(
+            list(args),
+            cwd=str(cwd) if cwd else None,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE if stderr_log_path is not None else subprocess.STDOUT,
+        )
+        meter = ProcessMeter(proc)
+        pumps = [_Pump(proc.stdout, _open(log_path), tail_lines, matchers, _stop)]  # type: ignore[arg-type]
+        if stderr_log_path is not None:
+            pumps.append(_Pump(proc.stderr, _open(stderr_log_path), tail_lines, matchers, _stop))  # type: ignore[arg-type]
+        for p in pumps:
+            p.start()
+
+        timed_out = False
+        try:
+            meter.wait(timeout=timeout_sec)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            proc.kill()
+            meter.wait()
+        metrics = meter.finish()
+        # The child is gone: what is left is at most a pipe buffer, unless a grandchild holds the pipe.
+        for p in pumps:
+            p.join(timeout=DRAIN_SEC)
+    finally:
+        for sink in sinks:
+            sink.close()
+
+    rc = 124 if timed_out else (1 if stopped else (proc.returncode or 0))
+    return StreamResult(
+        rc=rc,
+        tail="".join(pumps[0].tail),
+        timed_out=timed_out,
+        stopped_by=stopped[0].name if stopped else None,
+        lines=sum(p.lines for p in pumps),
+        bytes=sum(p.bytes for p in pumps),
+        log_path=str(log_path) if log_path is not None else None,
+        stderr_tail="".join(pumps[1].tail) if len(pumps) > 1 else "",
+        metrics=metrics,
+    )
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch helpers for per-task validators.
+
+Why:
+  audit_acceptance_gates_bulk.py used to start validate_acceptance_refs.py and
+  validate_acceptance_anchors.py once per task (two interpreters and three JSON
+  parses per task). The validators now expose `validate_tasks(task_ids, ...)`,
+  which validates a chunk of tasks in one process against the shared
+  TaskmasterStore; this module resolves task id lists and optionally spreads
+  chunks over a process pool.
+
+Contract:
+  - A chunk function takes list[str] task ids and returns one result per id,
+    in the same order. It must be a module-level function (or a
+    functools.partial of one) so it can be pickled for the process pool.
+  - Per-task reports are written by the validator exactly as in single-task mode.
+"""
+
+from __future__ import annotations
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+from taskmaster_store_lib import TaskmasterStore
+
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class TaskGateResult:
+    task_id: str
+    rc: int
+    out: str  # what the single-task CLI would have printed (stdout + traceback)
+    report_path: str
+
+
+def parse_task_ids(spec: str, *, store: TaskmasterStore) -> list[str]:
+    """
+    "all" -> every taskmaster_id present in tasks_back/tasks_gameplay; otherwise a
+    comma/space separated list (order kept, duplicates dropped).
+    """
+    spec = str(spec or "").strip()
+    if spec.lower() == "all":
+        return [str(tid) for tid in store.taskmaster_ids()]
+    out: list[str] = []
+    for token in re.split(r"[,\s]+", spec):
+        if token and token not in out:
+            out.append(token)
+    return out
+
+
+def run_chunked(fn: Callable[[list[str]], list[T]], task_ids: list[str], *, workers: int = 1) -> list[T]:
+    """
+    Runs `fn` over `task_ids` in-process (workers<=1) or split round-robin over a
+    process pool. Results are returned in `task_ids` order either way.
+    """
+    ids = list(task_ids)
+    if workers <= 1 or len(ids) <= 1:
+        return fn(ids)
+
+    n = min(int(workers), len(ids))
+    chunks = [ids[i::n] for i in range(n)]
+    with ProcessPoolExecutor(max_workers=n) as pool:
+        parts = list(pool.map(fn, chunks))
+
+    by_id: dict[str, T] = {}
+    for chunk, part in zip(chunks, parts):
+        by_id.update(zip(chunk, part))
+    return [by_id[tid] for tid in ids]
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 from pathlib import Path
 
 import check_tasks_all_refs
 import check_tasks_back_references
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
     root = Path(__file__).resolve().parents[2]
 
     # 1) Backlog-only check for tasks_back.json (taskmaster_exported != true).
@@ -14,9 +16,8 @@ def main() -> None:
     # 2) Full check for tasks_back.json + tasks_gameplay.json.
     ok_all = check_tasks_all_refs.run_check_all(root)
 
-    if not (ok_backlog and ok_all):
-        raise SystemExit(1)
+    return 0 if (ok_backlog and ok_all) else 1
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memoized, indexed access to the Taskmaster triplet files.
+
+Why:
+  sc scripts and the scripts/python validators each re-read and re-parse
+  tasks.json / tasks_back.json / tasks_gameplay.json and look up view tasks
+  with a linear scan per call. Bulk audits over all tasks therefore paid
+  O(tasks x view size) plus repeated JSON parsing; with in-process gates the
+  same files were also parsed once per gate.
+
+Design:
+  - One TaskmasterStore per (tasks.json, tasks_back.json, tasks_gameplay.json)
+    path tuple per process (see get_store()).
+  - Each file is parsed once and re-parsed only when its (mtime_ns, size) changes.
+  - Indexes: master tasks by str(id); view tasks by int taskmaster_id
+    (first occurrence wins, matching the previous linear scans).
+
+Contract:
+  Returned dicts/lists are shared between callers. Treat them as read-only;
+  scripts that rewrite task files must load their own copy (load_json).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def default_paths(root: Path | None = None) -> tuple[Path, Path, Path]:
+    base = (root or repo_root()) / ".taskmaster" / "tasks"
+    return (base / "tasks.json", base / "tasks_back.json", base / "tasks_gameplay.json")
+
+
+def load_json(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@dataclass(frozen=True)
+class TaskTriplet:
+    task_id: str
+    master: dict[str, Any] | None
+    back: dict[str, Any] | None
+    gameplay: dict[str, Any] | None
+
+
+class _CachedJson:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._stamp: tuple[int, int] | None = None
+        self._value: Any = None
+        self.loads = 0
+
+    def stamp(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self) -> tuple[Any, bool]:
+        """Returns (value, reloaded); value is None when the file is missing."""
+        stamp = self.stamp()
+        if self.loads and stamp == self._stamp:
+            return self._value, False
+        self._value = load_json(self.path) if stamp is not None else None
+        self._stamp = stamp
+        self.loads += 1
+        return self._value, True
+
+
+def _index_view(view: Any) -> dict[int, dict[str, Any]]:
+    index: dict[int, dict[str, Any]] = {}
+    if not isinstance(view, list):
+        return index
+    for t in view:
+        if not isinstance(t, dict):
+            continue
+        tid = t.get("taskmaster_id")
+        if isinstance(tid, int) and not isinstance(tid, bool) and tid not in index:
+            index[tid] = t
+    return index
+
+
+def _as_int_id(task_id: Any) -> int | None:
+    try:
+        return int(str(task_id).strip())
+    except ValueError:
+        return None
+
+
+class TaskmasterStore:
+    def __init__(self, tasks_json_path: Path, tasks_back_path: Path, tasks_gameplay_path: Path) -> None:
+        self.tasks_json_path = tasks_json_path
+        self.tasks_back_path = tasks_back_path
+        self.tasks_gameplay_path = tasks_gameplay_path
+        self._lock = threading.RLock()
+        self._tasks = _CachedJson(tasks_json_path)
+        self._back = _CachedJson(tasks_back_path)
+        self._gameplay = _CachedJson(tasks_gameplay_path)
+        self._master_index: dict[str, dict[str, Any]] = {}
+        self._back_index: dict[int, dict[str, Any]] = {}
+        self._gameplay_index: dict[int, dict[str, Any]] = {}
+
+    # --- raw documents
+
+    def tasks_json(self) -> dict[str, Any]:
+        with self._lock:
+            value, reloaded = self._tasks.get()
+            if value is None:
+                raise FileNotFoundError(f"tasks.json not found: {self.tasks_json_path}")
+            if reloaded:
+                self._master_index = {}
+                for t in iter_master_tasks(value):
+                    self._master_index.setdefault(str(t.get("id")), t)
+            return value
+
+    def back_view(self) -> Any:
+        """Parsed tasks_back.json (normally a list) or None when the file is missing."""
+        with self._lock:
+            value, reloaded = self._back.get()
+            if reloaded:
+                self._back_index = _index_view(value)
+            return value
+
+    def gameplay_view(self) -> Any:
+        """Parsed tasks_gameplay.json (normally a list) or None when the file is missing."""
+        with self._lock:
+            value, reloaded = self._gameplay.get()
+            if reloaded:
+                self._gameplay_index = _index_view(value)
+            return value
+
+    # --- lookups
+
+    def master_tasks(self) -> list[dict[str, Any]]:
+        return iter_master_tasks(self.tasks_json())
+
+    def master_task(self, task_id: Any) -> dict[str, Any] | None:
+        with self._lock:
+            self.tasks_json()
+            return self._master_index.get(str(task_id))
+
+    def back_task(self, task_id: Any) -> dict[str, Any] | None:
+        tid = _as_int_id(task_id)
+        with self._lock:
+            self.back_view()
+            return self._back_index.get(tid) if tid is not None else None
+
+    def gameplay_task(self, task_id: Any) -> dict[str, Any] | None:
+        tid = _as_int_id(task_id)
+        with self._lock:
+            self.gameplay_view()
+            return self._gameplay_index.get(tid) if tid is not None else None
+
+    def current_task_id(self) -> str:
+        for t in self.master_tasks():
+            if str(t.get("status")) == "in-progress":
+                return str(t.get("id"))
+        raise ValueError("No task with status=in-progress found in tasks.json")
+
+    def taskmaster_ids(self) -> list[int]:
+        """Sorted union of taskmaster_id values present in tasks_back/tasks_gameplay."""
+        with self._lock:
+            self.back_view()
+            self.gameplay_view()
+            return sorted(set(self._back_index) | set(self._gameplay_index))
+
+    def triplet(self, task_id: Any) -> TaskTriplet:
+        tid = str(task_id).strip()
+        return TaskTriplet(
+            task_id=tid,
+            master=self.master_task(tid),
+            back=self.back_task(tid),
+            gameplay=self.gameplay_task(tid),
+        )
+
+
+def iter_master_tasks(tasks_json: dict[str, Any]) -> list[dict[str, Any]]:
+    master = tasks_json.get("master") or {}
+    tasks = master.get("tasks") or []
+    if not isinstance(tasks, list):
+        return []
+    return [t for t in tasks if isinstance(t, dict)]
+
+
+_STORES: dict[tuple[Path, Path, Path], TaskmasterStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store(
+    root: Path | None = None,
+    *,
+    tasks_json_path: Path | None = None,
+    tasks_back_path: Path | None = None,
+    tasks_gameplay_path: Path | None = None,
+) -> TaskmasterStore:
+    d_tasks, d_back, d_gameplay = default_paths(root)
+    key = (
+        Path(tasks_json_path or d_tasks).resolve(),
+        Path(tasks_back_path or d_back).resolve(),
+        Path(tasks_gameplay_path or d_gameplay).resolve(),
+    )
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = TaskmasterStore(*key)
+            _STORES[key] = store
+        return store
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test impact CLI: print the dotnet --filter / GdUnit suite list affected by a change.
+
+Usage (Windows):
+  # Uncommitted changes (working tree + untracked) vs HEAD
+  py -3 scripts/python/test_impact.py
+
+  # Everything on this branch vs main, as JSON
+  py -3 scripts/python/test_impact.py --base main --out logs/ci/test-impact.json
+
+  # Only the dotnet filter expression (empty when no .NET test is affected)
+  py -3 scripts/python/test_impact.py --format dotnet-filter
+
+See test_impact_lib.py for the graph and the full-run rules. sc-test uses the same
+selection with `py -3 scripts/sc/test.py --type unit --impact`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from artifact_catalog_lib import KIND_COBERTURA, find_artifact
+from test_impact_lib import changed_files, gdunit_add_args, repo_root, select_tests
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Select the .NET test classes and GdUnit suites affected by changed files.")
+    ap.add_argument("--base", default="HEAD", help="Diff base (default HEAD: uncommitted changes only)")
+    ap.add_argument("--files", nargs="*", default=None, help="Explicit changed files (repo-relative); skips git")
+    ap.add_argument("--cobertura", default=None, help="Cobertura report for the coverage guard (default: latest registered)")
+    ap.add_argument("--format", choices=["json", "dotnet-filter", "gdunit-args"], default="json")
+    ap.add_argument("--out", default=None, help="Also write the JSON selection here")
+    args = ap.parse_args(argv)
+
+    root = repo_root()
+    changed = [f.replace("\\", "/") for f in args.files] if args.files is not None else changed_files(root, args.base)
+    cobertura = Path(args.cobertura) if args.cobertura else find_artifact(KIND_COBERTURA)
+    sel = select_tests(changed, root=root, cobertura=cobertura)
+    payload = {**sel.to_json(), "base": args.base, "cobertura": str(cobertura).replace("\\", "/") if cobertura else None}
+
+    if args.out:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    if args.format == "dotnet-filter":
+        print(sel.dotnet_filter if sel.mode == "impacted" else "")
+    elif args.format == "gdunit-args":
+        print(" ".join(gdunit_add_args(sel.gdunit_suites)) if sel.mode == "impacted" else "")
+    else:
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test impact analysis: map changed files to the .NET test classes and GdUnit suites
+that can observe them.
+
+Why:
+  sc-test always ran the full `dotnet test Game.sln` plus the fixed GdUnit directory
+  set, so a one-line change in Game.Core paid for the whole suite in the inner loop.
+
+Graph (built from the working tree, stdlib only):
+  - C#: each file declares types (class/record/struct/interface/enum) in a namespace.
+    File A depends on file B when A mentions a type declared in B and B's namespace is
+    visible from A (same/enclosing namespace, `using`, `using static`, `global using`,
+    or a fully qualified mention).
+  - Godot: .gd/.tscn/.tres files depend on every `res://` path they mention (res:// is
+    resolved against both the repo root and Tests.Godot/, whose Game.Godot/ is a mirror),
+    and .gd suites also depend on C# types they name (e.g. ClassDB.instantiate("SqliteDataStore")).
+  - Affected = changed files plus everything that transitively depends on them.
+
+Selection:
+  - dotnet: test classes declared in affected files under Game.Core.Tests/ ->
+    `--filter "FullyQualifiedName~Ns.Class.|..."`.
+  - GdUnit: affected test_*.gd suites under Tests.Godot/tests/ -> `-a tests/...` list.
+  - Coverage safety net: coverlet's cobertura report is aggregate (not per test), so it
+    is used as a guard: a changed C# file that the last cobertura report shows as
+    executed but that the graph maps to no test class (reflection/DI wiring) forces a
+    full unit run instead of silently selecting nothing.
+  - Full runs are forced when build inputs change (*.csproj, *.sln, *.props, *.targets,
+    global.json, project.godot, addons/), when git cannot produce a diff, or when the
+    selection would cover most of the suite anyway.
+"""
+
+from __future__ import annotations
+
+import re
+import subprocess
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+
+DOTNET_TEST_ROOTS = ("Game.Core.Tests/",)
+GDUNIT_TEST_PROJECT = "Tests.Godot"
+GDUNIT_TEST_ROOT = "Tests.Godot/tests/"
+GRAPH_EXTS = frozenset({".cs", ".gd", ".tscn", ".tres"})
+EXCLUDED_DIRS = frozenset({".git", ".godot", "bin", "obj", "logs", "TestResults", "addons", ".export_exclude"})
+FULL_RUN_SUFFIXES = (".csproj", ".sln", ".props", ".targets")
+FULL_RUN_NAMES = frozenset({"global.json", "project.godot", "Directory.Build.props", "Directory.Build.targets", "nuget.config"})
+FULL_RUN_PREFIXES = ("Tests.Godot/addons/", "addons/")
+DEFAULT_FULL_RATIO = 0.6
+
+NAMESPACE_RE = re.compile(r"^\s*namespace\s+([A-Za-z_][\w.]*)", re.MULTILINE)
+TYPE_DECL_RE = re.compile(r"\b(?:class|record|struct|interface|enum)\s+(?:struct\s+|class\s+)?([A-Za-z_][A-Za-z0-9_]*)")
+USING_RE = re.compile(r"^\s*(global\s+)?using\s+(static\s+)?(?:[A-Za-z_]\w*\s*=\s*)?([A-Za-z_][\w.]*)\s*;", re.MULTILINE)
+IDENT_RE = re.compile(r"\b[A-Z][A-Za-z0-9_]*\b")
+QUALIFIED_RE = re.compile(r"\b((?:[A-Za-z_]\w*\.)+)([A-Z][A-Za-z0-9_]*)\b")
+RES_PATH_RE = re.compile(r"res://([^\"'\s)\]]+)")
+TEST_ATTR_RE = re.compile(r"\[\s*(?:Fact|Theory)\b")
+COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class CsFile:
+    rel: str
+    namespace: str
+    types: list[str]
+    usings: set[str]
+    global_usings: set[str]
+    idents: set[str]
+    qualified: set[tuple[str, str]]
+    is_test: bool
+
+
+@dataclass
+class ImpactSelection:
+    mode: str  # impacted | full | none
+    changed: list[str]
+    reasons: list[str] = field(default_factory=list)
+    affected_files: int = 0
+    dotnet_classes: list[str] = field(default_factory=list)
+    dotnet_total_classes: int = 0
+    gdunit_suites: list[str] = field(default_factory=list)
+    gdunit_total_suites: int = 0
+
+    @property
+    def dotnet_filter(self) -> str:
+        return "|".join(f"FullyQualifiedName~{c}." for c in self.dotnet_classes)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "changed": self.changed,
+            "reasons": self.reasons,
+            "affected_files": self.affected_files,
+            "dotnet": {"classes": self.dotnet_classes, "total_classes": self.dotnet_total_classes, "filter": self.dotnet_filter},
+            "gdunit": {"suites": self.gdunit_suites, "total_suites": self.gdunit_total_suites},
+        }
+
+
+# --- changed files
+
+
+def changed_files(root: Path, base: str = "HEAD") -> list[str] | None:
+    """Files changed vs `base` (committed range + working tree + untracked); None when git fails."""
+    out: set[str] = set()
+    cmds = [["git", "diff", "--name-only", base], ["git", "ls-files", "--others", "--exclude-standard"]]
+    if base != "HEAD":
+        cmds.append(["git", "diff", "--name-only", f"{base}...HEAD"])
+    for cmd in cmds:
+        try:
+            proc = subprocess.run(cmd, cwd=root, capture_output=True, text=True, encoding="utf-8", errors="ignore", timeout=60)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if proc.returncode != 0:
+            return None
+        out.update(line.strip().replace("\\", "/") for line in proc.stdout.splitlines() if line.strip())
+    return sorted(out)
+
+
+# --- graph
+
+
+def _walk(root: Path) -> Iterable[tuple[str, Path]]:
+    for p in sorted(root.rglob("*")):
+        if p.suffix.lower() not in GRAPH_EXTS or not p.is_file():
+            continue
+        rel = p.relative_to(root)
+        if any(part in EXCLUDED_DIRS for part in rel.parts[:-1]):
+            continue
+        yield rel.as_posix(), p
+
+
+def parse_cs(rel: str, text: str) -> CsFile:
+    code = COMMENT_RE.sub(" ", text)
+    m = NAMESPACE_RE.search(code)
+    usings: set[str] = set()
+    global_usings: set[str] = set()
+    for g, static, name in USING_RE.findall(code):
+        ns = name.rsplit(".", 1)[0] if static else name
+        (global_usings if g else usings).add(ns)
+        if static:
+            usings.add(name)  # `using static Ns.Type` also makes Ns.Type's nested types visible
+    return CsFile(
+        rel=rel,
+        namespace=m.group(1) if m else "",
+        types=sorted(set(TYPE_DECL_RE.findall(code))),
+        usings=usings,
+        global_usings=global_usings,
+        idents=set(IDENT_RE.findall(code)),
+        qualified={(q.rstrip("."), t) for q, t in QUALIFIED_RE.findall(code)},
+        is_test=rel.startswith(DOTNET_TEST_ROOTS) and bool(TEST_ATTR_RE.search(code)),
+    )
+
+
+def _visible(user: CsFile, decl_ns: str, type_name: str, global_usings: set[str]) -> bool:
+    ns = user.namespace
+    if decl_ns == ns or not decl_ns or ns.startswith(decl_ns + "."):
+        return True
+    if decl_ns in user.usings or decl_ns in global_usings:
+        return True
+    return any(q == decl_ns or q.endswith("." + decl_ns) for q, t in user.qualified if t == type_name)
+
+
+@dataclass
+class ImpactGraph:
+    cs: dict[str, CsFile]
+    deps: dict[str, set[str]]  # file -> files it depends on
+    gd_suites: list[str]
+
+    def dependents(self) -> dict[str, set[str]]:
+        rev: dict[str, set[str]] = {}
+        for src, targets in self.deps.items():
+            for t in targets:
+                rev.setdefault(t, set()).add(src)
+        return rev
+
+    def affected(self, changed: Iterable[str]) -> set[str]:
+        rev = self.dependents()
+        seen = set(changed)
+        stack = list(seen)
+        while stack:
+            for dep in rev.get(stack.pop(), ()):
+                if dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        return seen
+
+    def dotnet_test_classes(self, files: Iterable[str] | None = None) -> list[str]:
+        out: set[str] = set()
+        for rel in self.cs if files is None else files:
+            f = self.cs.get(rel)
+            if f and f.is_test:
+                out.update(f"{f.namespace}.{t}" if f.namespace else t for t in f.types)
+        return sorted(out)
+
+
+def _res_targets(res_rel: str, known: set[str]) -> set[str]:
+    """res:// paths resolve against the repo root and the Tests.Godot project."""
+    return {c for c in (res_rel, f"{GDUNIT_TEST_PROJECT}/{res_rel}") if c in known}
+
+
+def build_graph(root: Path) -> ImpactGraph:
+    texts: dict[str, str] = {}
+    for rel, p in _walk(root):
+        try:
+            texts[rel] = p.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            continue
+    known = set(texts)
+
+    cs = {rel: parse_cs(rel, t) for rel, t in texts.items() if rel.endswith(".cs")}
+    global_usings: set[str] = set().union(*(f.global_usings for f in cs.values())) if cs else set()
+    declared: dict[str, list[CsFile]] = {}
+    for f in cs.values():
+        for t in f.types:
+            declared.setdefault(t, []).append(f)
+
+    deps: dict[str, set[str]] = {rel: set() for rel in texts}
+    for f in cs.values():
+        for ident in f.idents & declared.keys():
+            for d in declared[ident]:
+                if d.rel != f.rel and _visible(f, d.namespace, ident, global_usings):
+                    deps[f.rel].add(d.rel)
+
+    for rel, text in texts.items():
+        if rel.endswith(".cs"):
+            continue
+        for res_rel in RES_PATH_RE.findall(text):
+            deps[rel] |= _res_targets(res_rel, known)
+        if rel.endswith(".gd"):
+            # Suites reach C# nodes by class name (ClassDB.instantiate("SqliteDataStore")).
+            for ident in set(IDENT_RE.findall(text)) & declared.keys():
+                deps[rel].update(d.rel for d in declared[ident] if not d.rel.startswith(DOTNET_TEST_ROOTS))
+
+    suites = sorted(rel for rel in texts if rel.startswith(GDUNIT_TEST_ROOT) and Path(rel).name.startswith("test_") and rel.endswith(".gd"))
+    return ImpactGraph(cs=cs, deps=deps, gd_suites=suites)
+
+
+# --- coverage guard
+
+
+def covered_sources(cobertura: Path) -> set[str]:
+    """Posix source paths (suffix match) with at least one executed line in a cobertura report."""
+    out: set[str] = set()
+    try:
+        tree = ET.parse(cobertura)
+    except (OSError, ET.ParseError):
+        return out
+    for cls in tree.getroot().iter("class"):
+        filename = str(cls.attrib.get("filename") or "").replace("\\", "/")
+        if not filename:
+            continue
+        if any(int(line.attrib.get("hits", "0") or 0) > 0 for line in cls.iter("line")):
+            out.add(filename)
+    return out
+
+
+def _is_covered(rel: str, covered: set[str]) -> bool:
+    return any(c == rel or c.endswith("/" + rel) or rel.endswith("/" + c) for c in covered)
+
+
+# --- selection
+
+
+def _full_run_reason(path: str) -> str | None:
+    name = Path(path).name
+    if path.endswith(FULL_RUN_SUFFIXES) or name in FULL_RUN_NAMES:
+        return f"build input changed: {path}"
+    if path.startswith(FULL_RUN_PREFIXES):
+        return f"test framework changed: {path}"
+    return None
+
+
+def select_tests(
+    changed: list[str] | None,
+    *,
+    root: Path | None = None,
+    cobertura: Path | None = None,
+    full_ratio: float = DEFAULT_FULL_RATIO,
+    graph: ImpactGraph | None = None,
+) -> ImpactSelection:
+    root = root or repo_root()
+    if changed is None:
+        return ImpactSelection(mode="full", changed=[], reasons=["git diff unavailable"])
+    sel = ImpactSelection(mode="impacted", changed=list(changed))
+    sel.reasons.extend(r for r in (_full_run_reason(p) for p in changed) if r)
+    sel.reasons.extend(f"source deleted: {p}" for p in changed if p.endswith(".cs") and not (root / p).exists())
+    if sel.reasons:
+        sel.mode = "full"
+        return sel
+
+    graph = graph or build_graph(root)
+    affected = graph.affected(p for p in changed if p in graph.deps)
+    sel.affected_files = len(affected)
+    sel.dotnet_classes = graph.dotnet_test_classes(affected)
+    sel.dotnet_total_classes = len(graph.dotnet_test_classes())
+    sel.gdunit_suites = sorted(s for s in graph.gd_suites if s in affected)
+    sel.gdunit_total_suites = len(graph.gd_suites)
+
+    if cobertura is not None and cobertura.is_file():
+        covered = covered_sources(cobertura)
+        for p in changed:
+            if not p.endswith(".cs") or p.startswith(DOTNET_TEST_ROOTS) or p not in graph.cs:
+                continue
+            reached = graph.dotnet_test_classes(graph.affected([p]))
+            if not reached and _is_covered(p, covered):
+                sel.reasons.append(f"covered by tests but unreachable in the reference graph: {p}")
+        if sel.reasons:
+            sel.mode = "full"
+            return sel
+
+    total = sel.dotnet_total_classes + sel.gdunit_total_suites
+    picked = len(sel.dotnet_classes) + len(sel.gdunit_suites)
+    if total and picked / total >= full_ratio:
+        sel.mode = "full"
+        sel.reasons.append(f"selection covers {picked}/{total} test classes/suites (>= {full_ratio:.0%})")
+    elif picked == 0:
+        sel.mode = "none"
+    return sel
+
+
+def gdunit_add_args(suites: Iterable[str]) -> list[str]:
+    """Tests.Godot/tests/X/test_y.gd -> ["--add", "tests/X/test_y.gd", ...] for run_gdunit.py."""
+    out: list[str] = []
+    prefix = GDUNIT_TEST_PROJECT + "/"
+    for s in suites:
+        out += ["--add", s[len(prefix):] if s.startswith(prefix) else s]
+    return out
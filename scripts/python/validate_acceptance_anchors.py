@@ -18,17 +18,25 @@ Notes:
 
 Usage (Windows):
   py -3 scripts/python/validate_acceptance_anchors.py --task-id 11 --stage refactor --out logs/ci/<date>/.../acceptance-anchors.json
+
+Batch mode (one process, optional process pool):
+  py -3 scripts/python/validate_acceptance_anchors.py --task-ids all --stage refactor --out-dir logs/ci/<date>/audit-acceptance-gates --workers 4
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import re
+import traceback
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from task_batch_lib import TaskGateResult, parse_task_ids, run_chunked
+from taskmaster_store_lib import TaskmasterStore, get_store
+
 
 REFS_RE = re.compile(r"\bRefs\s*:\s*(.+)$", flags=re.IGNORECASE)
 XUNIT_MARKER_RE = re.compile(r"^\s*\[\s*(Fact|Theory)\s*\]\s*$")
@@ -39,38 +47,11 @@ def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def load_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def write_json(path: Path, payload: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8", newline="\n")
 
 
-def resolve_current_task_id(tasks_json: dict[str, Any]) -> str:
-    tasks = (tasks_json.get("master") or {}).get("tasks") or []
-    for t in tasks:
-        if not isinstance(t, dict):
-            continue
-        if str(t.get("status")) == "in-progress":
-            return str(t.get("id"))
-    raise ValueError("No task with status=in-progress found in tasks.json")
-
-
-def find_view_task(view: list[dict[str, Any]], task_id: str) -> dict[str, Any] | None:
-    try:
-        tid_int = int(str(task_id))
-    except ValueError:
-        return None
-    for t in view:
-        if not isinstance(t, dict):
-            continue
-        if t.get("taskmaster_id") == tid_int:
-            return t
-    return None
-
-
 def _split_refs_blob(blob: str) -> list[str]:
     normalized = str(blob or "").replace("`", " ").replace(",", " ").replace(";", " ")
     out: list[str] = []
@@ -120,7 +101,31 @@ def _is_anchor_bound_to_test(lines: list[str], anchor: str, *, max_lines_after_a
     return False
 
 
-def validate_view_entry(*, root: Path, view_name: str, task_id: str, entry: dict[str, Any], stage: str) -> dict[str, Any]:
+def _read_text(p: Path, cache: dict[Path, str] | None) -> str:
+    if cache is not None and p in cache:
+        return cache[p]
+    try:
+        t = p.read_text(encoding="utf-8", errors="ignore")
+    except Exception:  # noqa: BLE001
+        t = ""
+    if cache is not None:
+        cache[p] = t
+    return t
+
+
+def validate_view_entry(
+    *,
+    root: Path,
+    view_name: str,
+    task_id: str,
+    entry: dict[str, Any],
+    stage: str,
+    text_cache: dict[Path, str] | None = None,
+) -> dict[str, Any]:
+    """
+    text_cache: optional path -> text memo shared across tasks in batch mode
+    (test files are typically referenced by many acceptance items).
+    """
     acceptance = entry.get("acceptance") or []
     if not isinstance(acceptance, list):
         return {"view": view_name, "status": "skipped", "reason": "acceptance_not_list", "items": []}
@@ -180,10 +185,7 @@ def validate_view_entry(*, root: Path, view_name: str, task_id: str, entry: dict
         found_in: list[str] = []
         bound_in: list[str] = []
         for p in existing_files:
-            try:
-                t = p.read_text(encoding="utf-8", errors="ignore")
-            except Exception:  # noqa: BLE001
-                t = ""
+            t = _read_text(p, text_cache)
             if anchor in t:
                 rel = str(p.relative_to(root)).replace("\\", "/")
                 found_in.append(rel)
@@ -236,43 +238,97 @@ def validate_view_entry(*, root: Path, view_name: str, task_id: str, entry: dict
     return {"view": view_name, "status": status, "items": items, "errors": errors}
 
 
-def main() -> int:
-    ap = argparse.ArgumentParser(description="Validate acceptance anchors for one task.")
-    ap.add_argument("--task-id", default=None, help="Task id (e.g. 11). Default: first status=in-progress in tasks.json.")
-    ap.add_argument("--stage", choices=["red", "green", "refactor"], required=True)
-    ap.add_argument("--out", required=True, help="Output JSON path.")
-    args = ap.parse_args()
-
-    root = repo_root()
-    tasks_json = load_json(root / ".taskmaster/tasks/tasks.json")
-    task_id = str(args.task_id or "").strip() or resolve_current_task_id(tasks_json)
-
-    back_view = load_json(root / ".taskmaster/tasks/tasks_back.json")
-    gameplay_view = load_json(root / ".taskmaster/tasks/tasks_gameplay.json")
-    if not isinstance(back_view, list) or not isinstance(gameplay_view, list):
+def validate_task(
+    *,
+    root: Path,
+    store: TaskmasterStore,
+    task_id: str,
+    stage: str,
+    text_cache: dict[Path, str] | None = None,
+) -> dict[str, Any]:
+    if not isinstance(store.back_view(), list) or not isinstance(store.gameplay_view(), list):
         raise ValueError("Expected tasks_back.json/tasks_gameplay.json to be JSON arrays")
 
-    back_entry = find_view_task(back_view, task_id)
-    game_entry = find_view_task(gameplay_view, task_id)
+    back_entry = store.back_task(task_id)
+    game_entry = store.gameplay_task(task_id)
 
     results: list[dict[str, Any]] = []
-    if back_entry is not None:
-        results.append(validate_view_entry(root=root, view_name="back", task_id=task_id, entry=back_entry, stage=args.stage))
-    if game_entry is not None:
-        results.append(validate_view_entry(root=root, view_name="gameplay", task_id=task_id, entry=game_entry, stage=args.stage))
+    for view_name, entry in (("back", back_entry), ("gameplay", game_entry)):
+        if entry is not None:
+            results.append(
+                validate_view_entry(root=root, view_name=view_name, task_id=task_id, entry=entry, stage=stage, text_cache=text_cache)
+            )
 
     if not results:
-        payload = {"status": "fail", "task_id": task_id, "stage": args.stage, "error": "task_not_found_in_any_view"}
-        write_json(Path(args.out), payload)
-        print(f"ACCEPTANCE_ANCHORS status=fail task_id={task_id} stage={args.stage} errors=1")
-        return 1
+        return {"status": "fail", "task_id": task_id, "stage": stage, "error": "task_not_found_in_any_view"}
 
     errors = sum(len(r.get("errors") or []) for r in results)
     status = "ok" if errors == 0 else "fail"
-    payload = {"status": status, "task_id": task_id, "stage": args.stage, "views": results, "errors": errors}
-    write_json(Path(args.out), payload)
-    print(f"ACCEPTANCE_ANCHORS status={status} task_id={task_id} stage={args.stage} errors={errors}")
-    return 0 if status == "ok" else 1
+    return {"status": status, "task_id": task_id, "stage": stage, "views": results, "errors": errors}
+
+
+def write_report(payload: dict[str, Any], out_path: Path) -> tuple[int, str]:
+    """Writes the per-task report; returns (rc, summary line)."""
+    write_json(out_path, payload)
+    errors = payload["errors"] if "views" in payload else 1
+    line = f"ACCEPTANCE_ANCHORS status={payload['status']} task_id={payload['task_id']} stage={payload['stage']} errors={errors}"
+    return (0 if payload["status"] == "ok" else 1), line
+
+
+def validate_tasks(task_ids: list[str], *, stage: str, out_dir: str) -> list[TaskGateResult]:
+    """
+    Batch mode: validates `task_ids` in this process and writes
+    <out_dir>/task-<id>/acceptance-anchors.json per task (same content as single-task mode).
+    """
+    root = repo_root()
+    store = get_store(root)
+    text_cache: dict[Path, str] = {}
+    results: list[TaskGateResult] = []
+    for task_id in task_ids:
+        out_path = Path(out_dir) / f"task-{task_id}" / "acceptance-anchors.json"
+        try:
+            payload = validate_task(root=root, store=store, task_id=task_id, stage=stage, text_cache=text_cache)
+            rc, line = write_report(payload, out_path)
+            out = line + "\n"
+        except Exception:  # noqa: BLE001
+            rc, out = 1, traceback.format_exc()
+        results.append(TaskGateResult(task_id=task_id, rc=rc, out=out, report_path=str(out_path)))
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Validate acceptance anchors for one task (or many with --task-ids).")
+    ap.add_argument("--task-id", default=None, help="Task id (e.g. 11). Default: first status=in-progress in tasks.json.")
+    ap.add_argument("--task-ids", default=None, help="Batch mode: comma-separated task ids or 'all' (requires --out-dir).")
+    ap.add_argument("--stage", choices=["red", "green", "refactor"], required=True)
+    ap.add_argument("--out", default=None, help="Output JSON path (single-task mode).")
+    ap.add_argument("--out-dir", default=None, help="Batch mode: writes <out-dir>/task-<id>/acceptance-anchors.json.")
+    ap.add_argument("--workers", type=int, default=1, help="Batch mode: process pool size (default 1 = in-process).")
+    args = ap.parse_args(argv)
+
+    root = repo_root()
+    store = get_store(root)
+
+    if args.task_ids:
+        if not args.out_dir:
+            ap.error("--task-ids requires --out-dir")
+        task_ids = parse_task_ids(args.task_ids, store=store)
+        fn = functools.partial(validate_tasks, stage=args.stage, out_dir=str(Path(args.out_dir).resolve()))
+        batch = run_chunked(fn, task_ids, workers=int(args.workers))
+        for r in batch:
+            print(r.out, end="")
+        failed = sum(1 for r in batch if r.rc != 0)
+        print(f"ACCEPTANCE_ANCHORS_BATCH tasks={len(batch)} failed={failed} stage={args.stage}")
+        return 0 if failed == 0 else 1
+
+    if not args.out:
+        ap.error("--out is required (or use --task-ids with --out-dir)")
+
+    task_id = str(args.task_id or "").strip() or store.current_task_id()
+    payload = validate_task(root=root, store=store, task_id=task_id, stage=args.stage)
+    rc, line = write_report(payload, Path(args.out))
+    print(line)
+    return rc
 
 
 if __name__ == "__main__":
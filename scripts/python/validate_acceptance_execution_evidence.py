@@ -10,6 +10,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from artifact_catalog_lib import KIND_GDUNIT_RESULTS_XML, KIND_TRX, find_artifact
+from taskmaster_store_lib import get_store
+
 
 REFS_RE = re.compile(r"\bRefs\s*:\s*(.+)$", flags=re.IGNORECASE)
 CS_FACT_RE = re.compile(r"^\s*\[\s*(Fact|Theory)\s*\]\s*$")
@@ -49,29 +52,6 @@ def parse_refs_from_line(line: str) -> list[str]:
     return _split_refs_blob(m.group(1) or "")
 
 
-def resolve_current_task_id(tasks_json: dict[str, Any]) -> str:
-    tasks = (tasks_json.get("master") or {}).get("tasks") or []
-    for t in tasks:
-        if not isinstance(t, dict):
-            continue
-        if str(t.get("status")) == "in-progress":
-            return str(t.get("id"))
-    raise ValueError("No task with status=in-progress found in tasks.json")
-
-
-def find_view_task(view: list[dict[str, Any]], task_id: str) -> dict[str, Any] | None:
-    try:
-        tid_int = int(str(task_id))
-    except ValueError:
-        return None
-    for t in view:
-        if not isinstance(t, dict):
-            continue
-        if t.get("taskmaster_id") == tid_int:
-            return t
-    return None
-
-
 def load_sc_test_summary(root: Path, date: str) -> dict[str, Any]:
     p = root / "logs" / "ci" / date / "sc-test" / "summary.json"
     return load_json(p) if p.exists() else {}
@@ -84,9 +64,12 @@ def get_step(summary: dict[str, Any], name: str) -> dict[str, Any] | None:
     return None
 
 
-def find_latest_trx(unit_dir: Path) -> Path | None:
+def find_latest_trx(unit_dir: Path, *, run_id: str | None = None) -> Path | None:
     if not unit_dir.exists():
         return None
+    registered = find_artifact(KIND_TRX, run_id=run_id, under=unit_dir)
+    if registered is not None:
+        return registered
     candidates = list(unit_dir.glob("*.trx"))
     if not candidates:
         return None
@@ -104,9 +87,12 @@ def parse_trx_test_names(trx_path: Path) -> set[str]:
     return names
 
 
-def find_latest_gdunit_results_xml(report_dir: Path) -> Path | None:
+def find_latest_gdunit_results_xml(report_dir: Path, *, run_id: str | None = None) -> Path | None:
     if not report_dir.exists():
         return None
+    registered = find_artifact(KIND_GDUNIT_RESULTS_XML, run_id=run_id, under=report_dir)
+    if registered is not None:
+        return registered
     xmls = list(report_dir.rglob("results.xml"))
     if not xmls:
         return None
@@ -282,17 +268,17 @@ def validate_view(
     return {"view": view_name, "status": "ok" if not errors else "fail", "items": items, "errors": errors}
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Validate acceptance executed evidence for one task (TRX/JUnit).")
     ap.add_argument("--task-id", default=None, help="Task id (e.g. 11). Default: first status=in-progress in tasks.json.")
     ap.add_argument("--run-id", required=True, help="Expected sc-test run_id.")
     ap.add_argument("--out", required=True, help="Output JSON path.")
     ap.add_argument("--date", default="", help="Override date for logs lookup (YYYY-MM-DD). Default: today.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     root = repo_root()
-    tasks_json = load_json(root / ".taskmaster/tasks/tasks.json")
-    task_id = str(args.task_id or "").strip() or resolve_current_task_id(tasks_json)
+    store = get_store(root)
+    task_id = str(args.task_id or "").strip() or store.current_task_id()
     date = args.date.strip() or dt.date.today().strftime("%Y-%m-%d")
 
     summary = load_sc_test_summary(root, date)
@@ -321,7 +307,7 @@ def main() -> int:
     unit_dir = Path(unit_step.get("artifacts_dir")) if isinstance(unit_step, dict) and unit_step.get("artifacts_dir") else (root / "logs" / "unit" / date)
     unit_run_id_file = unit_dir / "run_id.txt"
     unit_run_id_value = unit_run_id_file.read_text(encoding="utf-8", errors="ignore").strip() if unit_run_id_file.exists() else None
-    trx = find_latest_trx(unit_dir)
+    trx = find_latest_trx(unit_dir, run_id=args.run_id)
     meta["unit_dir"] = str(unit_dir).replace("\\", "/")
     meta["unit_run_id_file"] = str(unit_run_id_file).replace("\\", "/")
     meta["unit_run_id_value"] = unit_run_id_value
@@ -334,7 +320,7 @@ def main() -> int:
         gd_report_dir = root / "logs" / "e2e" / date / "sc-test" / "gdunit-hard"
     gd_run_id_file = Path(gd_report_dir) / "run_id.txt"
     gd_run_id_value = gd_run_id_file.read_text(encoding="utf-8", errors="ignore").strip() if gd_run_id_file.exists() else None
-    gd_xml = find_latest_gdunit_results_xml(gd_report_dir)
+    gd_xml = find_latest_gdunit_results_xml(Path(gd_report_dir), run_id=args.run_id)
     meta["gd_report_dir"] = str(gd_report_dir).replace("\\", "/")
     meta["gd_run_id_file"] = str(gd_run_id_file).replace("\\", "/")
     meta["gd_run_id_value"] = gd_run_id_value
@@ -356,13 +342,11 @@ def main() -> int:
         if str(gd_run_id_value or "") != args.run_id:
             meta["errors"].append("gdunit_run_id_mismatch_or_missing")
 
-    back_view = load_json(root / ".taskmaster/tasks/tasks_back.json")
-    gameplay_view = load_json(root / ".taskmaster/tasks/tasks_gameplay.json")
-    if not isinstance(back_view, list) or not isinstance(gameplay_view, list):
+    if not isinstance(store.back_view(), list) or not isinstance(store.gameplay_view(), list):
         raise ValueError("Expected tasks_back.json/tasks_gameplay.json to be JSON arrays")
 
-    back_entry = find_view_task(back_view, task_id)
-    game_entry = find_view_task(gameplay_view, task_id)
+    back_entry = store.back_task(task_id)
+    game_entry = store.gameplay_task(task_id)
 
     results: list[dict[str, Any]] = []
     if back_entry is not None:
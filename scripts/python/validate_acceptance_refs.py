@@ -19,17 +19,25 @@ Supported ref format (per acceptance item):
 Usage (Windows):
   py -3 scripts/python/validate_acceptance_refs.py --task-id 11 --stage red --out logs/ci/<date>/.../acceptance-refs.json
   py -3 scripts/python/validate_acceptance_refs.py --task-id 11 --stage refactor --out logs/ci/<date>/.../acceptance-refs.json
+
+Batch mode (one process, optional process pool):
+  py -3 scripts/python/validate_acceptance_refs.py --task-ids all --stage refactor --out-dir logs/ci/<date>/audit-acceptance-gates --workers 4
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
 import re
+import traceback
 from pathlib import Path
 from typing import Any
 
+from task_batch_lib import TaskGateResult, parse_task_ids, run_chunked
+from taskmaster_store_lib import TaskmasterStore, get_store
+
 
 REFS_RE = re.compile(r"\bRefs\s*:\s*(.+)$", flags=re.IGNORECASE)
 
@@ -76,33 +84,6 @@ def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def load_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def resolve_current_task_id(tasks_json: dict[str, Any]) -> str:
-    tasks = (tasks_json.get("master") or {}).get("tasks") or []
-    for t in tasks:
-        if not isinstance(t, dict):
-            continue
-        if str(t.get("status")) == "in-progress":
-            return str(t.get("id"))
-    raise ValueError("No task with status=in-progress found in tasks.json")
-
-
-def find_view_task(view: list[dict[str, Any]], task_id: str) -> dict[str, Any] | None:
-    try:
-        tid_int = int(str(task_id))
-    except ValueError:
-        return None
-    for t in view:
-        if not isinstance(t, dict):
-            continue
-        if t.get("taskmaster_id") == tid_int:
-            return t
-    return None
-
-
 def is_abs_path(p: str) -> bool:
     if not p:
         return False
@@ -232,34 +213,15 @@ def validate_view(
     }
 
 
-def main() -> int:
-    ap = argparse.ArgumentParser(description="Validate acceptance Refs: mapping for one task.")
-    ap.add_argument("--task-id", default=None, help="Task id (e.g. 11). Default: first status=in-progress in tasks.json.")
-    ap.add_argument("--stage", choices=["red", "green", "refactor"], required=True)
-    ap.add_argument("--out", required=True, help="Output JSON path.")
-    args = ap.parse_args()
-
-    root = repo_root()
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-    tasks_json_path = root / ".taskmaster" / "tasks" / "tasks.json"
-    back_path = root / ".taskmaster" / "tasks" / "tasks_back.json"
-    gameplay_path = root / ".taskmaster" / "tasks" / "tasks_gameplay.json"
-
-    tasks_json = load_json(tasks_json_path)
-    task_id = str(args.task_id).strip() if args.task_id else resolve_current_task_id(tasks_json)
-
-    back = load_json(back_path)
-    gameplay = load_json(gameplay_path)
-    if not isinstance(back, list) or not isinstance(gameplay, list):
+def validate_task(*, root: Path, store: TaskmasterStore, task_id: str, stage: str) -> dict[str, Any]:
+    if not isinstance(store.back_view(), list) or not isinstance(store.gameplay_view(), list):
         raise ValueError("tasks_back.json and tasks_gameplay.json must be JSON arrays")
 
-    back_task = find_view_task(back, task_id)
-    gameplay_task = find_view_task(gameplay, task_id)
+    back_task = store.back_task(task_id)
+    gameplay_task = store.gameplay_task(task_id)
 
-    back_report = validate_view(root=root, label="tasks_back.json", entry=back_task, stage=args.stage)
-    game_report = validate_view(root=root, label="tasks_gameplay.json", entry=gameplay_task, stage=args.stage)
+    back_report = validate_view(root=root, label="tasks_back.json", entry=back_task, stage=stage)
+    game_report = validate_view(root=root, label="tasks_gameplay.json", entry=gameplay_task, stage=stage)
 
     errors = []
     errors.extend(back_report.get("errors") or [])
@@ -268,9 +230,9 @@ def main() -> int:
     if back_task is None and gameplay_task is None:
         errors.append("both tasks_back.json and tasks_gameplay.json mapped tasks are missing; at least one view must exist")
 
-    report = {
+    return {
         "task_id": task_id,
-        "stage": args.stage,
+        "stage": stage,
         "status": "ok" if not errors else "fail",
         "errors": errors,
         "views": {
@@ -279,9 +241,70 @@ def main() -> int:
         },
     }
 
+
+def write_report(report: dict[str, Any], out_path: Path) -> tuple[int, str]:
+    """Writes the per-task report; returns (rc, summary line)."""
+    out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8", newline="\n")
-    print(f"ACCEPTANCE_REFS status={report['status']} errors={len(errors)} task_id={task_id} stage={args.stage}")
-    return 0 if report["status"] == "ok" else 1
+    line = (
+        f"ACCEPTANCE_REFS status={report['status']} errors={len(report['errors'])} "
+        f"task_id={report['task_id']} stage={report['stage']}"
+    )
+    return (0 if report["status"] == "ok" else 1), line
+
+
+def validate_tasks(task_ids: list[str], *, stage: str, out_dir: str) -> list[TaskGateResult]:
+    """
+    Batch mode: validates `task_ids` in this process and writes
+    <out_dir>/task-<id>/acceptance-refs.json per task (same content as single-task mode).
+    """
+    root = repo_root()
+    store = get_store(root)
+    results: list[TaskGateResult] = []
+    for task_id in task_ids:
+        out_path = Path(out_dir) / f"task-{task_id}" / "acceptance-refs.json"
+        try:
+            rc, line = write_report(validate_task(root=root, store=store, task_id=task_id, stage=stage), out_path)
+            out = line + "\n"
+        except Exception:  # noqa: BLE001
+            rc, out = 1, traceback.format_exc()
+        results.append(TaskGateResult(task_id=task_id, rc=rc, out=out, report_path=str(out_path)))
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Validate acceptance Refs: mapping for one task (or many with --task-ids).")
+    ap.add_argument("--task-id", default=None, help="Task id (e.g. 11). Default: first status=in-progress in tasks.json.")
+    ap.add_argument("--task-ids", default=None, help="Batch mode: comma-separated task ids or 'all' (requires --out-dir).")
+    ap.add_argument("--stage", choices=["red", "green", "refactor"], required=True)
+    ap.add_argument("--out", default=None, help="Output JSON path (single-task mode).")
+    ap.add_argument("--out-dir", default=None, help="Batch mode: writes <out-dir>/task-<id>/acceptance-refs.json.")
+    ap.add_argument("--workers", type=int, default=1, help="Batch mode: process pool size (default 1 = in-process).")
+    args = ap.parse_args(argv)
+
+    root = repo_root()
+    store = get_store(root)
+
+    if args.task_ids:
+        if not args.out_dir:
+            ap.error("--task-ids requires --out-dir")
+        task_ids = parse_task_ids(args.task_ids, store=store)
+        fn = functools.partial(validate_tasks, stage=args.stage, out_dir=str(Path(args.out_dir).resolve()))
+        results = run_chunked(fn, task_ids, workers=int(args.workers))
+        for r in results:
+            print(r.out, end="")
+        failed = sum(1 for r in results if r.rc != 0)
+        print(f"ACCEPTANCE_REFS_BATCH tasks={len(results)} failed={failed} stage={args.stage}")
+        return 0 if failed == 0 else 1
+
+    if not args.out:
+        ap.error("--out is required (or use --task-ids with --out-dir)")
+
+    task_id = str(args.task_id).strip() if args.task_id else store.current_task_id()
+    report = validate_task(root=root, store=store, task_id=task_id, stage=args.stage)
+    rc, line = write_report(report, Path(args.out))
+    print(line)
+    return rc
 
 
 if __name__ == "__main__":
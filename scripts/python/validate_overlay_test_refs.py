@@ -76,11 +76,11 @@ def _find_test_refs_section(lines: list[str]) -> tuple[int | None, int | None]:
     return start, end
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Validate Test-Refs section for a single overlay markdown file.")
     ap.add_argument("--overlay", required=True, help="Overlay markdown path (repo-relative or absolute).")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     root = repo_root()
     overlay_path = Path(args.overlay)
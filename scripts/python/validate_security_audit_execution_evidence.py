@@ -93,12 +93,12 @@ def validate_jsonl(path: Path) -> tuple[bool, str | None, int]:
     return True, None, count
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Validate security audit JSONL execution evidence (run_id bound).")
     ap.add_argument("--run-id", required=True, help="Expected run_id from sc-test.")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
     ap.add_argument("--date", default=None, help="Date folder (YYYY-MM-DD). Default: today.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     root = repo_root()
     date = args.date or dt.date.today().strftime("%Y-%m-%d")
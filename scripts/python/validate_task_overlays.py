@@ -287,7 +287,7 @@ def validate_task_file(root: Path, task_file: Path, label: str, adr_ids: set[str
     return tasks_with_overlays, passed
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description="Validate task overlay references and ACCEPTANCE_CHECKLIST.md front matter.",
     )
@@ -297,7 +297,7 @@ def main() -> int:
         help="Task file path to validate (default: all .taskmaster/tasks/*.json).",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     root = Path(__file__).resolve().parents[2]
 
     adr_ids = collect_adr_ids(root)
@@ -28,38 +28,13 @@ import os
 from pathlib import Path
 from typing import Any
 
+from taskmaster_store_lib import get_store
+
 
 def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def load_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def resolve_current_task_id(tasks_json: dict[str, Any]) -> str:
-    tasks = (tasks_json.get("master") or {}).get("tasks") or []
-    for t in tasks:
-        if not isinstance(t, dict):
-            continue
-        if str(t.get("status")) == "in-progress":
-            return str(t.get("id"))
-    raise ValueError("No task with status=in-progress found in tasks.json")
-
-
-def find_view_task(view: list[dict[str, Any]], task_id: str) -> dict[str, Any] | None:
-    try:
-        tid_int = int(str(task_id))
-    except ValueError:
-        return None
-    for t in view:
-        if not isinstance(t, dict):
-            continue
-        if t.get("taskmaster_id") == tid_int:
-            return t
-    return None
-
-
 def is_abs_path(p: str) -> bool:
     # Avoid platform ambiguity: treat both Windows and POSIX abs paths as forbidden here.
     if not p:
@@ -120,31 +95,25 @@ def validate_test_refs(
     return errors, warnings
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Validate tasks_back/tasks_gameplay test_refs for one task.")
     ap.add_argument("--task-id", default=None, help="Task id (e.g. 11). Default: first status=in-progress in tasks.json.")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
     ap.add_argument("--require-non-empty", action="store_true", help="Fail if test_refs is empty.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     root = repo_root()
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    tasks_json_path = root / ".taskmaster" / "tasks" / "tasks.json"
-    back_path = root / ".taskmaster" / "tasks" / "tasks_back.json"
-    gameplay_path = root / ".taskmaster" / "tasks" / "tasks_gameplay.json"
-
-    tasks_json = load_json(tasks_json_path)
-    task_id = str(args.task_id).strip() if args.task_id else resolve_current_task_id(tasks_json)
+    store = get_store(root)
+    task_id = str(args.task_id).strip() if args.task_id else store.current_task_id()
 
-    back = load_json(back_path)
-    gameplay = load_json(gameplay_path)
-    if not isinstance(back, list) or not isinstance(gameplay, list):
+    if not isinstance(store.back_view(), list) or not isinstance(store.gameplay_view(), list):
         raise ValueError("tasks_back.json and tasks_gameplay.json must be JSON arrays")
 
-    back_task = find_view_task(back, task_id)
-    gameplay_task = find_view_task(gameplay, task_id)
+    back_task = store.back_task(task_id)
+    gameplay_task = store.gameplay_task(task_id)
 
     errors: list[str] = []
     warnings: list[str] = []
@@ -22,6 +22,8 @@ import json
 import re
 from pathlib import Path
 
+from source_index_lib import SourceFile, get_source_index
+
 
 PARSE_RE = re.compile(r"\bJsonDocument\.Parse\s*\(\s*([A-Za-z0-9_\.]+)", re.IGNORECASE)
 DESER_RE = re.compile(r"\bJsonSerializer\.Deserialize\s*<[^>]+>\s*\(\s*([A-Za-z0-9_\.]+)", re.IGNORECASE)
@@ -32,25 +34,15 @@ def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def iter_candidate_files(root: Path) -> list[Path]:
-    base = root / "Game.Godot"
-    if not base.exists():
-        return []
-    files: list[Path] = []
-    for p in base.rglob("*.cs"):
-        if any(seg in {"bin", "obj", ".godot", "logs"} for seg in p.parts):
-            continue
-        # Focus on likely UI/event handlers to minimize noise.
-        if "/Scripts/" not in p.as_posix().replace("\\", "/"):
-            continue
-        files.append(p)
-    return sorted(files)
+def iter_candidate_files(root: Path) -> list[SourceFile]:
+    # Focus on likely UI/event handlers to minimize noise.
+    return [sf for sf in get_source_index(root).iter_files(under="Game.Godot", exts=[".cs"]) if "/Scripts/" in sf.rel]
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Validate UI event JSON parsing guards (static scan).")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     root = repo_root()
     out_path = Path(args.out)
@@ -58,10 +50,10 @@ def main() -> int:
 
     violations: list[dict] = []
 
-    for p in iter_candidate_files(root):
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        lines = text.splitlines()
-        rel = p.relative_to(root).as_posix()
+    for sf in iter_candidate_files(root):
+        text = sf.text
+        lines = sf.lines
+        rel = sf.rel
 
         has_max_depth = "MaxDepth" in text
         for i, line in enumerate(lines, start=1):
@@ -22,6 +22,8 @@ import json
 import re
 from pathlib import Path
 
+from source_index_lib import SourceFile, get_source_index
+
 
 METHOD_SIG_RE = re.compile(
     r"^\s*(?:public|private|protected|internal)\s+(?:static\s+)?(?:async\s+)?(?:void|Task(?:<[^>]+>)?)\s+([A-Za-z_][A-Za-z0-9_]*)\s*\((.*?)\)\s*$"
@@ -33,18 +35,9 @@ def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def iter_candidate_files(root: Path) -> list[Path]:
-    base = root / "Game.Godot"
-    if not base.exists():
-        return []
-    files: list[Path] = []
-    for p in base.rglob("*.cs"):
-        if any(seg in {"bin", "obj", ".godot", "logs"} for seg in p.parts):
-            continue
-        if "/Scripts/" not in p.as_posix().replace("\\", "/"):
-            continue
-        files.append(p)
-    return sorted(files)
+def iter_candidate_files(root: Path) -> list[SourceFile]:
+    # Focus on likely UI/event handlers to minimize noise.
+    return [sf for sf in get_source_index(root).iter_files(under="Game.Godot", exts=[".cs"]) if "/Scripts/" in sf.rel]
 
 
 def _extract_method_body(lines: list[str], sig_index: int) -> tuple[int, int] | None:
@@ -69,10 +62,10 @@ def _extract_method_body(lines: list[str], sig_index: int) -> tuple[int, int] |
     return None
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Validate UI event source verification (static scan).")
     ap.add_argument("--out", required=True, help="Output JSON path (under logs/ci/... recommended).")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     root = repo_root()
     out_path = Path(args.out)
@@ -80,10 +73,9 @@ def main() -> int:
 
     violations: list[dict] = []
 
-    for p in iter_candidate_files(root):
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        lines = text.splitlines()
-        rel = p.relative_to(root).as_posix()
+    for sf in iter_candidate_files(root):
+        lines = sf.lines
+        rel = sf.rel
 
         for idx, line in enumerate(lines):
             m = METHOD_SIG_RE.match(line)
@@ -14,6 +14,7 @@ import json
 from pathlib import Path
 from typing import Any
 
+from _artifact_catalog import KIND_ACCEPTANCE_SUMMARY, find_artifact
 from _util import repo_root, today_str
 
 
@@ -22,6 +23,11 @@ def _to_posix(path: Path) -> str:
 
 
 def find_latest_acceptance_dir(*, task_id: str | None) -> Path | None:
+    summary = find_artifact(KIND_ACCEPTANCE_SUMMARY, task_id=str(task_id) if task_id else None)
+    if summary is not None:
+        return summary.parent
+
+    # Fallback for runs recorded before the artifact catalog existed.
     ci_root = repo_root() / "logs" / "ci"
     if not ci_root.exists():
         return None
@@ -134,9 +140,14 @@ def build_acceptance_evidence(*, task_id: str | None, max_chars: int = 4000) ->
         if passed is not None and total is not None:
             lines.append(f"- unit_tests: passed={passed}/{total} failed={failed}")
     if cov and cov.get("line_pct") is not None and cov.get("branch_pct") is not None:
-        lines.append(f"- coverage: lines={cov.get('line_pct')}% branches={cov.get('branch_pct')}% (threshold_ok={bool(unit.get('threshold_ok'))})")
+        bound = ">=" if cov.get("branch_pct_lower_bound") else ""
+        lines.append(f"- coverage: lines={cov.get('line_pct')}% branches={bound}{cov.get('branch_pct')}% (threshold_ok={bool(unit.get('threshold_ok'))})")
     if perf and perf.get("budget_status") in {"pass", "fail"}:
         lines.append(f"- perf_budget: p95_ms={perf.get('p95_ms')} <= {perf.get('max_p95_ms')} (frames={perf.get('frames')})")
+        budgets = perf.get("budgets") if isinstance(perf.get("budgets"), dict) else {}
+        for metric, r in budgets.items():
+            if isinstance(r, dict) and metric != "frame_p95_ms":
+                lines.append(f"  - {metric}: {r.get('status')} value={r.get('value')} max={r.get('max_ms')} gate={r.get('gate')} samples={r.get('samples')}")
     if findings_total is not None:
         lines.append(f"- security_soft_findings: total={findings_total}")
 
@@ -15,6 +15,30 @@ from _taskmaster import TaskmasterTriplet
 from _util import repo_root, today_str, write_text
 
 
+def _fmt_num(value: Any, scale: float = 1.0) -> str:
+    return "-" if value is None else f"{value / scale:.2f}"
+
+
+def cost_table(steps: list[StepResult]) -> list[str]:
+    """Markdown table of measured steps, most expensive (wall time) first."""
+    measured = [s for s in steps if s.metrics]
+    if not measured:
+        return []
+    mb = 1024 * 1024
+    lines = [
+        "| step | status | wall s | cpu user s | cpu sys s | peak RSS MB | read MB | write MB | procs |",
+        "|---|---|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for s in sorted(measured, key=lambda x: (x.metrics or {}).get("wall_sec") or 0.0, reverse=True):
+        m = s.metrics or {}
+        lines.append(
+            f"| {s.name} | {s.status} | {_fmt_num(m.get('wall_sec'))} | {_fmt_num(m.get('cpu_user_sec'))} | {_fmt_num(m.get('cpu_sys_sec'))}"
+            f" | {_fmt_num(m.get('peak_rss_bytes'), mb)} | {_fmt_num(m.get('read_bytes'), mb)} | {_fmt_num(m.get('write_bytes'), mb)}"
+            f" | {m.get('processes', '-')} |"
+        )
+    return lines
+
+
 def write_markdown_report(out_dir: Path, task: TaskmasterTriplet, steps: list[StepResult], *, metrics: dict[str, Any] | None = None) -> None:
     lines: list[str] = []
     lines.append("# Acceptance Check Report")
@@ -70,5 +94,13 @@ def write_markdown_report(out_dir: Path, task: TaskmasterTriplet, steps: list[St
             rel_log = str(Path(s.log).relative_to(repo_root())).replace("\\", "/")
             lines.append(f"  - log: `{rel_log}`")
     lines.append("")
+
+    table = cost_table(steps)
+    if table:
+        lines.append("## Step Cost")
+        lines.append("Sorted by wall time. Steps run concurrently (--jobs), so wall times overlap; CPU and I/O include child processes.")
+        lines.append("")
+        lines.extend(table)
+        lines.append("")
     write_text(out_dir / "report.md", "\n".join(lines) + "\n")
 
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+sc-side access to the artifact catalog (scripts/python/artifact_catalog_lib.py).
+
+sc scripts register the artifacts they write (sc-test summary, unit/gdunit dirs,
+acceptance summary) and the evidence finders query the catalog before falling
+back to walking logs/ci.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+def _bootstrap_imports() -> None:
+    py_dir = str(Path(__file__).resolve().parents[1] / "python")
+    if py_dir not in sys.path:
+        sys.path.insert(0, py_dir)
+
+
+_bootstrap_imports()
+
+from artifact_catalog_lib import (  # noqa: E402,F401
+    KIND_ACCEPTANCE_SUMMARY,
+    KIND_COBERTURA,
+    KIND_GDUNIT_REPORT_DIR,
+    KIND_GDUNIT_RESULTS_XML,
+    KIND_SC_TEST_SUMMARY,
+    KIND_TRX,
+    KIND_UNIT_DIR,
+    KIND_UNIT_SUMMARY,
+    find_artifact,
+    register_artifact,
+)
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+sc-side access to the input-hash build stamps (scripts/python/build_cache_lib.py).
+
+sc-build skips `dotnet build -warnaserror` while the target's stamp matches and reports
+cache_hit in its summary; the acceptance build step surfaces that flag.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+def _bootstrap_imports() -> None:
+    py_dir = str(Path(__file__).resolve().parents[1] / "python")
+    if py_dir not in sys.path:
+        sys.path.insert(0, py_dir)
+
+
+_bootstrap_imports()
+
+from build_cache_lib import BuildStamp, cache_enabled, dotnet_stamp  # noqa: E402,F401
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Shared `codex exec` client for sc LLM scripts.
+
+Why:
+  llm_review, llm_fill_acceptance_refs, llm_generate_*, llm_check_subtasks_coverage,
+  llm_extract_task_obligations, _acceptance_semantics_align and llm_semantic_gate_all
+  each carried a copy of the same subprocess wrapper, with no concurrency control,
+  no retry and no record of where LLM time goes.
+
+What this module adds around one `codex exec` call:
+  - Answer cache (see _llm_cache; bypass with --no-llm-cache / SC_LLM_CACHE=0).
+  - Process-wide concurrency limit (env SC_LLM_MAX_CONCURRENCY, default 4).
+  - Token-bucket rate limit on call starts (env SC_LLM_RATE_PER_MIN, default 30; 0 disables).
+  - Retry with jittered exponential backoff on transient failures (rate limits, 5xx,
+    dropped connections); env SC_LLM_RETRIES (default 2). Timeouts are not retried.
+  - One JSONL metrics line per call: logs/ci/<date>/sc-llm-metrics/calls.jsonl.
+  - submit(): fan out calls on a shared thread pool; the limiter still applies.
+
+Callers keep their own (rc, trace[, cmd]) signatures as thin wrappers over run_codex_exec().
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Sequence
+
+from _llm_cache import codex_exec_cached
+from _util import repo_root, today_str
+
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_RATE_PER_MIN = 30.0
+DEFAULT_RETRIES = 2
+RETRY_BASE_SEC = 10.0
+
+TRANSIENT_RE = re.compile(
+    r"\b(429|500|502|503|504)\b|rate.?limit|too many requests|overloaded|temporarily unavailable|"
+    r"connection (reset|refused|aborted|closed)|stream (disconnected|error)|timed out while",
+    flags=re.IGNORECASE,
+)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(str(os.environ.get(name) or "").strip() or default)
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class CodexResult:
+    rc: int
+    trace: str
+    cmd: list[str]
+    cached: bool = False
+    attempts: int = 1
+    elapsed_sec: float = 0.0
+    wait_sec: float = 0.0
+
+
+class _TokenBucket:
+    def __init__(self, rate_per_min: float, burst: float) -> None:
+        self.rate = max(0.0, rate_per_min) / 60.0
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Blocks until a token is available; returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                delay = (1.0 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+@dataclass
+class _ClientState:
+    max_concurrency: int
+    limiter: threading.BoundedSemaphore
+    bucket: _TokenBucket
+    pool: ThreadPoolExecutor | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    metrics_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _new_state(max_concurrency: int | None = None) -> _ClientState:
+    n = max(1, int(max_concurrency or _env_float("SC_LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)))
+    rate = _env_float("SC_LLM_RATE_PER_MIN", DEFAULT_RATE_PER_MIN)
+    return _ClientState(max_concurrency=n, limiter=threading.BoundedSemaphore(n), bucket=_TokenBucket(rate, burst=n))
+
+
+_state = _new_state()
+_state_lock = threading.Lock()
+
+
+def set_max_concurrency(n: int) -> None:
+    """Raises/lowers the process-wide limit (e.g. from a script's --concurrency flag)."""
+    global _state
+    n = max(1, int(n))
+    with _state_lock:
+        if n == _state.max_concurrency:
+            return
+        old = _state
+        _state = _new_state(n)
+        if old.pool is not None:
+            old.pool.shutdown(wait=False)
+
+
+def metrics_path() -> Path:
+    return repo_root() / "logs" / "ci" / today_str() / "sc-llm-metrics" / "calls.jsonl"
+
+
+def _record_metrics(state: _ClientState, payload: dict[str, object]) -> None:
+    p = metrics_path()
+    line = json.dumps(payload, ensure_ascii=False) + "\n"
+    try:
+        with state.metrics_lock:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            with p.open("a", encoding="utf-8") as fh:
+                fh.write(line)
+    except OSError:
+        pass  # metrics are best-effort
+
+
+def build_cmd(exe: str, *, out_last_message: Path, configs: Sequence[str] = (), sandbox: str = "read-only") -> list[str]:
+    config_args: list[str] = []
+    for c in configs:
+        if str(c).strip():
+            config_args.extend(["-c", str(c)])
+    return [
+        exe,
+        "exec",
+        *config_args,
+        "-s",
+        sandbox,
+        "-C",
+        str(repo_root()),
+        "--output-last-message",
+        str(out_last_message),
+        "-",
+    ]
+
+
+def _invoke(cmd: list[str], *, prompt: str, timeout_sec: int) -> tuple[int, str]:
+    try:
+        proc = subprocess.run(
+            cmd,
+            input=prompt,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+            cwd=str(repo_root()),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            timeout=timeout_sec,
+        )
+    except subprocess.TimeoutExpired:
+        return 124, "codex exec timeout\n"
+    except Exception as exc:  # noqa: BLE001
+        return 1, f"codex exec failed to start: {exc}\n"
+    return proc.returncode or 0, proc.stdout or ""
+
+
+def is_transient_failure(rc: int, trace: str) -> bool:
+    if rc in (0, 124, 127):
+        return False
+    return bool(TRANSIENT_RE.search(trace or ""))
+
+
+def run_codex_exec(
+    *,
+    prompt: str,
+    out_last_message: Path,
+    timeout_sec: int,
+    configs: Sequence[str] = (),
+    sandbox: str = "read-only",
+    label: str = "",
+    cache_salt: str = "",
+    cacheable: Callable[[str], bool] | None = None,
+) -> CodexResult:
+    exe = shutil.which("codex")
+    if not exe:
+        return CodexResult(rc=127, trace="codex executable not found in PATH\n", cmd=["codex"])
+    cmd = build_cmd(exe, out_last_message=out_last_message, configs=configs, sandbox=sandbox)
+    state = _state
+    retries = max(0, int(_env_float("SC_LLM_RETRIES", DEFAULT_RETRIES)))
+    counters = {"attempts": 0, "wait_sec": 0.0}
+
+    def _limited() -> tuple[int, str]:
+        traces: list[str] = []
+        while True:
+            counters["attempts"] += 1
+            t0 = time.monotonic()
+            with state.limiter:
+                counters["wait_sec"] += (time.monotonic() - t0) + state.bucket.acquire()
+                rc, trace = _invoke(cmd, prompt=prompt, timeout_sec=timeout_sec)
+            traces.append(trace if counters["attempts"] == 1 else f"\n=== codex retry attempt {counters['attempts']} ===\n{trace}")
+            if counters["attempts"] > retries or not is_transient_failure(rc, trace):
+                return rc, "".join(traces)
+            time.sleep(RETRY_BASE_SEC * (2 ** (counters["attempts"] - 1)) * random.uniform(0.75, 1.25))
+
+    started = time.monotonic()
+    rc, trace = codex_exec_cached(
+        prompt=prompt,
+        out_last_message=out_last_message,
+        run=_limited,
+        configs=configs,
+        sandbox=sandbox,
+        salt=cache_salt,
+        cacheable=cacheable,
+    )
+    elapsed = time.monotonic() - started
+    cached = counters["attempts"] == 0
+    try:
+        output_bytes = out_last_message.stat().st_size if out_last_message.is_file() else 0
+    except OSError:
+        output_bytes = 0
+
+    _record_metrics(
+        state,
+        {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "script": Path(sys.argv[0]).name if sys.argv and sys.argv[0] else "",
+            "label": label or out_last_message.name,
+            "rc": rc,
+            "cached": cached,
+            "attempts": counters["attempts"],
+            "elapsed_sec": round(elapsed, 3),
+            "wait_sec": round(float(counters["wait_sec"]), 3),
+            "prompt_bytes": len(prompt.encode("utf-8")),
+            "output_bytes": output_bytes,
+            "trace_bytes": len(trace.encode("utf-8")),
+            "configs": [str(c) for c in configs],
+        },
+    )
+    return CodexResult(
+        rc=rc,
+        trace=trace,
+        cmd=cmd,
+        cached=cached,
+        attempts=counters["attempts"],
+        elapsed_sec=elapsed,
+        wait_sec=float(counters["wait_sec"]),
+    )
+
+
+def submit(**kwargs: object) -> Future[CodexResult]:
+    """
+    Asynchronous run_codex_exec(**kwargs). The pool only queues work; the process-wide
+    limiter and rate bucket still bound how many codex processes actually run.
+    """
+    state = _state
+    with state.lock:
+        if state.pool is None:
+            state.pool = ThreadPoolExecutor(max_workers=max(state.max_concurrency, 2), thread_name_prefix="sc-codex")
+        pool = state.pool
+    return pool.submit(run_codex_exec, **kwargs)  # type: ignore[arg-type]
@@ -19,6 +19,7 @@ import json
 from pathlib import Path
 from typing import Any
 
+from _artifact_catalog import KIND_ACCEPTANCE_SUMMARY, find_artifact
 from _util import repo_root, today_str, write_text
 
 
@@ -30,6 +31,11 @@ def _to_posix(path: Path) -> str:
 
 
 def _find_latest_acceptance_dir(*, task_id: str | None) -> Path | None:
+    summary = find_artifact(KIND_ACCEPTANCE_SUMMARY, task_id=str(task_id) if task_id else None)
+    if summary is not None:
+        return summary.parent
+
+    # Fallback for runs recorded before the artifact catalog existed.
     ci_root = repo_root() / "logs" / "ci"
     if not ci_root.exists():
         return None
@@ -168,17 +174,41 @@ def _render_perf_report(*, task_id: str | None, acceptance_dir: Path) -> tuple[s
         lines.append("")
     elif verdict != "OK":
         lines.append("## P0")
-        lines.append(f"- perf p95_ms exceeded threshold (p95_ms={data.get('p95_ms')} max_p95_ms={data.get('max_p95_ms')})")
+        hard_failures = data.get("hard_failures") if isinstance(data.get("hard_failures"), list) else ["frame_p95_ms"]
+        budgets = data.get("budgets") if isinstance(data.get("budgets"), dict) else {}
+        for metric in hard_failures:
+            if metric == "budget-config":
+                lines.append(f"- {data.get('budgets_error')}")
+            elif metric == "frame_p95_ms" or metric not in budgets:
+                lines.append(f"- perf p95_ms exceeded threshold (p95_ms={data.get('p95_ms')} max_p95_ms={data.get('max_p95_ms')})")
+            else:
+                r = budgets[metric]
+                lines.append(f"- {metric} exceeded budget (value={r.get('value')} max_ms={r.get('max_ms')} samples={r.get('samples')})")
         lines.append("")
     else:
         lines.append("## P0")
         lines.append("- none")
         lines.append("")
 
+    history = data.get("history") if isinstance(data.get("history"), dict) else {}
+    if history.get("status") == "regression":
+        lines.append("## P1")
+        lines.append(
+            f"- {history.get('metric')} regressed vs perf history (median {history.get('baseline_median_ms')} -> "
+            f"{history.get('candidate_median_ms')} ms, delta={history.get('delta_ms')} ms, p={history.get('p_value')})"
+        )
+        lines.append("")
+
     lines.append("## Evidence")
     for k in ["headless_log", "frames", "p95_ms", "max_p95_ms", "budget_status"]:
         if k in data:
             lines.append(f"- {k}: {data.get(k)}")
+    budgets = data.get("budgets") if isinstance(data.get("budgets"), dict) else {}
+    for metric, r in budgets.items():
+        if isinstance(r, dict):
+            lines.append(f"- {metric}: {r.get('status')} (value={r.get('value')} max_ms={r.get('max_ms')} gate={r.get('gate')})")
+    if history:
+        lines.append(f"- history_status: {history.get('status')}")
     lines.append("")
 
     lines.append(f"Verdict: {verdict}")
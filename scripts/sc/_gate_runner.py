@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+In-process runner for scripts/python gate scripts.
+
+Why:
+  sc-acceptance-check used to start a fresh `py -3 scripts/python/<gate>.py`
+  interpreter per validator. On Windows agents interpreter startup and module
+  re-imports dominate the static half of the gate. Allowlisted gates expose
+  `main(argv) -> int`, so we can import them once and call them directly.
+
+Semantics (kept identical to the subprocess path):
+  - stdout and stderr are merged into one captured text (per thread, so
+    concurrently scheduled steps never interleave their logs).
+  - rc is main()'s return value / SystemExit code; an uncaught exception is
+    printed into the captured output and mapped to rc=1.
+
+Fallback to a subprocess (`run_cmd`) when:
+  - runner mode is "subprocess" (`--gate-runner subprocess` or env SC_GATE_RUNNER=subprocess)
+  - the script is not allowlisted
+  - the current working directory is not the repo root (subprocesses run with cwd=repo root)
+
+Note: in-process calls cannot be killed on timeout; the allowlist only contains
+bounded static scans.
+"""
+
+from __future__ import annotations
+
+import importlib
+import io
+import os
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import Any, Sequence
+
+from _stream_run import LineMatcher
+from _util import repo_root, run_cmd, write_text
+
+
+GATE_RUNNER_ENV = "SC_GATE_RUNNER"
+
+INPROC_GATES = frozenset(
+    {
+        "task_links_validate",
+        "validate_task_test_refs",
+        "validate_acceptance_refs",
+        "validate_acceptance_anchors",
+        "validate_task_overlays",
+        "validate_overlay_test_refs",
+        "validate_contracts",
+        "check_architecture_boundary",
+        "check_sentry_secrets",
+        "check_sanguo_gameloop_contracts",
+        "security_soft_scan",
+        "check_encoding",
+        "security_hard_path_gate",
+        "security_hard_sql_gate",
+        "security_hard_audit_gate",
+        "validate_ui_event_json_guards",
+        "validate_ui_event_source_verification",
+        "validate_acceptance_execution_evidence",
+        "validate_security_audit_execution_evidence",
+    }
+)
+
+_local = threading.local()
+_import_lock = threading.Lock()
+_install_lock = threading.Lock()
+
+
+def gate_runner_mode() -> str:
+    mode = str(os.environ.get(GATE_RUNNER_ENV) or "inproc").strip().lower()
+    return mode if mode in ("inproc", "subprocess") else "inproc"
+
+
+def set_gate_runner_mode(mode: str) -> None:
+    # Stored in the environment so nested sc scripts inherit the choice.
+    os.environ[GATE_RUNNER_ENV] = "subprocess" if str(mode).strip().lower() == "subprocess" else "inproc"
+
+
+class _ThreadRoutedStream(io.TextIOBase):
+    """Writes go to the current thread's capture buffer when set, else to the original stream."""
+
+    def __init__(self, fallback: Any) -> None:
+        self._fallback = fallback
+
+    def write(self, s: str) -> int:
+        buf = getattr(_local, "buf", None)
+        target = buf if buf is not None else self._fallback
+        target.write(s)
+        return len(s)
+
+    def flush(self) -> None:
+        if getattr(_local, "buf", None) is None:
+            self._fallback.flush()
+
+    def writable(self) -> bool:
+        return True
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return getattr(self._fallback, "encoding", "utf-8")
+
+    def isatty(self) -> bool:
+        return getattr(_local, "buf", None) is None and bool(getattr(self._fallback, "isatty", lambda: False)())
+
+    def fileno(self) -> int:
+        return self._fallback.fileno()
+
+
+def _install_stream_router() -> None:
+    with _install_lock:
+        if not isinstance(sys.stdout, _ThreadRoutedStream):
+            sys.stdout = _ThreadRoutedStream(sys.stdout)
+        if not isinstance(sys.stderr, _ThreadRoutedStream):
+            sys.stderr = _ThreadRoutedStream(sys.stderr)
+
+
+def _python_scripts_dir() -> Path:
+    return repo_root() / "scripts" / "python"
+
+
+def _load_gate(stem: str) -> Any:
+    py_dir = str(_python_scripts_dir())
+    with _import_lock:
+        if py_dir not in sys.path:
+            sys.path.insert(0, py_dir)
+        return importlib.import_module(stem)
+
+
+def inproc_target(cmd: Sequence[str]) -> tuple[str, list[str]] | None:
+    """
+    Returns (gate_stem, argv) when `cmd` is `py -3 scripts/python/<gate>.py ...` for an
+    allowlisted gate and in-process execution is allowed; otherwise None.
+    """
+    if gate_runner_mode() != "inproc":
+        return None
+    args = list(cmd)
+    if len(args) < 3 or args[0] != "py" or args[1] != "-3":
+        return None
+    script = str(args[2]).replace("\\", "/")
+    if not script.startswith("scripts/python/") or not script.endswith(".py"):
+        return None
+    stem = Path(script).stem
+    if stem not in INPROC_GATES:
+        return None
+    try:
+        if Path.cwd().resolve() != repo_root().resolve():
+            return None
+    except OSError:
+        return None
+    return stem, [str(a) for a in args[3:]]
+
+
+def run_gate_inprocess(stem: str, argv: list[str]) -> tuple[int, str]:
+    _install_stream_router()
+    buf = io.StringIO()
+    _local.buf = buf
+    try:
+        module = _load_gate(stem)
+        rc_obj: Any = module.main(argv)
+    except SystemExit as exc:
+        rc_obj = exc.code
+    except Exception:  # noqa: BLE001
+        traceback.print_exc(file=buf)
+        rc_obj = 1
+    finally:
+        _local.buf = None
+
+    if rc_obj is None:
+        rc = 0
+    elif isinstance(rc_obj, int):
+        rc = rc_obj
+    else:
+        # Mirrors interpreter behavior for SystemExit("message").
+        buf.write(f"{rc_obj}\n")
+        rc = 1
+    return rc, buf.getvalue()
+
+
+def run_gate_cmd(
+    cmd: Sequence[str],
+    *,
+    timeout_sec: int,
+    log_path: Path | None = None,
+    matchers: Sequence[LineMatcher] = (),
+) -> tuple[int, str]:
+    """
+    With log_path the output ends up in that file: a subprocess streams into it (the returned
+    text is then only the tail), an in-process gate writes its captured buffer once it returns.
+    """
+    target = inproc_target(cmd)
+    if target is None:
+        return run_cmd(cmd, cwd=repo_root(), timeout_sec=timeout_sec, log_path=log_path, matchers=matchers)
+    stem, argv = target
+    rc, out = run_gate_inprocess(stem, argv)
+    for line in out.splitlines(keepends=True):
+        for m in matchers:
+            m.feed(line)
+    if log_path is not None:
+        write_text(log_path, out)
+    return rc, out
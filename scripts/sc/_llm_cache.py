@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for `codex exec` answers.
+
+Why:
+  sc-llm-review, the acceptance/test generators and the semantic gates send the
+  same prompts again when they are re-run after an unrelated change, and every
+  call costs minutes of LLM latency.
+
+Design:
+  - Key: sha256 over (prompt, codex `-c` configs such as model / model_reasoning_effort,
+    sandbox mode, optional caller salt). Only successful calls (rc=0, non-empty last
+    message, optionally accepted by the caller) are stored.
+  - Entries live under logs/ci/.llm-cache/<key[:2]>/<key>.json and are written atomically.
+  - TTL (default 7 days, env SC_LLM_CACHE_TTL_SEC) and a total size cap
+    (default 256 MB, env SC_LLM_CACHE_MAX_MB) with least-recently-used eviction.
+  - Bypass with `--no-llm-cache` on the sc LLM scripts (sets env SC_LLM_CACHE=0 so nested
+    scripts inherit it).
+
+Note:
+  codex may read repo files that are not part of the prompt (in any sandbox mode). Those reads are not part of the key; use --no-llm-cache when the answer must
+  reflect the current working tree beyond what the prompt contains.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from _util import repo_root
+
+
+LLM_CACHE_ENV = "SC_LLM_CACHE"
+CACHE_SCHEMA = 1
+DEFAULT_TTL_SEC = 7 * 24 * 3600
+DEFAULT_MAX_MB = 256
+
+_evict_lock = threading.Lock()
+
+
+def llm_cache_enabled() -> bool:
+    return str(os.environ.get(LLM_CACHE_ENV, "1")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def set_llm_cache_enabled(enabled: bool) -> None:
+    os.environ[LLM_CACHE_ENV] = "1" if enabled else "0"
+
+
+def cache_dir(root: Path | None = None) -> Path:
+    return (root or repo_root()) / "logs" / "ci" / ".llm-cache"
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(str(os.environ.get(name) or "").strip() or default)
+    except ValueError:
+        return default
+
+
+def cache_key(prompt: str, *, configs: Sequence[str] = (), sandbox: str = "read-only", salt: str = "") -> str:
+    payload = json.dumps(
+        {"schema": CACHE_SCHEMA, "tool": "codex-exec", "sandbox": sandbox, "configs": [str(c) for c in configs], "salt": salt},
+        sort_keys=True,
+    )
+    h = hashlib.sha256(payload.encode("utf-8"))
+    h.update(b"\0")
+    h.update(prompt.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _entry_path(key: str, root: Path | None = None) -> Path:
+    return cache_dir(root) / key[:2] / f"{key}.json"
+
+
+def cache_get(key: str, *, root: Path | None = None) -> dict[str, Any] | None:
+    p = _entry_path(key, root)
+    try:
+        obj = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:  # noqa: BLE001
+        return None
+    ttl = _env_number("SC_LLM_CACHE_TTL_SEC", DEFAULT_TTL_SEC)
+    if not isinstance(obj, dict) or obj.get("schema") != CACHE_SCHEMA or time.time() - float(obj.get("created_at") or 0) > ttl:
+        return None
+    try:
+        os.utime(p)  # LRU recency for eviction
+    except OSError:
+        pass
+    return obj
+
+
+def cache_put(key: str, *, last_message: str, trace: str, configs: Sequence[str] = (), root: Path | None = None) -> None:
+    p = _entry_path(key, root)
+    payload = {
+        "schema": CACHE_SCHEMA,
+        "key": key,
+        "created_at": time.time(),
+        "configs": [str(c) for c in configs],
+        "last_message": last_message,
+        "trace": trace,
+    }
+    tmp = p.with_name(f"{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, p)
+    except OSError:
+        # Best-effort: a cache write failure must never fail the LLM step.
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return
+    evict(root=root)
+
+
+def evict(*, root: Path | None = None) -> None:
+    """Drops expired entries, then least-recently-used ones until the size cap holds."""
+    base = cache_dir(root)
+    if not base.is_dir():
+        return
+    ttl = _env_number("SC_LLM_CACHE_TTL_SEC", DEFAULT_TTL_SEC)
+    max_bytes = int(_env_number("SC_LLM_CACHE_MAX_MB", DEFAULT_MAX_MB) * 1024 * 1024)
+    now = time.time()
+    with _evict_lock:
+        entries: list[tuple[float, int, Path]] = []
+        for p in base.glob("*/*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            # mtime tracks last use (>= created_at): unused for a full TTL means expired.
+            if now - st.st_mtime > ttl:
+                p.unlink(missing_ok=True)
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _mtime, size, p in sorted(entries):
+            if total <= max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+
+def codex_exec_cached(
+    *,
+    prompt: str,
+    out_last_message: Path,
+    run: Callable[[], tuple[int, str]],
+    configs: Sequence[str] = (),
+    sandbox: str = "read-only",
+    salt: str = "",
+    cacheable: Callable[[str], bool] | None = None,
+) -> tuple[int, str]:
+    """
+    Serves `codex exec` from the cache or calls `run()` (which must write `out_last_message`)
+    and stores a successful answer. Returns (rc, trace) like the callers' own runners.
+
+    cacheable: optional check on the last message (e.g. "output parses") before storing it.
+    """
+    if not llm_cache_enabled():
+        return run()
+
+    key = cache_key(prompt, configs=configs, sandbox=sandbox, salt=salt)
+    hit = cache_get(key)
+    if hit is not None and str(hit.get("last_message") or "").strip():
+        out_last_message.parent.mkdir(parents=True, exist_ok=True)
+        out_last_message.write_text(str(hit["last_message"]), encoding="utf-8")
+        return 0, f"[llm-cache] hit key={key[:16]}\n" + str(hit.get("trace") or "")
+
+    rc, trace = run()
+    if rc == 0 and out_last_message.is_file():
+        last_message = out_last_message.read_text(encoding="utf-8", errors="ignore")
+        if last_message.strip() and (cacheable is None or cacheable(last_message)):
+            cache_put(key, last_message=last_message, trace=trace, configs=configs)
+    return rc, trace
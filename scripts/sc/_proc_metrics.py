@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+sc-side access to the step resource telemetry (scripts/python/proc_metrics_lib.py).
+
+The step scheduler, run_and_capture and sc-test wrap each step in a ResourceMeter and store
+its wall/CPU/peak-RSS/I/O numbers as `metrics` in the step summaries.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+def _bootstrap_imports() -> None:
+    py_dir = str(Path(__file__).resolve().parents[1] / "python")
+    if py_dir not in sys.path:
+        sys.path.insert(0, py_dir)
+
+
+_bootstrap_imports()
+
+from proc_metrics_lib import METRIC_KEYS, ResourceMeter  # noqa: E402,F401
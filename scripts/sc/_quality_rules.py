@@ -17,9 +17,23 @@ Scope (4 rules):
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+import sys
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any
+
+
+def _bootstrap_imports() -> None:
+    # Shared source index lives next to the static gates in scripts/python.
+    py_dir = str(Path(__file__).resolve().parents[1] / "python")
+    if py_dir not in sys.path:
+        sys.path.insert(0, py_dir)
+
+
+_bootstrap_imports()
+
+from gate_cache_lib import GateCache, rules_version_of  # noqa: E402
+from source_index_lib import SourceFile, get_source_index  # noqa: E402
 
 
 @dataclass(frozen=True)
@@ -37,17 +51,8 @@ _EVENTBUS_LOOKUP_RE = re.compile(r'GetNodeOrNull\s*<\s*EventBusAdapter\s*>\s*\(\
 _DOMAIN_EVENT_CONNECT_RE = re.compile(r"Connect\s*\(\s*EventBusAdapter\.SignalName\.DomainEventEmitted\b")
 
 
-def _to_posix(path: Path) -> str:
-    return str(path).replace("\\", "/")
-
-
-def _iter_cs_files(root: Path) -> Iterable[Path]:
-    for p in root.rglob("*.cs"):
-        if not p.is_file():
-            continue
-        if any(seg in {".git", ".godot", "bin", "obj", "logs", "TestResults"} for seg in p.parts):
-            continue
-        yield p
+def _iter_cs_files(root: Path) -> list[SourceFile]:
+    return get_source_index(root).iter_files(exts=[".cs"])
 
 
 def _is_blocking_wait_hard_scope(rel: str) -> bool:
@@ -66,10 +71,6 @@ def _is_blocking_wait_hard_scope(rel: str) -> bool:
     return False
 
 
-def _line_number(text: str, pos: int) -> int:
-    return text.count("\n", 0, pos) + 1
-
-
 def _find_jsondocument_parse_single_arg(text: str) -> list[int]:
     """
     Finds `JsonDocument.Parse(<single-arg>)` calls by parsing parentheses and
@@ -130,64 +131,78 @@ def _find_jsondocument_parse_single_arg(text: str) -> list[int]:
     return hits
 
 
-def scan_quality_rules(*, repo_root: Path) -> dict[str, Any]:
+def _scan_file(sf: SourceFile) -> list[Finding]:
     findings: list[Finding] = []
-
-    for p in _iter_cs_files(repo_root):
-        rel = _to_posix(p.relative_to(repo_root))
-        text = p.read_text(encoding="utf-8", errors="ignore")
-
-        if _is_blocking_wait_hard_scope(rel) and _BLOCKING_WAIT_RE.search(text):
-            for m in _BLOCKING_WAIT_RE.finditer(text):
-                line = _line_number(text, m.start())
-                sample = text.splitlines()[line - 1].strip() if line - 1 < len(text.splitlines()) else None
-                findings.append(
-                    Finding(
-                        rule="cs.blocking_async_wait",
-                        severity="p0",
-                        file=rel,
-                        line=line,
-                        message="Blocking async wait via GetAwaiter().GetResult() in Game.Core services or Godot runtime scripts.",
-                        sample=sample,
-                    )
+    rel = sf.rel
+    text = sf.text
+
+    if _is_blocking_wait_hard_scope(rel) and _BLOCKING_WAIT_RE.search(text):
+        for m in _BLOCKING_WAIT_RE.finditer(text):
+            line = sf.line_at(m.start())
+            sample = sf.lines[line - 1].strip() if line - 1 < len(sf.lines) else None
+            findings.append(
+                Finding(
+                    rule="cs.blocking_async_wait",
+                    severity="p0",
+                    file=rel,
+                    line=line,
+                    message="Blocking async wait via GetAwaiter().GetResult() in Game.Core services or Godot runtime scripts.",
+                    sample=sample,
                 )
-
-        # UI-specific rules: apply to runtime UI scripts (both main project and Tests.Godot runtime mirror).
-        if "/Scripts/" in rel and rel.endswith(".cs"):
-            lookups = list(_EVENTBUS_LOOKUP_RE.finditer(text))
-            if len(lookups) > 1:
-                findings.append(
-                    Finding(
-                        rule="cs.eventbus_repeated_lookup",
-                        severity="p1",
-                        file=rel,
-                        line=_line_number(text, lookups[1].start()),
-                        message=f"Repeated GetNodeOrNull<EventBusAdapter>(\"/root/EventBus\") lookups in one file (count={len(lookups)}). Prefer caching/injection.",
-                        sample=lookups[1].group(0),
-                    )
+            )
+
+    # UI-specific rules: apply to runtime UI scripts (both main project and Tests.Godot runtime mirror).
+    if "/Scripts/" in rel and rel.endswith(".cs"):
+        lookups = list(_EVENTBUS_LOOKUP_RE.finditer(text))
+        if len(lookups) > 1:
+            findings.append(
+                Finding(
+                    rule="cs.eventbus_repeated_lookup",
+                    severity="p1",
+                    file=rel,
+                    line=sf.line_at(lookups[1].start()),
+                    message=f"Repeated GetNodeOrNull<EventBusAdapter>(\"/root/EventBus\") lookups in one file (count={len(lookups)}). Prefer caching/injection.",
+                    sample=lookups[1].group(0),
                 )
-
-            if _DOMAIN_EVENT_CONNECT_RE.search(text) and "override void _ExitTree" not in text:
-                findings.append(
-                    Finding(
-                        rule="cs.domain_event_connect_without_exit_cleanup",
-                        severity="p1",
-                        file=rel,
-                        line=None,
-                        message="Connect(DomainEventEmitted) detected but no _ExitTree override found; risk of leaked signal connection.",
-                    )
+            )
+
+        if _DOMAIN_EVENT_CONNECT_RE.search(text) and "override void _ExitTree" not in text:
+            findings.append(
+                Finding(
+                    rule="cs.domain_event_connect_without_exit_cleanup",
+                    severity="p1",
+                    file=rel,
+                    line=None,
+                    message="Connect(DomainEventEmitted) detected but no _ExitTree override found; risk of leaked signal connection.",
                 )
-
-            for pos in _find_jsondocument_parse_single_arg(text):
-                findings.append(
-                    Finding(
-                        rule="cs.jsondocument_parse_single_arg",
-                        severity="p1",
-                        file=rel,
-                        line=_line_number(text, pos),
-                        message="JsonDocument.Parse(...) called without JsonDocumentOptions (no MaxDepth bound). Prefer JsonDocument.Parse(json, options).",
-                    )
+            )
+
+        for pos in _find_jsondocument_parse_single_arg(text):
+            findings.append(
+                Finding(
+                    rule="cs.jsondocument_parse_single_arg",
+                    severity="p1",
+                    file=rel,
+                    line=sf.line_at(pos),
+                    message="JsonDocument.Parse(...) called without JsonDocumentOptions (no MaxDepth bound). Prefer JsonDocument.Parse(json, options).",
                 )
+            )
+    return findings
+
+
+def scan_quality_rules(*, repo_root: Path, use_cache: bool = True) -> dict[str, Any]:
+    findings: list[Finding] = []
+    cache = GateCache("quality-rules", rules_version=rules_version_of(Path(__file__)), root=repo_root, enabled=use_cache)
+
+    for sf in _iter_cs_files(repo_root):
+        hit, cached = cache.get(sf.rel, sf.path, sha256=lambda: sf.sha256)
+        if hit:
+            findings.extend(Finding(**d) for d in cached)
+            continue
+        file_findings = _scan_file(sf)
+        cache.put(sf.rel, sf.path, [asdict(f) for f in file_findings], sha256=lambda: sf.sha256)
+        findings.extend(file_findings)
+    cache.save()
 
     by_sev: dict[str, list[dict[str, Any]]] = {"p0": [], "p1": [], "p2": []}
     for f in findings:
@@ -225,4 +240,5 @@ def scan_quality_rules(*, repo_root: Path) -> dict[str, Any]:
             "p1": len(p1),
             "p2": len(by_sev.get("p2") or []),
         },
+        "cache": cache.stats(),
     }
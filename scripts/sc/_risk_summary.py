@@ -195,7 +195,7 @@ def build_risk_summary(
                 signal_id="perf-budget-failed",
                 domain="performance",
                 severity="P0",
-                message="perf-budget failed (p95 exceeded or evidence missing while enabled)",
+                message="perf-budget failed (a hard ADR-0015 budget exceeded or evidence missing while enabled)",
                 step="perf-budget",
                 evidence=_to_posix((out_dir / "perf-budget.json").relative_to(root)) if (out_dir / "perf-budget.json").exists() else None,
             )
@@ -222,6 +222,41 @@ def build_risk_summary(
                 evidence=_to_posix((out_dir / "perf-budget.json").relative_to(root)) if (out_dir / "perf-budget.json").exists() else None,
             )
 
+        # Per-metric ADR-0015 budgets (frame p95/p99, scene switch, resource load).
+        budgets = perf_details.get("budgets") if isinstance(perf_details.get("budgets"), dict) else {}
+        enforced = _safe_int(max_p95_ms, 0) > 0
+        for metric, res in budgets.items():
+            if not isinstance(res, dict) or metric == "frame_p95_ms":
+                continue  # frame p95 is the step verdict itself (perf-budget-failed above)
+            status = str(res.get("status") or "")
+            hard = str(res.get("gate") or "") == "hard"
+            if status == "fail":
+                # Enforced hard budgets already failed the step (perf-budget-failed); only name them here.
+                if hard and enforced:
+                    severity = "P0"
+                elif enforced:
+                    perf_score -= 10
+                    severity = "P1"
+                else:
+                    perf_score -= 5
+                    severity = "P2"
+                message = f"perf budget exceeded: {metric}={res.get('value')}ms > {res.get('max_ms')}ms (gate={res.get('gate')})"
+            elif status == "no-data" and hard:
+                perf_score -= 2
+                severity = "P2"
+                message = f"no perf evidence for {metric} (no markers in headless.log)"
+            else:
+                continue
+            _add_signal(
+                signals,
+                signal_id=f"perf-budget:{metric}:{status}",
+                domain="performance",
+                severity=severity,
+                message=message,
+                step="perf-budget",
+                evidence=_to_posix((out_dir / "perf-budget.json").relative_to(root)) if (out_dir / "perf-budget.json").exists() else None,
+            )
+
     perf_level = _level_from_score(perf_score, **thresholds)
 
     # --- Technical debt / maintainability
@@ -17,4 +17,6 @@ class StepResult:
     cmd: list[str] | None = None
     log: str | None = None
     details: dict[str, Any] | None = None
+    # wall_sec, cpu_user_sec, cpu_sys_sec, peak_rss_bytes, read_bytes, write_bytes, processes (_proc_metrics)
+    metrics: dict[str, Any] | None = None
 
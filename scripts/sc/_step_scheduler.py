@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware step scheduler for sc scripts.
+
+Why:
+  Most sc-acceptance-check steps are independent static scans (contracts, arch
+  boundary, security gates, link validators). Running them one after another
+  makes the gate as slow as the sum of all steps. This module runs a small
+  dependency DAG in a bounded thread pool (steps are mostly subprocess-bound),
+  while keeping the returned step order identical to the declaration order so
+  summary.json stays deterministic.
+
+Notes:
+  - Dependencies only order execution; a failed dependency does not skip its
+    dependents (same semantics as the previous sequential runner).
+  - Dependencies on keys that were not declared (e.g. filtered out via --only)
+    are treated as already satisfied.
+  - Each step runs inside a ResourceMeter (_proc_metrics); a step function that returns a
+    single StepResult gets the measured wall/CPU/RSS/I/O as its `metrics`.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Callable
+
+from _proc_metrics import ResourceMeter
+from _step_result import StepResult
+
+
+StepFn = Callable[[], "StepResult | list[StepResult]"]
+
+
+@dataclass(frozen=True)
+class StepSpec:
+    key: str
+    run: StepFn
+    deps: tuple[str, ...] = ()
+
+
+def _as_list(value: StepResult | list[StepResult] | None) -> list[StepResult]:
+    if value is None:
+        return []
+    if isinstance(value, StepResult):
+        return [value]
+    return [s for s in value if isinstance(s, StepResult)]
+
+
+def _check_graph(specs: list[StepSpec]) -> None:
+    keys = [s.key for s in specs]
+    dupes = sorted({k for k in keys if keys.count(k) > 1})
+    if dupes:
+        raise ValueError(f"duplicate step keys: {dupes}")
+
+    known = set(keys)
+    deps = {s.key: [d for d in s.deps if d in known] for s in specs}
+    state: dict[str, int] = {}  # 1=visiting, 2=done
+
+    def visit(key: str, path: list[str]) -> None:
+        if state.get(key) == 2:
+            return
+        if state.get(key) == 1:
+            raise ValueError(f"step dependency cycle: {' -> '.join(path + [key])}")
+        state[key] = 1
+        for d in deps[key]:
+            visit(d, path + [key])
+        state[key] = 2
+
+    for k in keys:
+        visit(k, [])
+
+
+def _run_guarded(spec: StepSpec) -> list[StepResult]:
+    with ResourceMeter() as meter:
+        try:
+            steps = _as_list(spec.run())
+        except Exception as exc:  # noqa: BLE001
+            steps = [StepResult(name=spec.key, status="fail", rc=1, details={"error": f"step_exception: {exc}"})]
+    # Multi-result steps keep the metrics of their parts (run_and_capture measures each one).
+    if len(steps) == 1:
+        return [replace(steps[0], metrics=meter.metrics)]
+    return steps
+
+
+def run_step_graph(specs: list[StepSpec], *, max_workers: int = 4) -> list[StepResult]:
+    """
+    Runs `specs` respecting `deps` and returns all StepResults flattened in
+    declaration order (not completion order).
+    """
+    _check_graph(specs)
+    known = {s.key for s in specs}
+    results: dict[str, list[StepResult]] = {}
+
+    if max_workers <= 1:
+        # Sequential fallback: a topological order that is stable w.r.t. declaration order.
+        remaining = list(specs)
+        while remaining:
+            for spec in remaining:
+                if all(d in results or d not in known for d in spec.deps):
+                    results[spec.key] = _run_guarded(spec)
+                    remaining.remove(spec)
+                    break
+        return [r for s in specs for r in results[s.key]]
+
+    pending = list(specs)
+    running: dict[Future[list[StepResult]], str] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sc-step") as pool:
+        while pending or running:
+            ready = [s for s in pending if all(d in results or d not in known for d in s.deps)]
+            for spec in ready:
+                pending.remove(spec)
+                running[pool.submit(_run_guarded, spec)] = spec.key
+            if not running:
+                break
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                key = running.pop(fut)
+                results[key] = fut.result()
+
+    return [r for s in specs for r in results.get(s.key, [])]
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+sc-side access to the streaming subprocess runner (scripts/python/stream_run_lib.py).
+
+_util.run_cmd(log_path=...) streams long-running steps (sc-test, sc-build, acceptance
+subprocess gates) straight into their log files instead of buffering the console.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+def _bootstrap_imports() -> None:
+    py_dir = str(Path(__file__).resolve().parents[1] / "python")
+    if py_dir not in sys.path:
+        sys.path.insert(0, py_dir)
+
+
+_bootstrap_imports()
+
+from stream_run_lib import DEFAULT_TAIL_LINES, LineMatcher, StreamResult, run_streaming  # noqa: E402,F401
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -8,6 +9,17 @@ from typing import Any
 from _util import repo_root
 
 
+def _bootstrap_imports() -> None:
+    python_dir = repo_root() / "scripts" / "python"
+    if str(python_dir) not in sys.path:
+        sys.path.insert(0, str(python_dir))
+
+
+_bootstrap_imports()
+
+from taskmaster_store_lib import get_store  # noqa: E402
+
+
 @dataclass(frozen=True)
 class TaskmasterTriplet:
     task_id: str
@@ -94,20 +106,15 @@ def resolve_triplet(
     tasks_back_p = Path(tasks_back_path) if tasks_back_path else default_back
     tasks_gameplay_p = Path(tasks_gameplay_path) if tasks_gameplay_path else default_gameplay
 
-    tasks_json = load_json(tasks_json_p)
-    resolved_id = str(task_id) if task_id else resolve_current_task_id(tasks_json)
-    master_task = find_master_task(tasks_json, resolved_id)
-
-    back_task = None
-    gameplay_task = None
-    if tasks_back_p.exists():
-        back_obj = load_json(tasks_back_p)
-        if isinstance(back_obj, list):
-            back_task = _find_view_task(back_obj, resolved_id)
-    if tasks_gameplay_p.exists():
-        gameplay_obj = load_json(tasks_gameplay_p)
-        if isinstance(gameplay_obj, list):
-            gameplay_task = _find_view_task(gameplay_obj, resolved_id)
+    # Memoized per process: repeated resolve_triplet() calls (bulk loops, in-process
+    # gates) reuse one parse + index of the triplet files. Results are read-only.
+    store = get_store(tasks_json_path=tasks_json_p, tasks_back_path=tasks_back_p, tasks_gameplay_path=tasks_gameplay_p)
+    resolved_id = str(task_id) if task_id else store.current_task_id()
+    master_task = store.master_task(resolved_id)
+    if master_task is None:
+        raise KeyError(f"Task id not found in tasks.json: {resolved_id}")
+    back_task = store.back_task(resolved_id)
+    gameplay_task = store.gameplay_task(resolved_id)
 
     taskdoc_p = repo_root() / taskdoc_dir / f"{resolved_id}.md"
     taskdoc_path = str(taskdoc_p) if taskdoc_p.exists() else None
@@ -16,6 +16,8 @@ import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Any
 
+from _artifact_catalog import KIND_UNIT_DIR, find_artifact
+
 
 SC_TEST_OUT_RE = re.compile(r"^SC_TEST\s+status=\w+\s+out=(.+)\s*$", re.MULTILINE)
 
@@ -67,6 +69,7 @@ def _collect_unit_metrics_from_dir(unit_dir: Path) -> dict[str, Any] | None:
         "coverage": {
             "line_pct": coverage.get("line_pct"),
             "branch_pct": coverage.get("branch_pct"),
+            "branch_pct_lower_bound": bool(coverage.get("branch_pct_lower_bound")),
             "lines_covered": coverage.get("lines_covered"),
             "lines_valid": coverage.get("lines_valid"),
             "branches_covered": coverage.get("branches_covered"),
@@ -78,21 +81,29 @@ def _collect_unit_metrics_from_dir(unit_dir: Path) -> dict[str, Any] | None:
     }
 
 
-def collect_unit_metrics(*, tests_all_log: Path | None, fallback_unit_dir: Path) -> dict[str, Any] | None:
+def collect_unit_metrics(
+    *, tests_all_log: Path | None, fallback_unit_dir: Path, run_id: str | None = None
+) -> dict[str, Any] | None:
     """
     Best-effort extraction:
-      1) Parse tests-all.log for SC_TEST out=<dir>, then read sc-test/summary.json to locate unit artifacts dir.
-      2) Fallback to logs/unit/<date>/summary.json if present.
+      1) Unit artifacts dir registered in the artifact catalog for `run_id`.
+      2) Parse tests-all.log for SC_TEST out=<dir>, then read sc-test/summary.json to locate unit artifacts dir.
+      3) Fallback to logs/unit/<date>/summary.json if present.
     """
     unit_dir: Path | None = None
 
-    if tests_all_log and tests_all_log.is_file():
+    if run_id:
+        unit_dir = find_artifact(KIND_UNIT_DIR, run_id=run_id)
+
+    if not unit_dir and tests_all_log and tests_all_log.is_file():
+        from log_tail_lib import find_last
+
+        # The SC_TEST line is printed last by scripts/sc/test.py: scan backwards from EOF.
         try:
-            log_text = tests_all_log.read_text(encoding="utf-8", errors="ignore")
+            m = find_last(tests_all_log, SC_TEST_OUT_RE)
         except Exception:
-            log_text = ""
+            m = None
 
-        m = SC_TEST_OUT_RE.search(log_text)
         sc_test_dir = Path(m.group(1).strip()) if m else None
         if sc_test_dir and sc_test_dir.exists():
             sc_test_summary = _read_json(sc_test_dir / "summary.json")
@@ -3,10 +3,11 @@ from __future__ import annotations
 import datetime as dt
 import json
 import os
-import subprocess
 from pathlib import Path
 from typing import Any, Iterable, Sequence
 
+from _stream_run import DEFAULT_TAIL_LINES, LineMatcher, run_streaming
+
 
 def repo_root() -> Path:
     # scripts/sc/_util.py -> scripts/sc -> scripts -> repo root
@@ -48,23 +49,22 @@ def run_cmd(
     *,
     cwd: Path | None = None,
     timeout_sec: int = 900,
+    log_path: Path | None = None,
+    matchers: Sequence[LineMatcher] = (),
 ) -> tuple[int, str]:
-    proc = subprocess.Popen(
-        list(args),
-        cwd=str(cwd or repo_root()),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        encoding="utf-8",
-        errors="ignore",
+    """
+    stdout+stderr of one command. With log_path the output is streamed into that file as it
+    arrives and only the tail is returned; without it the whole output is returned.
+    """
+    res = run_streaming(
+        args,
+        cwd=cwd or repo_root(),
+        timeout_sec=timeout_sec,
+        log_path=log_path,
+        matchers=matchers,
+        tail_lines=DEFAULT_TAIL_LINES if log_path is not None else None,
     )
-    try:
-        out, _ = proc.communicate(timeout=timeout_sec)
-    except subprocess.TimeoutExpired:
-        proc.kill()
-        out, _ = proc.communicate()
-        return 124, out
-    return proc.returncode or 0, out
+    return res.rc, res.tail
 
 
 def first_existing(*candidates: str) -> str | None:
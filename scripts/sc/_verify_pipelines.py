@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Early-start verification pipelines for scripts that generate test files.
+
+Why:
+  llm_generate_tests_from_acceptance_refs.py verified with one sc-test run after every
+  referenced file had been generated, so the .NET unit run waited for the slowest .gd
+  generation (and vice versa).
+
+Design:
+  - A pipeline (unit: `sc/test.py --type unit`, e2e: `--type e2e`) lists the refs it
+    depends on; settle(ref) is called as each generation finishes (ok, fail or skipped)
+    and a pipeline is queued as soon as all of its refs are settled.
+  - Queued pipelines run one at a time on a single verify lane, overlapping with the
+    remaining generation: both pipelines build Game.Core (Game.sln and Tests.Godot.csproj
+    reference it) and write logs/ci/<date>/sc-test, so they must not run concurrently.
+  - Each pipeline writes verify-<task>-<name>.log; wait() also writes the combined
+    verify-<task>.log that the red-first compilation check reads.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from _util import repo_root, run_cmd, write_text
+
+
+@dataclass
+class VerifyPipeline:
+    name: str
+    cmd: list[str]
+    refs: set[str] = field(default_factory=set)
+    timeout_sec: int = 1_800
+
+
+class EarlyVerifier:
+    def __init__(self, pipelines: list[VerifyPipeline], *, out_dir: Path, task_id: str) -> None:
+        self.out_dir = out_dir
+        self.task_id = task_id
+        self.t0 = time.monotonic()
+        self._pending = list(pipelines)
+        self._started: list[tuple[VerifyPipeline, Future[dict[str, Any]]]] = []
+        self._lane = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sc-verify")
+        self._start_ready()
+
+    def settle(self, ref: str) -> None:
+        for p in self._pending:
+            p.refs.discard(ref)
+        self._start_ready()
+
+    def _start_ready(self) -> None:
+        ready = [p for p in self._pending if not p.refs]
+        self._pending = [p for p in self._pending if p.refs]
+        for p in ready:
+            queued_after = round(time.monotonic() - self.t0, 2)
+            print(f"[sc-verify] {p.name} queued after {queued_after}s")
+            self._started.append((p, self._lane.submit(self._run, p, queued_after)))
+
+    def _run(self, p: VerifyPipeline, queued_after: float) -> dict[str, Any]:
+        started = time.monotonic()
+        log_path = self.out_dir / f"verify-{self.task_id}-{p.name}.log"
+        rc, _ = run_cmd(p.cmd, cwd=repo_root(), timeout_sec=p.timeout_sec, log_path=log_path)
+        return {
+            "name": p.name,
+            "status": "ok" if rc == 0 else "fail",
+            "rc": rc,
+            "cmd": p.cmd,
+            "log": str(log_path),
+            "queued_after_sec": queued_after,
+            "started_after_sec": round(started - self.t0, 2),
+            "seconds": round(time.monotonic() - started, 2),
+        }
+
+    def wait(self) -> list[dict[str, Any]]:
+        """Starts anything still pending (refs never settled) and returns pipeline results in start order."""
+        for p in self._pending:
+            p.refs.clear()
+        self._start_ready()
+        results = [fut.result() for _, fut in self._started]
+        self._lane.shutdown(wait=True)
+        combined = []
+        for r in results:
+            text = Path(r["log"]).read_text(encoding="utf-8", errors="ignore")
+            combined.append(f"===== verify {r['name']} rc={r['rc']} =====\n{text}")
+        write_text(self.out_dir / f"verify-{self.task_id}.log", "\n".join(combined))
+        return results
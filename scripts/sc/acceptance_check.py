@@ -30,6 +30,8 @@ from pathlib import Path
 from typing import Any
 
 from _acceptance_report import write_markdown_report
+from _artifact_catalog import KIND_ACCEPTANCE_SUMMARY, register_artifact
+from _gate_runner import gate_runner_mode, run_gate_cmd, set_gate_runner_mode
 from _acceptance_steps import (
     StepResult,
     step_acceptance_refs_validate,
@@ -51,9 +53,10 @@ from _acceptance_steps import (
     step_tests_all,
 )
 from _risk_summary import write_risk_summary
+from _step_scheduler import StepSpec, run_step_graph
 from _taskmaster import resolve_triplet
 from _unit_metrics import collect_unit_metrics
-from _util import ci_dir, repo_root, run_cmd, today_str, write_json, write_text
+from _util import ci_dir, repo_root, today_str, write_json, write_text
 
 
 def parse_task_id(value: str | None) -> str | None:
@@ -183,7 +186,7 @@ def step_acceptance_executed_refs(out_dir: Path, *, task_id: int, expected_run_i
         "--out",
         str(out_json),
     ]
-    rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=120)
+    rc, out = run_gate_cmd(cmd, timeout_sec=120)
     log_path = out_dir / "acceptance-executed-refs.log"
     write_text(log_path, out)
     return StepResult(name="acceptance-executed-refs", status="ok" if rc == 0 else "fail", rc=rc, cmd=cmd, log=str(log_path))
@@ -200,7 +203,7 @@ def step_security_audit_evidence(out_dir: Path, *, expected_run_id: str) -> Step
         "--out",
         str(out_json),
     ]
-    rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=120)
+    rc, out = run_gate_cmd(cmd, timeout_sec=120)
     log_path = out_dir / "security-audit-executed-evidence.log"
     write_text(log_path, out)
     return StepResult(name="security-audit-executed-evidence", status="ok" if rc == 0 else "fail", rc=rc, cmd=cmd, log=str(log_path))
@@ -217,6 +220,11 @@ def main() -> int:
     )
     ap.add_argument("--perf-p95-ms", type=int, default=None, help="Enable perf hard gate by parsing [PERF] p95_ms from latest logs/ci/**/headless.log. 0 disables.")
     ap.add_argument("--require-perf", action="store_true", help="(legacy) enable perf hard gate using env PERF_P95_THRESHOLD_MS (or default 20ms)")
+    ap.add_argument(
+        "--perf-budgets",
+        default=None,
+        help="ADR-0015 budgets config (frame p99, scene switch, resource load). Default: scripts/ci/perf-budgets.json",
+    )
     ap.add_argument("--strict-adr-status", action="store_true", help="fail if any referenced ADR is not Accepted")
     ap.add_argument("--strict-test-quality", action="store_true", help="fail if deterministic test-quality heuristics report verdict=Needs Fix")
     ap.add_argument("--strict-quality-rules", action="store_true", help="fail if deterministic quality rules report verdict=Needs Fix")
@@ -275,7 +283,29 @@ def main() -> int:
         default=None,
         help="Comma-separated step filter (adr,links,subtasks,overlay,contracts,arch,build,security,quality,rules,tests,perf,risk). Default: all.",
     )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Max concurrent independent steps (dependency-ordered; summary step order stays fixed). 1 = sequential. Default: 4.",
+    )
+    ap.add_argument(
+        "--no-gate-cache",
+        action="store_true",
+        help="Disable the per-file findings cache (logs/ci/.cache/) of deterministic gates for this run.",
+    )
+    ap.add_argument(
+        "--gate-runner",
+        default=None,
+        choices=["inproc", "subprocess"],
+        help="How scripts/python gates run: inproc (import + main(argv), default) or subprocess (one interpreter per gate). Env: SC_GATE_RUNNER.",
+    )
     args = ap.parse_args()
+    if args.gate_runner:
+        set_gate_runner_mode(args.gate_runner)
+    if args.no_gate_cache:
+        # Inherited by gate subprocesses; gate_cache_lib honors SC_GATE_CACHE=0.
+        os.environ["SC_GATE_CACHE"] = "0"
 
     task_id = parse_task_id(args.task_id)
     try:
@@ -292,7 +322,11 @@ def main() -> int:
     def enabled(key: str) -> bool:
         return True if only is None else (key in only)
 
-    steps: list[StepResult] = []
+    specs: list[StepSpec] = []
+
+    def add(key: str, fn: Any, *deps: str) -> None:
+        specs.append(StepSpec(key=key, run=fn, deps=tuple(deps)))
+
     has_gd_refs = task_requires_headless_e2e(triplet)
     needs_headless = bool(args.require_headless_e2e) and has_gd_refs
     require_executed = bool(args.require_executed_refs)
@@ -300,105 +334,122 @@ def main() -> int:
     if subtasks_mode not in ("skip", "warn", "require"):
         subtasks_mode = "skip"
     run_id = uuid.uuid4().hex
+    # sc-test and its runners register artifacts under this task in the artifact catalog.
+    os.environ["SC_TASK_ID"] = str(triplet.task_id)
 
     if enabled("adr"):
-        steps.append(step_adr_compliance(out_dir, triplet, strict_status=bool(args.strict_adr_status)))
+        add("adr", lambda: step_adr_compliance(out_dir, triplet, strict_status=bool(args.strict_adr_status)))
     if enabled("links"):
-        steps.append(step_task_links_validate(out_dir))
-        steps.append(step_task_test_refs_validate(out_dir, triplet, require_non_empty=bool(args.require_task_test_refs)))
-        steps.append(step_acceptance_refs_validate(out_dir, triplet))
-        steps.append(step_acceptance_anchors_validate(out_dir, triplet))
+        add("task-links", lambda: step_task_links_validate(out_dir))
+        add("task-test-refs", lambda: step_task_test_refs_validate(out_dir, triplet, require_non_empty=bool(args.require_task_test_refs)))
+        add("acceptance-refs", lambda: step_acceptance_refs_validate(out_dir, triplet))
+        add("acceptance-anchors", lambda: step_acceptance_anchors_validate(out_dir, triplet))
     if enabled("subtasks"):
         if subtasks_mode == "skip":
-            steps.append(StepResult(name="subtasks-coverage", status="skipped", rc=0, details={"reason": "subtasks_coverage_skip"}))
+            add("subtasks", lambda: StepResult(name="subtasks-coverage", status="skipped", rc=0, details={"reason": "subtasks_coverage_skip"}))
         else:
-            steps.append(step_subtasks_coverage_llm(out_dir, triplet, timeout_sec=int(args.subtasks_timeout_sec)))
+            add("subtasks", lambda: step_subtasks_coverage_llm(out_dir, triplet, timeout_sec=int(args.subtasks_timeout_sec)))
     elif subtasks_mode in ("warn", "require"):
-        steps.append(
-            StepResult(
+        add(
+            "subtasks",
+            lambda: StepResult(
                 name="subtasks-coverage",
                 status="fail" if subtasks_mode == "require" else "skipped",
                 rc=1 if subtasks_mode == "require" else 0,
                 details={"error": "subtasks_step_disabled", "hint": "include 'subtasks' in --only (or omit --only) when using --subtasks-coverage warn|require"},
-            )
+            ),
         )
     if enabled("overlay"):
-        steps.append(step_overlay_validate(out_dir, triplet))
+        add("overlay", lambda: step_overlay_validate(out_dir, triplet))
     if enabled("contracts"):
-        steps.append(step_contracts_validate(out_dir))
+        add("contracts", lambda: step_contracts_validate(out_dir))
     if enabled("arch"):
-        steps.append(step_architecture_boundary(out_dir))
+        add("arch", lambda: step_architecture_boundary(out_dir))
     if enabled("build"):
-        steps.append(step_build_warnaserror(out_dir))
+        add("build", lambda: step_build_warnaserror(out_dir))
     if enabled("quality"):
-        steps.append(step_test_quality_soft(out_dir, triplet, strict=bool(args.strict_test_quality)))
+        add("quality", lambda: step_test_quality_soft(out_dir, triplet, strict=bool(args.strict_test_quality)))
     if enabled("rules"):
-        steps.append(step_quality_rules(out_dir, strict=bool(args.strict_quality_rules)))
+        add("rules", lambda: step_quality_rules(out_dir, strict=bool(args.strict_quality_rules)))
     if enabled("security"):
-        steps.append(
-            step_security_hard(
+        add(
+            "security-hard",
+            lambda: step_security_hard(
                 out_dir,
                 path_mode=str(args.security_path_gate),
                 sql_mode=str(args.security_sql_gate),
                 audit_schema_mode=str(args.security_audit_schema_gate),
-            )
+            ),
         )
-        steps.append(step_ui_event_security(out_dir, json_mode=str(args.ui_event_json_guards), source_mode=str(args.ui_event_source_verify)))
-        steps.append(step_security_soft(out_dir))
+        add("ui-event-security", lambda: step_ui_event_security(out_dir, json_mode=str(args.ui_event_json_guards), source_mode=str(args.ui_event_source_verify)))
+        add("security-soft", lambda: step_security_soft(out_dir))
 
     godot_bin = args.godot_bin or os.environ.get("GODOT_BIN")
     audit_mode = str(args.security_audit_evidence or "skip").strip().lower()
+
+    def audit_evidence() -> StepResult:
+        audit_step = step_security_audit_evidence(out_dir, expected_run_id=run_id)
+        if audit_mode == "warn" and audit_step.status != "ok":
+            return StepResult(name="security-audit-executed-evidence", status="ok", rc=0, details={"mode": "warn", "reason": "audit_evidence_missing"})
+        return audit_step
+
     if enabled("tests"):
         test_type = "all" if has_gd_refs else "unit"
         if test_type != "unit" and not godot_bin:
-            steps.append(StepResult(name="tests-all", status="fail", rc=2, details={"error": "missing_godot_bin", "hint": "set --godot-bin or env GODOT_BIN"}))
+            add("tests", lambda: StepResult(name="tests-all", status="fail", rc=2, details={"error": "missing_godot_bin", "hint": "set --godot-bin or env GODOT_BIN"}))
         else:
-            steps.append(step_tests_all(out_dir, godot_bin, run_id=run_id, test_type=test_type))
+            # Tests rebuild the same projects as the build gate: never run them concurrently.
+            # perf-budget grades the smoke log of this run, so the smoke scene must launch cold.
+            smoke_cold = enabled("perf")
+            add("tests", lambda: step_tests_all(out_dir, godot_bin, run_id=run_id, test_type=test_type, smoke_cold=smoke_cold), "build")
             if needs_headless:
-                steps.append(step_headless_e2e_evidence(out_dir, expected_run_id=run_id))
+                add("headless-e2e-evidence", lambda: step_headless_e2e_evidence(out_dir, expected_run_id=run_id), "tests")
             if require_executed:
-                steps.append(step_acceptance_executed_refs(out_dir, task_id=int(triplet.task_id), expected_run_id=run_id))
+                add("executed-refs", lambda: step_acceptance_executed_refs(out_dir, task_id=int(triplet.task_id), expected_run_id=run_id), "tests")
             if audit_mode in ("warn", "require"):
-                audit_step = step_security_audit_evidence(out_dir, expected_run_id=run_id)
-                if audit_mode == "warn" and audit_step.status != "ok":
-                    steps.append(StepResult(name="security-audit-executed-evidence", status="ok", rc=0, details={"mode": "warn", "reason": "audit_evidence_missing"}))
-                else:
-                    steps.append(audit_step)
+                add("security-audit-evidence", audit_evidence, "tests")
     elif needs_headless:
-        steps.append(
-            StepResult(
+        add(
+            "headless-e2e-evidence",
+            lambda: StepResult(
                 name="headless-e2e-evidence",
                 status="fail",
                 rc=1,
                 details={"error": "tests_step_disabled", "hint": "include 'tests' in --only (or omit --only) when using --require-headless-e2e"},
-            )
+            ),
         )
     elif require_executed:
-        steps.append(
-            StepResult(
+        add(
+            "executed-refs",
+            lambda: StepResult(
                 name="acceptance-executed-refs",
                 status="fail",
                 rc=1,
                 details={"error": "tests_step_disabled", "hint": "include 'tests' in --only (or omit --only) when using --require-executed-refs"},
-            )
+            ),
         )
     elif audit_mode == "require":
-        steps.append(
-            StepResult(
+        add(
+            "security-audit-evidence",
+            lambda: StepResult(
                 name="security-audit-executed-evidence",
                 status="fail",
                 rc=1,
                 details={"error": "tests_step_disabled", "hint": "include 'tests' in --only (or omit --only) when using --security-audit-evidence require"},
-            )
+            ),
         )
     elif audit_mode == "warn":
-        steps.append(StepResult(name="security-audit-executed-evidence", status="ok", rc=0, details={"mode": "warn", "reason": "tests_step_disabled"}))
+        add("security-audit-evidence", lambda: StepResult(name="security-audit-executed-evidence", status="ok", rc=0, details={"mode": "warn", "reason": "tests_step_disabled"}))
 
     env_v = os.environ.get("PERF_P95_THRESHOLD_MS")
     env_p95 = int(env_v) if (env_v and env_v.isdigit()) else None
     perf_p95_ms = max(0, int(args.perf_p95_ms)) if args.perf_p95_ms is not None else (env_p95 if env_p95 is not None else (20 if args.require_perf else 0))
     if enabled("perf"):
-        steps.append(step_perf_budget(out_dir, max_p95_ms=perf_p95_ms))
+        # perf-budget parses the headless.log produced by the tests step.
+        perf_budgets = Path(args.perf_budgets) if args.perf_budgets else None
+        add("perf", lambda: step_perf_budget(out_dir, max_p95_ms=perf_p95_ms, budgets_path=perf_budgets), "tests")
+
+    steps: list[StepResult] = run_step_graph(specs, max_workers=max(1, int(args.jobs)))
 
     hard_failed = False
     for s in steps:
@@ -416,6 +467,7 @@ def main() -> int:
     unit = collect_unit_metrics(
         tests_all_log=tests_log,
         fallback_unit_dir=(repo_root() / "logs" / "unit" / today_str()),
+        run_id=run_id,
     )
     if unit:
         metrics["unit"] = unit
@@ -460,6 +512,8 @@ def main() -> int:
         "task_id": triplet.task_id,
         "title": triplet.master.get("title"),
         "only": args.only,
+        "jobs": max(1, int(args.jobs)),
+        "gate_runner": gate_runner_mode(),
         "status": "fail" if hard_failed else "ok",
         "steps": [s.__dict__ for s in steps],
         "out_dir": str(out_dir),
@@ -473,6 +527,7 @@ def main() -> int:
 
     write_json(out_dir / "summary.json", summary)
     write_markdown_report(out_dir, triplet, steps, metrics=metrics or None)
+    register_artifact(KIND_ACCEPTANCE_SUMMARY, out_dir / "summary.json", run_id=run_id, task_id=str(triplet.task_id), step="sc-acceptance-check")
 
     print(f"SC_ACCEPTANCE status={summary['status']} out={out_dir}")
     return 0 if not hard_failed else 1
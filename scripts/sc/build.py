@@ -6,6 +6,10 @@ Usage (Windows):
   py -3 scripts/sc/build.py
   py -3 scripts/sc/build.py GodotGame.sln --type prod --clean --verbose
 
+The build is skipped (summary cache_hit=true) while the target's input-hash stamp matches:
+no .cs/.csproj/.sln/MSBuild config changed since the last successful build with the same
+configuration. --clean always rebuilds; SC_BUILD_CACHE=0 disables the skip.
+
 TDD helper (gated, non-generative):
   py -3 scripts/sc/build.py tdd --stage green
 """
@@ -16,7 +20,8 @@ import argparse
 import sys
 from pathlib import Path
 
-from _util import ci_dir, repo_root, run_cmd, write_json, write_text
+from _build_cache import dotnet_stamp
+from _util import ci_dir, repo_root, run_cmd, write_json
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -34,9 +39,8 @@ def main() -> int:
     #   py -3 scripts/sc/build.py tdd ...
     if len(sys.argv) > 1 and sys.argv[1] == "tdd":
         cmd = ["py", "-3", "scripts/sc/build/tdd.py"] + sys.argv[2:]
-        rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=3_600)
         out_dir = ci_dir("sc-build")
-        write_text(out_dir / "tdd.log", out)
+        rc, _ = run_cmd(cmd, cwd=repo_root(), timeout_sec=3_600, log_path=out_dir / "tdd.log")
         print(f"SC_BUILD_TDD rc={rc} out={out_dir}")
         return 0 if rc == 0 else rc
 
@@ -62,11 +66,21 @@ def main() -> int:
     }
 
     logs = []
+    stamp = dotnet_stamp(target, "build-warnaserror", configuration=config)
+    summary["cache_hit"] = not args.clean and stamp.hit()
+    if summary["cache_hit"]:
+        summary["stamp"] = str(stamp.path)
+        summary["logs"] = logs
+        summary["status"] = "ok"
+        write_json(out_dir / "summary.json", summary)
+        print(f"SC_BUILD status=ok cache_hit=true out={out_dir}")
+        return 0
+
+    stamp.invalidate()
     if args.clean:
         cmd = ["dotnet", "clean", str(target), "-c", config]
-        rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=900)
         log_path = out_dir / "dotnet-clean.log"
-        write_text(log_path, out)
+        rc, _ = run_cmd(cmd, cwd=repo_root(), timeout_sec=900, log_path=log_path)
         logs.append({"name": "dotnet-clean", "cmd": cmd, "rc": rc, "log": str(log_path)})
         if rc != 0:
             summary["logs"] = logs
@@ -78,16 +92,18 @@ def main() -> int:
     if args.verbose:
         cmd += ["-v", "normal"]
 
-    rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=1_800)
     log_path = out_dir / "dotnet-build.log"
-    write_text(log_path, out)
+    rc, _ = run_cmd(cmd, cwd=repo_root(), timeout_sec=1_800, log_path=log_path)
     logs.append({"name": "dotnet-build", "cmd": cmd, "rc": rc, "log": str(log_path)})
 
+    if rc == 0:
+        stamp.record()
+
     summary["logs"] = logs
     summary["status"] = "ok" if rc == 0 else "fail"
     write_json(out_dir / "summary.json", summary)
 
-    print(f"SC_BUILD status={summary['status']} out={out_dir}")
+    print(f"SC_BUILD status={summary['status']} cache_hit=false out={out_dir}")
     return 0 if rc == 0 else rc
 
 
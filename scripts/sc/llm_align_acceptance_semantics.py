@@ -21,6 +21,7 @@ import argparse
 from pathlib import Path
 from typing import Any
 
+from _llm_cache import set_llm_cache_enabled  # type: ignore
 from _taskmaster import default_paths, load_json  # type: ignore
 from _util import ci_dir, today_str, write_json, write_text  # type: ignore
 
@@ -55,7 +56,10 @@ def main() -> int:
     ap.add_argument("--align-view-descriptions-to-master", action="store_true")
     ap.add_argument("--semantic-findings-json", default="", help="Optional sc-semantic-gate-all/summary.json for hints.")
     ap.add_argument("--timeout-sec", type=int, default=240)
+    ap.add_argument("--no-llm-cache", action="store_true", help="Bypass the codex answer cache under logs/ci/.llm-cache/.")
     args = ap.parse_args()
+    if args.no_llm_cache:
+        set_llm_cache_enabled(False)
 
     tasks_json_path, tasks_back_path, tasks_gameplay_path = default_paths()
     tasks_json = load_json(tasks_json_path)
@@ -27,8 +27,6 @@ import argparse
 import json
 import os
 import re
-import shutil
-import subprocess
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -41,6 +39,8 @@ def _bootstrap_imports() -> None:
 
 _bootstrap_imports()
 
+from _codex_client import run_codex_exec  # noqa: E402
+from _llm_cache import set_llm_cache_enabled  # noqa: E402
 from _taskmaster import default_paths, iter_master_tasks, load_json  # noqa: E402
 from _util import ci_dir, repo_root, run_cmd, today_str, write_json, write_text  # noqa: E402
 
@@ -87,37 +87,8 @@ def _extract_testing_framework_excerpt() -> str:
 
 
 def _run_codex_exec(*, prompt: str, out_last_message: Path, timeout_sec: int) -> tuple[int, str, list[str]]:
-    exe = shutil.which("codex")
-    if not exe:
-        return 127, "codex executable not found in PATH\n", ["codex"]
-    cmd = [
-        exe,
-        "exec",
-        "-s",
-        "read-only",
-        "-C",
-        str(repo_root()),
-        "--output-last-message",
-        str(out_last_message),
-        "-",
-    ]
-    try:
-        proc = subprocess.run(
-            cmd,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            cwd=str(repo_root()),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            timeout=timeout_sec,
-        )
-    except subprocess.TimeoutExpired:
-        return 124, "codex exec timeout\n", cmd
-    except Exception as exc:  # noqa: BLE001
-        return 1, f"codex exec failed to start: {exc}\n", cmd
-    return proc.returncode or 0, proc.stdout or "", cmd
+    res = run_codex_exec(prompt=prompt, out_last_message=out_last_message, timeout_sec=timeout_sec)
+    return res.rc, res.trace, res.cmd
 
 
 def _extract_json_object(text: str) -> dict[str, Any]:
@@ -506,7 +477,10 @@ def main() -> int:
     ap.add_argument("--max-refs-per-item", type=int, default=2, help="Max refs per acceptance item (default: 2).")
     ap.add_argument("--candidate-limit", type=int, default=30, help="Max existing candidate tests to provide to the model.")
     ap.add_argument("--max-tasks", type=int, default=0, help="Optional safety cap; 0 means no limit.")
+    ap.add_argument("--no-llm-cache", action="store_true", help="Bypass the codex answer cache under logs/ci/.llm-cache/.")
     args = ap.parse_args()
+    if args.no_llm_cache:
+        set_llm_cache_enabled(False)
 
     root = repo_root()
     out_dir = ci_dir("sc-llm-acceptance-refs")
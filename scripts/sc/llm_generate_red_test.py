@@ -24,8 +24,6 @@ from __future__ import annotations
 import argparse
 import json
 import re
-import shutil
-import subprocess
 import sys
 from pathlib import Path
 from typing import Any
@@ -38,6 +36,8 @@ def _bootstrap_imports() -> None:
 
 _bootstrap_imports()
 
+from _codex_client import run_codex_exec  # noqa: E402
+from _llm_cache import set_llm_cache_enabled  # noqa: E402
 from _taskmaster import resolve_triplet  # noqa: E402
 from _util import ci_dir, repo_root, run_cmd, write_json, write_text  # noqa: E402
 
@@ -93,37 +93,8 @@ def _extract_testing_framework_excerpt() -> str:
 
 
 def _run_codex_exec(*, prompt: str, out_last_message: Path, timeout_sec: int) -> tuple[int, str, list[str]]:
-    exe = shutil.which("codex")
-    if not exe:
-        return 127, "codex executable not found in PATH\n", ["codex"]
-    cmd = [
-        exe,
-        "exec",
-        "-s",
-        "read-only",
-        "-C",
-        str(repo_root()),
-        "--output-last-message",
-        str(out_last_message),
-        "-",
-    ]
-    try:
-        proc = subprocess.run(
-            cmd,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            cwd=str(repo_root()),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            timeout=timeout_sec,
-        )
-    except subprocess.TimeoutExpired:
-        return 124, "codex exec timeout\n", cmd
-    except Exception as exc:  # noqa: BLE001
-        return 1, f"codex exec failed to start: {exc}\n", cmd
-    return proc.returncode or 0, proc.stdout or "", cmd
+    res = run_codex_exec(prompt=prompt, out_last_message=out_last_message, timeout_sec=timeout_sec)
+    return res.rc, res.trace, res.cmd
 
 
 def _build_prompt(*, task_id: str, context: dict[str, Any]) -> str:
@@ -208,7 +179,10 @@ def main() -> int:
     ap.add_argument("--task-id", required=True, help="Task id (master id, e.g. 11).")
     ap.add_argument("--timeout-sec", type=int, default=600, help="codex exec timeout in seconds (default: 600).")
     ap.add_argument("--verify-red", action="store_true", help="Run sc-build tdd --stage red after writing the file.")
+    ap.add_argument("--no-llm-cache", action="store_true", help="Bypass the codex answer cache under logs/ci/.llm-cache/.")
     args = ap.parse_args()
+    if args.no_llm_cache:
+        set_llm_cache_enabled(False)
 
     task_id = str(args.task_id).split(".", 1)[0].strip()
     if not task_id.isdigit():
@@ -11,6 +11,11 @@ Optional TDD helper:
     via LLM and generates a meaningful failing test for that primary ref first. Other
     referenced test files are generated as scaffolding (not intentionally failing).
 
+With --concurrency N, up to N missing files are generated by codex in parallel and each file
+is written as soon as its answer arrives. Verification is split into a unit pipeline (C# refs)
+and, for --verify all, an e2e pipeline (.gd refs); each starts as soon as its own refs are
+generated, on one serial verify lane (see _verify_pipelines.py).
+
 This tool is intentionally conservative:
   - It only creates files explicitly referenced by acceptance Refs.
   - It does not invent new paths.
@@ -19,6 +24,7 @@ This tool is intentionally conservative:
 Usage (Windows):
   py -3 scripts/sc/llm_generate_tests_from_acceptance_refs.py --task-id 11 --verify unit
   py -3 scripts/sc/llm_generate_tests_from_acceptance_refs.py --task-id 10 --verify all --godot-bin \"$env:GODOT_BIN\"
+  py -3 scripts/sc/llm_generate_tests_from_acceptance_refs.py --task-id 10 --concurrency 4 --verify all --godot-bin \"$env:GODOT_BIN\"
   py -3 scripts/sc/llm_generate_tests_from_acceptance_refs.py --task-id 11 --tdd-stage red-first --verify none
 """
 
@@ -28,9 +34,9 @@ import argparse
 import json
 import os
 import re
-import shutil
-import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -42,8 +48,11 @@ def _bootstrap_imports() -> None:
 
 _bootstrap_imports()
 
+from _codex_client import run_codex_exec, set_max_concurrency  # noqa: E402
+from _llm_cache import set_llm_cache_enabled  # noqa: E402
 from _taskmaster import resolve_triplet  # noqa: E402
 from _util import ci_dir, repo_root, run_cmd, write_json, write_text  # noqa: E402
+from _verify_pipelines import EarlyVerifier, VerifyPipeline  # noqa: E402
 
 
 REFS_RE = re.compile(r"\bRefs\s*:\s*(.+)$", flags=re.IGNORECASE)
@@ -63,6 +72,7 @@ class GenResult:
     trace_path: str | None = None
     output_path: str | None = None
     error: str | None = None
+    seconds: float | None = None
 
 
 def _read_text(path: Path) -> str:
@@ -136,37 +146,8 @@ def _extract_acceptance_refs_with_anchors(*, acceptance: Any, task_id: str) -> d
 
 
 def _run_codex_exec(*, prompt: str, out_last_message: Path, timeout_sec: int) -> tuple[int, str, list[str]]:
-    exe = shutil.which("codex")
-    if not exe:
-        return 127, "codex executable not found in PATH\n", ["codex"]
-    cmd = [
-        exe,
-        "exec",
-        "-s",
-        "read-only",
-        "-C",
-        str(repo_root()),
-        "--output-last-message",
-        str(out_last_message),
-        "-",
-    ]
-    try:
-        proc = subprocess.run(
-            cmd,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            cwd=str(repo_root()),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            timeout=timeout_sec,
-        )
-    except subprocess.TimeoutExpired:
-        return 124, "codex exec timeout\n", cmd
-    except Exception as exc:  # noqa: BLE001
-        return 1, f"codex exec failed to start: {exc}\n", cmd
-    return proc.returncode or 0, proc.stdout or "", cmd
+    res = run_codex_exec(prompt=prompt, out_last_message=out_last_message, timeout_sec=timeout_sec)
+    return res.rc, res.trace, res.cmd
 
 
 def _extract_json_object(text: str) -> dict[str, Any]:
@@ -380,15 +361,77 @@ def _select_primary_ref_with_llm(
         return candidates[0], meta
 
 
+def _generate_ref(
+    *,
+    task_id: str,
+    title: str,
+    ref_norm: str,
+    entries: list[dict[str, str]],
+    intent: str,
+    task_context_md: str,
+    out_dir: Path,
+    name: str,
+    timeout_sec: int,
+) -> GenResult:
+    """One codex call for one missing ref; the file is written as soon as its answer is valid."""
+    started = time.monotonic()
+    prompt = _prompt_for_ref(
+        task_id=task_id,
+        title=title,
+        ref=ref_norm,
+        acceptance_texts=[x.get("text", "") for x in entries],
+        required_anchors=sorted({x.get("anchor", "") for x in entries if str(x.get("anchor", "")).strip()}),
+        intent=intent,
+        task_context_markdown=task_context_md,
+    )
+    prompt_path = out_dir / f"prompt-{task_id}-{name}.txt"
+    write_text(prompt_path, prompt)
+    output_path = out_dir / f"codex-last-{task_id}-{name}.txt"
+    trace_path = out_dir / f"codex-trace-{task_id}-{name}.log"
+    paths = {"prompt_path": str(prompt_path), "trace_path": str(trace_path), "output_path": str(output_path)}
+
+    rc, trace_out, _cmd = _run_codex_exec(prompt=prompt, out_last_message=output_path, timeout_sec=timeout_sec)
+    write_text(trace_path, trace_out)
+    last_msg = _read_text(output_path) if output_path.exists() else ""
+    if rc != 0 or not last_msg.strip():
+        return GenResult(
+            ref=ref_norm,
+            status="fail",
+            rc=rc,
+            error="codex exec failed/empty output",
+            seconds=round(time.monotonic() - started, 2),
+            **paths,
+        )
+
+    try:
+        obj = _extract_json_object(last_msg)
+        fp = str(obj.get("file_path") or "").replace("\\", "/")
+        content = str(obj.get("content") or "")
+        if fp != ref_norm:
+            raise ValueError(f"unexpected file_path: {fp}")
+        if not content.strip():
+            raise ValueError("empty content")
+        disk = repo_root() / ref_norm
+        disk.parent.mkdir(parents=True, exist_ok=True)
+        disk.write_text(content.replace("\r\n", "\n"), encoding="utf-8", newline="\n")
+    except Exception as exc:  # noqa: BLE001
+        return GenResult(ref=ref_norm, status="fail", rc=1, error=str(exc), seconds=round(time.monotonic() - started, 2), **paths)
+    return GenResult(ref=ref_norm, status="ok", rc=0, seconds=round(time.monotonic() - started, 2), **paths)
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Generate missing tests from acceptance Refs using Codex.")
     ap.add_argument("--task-id", required=True, help="Task id (master id, e.g. 11).")
     ap.add_argument("--timeout-sec", type=int, default=600, help="Per-file codex exec timeout (seconds).")
+    ap.add_argument("--concurrency", type=int, default=1, help="Missing ref files generated by codex in parallel (default: 1).")
     ap.add_argument("--select-timeout-sec", type=int, default=120, help="LLM primary-ref selection timeout (seconds).")
     ap.add_argument("--tdd-stage", choices=["normal", "red-first"], default="normal")
     ap.add_argument("--verify", choices=["none", "unit", "all", "auto"], default="auto")
     ap.add_argument("--godot-bin", default=None, help="Required when verify=all/auto and .gd files are involved.")
+    ap.add_argument("--no-llm-cache", action="store_true", help="Bypass the codex answer cache under logs/ci/.llm-cache/.")
     args = ap.parse_args()
+    if args.no_llm_cache:
+        set_llm_cache_enabled(False)
 
     task_id = str(args.task_id).split(".", 1)[0].strip()
     if not task_id.isdigit():
@@ -491,10 +534,10 @@ def main() -> int:
         by_ref[r] = uniq
 
     refs = sorted(by_ref.keys())
-    results: list[GenResult] = []
-
-    any_gd = False
-    created = 0
+    # Keys are already "/"-normalized by _extract_acceptance_refs_with_anchors.
+    missing = [r for r in refs if not (repo_root() / r).exists()]
+    results: list[GenResult] = [GenResult(ref=r, status="skipped", rc=0) for r in refs if r not in missing]
+    any_gd = any(r.lower().endswith(".gd") for r in missing)
 
     primary_ref = None
     if str(args.tdd_stage) == "red-first":
@@ -507,87 +550,58 @@ def main() -> int:
         )
         write_json(out_dir / f"primary-select.{task_id}.json", primary_meta)
 
-    for ref in refs:
-        ref_norm = ref.replace("\\", "/")
-        disk = repo_root() / ref_norm
-        if disk.exists():
-            results.append(GenResult(ref=ref_norm, status="skipped", rc=0))
-            continue
-
-        if disk.suffix.lower() == ".gd":
-            any_gd = True
-
-        if str(args.tdd_stage) == "red-first" and primary_ref and ref_norm == primary_ref:
-            intent = "red"
-        else:
-            # Default to scaffold unless explicitly selecting a red-first primary ref.
-            # This avoids generating multiple failing tests when verify!=none.
-            intent = "scaffold"
+    # Decide verification mode; pipelines start as soon as the refs they test are generated.
+    verify = args.verify
+    if verify == "auto":
+        verify = "all" if any_gd else "unit"
 
-        prompt = _prompt_for_ref(
+    test_step = None
+    verifier = None
+    if verify == "all" and not (args.godot_bin or os.environ.get("GODOT_BIN")):
+        write_text(out_dir / f"verify-{task_id}.log", "ERROR: verify=all requires --godot-bin or env GODOT_BIN\n")
+        test_step = {"status": "fail", "rc": 2, "error": "missing_godot_bin"}
+    elif verify != "none":
+        pipelines = [VerifyPipeline("unit", ["py", "-3", "scripts/sc/test.py", "--type", "unit"], {r for r in missing if not r.lower().endswith(".gd")})]
+        if verify == "all":
+            godot_bin = str(args.godot_bin or os.environ.get("GODOT_BIN"))
+            pipelines.append(
+                VerifyPipeline("e2e", ["py", "-3", "scripts/sc/test.py", "--type", "e2e", "--godot-bin", godot_bin], {r for r in missing if r.lower().endswith(".gd")})
+            )
+        verifier = EarlyVerifier(pipelines, out_dir=out_dir, task_id=task_id)
+
+    names = [Path(r).name for r in missing]
+    concurrency = max(1, int(args.concurrency))
+    set_max_concurrency(concurrency)
+
+    def _generate(ref_norm: str) -> GenResult:
+        # Default to scaffold unless explicitly selecting a red-first primary ref.
+        # This avoids generating multiple failing tests when verify!=none.
+        intent = "red" if str(args.tdd_stage) == "red-first" and primary_ref and ref_norm == primary_ref else "scaffold"
+        entries = by_ref.get(ref_norm, [])
+        # Artifact names use the file name; refs sharing one across directories get the full path.
+        name = Path(ref_norm).name if names.count(Path(ref_norm).name) == 1 else ref_norm.replace("/", "__")
+        return _generate_ref(
             task_id=task_id,
             title=title,
-            ref=ref_norm,
-            acceptance_texts=[x.get("text", "") for x in by_ref.get(ref, [])],
-            required_anchors=sorted({x.get("anchor", "") for x in by_ref.get(ref, []) if str(x.get("anchor", "")).strip()}),
+            ref_norm=ref_norm,
+            entries=entries,
             intent=intent,
-            task_context_markdown=task_context_md,
+            task_context_md=task_context_md,
+            out_dir=out_dir,
+            name=name,
+            timeout_sec=int(args.timeout_sec),
         )
-        prompt_path = out_dir / f"prompt-{task_id}-{Path(ref_norm).name}.txt"
-        write_text(prompt_path, prompt)
-        output_path = out_dir / f"codex-last-{task_id}-{Path(ref_norm).name}.txt"
-        trace_path = out_dir / f"codex-trace-{task_id}-{Path(ref_norm).name}.log"
-
-        rc, trace_out, _cmd = _run_codex_exec(prompt=prompt, out_last_message=output_path, timeout_sec=int(args.timeout_sec))
-        write_text(trace_path, trace_out)
-        last_msg = _read_text(output_path) if output_path.exists() else ""
-        if rc != 0 or not last_msg.strip():
-            results.append(
-                GenResult(
-                    ref=ref_norm,
-                    status="fail",
-                    rc=rc,
-                    prompt_path=str(prompt_path),
-                    trace_path=str(trace_path),
-                    output_path=str(output_path),
-                    error="codex exec failed/empty output",
-                )
-            )
-            continue
 
-        try:
-            obj = _extract_json_object(last_msg)
-            fp = str(obj.get("file_path") or "").replace("\\", "/")
-            content = str(obj.get("content") or "")
-            if fp != ref_norm:
-                raise ValueError(f"unexpected file_path: {fp}")
-            if not content.strip():
-                raise ValueError("empty content")
-            disk.parent.mkdir(parents=True, exist_ok=True)
-            disk.write_text(content.replace("\r\n", "\n"), encoding="utf-8", newline="\n")
-            created += 1
-            results.append(
-                GenResult(
-                    ref=ref_norm,
-                    status="ok",
-                    rc=0,
-                    prompt_path=str(prompt_path),
-                    trace_path=str(trace_path),
-                    output_path=str(output_path),
-                )
-            )
-        except Exception as exc:  # noqa: BLE001
-            results.append(
-                GenResult(
-                    ref=ref_norm,
-                    status="fail",
-                    rc=1,
-                    prompt_path=str(prompt_path),
-                    trace_path=str(trace_path),
-                    output_path=str(output_path),
-                    error=str(exc),
-                )
-            )
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="sc-gen-tests") as pool:
+        futures = {pool.submit(_generate, r): r for r in missing}
+        for done, fut in enumerate(as_completed(futures), start=1):
+            result = fut.result()
+            results.append(result)
+            print(f"[sc-llm-acceptance-tests] {done}/{len(missing)} {result.ref} status={result.status} seconds={result.seconds}")
+            if verifier is not None:
+                verifier.settle(result.ref)
+    results.sort(key=lambda r: r.ref)
+    created = sum(1 for r in results if r.status == "ok")
 
     # Sync test_refs from acceptance refs (task-level union evidence).
     sync_cmd = [
@@ -603,28 +617,10 @@ def main() -> int:
     sync_rc, sync_out = run_cmd(sync_cmd, cwd=repo_root(), timeout_sec=60)
     write_text(out_dir / f"sync-test-refs-{task_id}.log", sync_out)
 
-    # Decide verification mode.
-    verify = args.verify
-    if verify == "auto":
-        verify = "all" if any_gd else "unit"
-
-    test_step = None
-    if verify != "none":
-        if verify == "all":
-            godot_bin = args.godot_bin or os.environ.get("GODOT_BIN")
-            if not godot_bin:
-                write_text(out_dir / f"verify-{task_id}.log", "ERROR: verify=all requires --godot-bin or env GODOT_BIN\n")
-                test_step = {"status": "fail", "rc": 2, "error": "missing_godot_bin"}
-            else:
-                cmd = ["py", "-3", "scripts/sc/test.py", "--type", "all", "--godot-bin", str(godot_bin)]
-                rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=1_800)
-                write_text(out_dir / f"verify-{task_id}.log", out)
-                test_step = {"status": "ok" if rc == 0 else "fail", "rc": rc, "cmd": cmd}
-        else:
-            cmd = ["py", "-3", "scripts/sc/test.py", "--type", "unit"]
-            rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=1_800)
-            write_text(out_dir / f"verify-{task_id}.log", out)
-            test_step = {"status": "ok" if rc == 0 else "fail", "rc": rc, "cmd": cmd}
+    if verifier is not None:
+        pipeline_results = verifier.wait()
+        rc = next((r["rc"] for r in pipeline_results if r["rc"] != 0), 0)
+        test_step = {"status": "ok" if rc == 0 else "fail", "rc": rc, "pipelines": pipeline_results}
 
     summary = {
         "cmd": "sc-llm-generate-tests-from-acceptance-refs",
@@ -634,6 +630,7 @@ def main() -> int:
         "primary_ref": primary_ref,
         "refs_total": len(refs),
         "created": created,
+        "concurrency": concurrency,
         "sync_test_refs_rc": sync_rc,
         "verify_mode": verify,
         "test_step": test_step,
@@ -21,15 +21,16 @@ from __future__ import annotations
 import argparse
 import os
 import re
-import shutil
-import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from _acceptance_artifacts import build_acceptance_evidence
+from _codex_client import run_codex_exec, set_max_concurrency
 from _deterministic_review import DETERMINISTIC_AGENTS, build_deterministic_review
+from _llm_cache import set_llm_cache_enabled
 from _taskmaster import TaskmasterTriplet, resolve_triplet
 from _util import ci_dir, repo_root, run_cmd, split_csv, today_str, write_json, write_text
 
@@ -595,44 +596,13 @@ def _run_codex_exec(
     timeout_sec: int,
     codex_configs: list[str] | None = None,
 ) -> tuple[int, str, list[str]]:
-    exe = shutil.which("codex")
-    if not exe:
-        return 127, "codex executable not found in PATH\n", ["codex"]
-
-    extra_config = [c for c in (codex_configs or []) if str(c).strip()]
-    extra_config_args: list[str] = []
-    for c in extra_config:
-        extra_config_args.extend(["-c", str(c)])
-
-    cmd = [
-        exe,
-        "exec",
-        *extra_config_args,
-        "-s",
-        "read-only",
-        "-C",
-        str(repo_root()),
-        "--output-last-message",
-        str(output_last_message),
-        "-",
-    ]
-    try:
-        proc = subprocess.run(
-            cmd,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            cwd=str(repo_root()),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            timeout=timeout_sec,
-        )
-    except subprocess.TimeoutExpired:
-        return 124, "codex exec timeout\n", cmd
-    except Exception as exc:  # noqa: BLE001
-        return 1, f"codex exec failed to start: {exc}\n", cmd
-    return proc.returncode or 0, proc.stdout or "", cmd
+    res = run_codex_exec(
+        prompt=prompt,
+        out_last_message=output_last_message,
+        timeout_sec=timeout_sec,
+        configs=[c for c in (codex_configs or []) if str(c).strip()],
+    )
+    return res.rc, res.trace, res.cmd
 
 
 def main() -> int:
@@ -675,6 +645,12 @@ def main() -> int:
         help="Total timeout budget for the whole run (seconds). Use --agent-timeout-sec for per-agent cap.",
     )
     ap.add_argument("--agent-timeout-sec", type=int, default=300, help="Per-agent timeout cap (seconds).")
+    ap.add_argument(
+        "--max-parallel",
+        type=int,
+        default=4,
+        help="Max agents reviewed concurrently (default: 4). Use 1 for the previous sequential behavior.",
+    )
     ap.add_argument(
         "--agent-timeouts",
         default="",
@@ -709,7 +685,10 @@ def main() -> int:
         action="store_true",
         help="Skip loading any external Claude agent prompt files; use the built-in minimal role prompt only.",
     )
+    ap.add_argument("--no-llm-cache", action="store_true", help="Bypass the codex answer cache under logs/ci/.llm-cache/.")
     args = ap.parse_args()
+    if args.no_llm_cache:
+        set_llm_cache_enabled(False)
 
     codex_configs: list[str] = []
     if str(args.model_reasoning_effort or "").strip():
@@ -823,7 +802,12 @@ def main() -> int:
     start_ts = time.monotonic()
     deadline_ts = start_ts + total_timeout_sec
 
-    for agent in agents:
+    def _review_agent(agent: str) -> tuple[list[ReviewResult], bool, bool]:
+        # Runs one agent; independent agents run concurrently (see --max-parallel).
+        # Each agent writes its prompt/review/trace files as soon as it completes.
+        agent_results: list[ReviewResult] = []
+        had_warnings = False
+        hard_fail = False
         remaining = int(deadline_ts - time.monotonic())
         if remaining <= 0:
             status = "fail" if args.strict else "skipped"
@@ -831,7 +815,7 @@ def main() -> int:
                 had_warnings = True
             if status == "fail":
                 hard_fail = True
-            results.append(
+            agent_results.append(
                 ReviewResult(
                     agent=agent,
                     status=status,
@@ -846,7 +830,7 @@ def main() -> int:
                     },
                 )
             )
-            continue
+            return agent_results, had_warnings, hard_fail
 
         if agent in DETERMINISTIC_AGENTS:
             det = build_deterministic_review(agent=agent, out_dir=out_dir, task_id=triplet.task_id if triplet else None)
@@ -855,7 +839,7 @@ def main() -> int:
                 had_warnings = True
             if det.get("status") == "fail":
                 hard_fail = True
-            results.append(
+            agent_results.append(
                 ReviewResult(
                     agent=agent,
                     status=str(det.get("status")),
@@ -871,7 +855,7 @@ def main() -> int:
                     },
                 )
             )
-            continue
+            return agent_results, had_warnings, hard_fail
 
         agent_prompt, prompt_meta = _agent_prompt(agent, claude_agents_root=claude_agents_root, skip_agent_files=bool(args.skip_agent_prompts))
         blocks = [agent_prompt]
@@ -892,7 +876,7 @@ def main() -> int:
 
         if bool(args.prompts_only):
             had_warnings = True
-            results.append(
+            agent_results.append(
                 ReviewResult(
                     agent=agent,
                     status="skipped",
@@ -909,7 +893,7 @@ def main() -> int:
                 )
             )
             write_text(trace_path, "--prompts-only: LLM execution skipped.\n")
-            continue
+            return agent_results, had_warnings, hard_fail
 
         agent_cap = per_agent_overrides.get(agent, per_agent_timeout_sec)
         effective_timeout = max(1, min(int(agent_cap), int(remaining)))
@@ -940,7 +924,7 @@ def main() -> int:
             if semantic_gate == "require" and verdict != "OK":
                 had_warnings = True
                 hard_fail = True
-        results.append(
+        agent_results.append(
             ReviewResult(
                 agent=agent,
                 status=status,
@@ -959,6 +943,17 @@ def main() -> int:
                 },
             )
         )
+        return agent_results, had_warnings, hard_fail
+
+    max_parallel = max(1, int(args.max_parallel))
+    set_max_concurrency(max_parallel)
+    with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="sc-llm-review") as pool:
+        # map() keeps the declared agent order for summary.json.
+        outcomes = list(pool.map(_review_agent, agents))
+    for agent_results, agent_warn, agent_fail in outcomes:
+        results.extend(agent_results)
+        had_warnings = had_warnings or agent_warn
+        hard_fail = hard_fail or agent_fail
 
     summary = {
         "cmd": "sc-llm-review",
@@ -9,7 +9,15 @@ Purpose:
 Design:
   - This is "stage 2" only (LLM semantic audit).
   - It does NOT re-check deterministic gates already covered by sc-acceptance-check.
-  - Output is written to logs/ci/<YYYY-MM-DD>/sc-semantic-gate-all/.
+  - Output is written to logs/ci/<YYYY-MM-DD>/sc-semantic-gate-all/ (or --out-dir).
+  - Batches are dispatched with a bounded worker pool (--concurrency) and streamed to
+    findings.tsv / summary.json as they finish.
+  - Retries are layered: transport failures (rate limits, 5xx, dropped connections) are retried
+    by _codex_client (env SC_LLM_RETRIES); --retries only re-asks, with exponential backoff, when
+    codex exited 0 but the answer is unparseable or misses a task verdict.
+  - --resume skips batches whose batch-XX.result.json matches the current task ids and prompt hash;
+    only complete batches (every run rc=0 with a parsed verdict per task) are written, so
+    failed or timed-out batches are retried.
 
 Output format:
   The LLM is instructed to emit strict TSV lines:
@@ -19,14 +27,19 @@ Output format:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import random
 import re
-import shutil
-import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from _codex_client import run_codex_exec, set_max_concurrency
+from _llm_cache import set_llm_cache_enabled
 from _taskmaster import resolve_triplet
 from _util import ci_dir, repo_root, today_str
 
@@ -137,40 +150,25 @@ def _task_brief(task_id: int, *, max_acceptance_items: int) -> str:
     return "\n".join(lines).strip()
 
 
-def _run_codex_exec(*, prompt: str, out_path: Path, timeout_sec: int, model_reasoning_effort: str) -> tuple[int, str]:
-    exe = shutil.which("codex")
-    if not exe:
-        return 127, "codex executable not found in PATH\n"
-    cmd = [
-        exe,
-        "exec",
-        "-c",
-        f'model_reasoning_effort="{model_reasoning_effort}"',
-        "-s",
-        "read-only",
-        "-C",
-        str(repo_root()),
-        "--output-last-message",
-        str(out_path),
-        "-",
-    ]
-    try:
-        proc = subprocess.run(
-            cmd,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            cwd=str(repo_root()),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            timeout=timeout_sec,
-        )
-    except subprocess.TimeoutExpired:
-        return 124, "codex exec timeout\n"
-    except Exception as exc:  # noqa: BLE001
-        return 1, f"codex exec failed: {exc}\n"
-    return proc.returncode or 0, proc.stdout or ""
+def _run_codex_exec(
+    *,
+    prompt: str,
+    batch: list[int],
+    out_path: Path,
+    timeout_sec: int,
+    model_reasoning_effort: str,
+    cache_salt: str = "",
+) -> tuple[int, str]:
+    res = run_codex_exec(
+        prompt=prompt,
+        out_last_message=out_path,
+        timeout_sec=timeout_sec,
+        configs=[f'model_reasoning_effort="{model_reasoning_effort}"'],
+        cache_salt=cache_salt,
+        # Partial answers are never cached, so a gate-level retry really asks again.
+        cacheable=lambda text: not _missing_verdicts(batch, _parse_tsv_output(text)),
+    )
+    return res.rc, res.trace
 
 
 def _build_batch_prompt(*, batch: list[int], max_acceptance_items: int) -> str:
@@ -228,6 +226,231 @@ def _parse_tsv_output(text: str) -> list[SemanticFinding]:
     return out
 
 
+def _consensus(batch: list[int], per_run: list[dict[int, SemanticFinding]]) -> dict[int, SemanticFinding]:
+    # Consensus: majority vote per task (OK vs Needs Fix). Ties -> Unknown.
+    out: dict[int, SemanticFinding] = {}
+    for tid in batch:
+        ok = sum(1 for r in per_run if r[tid].verdict == "OK")
+        nf = sum(1 for r in per_run if r[tid].verdict == "Needs Fix")
+        if ok == nf:
+            verdict = "Unknown"
+        else:
+            verdict = "OK" if ok > nf else "Needs Fix"
+
+        # Pick the first matching reason for the consensus verdict.
+        reason = ""
+        for r in per_run:
+            f = r[tid]
+            if f.verdict == verdict:
+                reason = f.reason
+                break
+        if verdict == "Unknown" and not reason:
+            # Fall back to any reason if available.
+            reason = next((r[tid].reason for r in per_run if r[tid].reason), "no consensus verdict")
+
+        out[tid] = SemanticFinding(task_id=tid, verdict=verdict, reason=reason)
+    return out
+
+
+def _missing_verdicts(batch: list[int], parsed: list[SemanticFinding]) -> bool:
+    verdicts = {p.task_id: p.verdict for p in parsed}
+    return any(verdicts.get(tid, "Unknown") == "Unknown" for tid in batch)
+
+
+def _should_retry(rc: int, batch: list[int], parsed: list[SemanticFinding]) -> bool:
+    # Only content problems are retried here. A non-zero rc already went through the client's
+    # transport retries (SC_LLM_RETRIES); timeouts and a missing codex would fail again, so
+    # the batch stays incomplete and --resume picks it up later.
+    return rc == 0 and _missing_verdicts(batch, parsed)
+
+
+def _backoff_delay(attempt: int, *, base_sec: float) -> float:
+    # Exponential backoff with +/-25% jitter so concurrent batches do not retry in lockstep.
+    return max(0.0, base_sec) * (2 ** (attempt - 1)) * random.uniform(0.75, 1.25)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    index: int
+    task_ids: list[int]
+    prompt_sha256: str
+    findings: dict[int, SemanticFinding]
+    attempts: list[int]  # codex calls per consensus run
+    resumed: bool = False
+    # Every consensus run exited 0 with a parsed OK/Needs Fix verdict for every task; only such
+    # batches are persisted for --resume (a codex/network outage must be retried, not replayed).
+    complete: bool = False
+
+
+def _run_batch(
+    *,
+    idx: int,
+    batch: list[int],
+    prompt: str,
+    prompt_sha256: str,
+    out_dir: Path,
+    runs: int,
+    timeout_sec: int,
+    model_reasoning_effort: str,
+    retries: int,
+    retry_backoff_sec: float,
+) -> BatchResult:
+    per_run: list[dict[int, SemanticFinding]] = []
+    attempts: list[int] = []
+    complete = True
+    for run_idx in range(1, runs + 1):
+        suffix = f"-run-{run_idx:02d}" if runs > 1 else ""
+        out_path = out_dir / f"batch-{idx:02d}{suffix}.tsv"
+        trace_path = out_dir / f"batch-{idx:02d}{suffix}.trace.log"
+
+        traces: list[str] = []
+        parsed: list[SemanticFinding] = []
+        attempt = 0
+        while True:
+            attempt += 1
+            # Never parse a stale answer from a previous attempt/run.
+            out_path.unlink(missing_ok=True)
+            rc, trace = _run_codex_exec(
+                prompt=prompt,
+                batch=batch,
+                out_path=out_path,
+                timeout_sec=timeout_sec,
+                model_reasoning_effort=model_reasoning_effort,
+                # Consensus runs must be independent samples, not cache replays of run 1.
+                cache_salt=f"consensus-run-{run_idx}" if runs > 1 else "",
+            )
+            traces.append(trace if attempt == 1 else f"\n=== retry attempt {attempt} (rc={rc}) ===\n{trace}")
+            trace_path.write_text("".join(traces), encoding="utf-8")
+
+            tsv = out_path.read_text(encoding="utf-8", errors="ignore") if out_path.is_file() else ""
+            parsed = _parse_tsv_output(tsv)
+            if attempt > retries or not _should_retry(rc, batch, parsed):
+                break
+            time.sleep(_backoff_delay(attempt, base_sec=retry_backoff_sec))
+        attempts.append(attempt)
+
+        run_map: dict[int, SemanticFinding] = {p.task_id: p for p in parsed}
+        if rc != 0 or any(tid not in run_map or run_map[tid].verdict == "Unknown" for tid in batch):
+            complete = False
+        # Mark missing tasks in this run as unknown for visibility.
+        for tid in batch:
+            if tid not in run_map:
+                run_map[tid] = SemanticFinding(task_id=tid, verdict="Unknown", reason="no parseable verdict")
+        per_run.append(run_map)
+
+    return BatchResult(
+        index=idx,
+        task_ids=list(batch),
+        prompt_sha256=prompt_sha256,
+        findings=_consensus(batch, per_run),
+        attempts=attempts,
+        complete=complete,
+    )
+
+
+def _result_path(out_dir: Path, idx: int) -> Path:
+    return out_dir / f"batch-{idx:02d}.result.json"
+
+
+def _load_finished_batches(out_dir: Path, *, runs: int, model_reasoning_effort: str) -> dict[tuple[tuple[int, ...], str], dict[str, Any]]:
+    """
+    Finished batch results keyed by (task ids, prompt sha256). A batch is only reused when it
+    completed (see BatchResult.complete) and the prompt (task content + audit rules) and
+    consensus settings are unchanged.
+    """
+    out: dict[tuple[tuple[int, ...], str], dict[str, Any]] = {}
+    for p in sorted(out_dir.glob("batch-*.result.json")):
+        try:
+            obj = _read_json(p)
+        except Exception:  # noqa: BLE001
+            continue
+        if not isinstance(obj, dict) or obj.get("complete") is not True:
+            continue
+        if obj.get("consensus_runs") != runs or obj.get("model_reasoning_effort") != model_reasoning_effort:
+            continue
+        ids = obj.get("task_ids")
+        findings = obj.get("findings")
+        if not isinstance(ids, list) or not isinstance(findings, list):
+            continue
+        out[(tuple(int(x) for x in ids), str(obj.get("prompt_sha256") or ""))] = obj
+    return out
+
+
+class _ResultSink:
+    """
+    Streams results as batches finish: batch-XX.result.json, findings.tsv (append) and a
+    partial summary.json ("complete": false) so an interrupted run still leaves usable output.
+    """
+
+    def __init__(self, *, out_dir: Path, base_summary: dict[str, Any], runs: int, model_reasoning_effort: str) -> None:
+        self.out_dir = out_dir
+        self.base_summary = base_summary
+        self.runs = runs
+        self.model_reasoning_effort = model_reasoning_effort
+        self.findings: dict[int, SemanticFinding] = {}
+        self.resumed: list[int] = []
+        self.incomplete: list[int] = []
+        self.finished = 0
+        self._lock = threading.Lock()
+        (out_dir / "findings.tsv").write_text("", encoding="utf-8")
+
+    def add(self, result: BatchResult) -> None:
+        with self._lock:
+            if not result.resumed and not result.complete:
+                # Failed/timed-out/unparseable runs: keep the findings in this run's output only.
+                _result_path(self.out_dir, result.index).unlink(missing_ok=True)
+                self.incomplete.append(result.index)
+            elif not result.resumed:
+                payload = {
+                    "index": result.index,
+                    "task_ids": result.task_ids,
+                    "prompt_sha256": result.prompt_sha256,
+                    "consensus_runs": self.runs,
+                    "model_reasoning_effort": self.model_reasoning_effort,
+                    "attempts": result.attempts,
+                    "complete": True,
+                    "findings": [
+                        {"task_id": f.task_id, "verdict": f.verdict, "reason": f.reason} for f in result.findings.values()
+                    ],
+                }
+                _result_path(self.out_dir, result.index).write_text(
+                    json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+                )
+            else:
+                self.resumed.append(result.index)
+            with (self.out_dir / "findings.tsv").open("a", encoding="utf-8") as fh:
+                for tid in result.task_ids:
+                    f = result.findings[tid]
+                    fh.write(f"T{tid}\t{f.verdict}\t{f.reason}\n")
+            self.findings.update(result.findings)
+            self.finished += 1
+            self.write_summary(complete=False)
+
+    def write_summary(self, *, complete: bool) -> dict[str, Any]:
+        needs_fix = sorted([f.task_id for f in self.findings.values() if f.verdict == "Needs Fix"])
+        unknown = sorted([f.task_id for f in self.findings.values() if f.verdict == "Unknown"])
+        summary = {
+            **self.base_summary,
+            "complete": complete,
+            "finished_batches": self.finished,
+            "resumed_batches": sorted(self.resumed),
+            "incomplete_batches": sorted(self.incomplete),
+            "counts": {
+                "ok": sum(1 for f in self.findings.values() if f.verdict == "OK"),
+                "needs_fix": len(needs_fix),
+                "unknown": len(unknown),
+            },
+            "needs_fix": needs_fix,
+            "unknown": unknown,
+            "findings": [
+                {"task_id": tid, "verdict": f.verdict, "reason": f.reason}
+                for tid, f in sorted(self.findings.items(), key=lambda x: x[0])
+            ],
+        }
+        (self.out_dir / "summary.json").write_text(json.dumps(summary, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        return summary
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="sc semantic equivalence gate (batch) for all tasks")
     ap.add_argument(
@@ -251,14 +474,33 @@ def main() -> int:
     )
     ap.add_argument("--max-acceptance-items", type=int, default=12, help="Max acceptance items per view included in prompt.")
     ap.add_argument("--max-tasks", type=int, default=0, help="Limit total tasks (0=all).")
+    ap.add_argument("--concurrency", type=int, default=1, help="Batches dispatched to codex in parallel (default: 1).")
+    ap.add_argument(
+        "--retries",
+        type=int,
+        default=1,
+        help="Re-asks per batch run when codex exits 0 with unparseable/incomplete output (default: 1); transport retries: SC_LLM_RETRIES.",
+    )
+    ap.add_argument("--retry-backoff-sec", type=float, default=15.0, help="Base backoff before a retry; doubles per attempt (default: 15).")
+    ap.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse finished batch-*.result.json in the output dir when task ids, prompt and consensus settings match.",
+    )
+    ap.add_argument("--out-dir", default="", help="Output dir (default: logs/ci/<date>/sc-semantic-gate-all). Use a fixed dir to resume across days.")
+    ap.add_argument("--no-llm-cache", action="store_true", help="Bypass the codex answer cache under logs/ci/.llm-cache/.")
     args = ap.parse_args()
+    if args.no_llm_cache:
+        set_llm_cache_enabled(False)
 
     batch_size = int(args.batch_size)
     if batch_size <= 0:
         print("[sc-semantic-gate-all] ERROR: --batch-size must be > 0")
         return 2
 
-    out_dir = ci_dir("sc-semantic-gate-all")
+    out_dir = Path(args.out_dir) if str(args.out_dir or "").strip() else ci_dir("sc-semantic-gate-all")
+    if not out_dir.is_absolute():
+        out_dir = repo_root() / out_dir
     out_dir.mkdir(parents=True, exist_ok=True)
 
     all_ids = _load_all_task_ids()
@@ -281,80 +523,72 @@ def main() -> int:
     for i in range(0, len(all_ids), batch_size):
         batches.append(all_ids[i : i + batch_size])
 
-    all_findings: dict[int, SemanticFinding] = {}
+    runs = max(1, int(args.consensus_runs))
+    concurrency = max(1, int(args.concurrency))
+    # The shared codex client caps concurrent codex processes process-wide; lift it to --concurrency.
+    set_max_concurrency(max(concurrency, 1))
+    effort = str(args.model_reasoning_effort)
+    finished = _load_finished_batches(out_dir, runs=runs, model_reasoning_effort=effort) if args.resume else {}
+
+    sink = _ResultSink(
+        out_dir=out_dir,
+        base_summary={
+            "cmd": "sc-semantic-gate-all",
+            "date": today_str(),
+            "batches": len(batches),
+            "batch_size": batch_size,
+            "concurrency": concurrency,
+            "total_tasks": len(all_ids),
+        },
+        runs=runs,
+        model_reasoning_effort=effort,
+    )
+
+    pending: list[tuple[int, list[int], str, str]] = []
     for idx, batch in enumerate(batches, 1):
         prompt = _build_batch_prompt(batch=batch, max_acceptance_items=int(args.max_acceptance_items))
-        runs = max(1, int(args.consensus_runs))
-        per_run: list[dict[int, SemanticFinding]] = []
-        for run_idx in range(1, runs + 1):
-            suffix = f"-run-{run_idx:02d}" if runs > 1 else ""
-            out_path = out_dir / f"batch-{idx:02d}{suffix}.tsv"
-            trace_path = out_dir / f"batch-{idx:02d}{suffix}.trace.log"
+        prompt_sha = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        prev = finished.get((tuple(batch), prompt_sha))
+        if prev is not None:
+            findings = {
+                int(f["task_id"]): SemanticFinding(task_id=int(f["task_id"]), verdict=str(f["verdict"]), reason=str(f.get("reason") or ""))
+                for f in prev["findings"]
+                if isinstance(f, dict) and int(f.get("task_id", -1)) in batch
+            }
+            if set(findings) == set(batch):
+                sink.add(BatchResult(index=idx, task_ids=batch, prompt_sha256=prompt_sha, findings=findings, attempts=[], resumed=True))
+                print(f"[sc-semantic-gate-all] batch {idx}/{len(batches)} resumed tasks={len(batch)}")
+                continue
+        pending.append((idx, batch, prompt, prompt_sha))
+
+    def _submit(item: tuple[int, list[int], str, str]) -> BatchResult:
+        idx, batch, prompt, prompt_sha = item
+        return _run_batch(
+            idx=idx,
+            batch=batch,
+            prompt=prompt,
+            prompt_sha256=prompt_sha,
+            out_dir=out_dir,
+            runs=runs,
+            timeout_sec=int(args.timeout_sec),
+            model_reasoning_effort=effort,
+            retries=max(0, int(args.retries)),
+            retry_backoff_sec=float(args.retry_backoff_sec),
+        )
 
-            rc, trace = _run_codex_exec(
-                prompt=prompt,
-                out_path=out_path,
-                timeout_sec=int(args.timeout_sec),
-                model_reasoning_effort=str(args.model_reasoning_effort),
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="sc-semantic") as pool:
+        futures = [pool.submit(_submit, item) for item in pending]
+        for fut in as_completed(futures):
+            result = fut.result()
+            sink.add(result)
+            print(
+                f"[sc-semantic-gate-all] batch {result.index}/{len(batches)} runs={runs} tasks={len(result.task_ids)} "
+                f"attempts={sum(result.attempts)}"
             )
-            trace_path.write_text(trace, encoding="utf-8")
-
-            tsv = out_path.read_text(encoding="utf-8", errors="ignore") if out_path.is_file() else ""
-            parsed = _parse_tsv_output(tsv)
-            run_map: dict[int, SemanticFinding] = {p.task_id: p for p in parsed}
-            # Mark missing tasks in this run as unknown for visibility.
-            for tid in batch:
-                if tid not in run_map:
-                    run_map[tid] = SemanticFinding(task_id=tid, verdict="Unknown", reason="no parseable verdict")
-            per_run.append(run_map)
-
-        # Consensus: majority vote per task (OK vs Needs Fix). Ties -> Unknown.
-        for tid in batch:
-            ok = sum(1 for r in per_run if r[tid].verdict == "OK")
-            nf = sum(1 for r in per_run if r[tid].verdict == "Needs Fix")
-            if ok == nf:
-                verdict = "Unknown"
-            else:
-                verdict = "OK" if ok > nf else "Needs Fix"
-
-            # Pick the first matching reason for the consensus verdict.
-            reason = ""
-            for r in per_run:
-                f = r[tid]
-                if f.verdict == verdict:
-                    reason = f.reason
-                    break
-            if verdict == "Unknown" and not reason:
-                # Fall back to any reason if available.
-                reason = next((r[tid].reason for r in per_run if r[tid].reason), "no consensus verdict")
-
-            all_findings[tid] = SemanticFinding(task_id=tid, verdict=verdict, reason=reason)
-
-        print(f"[sc-semantic-gate-all] batch {idx}/{len(batches)} runs={runs} tasks={len(batch)}")
-
-    needs_fix = sorted([f.task_id for f in all_findings.values() if f.verdict == "Needs Fix"])
-    unknown = sorted([f.task_id for f in all_findings.values() if f.verdict == "Unknown"])
-
-    summary = {
-        "cmd": "sc-semantic-gate-all",
-        "date": today_str(),
-        "batches": len(batches),
-        "batch_size": batch_size,
-        "total_tasks": len(all_ids),
-        "counts": {
-            "ok": sum(1 for f in all_findings.values() if f.verdict == "OK"),
-            "needs_fix": len(needs_fix),
-            "unknown": len(unknown),
-        },
-        "needs_fix": needs_fix,
-        "unknown": unknown,
-        "findings": [
-            {"task_id": tid, "verdict": f.verdict, "reason": f.reason}
-            for tid, f in sorted(all_findings.items(), key=lambda x: x[0])
-        ],
-    }
-    (out_dir / "summary.json").write_text(json.dumps(summary, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
+    summary = sink.write_summary(complete=True)
+    needs_fix = summary["needs_fix"]
+    unknown = summary["unknown"]
     print(f"SC_SEMANTIC_GATE_ALL needs_fix={len(needs_fix)} unknown={len(unknown)} out={out_dir}")
     return 0
 
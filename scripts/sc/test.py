@@ -10,6 +10,27 @@ Usage (Windows):
   py -3 scripts/sc/test.py --type unit
   py -3 scripts/sc/test.py --type e2e --godot-bin \"C:\\Godot\\Godot_v4.5.1-stable_mono_win64_console.exe\"
   py -3 scripts/sc/test.py --type all --godot-bin \"%GODOT_BIN%\"
+  py -3 scripts/sc/test.py --type unit --impact            # only tests affected by uncommitted changes
+  py -3 scripts/sc/test.py --type all --impact --impact-base main --godot-bin \"%GODOT_BIN%\"
+
+--impact (scripts/python/test_impact_lib.py) narrows dotnet test to the affected test classes and
+GdUnit to the affected suites; it falls back to the full run on build-input changes. Nightly and
+acceptance runs omit it and stay full.
+
+--unit-shards N (env SC_UNIT_SHARDS; 0 = one per core) runs dotnet test classes in N parallel
+processes and merges TRX/cobertura (scripts/python/dotnet_shard_lib.py). Ignored when --impact
+narrows the run to a filter.
+
+--gdunit-shards N (env SC_GDUNIT_SHARDS; 0 = one per core) splits the hard GdUnit suites across N
+headless Godot instances (scripts/python/gdunit_shard_lib.py); the merged results.xml lands in
+the same report directory.
+
+--warm-worker starts (or reuses) warm headless Godot workers for Tests.Godot and the game project
+before the e2e steps (scripts/python/godot_worker.py); run_gdunit.py and smoke_headless.py then
+skip engine boot and the prewarm. Workers stay up until idle for the next run.
+
+Every step in summary.json carries `metrics` (wall, CPU user/sys, peak RSS and I/O of the step
+and its child processes; scripts/python/proc_metrics_lib.py).
 """
 
 from __future__ import annotations
@@ -19,8 +40,10 @@ import os
 import shutil
 import uuid
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+from _artifact_catalog import KIND_GDUNIT_REPORT_DIR, KIND_SC_TEST_SUMMARY, KIND_UNIT_DIR, register_artifact
+from _proc_metrics import ResourceMeter
 from _util import ci_dir, repo_root, run_cmd, today_str, write_json, write_text
 
 
@@ -34,18 +57,77 @@ def build_parser() -> argparse.ArgumentParser:
     ap.add_argument("--smoke-scene", default="res://Game.Godot/Scenes/Main.tscn", help="Main scene for smoke test")
     ap.add_argument("--timeout-sec", type=int, default=600)
     ap.add_argument("--skip-smoke", action="store_true")
+    ap.add_argument(
+        "--smoke-perf-runs",
+        type=int,
+        default=1,
+        help="Launch the smoke scene N times and pool [PERF] windows with bootstrap CIs (perf-runs.json); 1 = single smoke run",
+    )
+    ap.add_argument("--smoke-perf-warmup-sec", type=float, default=5.0, help="Perf runs: drop [PERF] windows before this uptime")
+    ap.add_argument("--impact", action="store_true", help="run only tests affected by changed files (test impact analysis)")
+    ap.add_argument("--impact-base", default="HEAD", help="diff base for --impact (default HEAD: uncommitted changes)")
+    ap.add_argument(
+        "--unit-shards",
+        type=int,
+        default=int(os.environ.get("SC_UNIT_SHARDS", "1") or 1),
+        help="parallel dotnet test shards (0 = auto; default env SC_UNIT_SHARDS or 1)",
+    )
+    ap.add_argument(
+        "--gdunit-shards",
+        type=int,
+        default=int(os.environ.get("SC_GDUNIT_SHARDS", "1") or 1),
+        help="parallel headless Godot instances for GdUnit (0 = auto; default env SC_GDUNIT_SHARDS or 1)",
+    )
+    ap.add_argument("--warm-worker", action="store_true", help="dispatch GdUnit/smoke to warm headless Godot workers")
+    ap.add_argument(
+        "--smoke-cold",
+        action="store_true",
+        help="launch the smoke scene cold even with --warm-worker (its headless.log feeds a perf budget)",
+    )
     ap.add_argument("--no-coverage-gate", action="store_true", help="do not enforce default coverage thresholds")
     ap.add_argument("--no-coverage-report", action="store_true", help="skip HTML coverage report generation")
     return ap
 
 
-def run_unit(out_dir: Path, solution: str, configuration: str, *, run_id: str) -> dict[str, Any]:
+def measured(fn: Callable[..., dict[str, Any]], *args: Any, **kwargs: Any) -> dict[str, Any]:
+    with ResourceMeter() as meter:
+        step = fn(*args, **kwargs)
+    return {**step, "metrics": meter.metrics}
+
+
+def compute_impact(out_dir: Path, base: str) -> Any:
+    from artifact_catalog_lib import KIND_COBERTURA, find_artifact
+    from test_impact_lib import changed_files, select_tests
+
+    root = repo_root()
+    sel = select_tests(changed_files(root, base), root=root, cobertura=find_artifact(KIND_COBERTURA))
+    write_json(out_dir / "test-impact.json", {**sel.to_json(), "base": base})
+    print(
+        f"[sc-test] impact mode={sel.mode} changed={len(sel.changed)} dotnet_classes={len(sel.dotnet_classes)}/{sel.dotnet_total_classes} "
+        f"gdunit_suites={len(sel.gdunit_suites)}/{sel.gdunit_total_suites}"
+    )
+    return sel
+
+
+def run_unit(
+    out_dir: Path,
+    solution: str,
+    configuration: str,
+    *,
+    run_id: str,
+    dotnet_filter: str | None = None,
+    shards: int = 1,
+) -> dict[str, Any]:
     cmd = ["py", "-3", "scripts/python/run_dotnet.py", "--solution", solution, "--configuration", configuration]
-    rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=1_800)
+    if dotnet_filter:
+        cmd += ["--filter", dotnet_filter]
+    elif shards != 1:
+        cmd += ["--shards", str(shards)]
     log_path = out_dir / "unit.log"
-    write_text(log_path, out)
+    rc, _ = run_cmd(cmd, cwd=repo_root(), timeout_sec=1_800, log_path=log_path)
     unit_artifacts_dir = repo_root() / "logs" / "unit" / today_str()
     write_text(unit_artifacts_dir / "run_id.txt", run_id + "\n")
+    register_artifact(KIND_UNIT_DIR, unit_artifacts_dir, run_id=run_id, step="unit")
     return {"name": "unit", "cmd": cmd, "rc": rc, "log": str(log_path), "artifacts_dir": str(unit_artifacts_dir)}
 
 
@@ -73,9 +155,8 @@ def run_coverage_report(out_dir: Path, unit_artifacts_dir: Path) -> dict[str, An
         f"-targetdir:{target_dir}",
         "-reporttypes:Html",
     ]
-    rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=300)
     log_path = out_dir / "coverage-report.log"
-    write_text(log_path, out)
+    rc, _ = run_cmd(cmd, cwd=repo_root(), timeout_sec=300, log_path=log_path)
     return {
         "name": "coverage-report",
         "cmd": cmd,
@@ -86,7 +167,15 @@ def run_coverage_report(out_dir: Path, unit_artifacts_dir: Path) -> dict[str, An
     }
 
 
-def run_gdunit_hard(out_dir: Path, godot_bin: str, timeout_sec: int, *, run_id: str) -> dict[str, Any]:
+def run_gdunit_hard(
+    out_dir: Path,
+    godot_bin: str,
+    timeout_sec: int,
+    *,
+    run_id: str,
+    suites: list[str] | None = None,
+    shards: int = 1,
+) -> dict[str, Any]:
     date = today_str()
     report_dir = Path("logs") / "e2e" / date / "sc-test" / "gdunit-hard"
     os.environ["AUDIT_LOG_ROOT"] = str(repo_root() / "logs" / "ci" / date)
@@ -110,17 +199,56 @@ def run_gdunit_hard(out_dir: Path, godot_bin: str, timeout_sec: int, *, run_id:
         "--project",
         "Tests.Godot",
     ]
-    for d in add_dirs:
-        cmd += ["--add", d]
+    if suites is not None:
+        # Impact selection: affected suites inside the hard directory set only.
+        from test_impact_lib import GDUNIT_TEST_PROJECT, gdunit_add_args
+
+        prefixes = tuple(f"{GDUNIT_TEST_PROJECT}/{d}/" for d in add_dirs)
+        selected = [s for s in suites if s.startswith(prefixes)]
+        if not selected:
+            return {"name": "gdunit-hard", "status": "skipped", "rc": 0, "reason": "no affected suites in the hard set"}
+        cmd += gdunit_add_args(selected)
+    else:
+        for d in add_dirs:
+            cmd += ["--add", d]
     cmd += ["--timeout-sec", str(timeout_sec), "--rd", str(report_dir)]
-    rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=timeout_sec + 300)
+    if shards != 1:
+        cmd += ["--shards", str(shards)]
     log_path = out_dir / "gdunit-hard.log"
-    write_text(log_path, out)
+    rc, _ = run_cmd(cmd, cwd=repo_root(), timeout_sec=timeout_sec + 300, log_path=log_path)
     write_text(repo_root() / report_dir / "run_id.txt", run_id + "\n")
+    register_artifact(KIND_GDUNIT_REPORT_DIR, repo_root() / report_dir, run_id=run_id, step="gdunit-hard")
     return {"name": "gdunit-hard", "cmd": cmd, "rc": rc, "log": str(log_path), "report_dir": str(report_dir)}
 
 
-def run_smoke(out_dir: Path, godot_bin: str, scene: str) -> dict[str, Any]:
+def start_warm_workers(out_dir: Path, godot_bin: str, *, gdunit: bool = True) -> dict[str, Any]:
+    """
+    Best-effort: a worker that fails to start only means the runners launch cold.
+    Sharded GdUnit runs are cold by design, so gdunit=False skips the Tests.Godot worker.
+    """
+    results: dict[str, Any] = {}
+    logs: list[str] = []
+    projects = ([("Tests.Godot", True)] if gdunit else []) + [(".", False)]
+    for project, build in projects:
+        cmd = ["py", "-3", "scripts/python/godot_worker.py", "start", "--godot-bin", godot_bin, "--project", project]
+        if build:
+            cmd.append("--build-solutions")
+        rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=900)
+        results[project] = {"rc": rc, "status": (out.strip().splitlines() or [""])[-1]}
+        logs.append(out)
+    write_text(out_dir / "warm-worker.log", "\n".join(logs))
+    return results
+
+
+def run_smoke(
+    out_dir: Path,
+    godot_bin: str,
+    scene: str,
+    *,
+    perf_runs: int = 1,
+    perf_warmup_sec: float = 5.0,
+    cold: bool = False,
+) -> dict[str, Any]:
     if scene.startswith("res://"):
         disk_path = repo_root() / scene[len("res://") :]
         if not disk_path.exists():
@@ -139,13 +267,16 @@ def run_smoke(out_dir: Path, godot_bin: str, scene: str) -> dict[str, Any]:
         "--scene",
         scene,
         "--timeout-sec",
-        "5",
+        "5" if perf_runs <= 1 else "20",
         "--mode",
         "strict",
     ]
-    rc, out = run_cmd(cmd, cwd=repo_root(), timeout_sec=120)
+    if perf_runs > 1:
+        cmd += ["--perf-runs", str(perf_runs), "--perf-warmup-sec", str(perf_warmup_sec)]
+    elif cold:
+        cmd += ["--cold"]
     log_path = out_dir / "smoke.log"
-    write_text(log_path, out)
+    rc, _ = run_cmd(cmd, cwd=repo_root(), timeout_sec=120 + 30 * max(0, perf_runs - 1), log_path=log_path)
     return {"name": "smoke", "cmd": cmd, "rc": rc, "log": str(log_path)}
 
 
@@ -154,6 +285,8 @@ def main() -> int:
     out_dir = ci_dir("sc-test")
     run_id = str(args.run_id or "").strip() or uuid.uuid4().hex
     write_text(out_dir / "run_id.txt", run_id + "\n")
+    # Child runners (run_dotnet.py / run_gdunit.py) tag their catalog entries with this run.
+    os.environ["SC_RUN_ID"] = run_id
 
     godot_bin = args.godot_bin or os.environ.get("GODOT_BIN")
 
@@ -169,18 +302,33 @@ def main() -> int:
 
     hard_fail = False
 
-    if args.type in ("unit", "all"):
+    impact = compute_impact(out_dir, str(args.impact_base)) if args.impact else None
+    if impact is not None:
+        summary["impact"] = {"mode": impact.mode, "base": args.impact_base, "reasons": impact.reasons, "file": str(out_dir / "test-impact.json")}
+    narrowed = impact is not None and impact.mode != "full"
+
+    if args.type in ("unit", "all") and narrowed and not impact.dotnet_classes:
+        summary["steps"].append({"name": "unit", "status": "skipped", "rc": 0, "reason": "no affected .NET test classes"})
+    elif args.type in ("unit", "all"):
         if not args.no_coverage_gate:
             os.environ.setdefault("COVERAGE_LINES_MIN", "90")
             os.environ.setdefault("COVERAGE_BRANCHES_MIN", "85")
 
-        step = run_unit(out_dir, args.solution, args.configuration, run_id=run_id)
+        step = measured(
+            run_unit,
+            out_dir,
+            args.solution,
+            args.configuration,
+            run_id=run_id,
+            dotnet_filter=impact.dotnet_filter if narrowed else None,
+            shards=args.unit_shards,
+        )
         summary["steps"].append(step)
         if step["rc"] != 0:
             hard_fail = True
         else:
             if not args.no_coverage_report:
-                cov = run_coverage_report(out_dir, Path(step["artifacts_dir"]))
+                cov = measured(run_coverage_report, out_dir, Path(step["artifacts_dir"]))
                 summary["steps"].append(cov)
                 if cov.get("status") == "fail":
                     hard_fail = True
@@ -190,19 +338,42 @@ def main() -> int:
             print("[sc-test] ERROR: --godot-bin (or env GODOT_BIN) is required for e2e/integration tests.")
             return 2
 
-        step = run_gdunit_hard(out_dir, godot_bin, args.timeout_sec, run_id=run_id)
-        summary["steps"].append(step)
-        if step["rc"] != 0:
-            hard_fail = True
+        if args.warm_worker:
+            summary["warm_workers"] = measured(start_warm_workers, out_dir, godot_bin, gdunit=args.gdunit_shards == 1)
+
+        if narrowed and not impact.gdunit_suites:
+            summary["steps"].append({"name": "gdunit-hard", "status": "skipped", "rc": 0, "reason": "no affected GdUnit suites"})
+        else:
+            step = measured(
+                run_gdunit_hard,
+                out_dir,
+                godot_bin,
+                args.timeout_sec,
+                run_id=run_id,
+                suites=impact.gdunit_suites if narrowed else None,
+                shards=args.gdunit_shards,
+            )
+            summary["steps"].append(step)
+            if step["rc"] != 0:
+                hard_fail = True
 
         if not args.skip_smoke:
-            sm = run_smoke(out_dir, godot_bin, args.smoke_scene)
+            sm = measured(
+                run_smoke,
+                out_dir,
+                godot_bin,
+                args.smoke_scene,
+                perf_runs=max(1, int(args.smoke_perf_runs)),
+                perf_warmup_sec=float(args.smoke_perf_warmup_sec),
+                cold=bool(args.smoke_cold),
+            )
             summary["steps"].append(sm)
             if sm["rc"] != 0:
                 hard_fail = True
 
     summary["status"] = "ok" if not hard_fail else "fail"
     write_json(out_dir / "summary.json", summary)
+    register_artifact(KIND_SC_TEST_SUMMARY, out_dir / "summary.json", run_id=run_id, step="sc-test")
 
     print(f"SC_TEST status={summary['status']} out={out_dir}")
     return 0 if not hard_fail else 1
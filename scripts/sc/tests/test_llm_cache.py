@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/sc/_llm_cache.py.
+
+Run:
+  py -3 -m unittest discover -s scripts/sc/tests
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+def _bootstrap_imports() -> None:
+    sc_dir = str(Path(__file__).resolve().parents[1])
+    if sc_dir not in sys.path:
+        sys.path.insert(0, sc_dir)
+
+
+_bootstrap_imports()
+
+import _llm_cache  # noqa: E402
+
+
+class CacheKeyTests(unittest.TestCase):
+    def test_sandbox_is_part_of_the_key(self) -> None:
+        read_only = _llm_cache.cache_key("prompt", configs=["model=x"], sandbox="read-only")
+        workspace = _llm_cache.cache_key("prompt", configs=["model=x"], sandbox="workspace-write")
+        self.assertNotEqual(read_only, workspace)
+
+    def test_cached_call_is_not_served_across_sandboxes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(_llm_cache, "cache_dir", lambda root=None: Path(tmp) / "cache"), \
+                mock.patch.dict("os.environ", {_llm_cache.LLM_CACHE_ENV: "1"}):
+            out = Path(tmp) / "last.txt"
+            calls: list[str] = []
+
+            def run(answer: str):
+                def _run() -> tuple[int, str]:
+                    calls.append(answer)
+                    out.write_text(answer, encoding="utf-8")
+                    return 0, "trace"
+                return _run
+
+            _llm_cache.codex_exec_cached(prompt="p", out_last_message=out, run=run("ro"), sandbox="read-only")
+            _llm_cache.codex_exec_cached(prompt="p", out_last_message=out, run=run("ww"), sandbox="workspace-write")
+            self.assertEqual(calls, ["ro", "ww"])
+            self.assertEqual(out.read_text(encoding="utf-8"), "ww")
+
+            rc, trace = _llm_cache.codex_exec_cached(prompt="p", out_last_message=out, run=run("again"), sandbox="read-only")
+            self.assertEqual((rc, calls), (0, ["ro", "ww"]))
+            self.assertTrue(trace.startswith("[llm-cache] hit"))
+            self.assertEqual(out.read_text(encoding="utf-8"), "ro")
+
+
+if __name__ == "__main__":
+    unittest.main()